@@ -24,7 +24,7 @@ class AdvancedMachineNativeConverter(MachineNativeConverter):
         self._semantic_rules_backup = copy.deepcopy(self.conversion_rules.get("semantic", []))
         logger.info("AdvancedMachineNativeConverter 初始化完成 (enable_semantic=%s)", enable_semantic)
 
-    def convert_project(self, source_path: str, target_path: str) -> Dict[str, Any]:
+    def convert_project(self, source_path: str, target_path: str, **options) -> Dict[str, Any]:
         """
         目前直接調用基礎轉換器，預留高級語意/增強策略掛鉤。
         """
@@ -36,7 +36,7 @@ class AdvancedMachineNativeConverter(MachineNativeConverter):
             logger.info("已禁用語意層轉換 (semantic layer skipped)")
 
         try:
-            return super().convert_project(source_path, target_path)
+            return super().convert_project(source_path, target_path, **options)
         finally:
             # 恢復原規則以避免重複實例或多次調用時的副作用
             self.conversion_rules["semantic"] = semantic_backup
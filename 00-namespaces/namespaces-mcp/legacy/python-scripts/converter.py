@@ -10,8 +10,11 @@ import os
 import re
 import json
 import yaml
+import shutil
+import fnmatch
 import hashlib
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -24,6 +27,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger('MachineNativeOps.Converter')
 
+# 治理層級（按轉換順序）
+LAYERS = ["namespace", "dependency", "reference", "structure", "semantic", "governance"]
+
+# 複製專案時略過的文件與目錄（fnmatch 模式）
+IGNORE_PATTERNS = (
+    '.git', '.svn', '.DS_Store', '__pycache__', 'node_modules',
+    '*.pyc', '*.class', '*.jar', '.idea', '.vscode'
+)
+
+# 增量轉換清單
+MANIFEST_NAME = ".conversion-manifest.json"
+MANIFEST_VERSION = 1
+
 
 @dataclass
 class ConversionRule:
@@ -333,8 +349,23 @@ class MachineNativeConverter:
             )
         ]
     
-    def convert_project(self, source_path: str, target_path: str) -> Dict[str, ConversionResult]:
-        """執行專案轉換"""
+    def convert_project(self, source_path: str, target_path: str,
+                        incremental: bool = False,
+                        max_workers: Optional[int] = None,
+                        parallel_threshold: int = 64) -> Dict[str, ConversionResult]:
+        """
+        執行專案轉換
+
+        單次遍歷源專案，每個文件只讀取一次，在內存中依層級順序套用所有適用的
+        預編譯規則，有變更時寫入一次（其餘文件直接複製）。
+
+        Args:
+            source_path: 源專案路徑
+            target_path: 目標專案路徑
+            incremental: 增量模式，保留目標目錄，源文件雜湊與上次清單一致時略過
+            max_workers: 進程池大小（預設為 CPU 數）
+            parallel_threshold: 文件數達到此值時使用進程池
+        """
         logger.info(f"開始轉換專案: {source_path} → {target_path}")
         
         source_dir = Path(source_path)
@@ -343,19 +374,82 @@ class MachineNativeConverter:
         if not source_dir.exists():
             raise ValueError(f"源專案路徑不存在: {source_path}")
         
-        # 創建目標目錄
+        rules, rule_errors = self._compile_rules()
+        rule_specs = [(self._rule_extensions(rule), rule.pattern, rule.replacement) for _, rule in rules]
+        rules_digest = hashlib.sha256(
+            json.dumps([MANIFEST_VERSION, rule_specs], sort_keys=True).encode()
+        ).hexdigest()
+
+        manifest_path = target_dir / MANIFEST_NAME
+        previous = self._load_manifest(manifest_path, rules_digest) if incremental else {}
+        if not incremental and target_dir.exists():
+            shutil.rmtree(target_dir)
         target_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 複製專案結構
-        self._copy_project_structure(source_dir, target_dir)
-        
-        # 執行六層轉換
+
+        # 單次遍歷：建立目錄結構並收集文件
+        files = self._collect_files(source_dir, target_dir)
+        logger.info(f"專案結構已建立: {source_dir} → {target_dir} ({len(files)} 個文件)")
+
+        jobs = [
+            (str(source_dir / rel), str(target_dir / rel), previous.get(rel, {}).get("sha256"))
+            for rel in files
+        ]
+        workers = max_workers or os.cpu_count() or 1
+        if len(jobs) < parallel_threshold or workers < 2:
+            _init_convert_worker(rule_specs)
+            outcomes = _convert_chunk(jobs)
+        else:
+            chunk_size = max(1, len(jobs) // (workers * 4))
+            chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_convert_worker,
+                                     initargs=(rule_specs,)) as pool:
+                outcomes = [outcome for chunk in pool.map(_convert_chunk, chunks) for outcome in chunk]
+
+        # 彙總各規則變更數並記錄到 SSOT
+        rule_changes = [0] * len(rules)
+        manifest_files = {}
+        skipped = 0
+        for rel, (digest, changes, error) in zip(files, outcomes):
+            if error:
+                logger.warning(f"處理文件失敗 {source_dir / rel}: {error}")
+            if digest is None:
+                continue
+            if changes is None:
+                skipped += 1
+                changes = previous[rel]["changes"]
+            manifest_files[rel] = {"sha256": digest, "changes": changes}
+            for index, count in changes:
+                rule = rules[index][1]
+                rule_changes[index] += count
+                self._register_ssot_change(target_dir / rel, rule.context, count, rule.priority / 100)
+
+        # 刪除源專案中已不存在的文件
+        for rel in previous.keys() - manifest_files.keys():
+            (target_dir / rel).unlink(missing_ok=True)
+
+        self._save_manifest(manifest_path, rules_digest, manifest_files)
+        if incremental:
+            logger.info(f"增量轉換: 略過 {skipped} 個未變更文件")
+
         results = {}
-        layers = ["namespace", "dependency", "reference", "structure", "semantic", "governance"]
-        
-        for layer in layers:
-            logger.info(f"執行 {layer} 層轉換...")
-            results[layer] = self._apply_layer_conversion(layer, target_dir)
+        for layer in LAYERS:
+            details = {}
+            changes_made = 0
+            for index, (rule_layer, rule) in enumerate(rules):
+                if rule_layer == layer:
+                    changes_made += rule_changes[index]
+                    details[rule.context] = rule_changes[index]
+            for rule_layer, rule, error in rule_errors:
+                if rule_layer == layer:
+                    details[rule.context] = {"error": error}
+            results[layer] = ConversionResult(
+                layer=layer,
+                files_processed=len(files),
+                changes_made=changes_made,
+                success=changes_made > 0,
+                details=details,
+                timestamp=datetime.now().isoformat()
+            )
         
         # 生成轉換報告
         self._generate_conversion_report(results, target_dir)
@@ -363,89 +457,66 @@ class MachineNativeConverter:
         logger.info("專案轉換完成")
         return results
     
-    def _copy_project_structure(self, source: Path, target: Path):
-        """複製專案結構"""
-        import shutil
-        
-        if target.exists():
-            shutil.rmtree(target)
-        
-        ignore_patterns = shutil.ignore_patterns(
-            '.git', '.svn', '.DS_Store', '__pycache__', 'node_modules',
-            '*.pyc', '*.class', '*.jar', '.idea', '.vscode'
-        )
-        
-        shutil.copytree(source, target, ignore=ignore_patterns)
-        logger.info(f"專案結構已複製: {source} → {target}")
-    
-    def _apply_layer_conversion(self, layer: str, target_dir: Path) -> ConversionResult:
-        """應用層級轉換"""
-        rules = self.conversion_rules.get(layer, [])
-        files_processed = 0
-        changes_made = 0
-        details = {}
-        
-        for rule in rules:
-            try:
-                rule_changes = self._apply_conversion_rule(rule, target_dir)
-                changes_made += rule_changes
-                details[rule.context] = rule_changes
-                logger.debug(f"規則 {rule.name} 應用完成，變更數: {rule_changes}")
-            except Exception as e:
-                logger.error(f"規則 {rule.name} 應用失敗: {e}")
-                details[rule.context] = {"error": str(e)}
-        
-        # 統計處理的文件數
-        for root, _, files in os.walk(target_dir):
-            files_processed += len(files)
-        
-        return ConversionResult(
-            layer=layer,
-            files_processed=files_processed,
-            changes_made=changes_made,
-            success=changes_made > 0,
-            details=details,
-            timestamp=datetime.now().isoformat()
-        )
-    
-    def _apply_conversion_rule(self, rule: ConversionRule, target_dir: Path) -> int:
-        """應用單個轉換規則"""
-        changes_made = 0
-        
-        for root, _, files in os.walk(target_dir):
-            for file in files:
-                file_path = Path(root) / file
-                
-                # 檢查文件類型
-                if not self._should_process_file(file_path, rule.file_types):
-                    continue
-                
+    def _compile_rules(self) -> Tuple[List[Tuple[str, ConversionRule]], List[Tuple[str, ConversionRule, str]]]:
+        """按層級順序驗證規則，返回 ([(層級, 規則)], [(層級, 規則, 錯誤)])"""
+        rules, errors = [], []
+        for layer in LAYERS:
+            for rule in self.conversion_rules.get(layer, []):
                 try:
-                    # 讀取文件內容
-                    content = file_path.read_text(encoding='utf-8')
-                    
-                    # 應用轉換規則
-                    new_content, changes = self._apply_pattern_replacement(
-                        content, rule.pattern, rule.replacement
-                    )
-                    
-                    if changes > 0:
-                        # 寫入轉換後內容
-                        file_path.write_text(new_content, encoding='utf-8')
-                        changes_made += changes
-                        
-                        # 記錄到 SSOT
-                        self._register_ssot_change(
-                            file_path, rule.context, changes, rule.priority / 100
-                        )
-                        
-                        logger.debug(f"文件 {file_path} 轉換完成，變更數: {changes}")
-                
-                except Exception as e:
-                    logger.warning(f"處理文件失敗 {file_path}: {e}")
-                    continue
-        
-        return changes_made
+                    re.compile(rule.pattern, re.MULTILINE)
+                    rules.append((layer, rule))
+                except re.error as e:
+                    logger.error(f"規則 {rule.name} 應用失敗: {e}")
+                    errors.append((layer, rule, str(e)))
+        return rules, errors
+
+    def _rule_extensions(self, rule: ConversionRule) -> Optional[List[str]]:
+        """規則適用的副檔名（None 表示所有文件）"""
+        if "all" in rule.file_types:
+            return None
+        file_type_mapping = self.config.get("file_types", {})
+        return sorted({
+            extension
+            for file_type, extensions in file_type_mapping.items()
+            if file_type in rule.file_types
+            for extension in extensions
+        })
+
+    def _collect_files(self, source: Path, target: Path) -> List[str]:
+        """遍歷源專案（略過忽略模式與目標目錄本身），建立目標目錄並返回相對路徑"""
+        target_resolved = target.resolve()
+        files = []
+        for root, dirs, filenames in os.walk(source, followlinks=True):
+            root_path = Path(root)
+            dirs[:] = sorted(
+                d for d in dirs
+                if not _is_ignored(d) and (root_path / d).resolve() != target_resolved
+            )
+            rel_root = root_path.relative_to(source)
+            (target / rel_root).mkdir(parents=True, exist_ok=True)
+            files.extend(
+                str(rel_root / name) for name in sorted(filenames) if not _is_ignored(name)
+            )
+        return files
+
+    def _load_manifest(self, manifest_path: Path, rules_digest: str) -> Dict[str, Any]:
+        """讀取上次轉換的清單（規則已變更時視為全量轉換）"""
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("rules") != rules_digest:
+            logger.info("轉換規則已變更，執行全量轉換")
+            return {}
+        return manifest.get("files", {})
+
+    def _save_manifest(self, manifest_path: Path, rules_digest: str, files: Dict[str, Any]):
+        """寫入轉換清單（臨時文件 + 原子替換）"""
+        tmp_path = manifest_path.with_name(f".{manifest_path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "rules": rules_digest, "files": files}, f)
+        os.replace(tmp_path, manifest_path)
     
     def _should_process_file(self, file_path: Path, allowed_types: List[str]) -> bool:
         """檢查是否應該處理文件"""
@@ -582,6 +653,92 @@ class MachineNativeConverter:
         logger.info(f"Markdown 報告已生成: {report_path}")
 
 
+def _is_ignored(name: str) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in IGNORE_PATTERNS)
+
+
+# 進程池工作者狀態（由 _init_convert_worker 設定，每個進程只編譯一次規則）
+_WORKER_RULES: List[Tuple[Optional[frozenset], re.Pattern, str]] = []
+_WORKER_RULES_BY_SUFFIX: Dict[str, List[int]] = {}
+
+
+def _init_convert_worker(rule_specs: List[Tuple[Optional[List[str]], str, str]]):
+    """編譯規則（按層級順序）"""
+    global _WORKER_RULES, _WORKER_RULES_BY_SUFFIX
+    _WORKER_RULES = [
+        (frozenset(extensions) if extensions is not None else None,
+         re.compile(pattern, re.MULTILINE),
+         replacement)
+        for extensions, pattern, replacement in rule_specs
+    ]
+    _WORKER_RULES_BY_SUFFIX = {}
+
+
+def _rules_for_suffix(suffix: str) -> List[int]:
+    rules = _WORKER_RULES_BY_SUFFIX.get(suffix)
+    if rules is None:
+        rules = [
+            index for index, (extensions, _, _) in enumerate(_WORKER_RULES)
+            if extensions is None or suffix in extensions
+        ]
+        _WORKER_RULES_BY_SUFFIX[suffix] = rules
+    return rules
+
+
+def _convert_file(source: str, target: str, previous_digest: Optional[str]):
+    """
+    轉換單一文件：讀取一次，在內存中依序套用規則，有變更時寫入一次
+
+    Returns:
+        (內容雜湊, [(規則索引, 變更數)] 或 None（增量略過）, 錯誤訊息)
+    """
+    data = Path(source).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if digest == previous_digest and os.path.exists(target):
+        return digest, None, None
+
+    rules = _rules_for_suffix(Path(source).suffix.lower())
+    changes = []
+    error = None
+    content = None
+    if rules:
+        try:
+            # 與 read_text 相同的換行處理
+            content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        except UnicodeDecodeError as e:
+            error = str(e)
+
+    new_content = content
+    if content is not None:
+        for index in rules:
+            _, pattern, replacement = _WORKER_RULES[index]
+            try:
+                new_content, count = pattern.subn(replacement, new_content)
+            except (re.error, IndexError) as e:
+                error = str(e)
+                continue
+            if count:
+                changes.append((index, count))
+
+    if changes:
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+        shutil.copymode(source, target)
+    else:
+        shutil.copy2(source, target)
+    return digest, changes, error
+
+
+def _convert_chunk(jobs: List[Tuple[str, str, Optional[str]]]) -> List[Tuple[Optional[str], Any, Optional[str]]]:
+    outcomes = []
+    for source, target, previous_digest in jobs:
+        try:
+            outcomes.append(_convert_file(source, target, previous_digest))
+        except OSError as e:
+            outcomes.append((None, [], str(e)))
+    return outcomes
+
+
 def find_repository_root(start: Optional[Path] = None) -> Path:
     """尋找儲存庫根目錄"""
     resolved_path = (start or Path(__file__)).resolve()
@@ -600,6 +757,8 @@ def main():
     parser.add_argument('target', nargs='?', help='目標專案路徑')
     parser.add_argument('--config', '-c', help='配置文件路徑')
     parser.add_argument('--verbose', '-v', action='store_true', help='詳細輸出')
+    parser.add_argument('--incremental', action='store_true', help='增量轉換（略過內容未變更的文件）')
+    parser.add_argument('--workers', type=int, help='並行進程數')
     
     args = parser.parse_args()
     
@@ -627,7 +786,11 @@ def main():
     
     try:
         converter = MachineNativeConverter(args.config)
-        results = converter.convert_project(args.source, args.target)
+        results = converter.convert_project(
+            args.source, args.target,
+            incremental=args.incremental,
+            max_workers=args.workers,
+        )
         
         total_changes = sum(r.changes_made for r in results.values())
         successful_layers = sum(1 for r in results.values() if r.success)
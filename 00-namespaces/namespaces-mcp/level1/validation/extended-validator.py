@@ -9,10 +9,13 @@ Implements comprehensive validation beyond basic schema checking:
 - Naming specification validation
 - Reference integrity validation
 - Circular dependency detection
+- Persistent result cache keyed on artifact content digest
 """
 
 import sys
 import json
+import hashlib
+import sqlite3
 import yaml
 import argparse
 import networkx as nx
@@ -29,6 +32,9 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent / "tools"))
 from validator import MCPValidator, ValidationStatus, ValidationResult
 
+# Bump whenever validation logic changes so cached results are invalidated
+EXTENDED_VALIDATOR_VERSION = "1.1.0"
+
 class ExtendedValidationStatus(Enum):
     """Extended validation status enumeration"""
     PASSED = "passed"
@@ -60,6 +66,73 @@ class ExtendedValidationResult(ValidationResult):
             "performance_metrics": self.performance_metrics
         })
         return base_dict
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExtendedValidationResult":
+        """Rebuild a result from to_dict() output"""
+        return cls(
+            status=ExtendedValidationStatus(data["status"]),
+            artifact_path=data["artifact_path"],
+            artifact_type=data.get("artifact_type"),
+            errors=list(data.get("errors", [])),
+            warnings=list(data.get("warnings", [])),
+            dependency_results=data.get("dependency_results", {}),
+            semantic_results=data.get("semantic_results", {}),
+            endpoint_results=data.get("endpoint_results", {}),
+            naming_results=data.get("naming_results", {}),
+            reference_results=data.get("reference_results", {}),
+            circular_dependency_detected=data.get("circular_dependency_detected", False),
+            performance_metrics=data.get("performance_metrics", {})
+        )
+
+class ValidationCache:
+    """
+    Persistent validation result cache backed by SQLite
+    
+    Results are keyed on the artifact content digest, the validator version and
+    a digest of the active rules (schema, naming rules, semantic types, registry),
+    so editing an artifact, upgrading the validator or changing any rule input
+    misses the cache.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " content_digest TEXT NOT NULL,"
+            " validator_version TEXT NOT NULL,"
+            " rules_digest TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " PRIMARY KEY (content_digest, validator_version, rules_digest))"
+        )
+        self._conn.commit()
+    
+    def get(self, content_digest: str, rules_digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result dict, or None on a miss"""
+        row = self._conn.execute(
+            "SELECT result FROM results WHERE content_digest = ? AND validator_version = ? AND rules_digest = ?",
+            (content_digest, EXTENDED_VALIDATOR_VERSION, rules_digest)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+    
+    def put(self, content_digest: str, rules_digest: str, result: Dict[str, Any]) -> None:
+        """Store a result dict"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (content_digest, EXTENDED_VALIDATOR_VERSION, rules_digest, json.dumps(result, default=str))
+        )
+        self._conn.commit()
+    
+    def close(self) -> None:
+        self._conn.close()
 
 class DependencyValidator:
     """Validates artifact dependencies and relationships"""
@@ -699,9 +772,11 @@ class ReferenceValidator:
 class ExtendedMCPValidator(MCPValidator):
     """Extended MCP validator with comprehensive validation capabilities"""
     
-    def __init__(self, schema_path: Optional[Path] = None, artifact_registry: Optional[Dict] = None):
+    def __init__(self, schema_path: Optional[Path] = None, artifact_registry: Optional[Dict] = None,
+                 cache: Optional[ValidationCache] = None):
         super().__init__(schema_path)
         self.artifact_registry = artifact_registry or {}
+        self.cache = cache
         
         # Initialize specialized validators
         self.dependency_validator = DependencyValidator(self.artifact_registry)
@@ -710,6 +785,20 @@ class ExtendedMCPValidator(MCPValidator):
         self.naming_validator = NamingSpecificationValidator()
         self.reference_validator = ReferenceValidator(self.artifact_registry)
     
+    def rules_digest(self, strict: bool) -> str:
+        """Digest of every rule input that affects validation results"""
+        rules = {
+            "schema": self.schema,
+            "registry": self.artifact_registry,
+            "semantic_types": self.semantic_validator.semantic_type_schemas,
+            "type_relationships": self.semantic_validator.type_relationships,
+            "naming_rules": self.naming_validator.naming_rules,
+            "reserved_namespaces": sorted(self.naming_validator.reserved_namespaces),
+            "strict": strict
+        }
+        payload = json.dumps(rules, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
     def validate_artifact_extended(self, artifact_path: Path, strict: bool = False, 
                                  validate_endpoints: bool = False, 
                                  base_url: str = "http://localhost:8080") -> ExtendedValidationResult:
@@ -718,6 +807,36 @@ class ExtendedMCPValidator(MCPValidator):
         # Start timing
         start_time = datetime.now()
         
+        # Cached results are reused unless live endpoints are checked
+        cache_key = None
+        if self.cache is not None and not validate_endpoints:
+            try:
+                with open(artifact_path, 'rb') as f:
+                    content_digest = hashlib.sha256(f.read()).hexdigest()
+                cache_key = (content_digest, self.rules_digest(strict))
+            except OSError:
+                cache_key = None
+            if cache_key is not None:
+                cached = self.cache.get(*cache_key)
+                if cached is not None:
+                    result = ExtendedValidationResult.from_dict(cached)
+                    result.artifact_path = str(artifact_path)
+                    result.performance_metrics["validation_time_seconds"] = (
+                        datetime.now() - start_time
+                    ).total_seconds()
+                    result.performance_metrics["cache_hit"] = 1.0
+                    return result
+        
+        result = self._validate_artifact_extended(
+            artifact_path, strict, validate_endpoints, base_url, start_time
+        )
+        if cache_key is not None:
+            self.cache.put(*cache_key, result.to_dict())
+        return result
+    
+    def _validate_artifact_extended(self, artifact_path: Path, strict: bool,
+                                    validate_endpoints: bool, base_url: str,
+                                    start_time: datetime) -> ExtendedValidationResult:
         # Load and parse artifact
         try:
             with open(artifact_path, 'r') as f:
@@ -860,6 +979,12 @@ Examples:
         help='Show performance metrics'
     )
     
+    parser.add_argument(
+        '--cache',
+        type=Path,
+        help='Path to a persistent result cache (SQLite); unchanged artifacts are not revalidated'
+    )
+    
     args = parser.parse_args()
     
     # Validate artifact path
@@ -874,9 +999,11 @@ Examples:
             artifact_registry = yaml.safe_load(f)
     
     # Create extended validator
+    cache = ValidationCache(args.cache) if args.cache else None
     validator = ExtendedMCPValidator(
         schema_path=args.schema,
-        artifact_registry=artifact_registry
+        artifact_registry=artifact_registry,
+        cache=cache
     )
     
     # Validate artifact
@@ -886,6 +1013,8 @@ Examples:
         validate_endpoints=args.validate_endpoints,
         base_url=args.base_url
     )
+    if cache is not None:
+        cache.close()
     
     # Output results
     if args.format == 'json':
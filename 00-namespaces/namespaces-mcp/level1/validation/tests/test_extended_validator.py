@@ -10,15 +10,21 @@ from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
 from pathlib import Path
 
-# Import the extended validation system
+# Import the extended validation system (the module file name contains a hyphen)
+import importlib.util
 import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_spec = importlib.util.spec_from_file_location(
+    "extended_validator", Path(__file__).resolve().parent.parent / "extended-validator.py"
+)
+extended_validator = importlib.util.module_from_spec(_spec)
+sys.modules["extended_validator"] = extended_validator
+_spec.loader.exec_module(extended_validator)
 
 from extended_validator import (
     ExtendedMCPValidator, DependencyValidator, SemanticTypeValidator,
     EndpointValidator, NamingSpecificationValidator, ReferenceValidator,
-    ExtendedValidationStatus, ExtendedValidationResult
+    ExtendedValidationStatus, ExtendedValidationResult, ValidationCache
 )
 
 class TestDependencyValidator:
@@ -523,6 +529,62 @@ class TestExtendedMCPValidator:
             assert "dependency_count" in result.performance_metrics
             assert result.performance_metrics["dependency_count"] == 1
 
+class TestValidationCache:
+    """Test the persistent validation result cache"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.artifact = {
+            "apiVersion": "mcp.io/v1",
+            "kind": "Manifest",
+            "metadata": {"version": "1.0.0", "semanticType": "manifest"},
+            "spec": {"description": "Cached artifact"}
+        }
+    
+    def test_cache_hit_returns_same_result(self, tmp_path):
+        """Test unchanged artifacts are served from the cache"""
+        artifact_path = tmp_path / "artifact.yaml"
+        artifact_path.write_text(yaml.dump(self.artifact))
+        cache = ValidationCache(tmp_path / "cache.db")
+        validator = ExtendedMCPValidator(cache=cache)
+        
+        first = validator.validate_artifact_extended(artifact_path)
+        second = validator.validate_artifact_extended(artifact_path)
+        
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert second.status == first.status
+        assert second.errors == first.errors
+        assert second.performance_metrics["cache_hit"] == 1.0
+    
+    def test_cache_invalidation(self, tmp_path):
+        """Test content, strict mode and registry changes miss the cache"""
+        artifact_path = tmp_path / "artifact.yaml"
+        artifact_path.write_text(yaml.dump(self.artifact))
+        cache = ValidationCache(tmp_path / "cache.db")
+        validator = ExtendedMCPValidator(cache=cache)
+        
+        validator.validate_artifact_extended(artifact_path)
+        validator.validate_artifact_extended(artifact_path, strict=True)
+        validator.artifact_registry["com.example/artifact1"] = {"version": "1.0.0"}
+        validator.validate_artifact_extended(artifact_path)
+        self.artifact["spec"]["description"] = "Changed"
+        artifact_path.write_text(yaml.dump(self.artifact))
+        validator.validate_artifact_extended(artifact_path)
+        
+        assert (cache.hits, cache.misses) == (0, 4)
+    
+    def test_endpoint_validation_bypasses_cache(self, tmp_path):
+        """Test live endpoint checks are never served from the cache"""
+        artifact_path = tmp_path / "artifact.yaml"
+        artifact_path.write_text(yaml.dump(self.artifact))
+        cache = ValidationCache(tmp_path / "cache.db")
+        validator = ExtendedMCPValidator(cache=cache)
+        
+        validator.validate_artifact_extended(artifact_path, validate_endpoints=True)
+        validator.validate_artifact_extended(artifact_path, validate_endpoints=True)
+        
+        assert (cache.hits, cache.misses) == (0, 0)
+
 class TestIntegration:
     """Integration tests for the complete validation system"""
     
@@ -59,6 +59,8 @@ MachineNativeOps 命名空間 MCP 轉換工具
     -c, --config    配置文件路徑 (默認: config/conversion.yaml)
     -v, --verbose   詳細輸出模式
     -d, --dry-run   乾跑模式 (不實際修改文件)
+    -i, --incremental  增量轉換 (略過內容未變更的文件)
+    -j, --workers   並行進程數 (默認: CPU 數)
     -h, --help      顯示此幫助信息
 
 範例:
@@ -71,6 +73,9 @@ MachineNativeOps 命名空間 MCP 轉換工具
     # 乾跑模式
     $0 /path/to/source /path/to/target --dry-run
 
+    # 增量轉換
+    $0 /path/to/source /path/to/target --incremental
+
 版本: 1.0.0
 作者: MachineNativeOps Team
 EOF
@@ -90,6 +95,8 @@ parse_arguments() {
     CONFIG_FILE="$CONFIG_DIR/conversion.yaml"
     VERBOSE=false
     DRY_RUN=false
+    INCREMENTAL=false
+    WORKERS=""
 
     while [ $# -gt 0 ]; do
         case "$1" in
@@ -105,6 +112,14 @@ parse_arguments() {
                 DRY_RUN=true
                 shift
                 ;;
+            -i|--incremental)
+                INCREMENTAL=true
+                shift
+                ;;
+            -j|--workers)
+                WORKERS="$2"
+                shift 2
+                ;;
             -h|--help)
                 show_help
                 exit 0
@@ -192,6 +207,14 @@ execute_conversion() {
         PYTHON_CMD="$PYTHON_CMD --verbose"
     fi
 
+    if [ "$INCREMENTAL" = true ]; then
+        PYTHON_CMD="$PYTHON_CMD --incremental"
+    fi
+
+    if [ -n "$WORKERS" ]; then
+        PYTHON_CMD="$PYTHON_CMD --workers \"$WORKERS\""
+    fi
+
     # 執行轉換
     log_info "執行轉換命令..."
     eval $PYTHON_CMD
@@ -11,8 +11,8 @@ from pathlib import Path
 import sys
 import os
 
-# 添加 src 目錄到路徑
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# 轉換器腳本位於 legacy/python-scripts
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'legacy', 'python-scripts'))
 
 from converter import MachineNativeConverter, ConversionRule
 
@@ -100,6 +100,51 @@ class TestMachineNativeConverter(unittest.TestCase):
         content = converted_file.read_text()
         self.assertIn("machine_native.utils", content)
     
+    def test_incremental_conversion(self):
+        """測試增量轉換略過未變更文件"""
+        (self.source_dir / "a.py").write_text("class Alpha:\n    pass")
+        (self.source_dir / "b.py").write_text("class Beta:\n    pass")
+        (self.source_dir / "old.py").write_text("class Old:\n    pass")
+
+        first = self.converter.convert_project(str(self.source_dir), str(self.target_dir))
+
+        # 修改一個文件、刪除一個文件後增量轉換
+        (self.source_dir / "b.py").write_text("class Gamma:\n    pass")
+        (self.source_dir / "old.py").unlink()
+        converter = MachineNativeConverter()
+        second = converter.convert_project(
+            str(self.source_dir), str(self.target_dir), incremental=True
+        )
+
+        self.assertIn("MachineNativeAlpha", (self.target_dir / "a.py").read_text())
+        self.assertIn("MachineNativeGamma", (self.target_dir / "b.py").read_text())
+        self.assertFalse((self.target_dir / "old.py").exists())
+        # 略過的文件沿用上次的變更統計
+        self.assertEqual(second["namespace"].changes_made, 2)
+        self.assertEqual(first["namespace"].changes_made, 3)
+        self.assertEqual(len(converter.ssot_registry), 2)
+
+    def test_parallel_conversion_matches_serial(self):
+        """測試進程池轉換結果與單進程一致"""
+        for i in range(20):
+            (self.source_dir / f"module_{i}.py").write_text(
+                f"from utils import helper\nclass Item{i}:\n    MAX_SIZE = {i}\n"
+            )
+
+        serial_dir = Path(self.temp_dir) / "serial"
+        serial = self.converter.convert_project(
+            str(self.source_dir), str(serial_dir), max_workers=1
+        )
+        parallel = MachineNativeConverter().convert_project(
+            str(self.source_dir), str(self.target_dir), max_workers=2, parallel_threshold=0
+        )
+
+        for layer, result in serial.items():
+            self.assertEqual(result.changes_made, parallel[layer].changes_made)
+        for i in range(20):
+            name = f"module_{i}.py"
+            self.assertEqual((serial_dir / name).read_text(), (self.target_dir / name).read_text())
+
     def test_pattern_replacement(self):
         """測試模式替換"""
         content = "class MyClass:\n    pass"
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+倉庫文件清單 - Repository Inventory
+
+供應鏈驗證各階段共用的文件清單與內容快取：
+- 一次 os.scandir 遍歷，跳過 .git / __pycache__ / node_modules 等目錄
+- 內容快取以 (路徑, mtime, 大小) 為鍵，文件只讀取一次
+- 文本按需解碼，解析結果（例如 YAML 文檔）按需計算並共用
+"""
+
+import fnmatch
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_SKIP_DIRS = frozenset({'.git', '__pycache__', 'node_modules'})
+
+CacheKey = Tuple[str, int, int]
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """清單中的文件"""
+    path: str        # 絕對路徑
+    rel: str         # 相對倉庫根目錄的 POSIX 路徑
+    name: str
+    suffix: str
+    size: int
+    mtime_ns: int
+
+    @property
+    def key(self) -> CacheKey:
+        return (self.path, self.mtime_ns, self.size)
+
+
+class _CachedContent:
+    __slots__ = ('data', 'text', 'text_error', 'derived')
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.text: Optional[str] = None
+        self.text_error: Optional[UnicodeDecodeError] = None
+        self.derived: Dict[str, Tuple[bool, Any]] = {}
+
+
+class ContentCache:
+    """
+    文件內容快取
+
+    以 (路徑, mtime, 大小) 為鍵，文件修改後自動失效；按原始字節總量做 LRU 淘汰。
+    解碼失敗與解析異常同樣被快取，再次讀取時重新拋出。
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[CacheKey, _CachedContent]' = OrderedDict()
+        self._bytes = 0
+        self.reads = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _content(self, entry: FileEntry) -> _CachedContent:
+        content = self._entries.get(entry.key)
+        if content is not None:
+            self._entries.move_to_end(entry.key)
+            self.hits += 1
+            return content
+
+        with open(entry.path, 'rb') as f:
+            data = f.read()
+        self.reads += 1
+        content = _CachedContent(data)
+        self._entries[entry.key] = content
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.data)
+        return content
+
+    def read_bytes(self, entry: FileEntry) -> bytes:
+        """讀取原始字節"""
+        return self._content(entry).data
+
+    def read_text(self, entry: FileEntry) -> str:
+        """讀取 UTF-8 文本（解碼失敗拋出 UnicodeDecodeError）"""
+        content = self._content(entry)
+        if content.text is None and content.text_error is None:
+            try:
+                content.text = content.data.decode('utf-8')
+            except UnicodeDecodeError as e:
+                content.text_error = e
+        if content.text_error is not None:
+            raise content.text_error
+        return content.text
+
+    def derive(self, entry: FileEntry, kind: str, fn: Callable[[str], Any]) -> Any:
+        """
+        計算並快取由文本派生的結果
+
+        Args:
+            entry: 文件
+            kind: 派生結果的類型名稱（例如 "yaml"）
+            fn: 由文本計算結果的函數；拋出的異常同樣被快取
+        """
+        content = self._content(entry)
+        cached = content.derived.get(kind)
+        if cached is None:
+            try:
+                cached = (True, fn(self.read_text(entry)))
+            except Exception as e:
+                cached = (False, e)
+            content.derived[kind] = cached
+        ok, value = cached
+        if not ok:
+            raise value
+        return value
+
+    def clear(self) -> None:
+        """清空快取"""
+        self._entries.clear()
+        self._bytes = 0
+
+
+class RepositoryInventory:
+    """
+    倉庫文件清單
+
+    構造時遍歷一次倉庫；各階段通過後綴、文件名模式或目錄前綴篩選文件，
+    並經由共用的 ContentCache 讀取內容。
+    """
+
+    def __init__(self, root: str, skip_dirs: Optional[Iterable[str]] = None,
+                 cache: Optional[ContentCache] = None):
+        self.root = Path(root).resolve()
+        self.skip_dirs = frozenset(skip_dirs) if skip_dirs is not None else DEFAULT_SKIP_DIRS
+        self.cache = cache or ContentCache()
+        self.files: List[FileEntry] = self._walk()
+        self._by_rel: Dict[str, FileEntry] = {entry.rel: entry for entry in self.files}
+        self._by_suffix: Dict[str, List[FileEntry]] = {}
+        for entry in self.files:
+            self._by_suffix.setdefault(entry.suffix, []).append(entry)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 傳給工作進程時不攜帶已快取的內容
+        state = self.__dict__.copy()
+        state['cache'] = ContentCache(self.cache.max_bytes)
+        return state
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def _walk(self) -> List[FileEntry]:
+        files: List[FileEntry] = []
+        stack = [(str(self.root), '')]
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            subdirs = []
+            for dirent in entries:
+                try:
+                    if dirent.is_dir(follow_symlinks=False):
+                        if dirent.name not in self.skip_dirs:
+                            subdirs.append((dirent.path, f"{prefix}{dirent.name}/"))
+                    elif dirent.is_file():
+                        stat = dirent.stat()
+                        files.append(FileEntry(
+                            path=dirent.path,
+                            rel=f"{prefix}{dirent.name}",
+                            name=dirent.name,
+                            suffix=os.path.splitext(dirent.name)[1],
+                            size=stat.st_size,
+                            mtime_ns=stat.st_mtime_ns,
+                        ))
+                except OSError:
+                    continue
+            # 逆序入棧，保持按路徑排序的遍歷順序
+            stack.extend(reversed(subdirs))
+        return files
+
+    def get(self, rel: str) -> Optional[FileEntry]:
+        """按相對路徑查找文件"""
+        return self._by_rel.get(rel)
+
+    def with_suffix(self, *suffixes: str) -> List[FileEntry]:
+        """按後綴篩選（保持遍歷順序）"""
+        if len(suffixes) == 1:
+            return list(self._by_suffix.get(suffixes[0], []))
+        wanted = set(suffixes)
+        return [entry for entry in self.files if entry.suffix in wanted]
+
+    def matching(self, *patterns: str) -> List[FileEntry]:
+        """按文件名模式篩選（fnmatch，任一模式匹配即可）"""
+        return [
+            entry for entry in self.files
+            if any(fnmatch.fnmatchcase(entry.name, pattern) for pattern in patterns)
+        ]
+
+    def under(self, rel_dir: str) -> List[FileEntry]:
+        """目錄下的所有文件"""
+        prefix = rel_dir.rstrip('/') + '/'
+        return [entry for entry in self.files if entry.rel.startswith(prefix)]
+
+    def has_dir(self, rel_dir: str) -> bool:
+        """目錄是否存在（含被跳過的目錄）"""
+        return (self.root / rel_dir).is_dir()
+
+    def read_bytes(self, entry: FileEntry) -> bytes:
+        return self.cache.read_bytes(entry)
+
+    def read_text(self, entry: FileEntry) -> str:
+        return self.cache.read_text(entry)
+
+    def yaml_documents(self, entry: FileEntry) -> List[Any]:
+        """解析後的 YAML 文檔（各階段共用，調用方不應修改）"""
+        import yaml
+
+        return self.cache.derive(entry, 'yaml', lambda text: list(yaml.safe_load_all(text)))
+
+    def json_document(self, entry: FileEntry) -> Any:
+        """解析後的 JSON 文檔（各階段共用，調用方不應修改）"""
+        import json
+
+        return self.cache.derive(entry, 'json', json.loads)
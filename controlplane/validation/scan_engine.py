@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+多模式掃描引擎 - Multi-pattern Scan Engine
+
+供應鏈驗證 Stage 4 的 Secrets / 惡意程式掃描：
+- 聲明了字面量的規則以 bytes.find 在整個文件緩衝區上定位候選行
+- 其餘規則預編譯為一個帶命名組的交替正則，對整個文件緩衝區掃描一次
+- 只在候選行上計算行號並逐條規則確認（與逐行掃描結果一致）
+- 文件經 mmap 讀取，含 NUL 字節的文件視為二進位跳過內容掃描
+- 文件按大小分片，在進程池中並行掃描
+- 規則集可從 YAML 載入
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent / "supply-chain-scan-rules.yaml"
+
+# 匹配語義變更時遞增（作為結果快取鍵的一部分）
+ENGINE_VERSION = "1"
+
+SNIFF_BYTES = 8192
+SNIPPET_LENGTH = 100
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """掃描規則"""
+    id: str
+    category: str
+    pattern: str
+    severity: str = "HIGH"
+    target: str = "content"                 # content | filename
+    literals: Tuple[str, ...] = ()
+    ignore_case: bool = True
+
+
+@dataclass(frozen=True)
+class ScanCategory:
+    """規則類別"""
+    name: str
+    suffixes: Tuple[str, ...] = ()
+    line_allowlist: Tuple[str, ...] = ()
+    first_match_per_line: bool = False
+    snippet_ellipsis: bool = False
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """規則集"""
+    categories: Tuple[ScanCategory, ...]
+    rules: Tuple[ScanRule, ...]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RuleSet":
+        categories = tuple(
+            ScanCategory(
+                name=name,
+                suffixes=tuple(spec.get('suffixes', ())),
+                line_allowlist=tuple(marker.lower() for marker in spec.get('line_allowlist', ())),
+                first_match_per_line=bool(spec.get('first_match_per_line', False)),
+                snippet_ellipsis=bool(spec.get('snippet_ellipsis', False)),
+            )
+            for name, spec in (data.get('categories') or {}).items()
+        )
+        known = {category.name for category in categories}
+        rules = []
+        for spec in data.get('rules') or []:
+            rule = ScanRule(
+                id=spec['id'],
+                category=spec['category'],
+                pattern=spec['pattern'],
+                severity=spec.get('severity', 'HIGH'),
+                target=spec.get('target', 'content'),
+                literals=tuple(literal.lower() for literal in spec.get('literals', ())),
+                ignore_case=bool(spec.get('ignore_case', True)),
+            )
+            if rule.category not in known:
+                raise ValueError(f"Rule '{rule.id}' uses unknown category '{rule.category}'")
+            if rule.target not in ('content', 'filename'):
+                raise ValueError(f"Rule '{rule.id}' has invalid target '{rule.target}'")
+            if not all(literal.isascii() for literal in rule.literals):
+                raise ValueError(f"Rule '{rule.id}' has non-ASCII literals")
+            rules.append(rule)
+        return cls(categories=categories, rules=tuple(rules))
+
+    @classmethod
+    def from_yaml(cls, path: Optional[str] = None) -> "RuleSet":
+        """從 YAML 文件載入規則集（預設為 supply-chain-scan-rules.yaml）"""
+        import yaml
+
+        with open(path or DEFAULT_RULES_PATH, 'r', encoding='utf-8') as f:
+            return cls.from_dict(yaml.safe_load(f) or {})
+
+    @property
+    def digest(self) -> str:
+        """規則集內容雜湊（規則變更時改變）"""
+        payload = json.dumps(asdict(self), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class Finding:
+    """掃描命中"""
+    category: str
+    file: str
+    type: str
+    severity: str
+    line: Optional[int] = None
+    content: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {'file': self.file}
+        if self.line is not None:
+            result['line'] = self.line
+        result['type'] = self.type
+        if self.content is not None:
+            result['content'] = self.content
+        result['severity'] = self.severity
+        return result
+
+
+@dataclass
+class ScanStats:
+    """掃描統計"""
+    files: int = 0
+    bytes_scanned: int = 0
+    binary_files: int = 0
+    prefiltered: int = 0
+    errors: int = 0
+
+    def merge(self, other: "ScanStats") -> None:
+        self.files += other.files
+        self.bytes_scanned += other.bytes_scanned
+        self.binary_files += other.binary_files
+        self.prefiltered += other.prefiltered
+        self.errors += other.errors
+
+
+def _compile(pattern: str, ignore_case: bool) -> "re.Pattern[bytes]":
+    return re.compile(pattern.encode('utf-8'), re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+
+
+class _CompiledCategory:
+    """一個類別編譯後的正則與字面量"""
+
+    def __init__(self, category: ScanCategory, rules: Sequence[ScanRule]):
+        self.category = category
+        self.suffixes = frozenset(category.suffixes)
+        self.rules = list(rules)
+        self.rule_patterns = [_compile(rule.pattern, rule.ignore_case) for rule in self.rules]
+
+        # 有字面量的規則以 bytes.find 定位候選行；其餘規則合併為一個交替正則
+        self.literals = sorted({literal.encode('ascii') for rule in self.rules for literal in rule.literals})
+        alternatives = []
+        for i, rule in enumerate(self.rules):
+            if not rule.literals:
+                flags = '(?i:' if rule.ignore_case else '(?-i:'
+                alternatives.append(f"(?P<r{i}>{flags}{rule.pattern}))")
+        self.combined = re.compile('|'.join(alternatives).encode('utf-8'), re.MULTILINE) if alternatives else None
+
+    def candidate_lines(self, buf: Any) -> Dict[int, int]:
+        """可能命中的行，{行首偏移: 行尾偏移}"""
+        size = len(buf)
+        lines: Dict[int, int] = {}
+        if self.literals:
+            lowered = buf[:].lower()
+            for literal in self.literals:
+                pos = lowered.find(literal)
+                while pos >= 0:
+                    start = lowered.rfind(b'\n', 0, pos) + 1
+                    end = lowered.find(b'\n', pos)
+                    if end < 0:
+                        end = size
+                    lines[start] = end
+                    pos = lowered.find(literal, end + 1)
+        if self.combined is not None:
+            pos = 0
+            while pos <= size:
+                match = self.combined.search(buf, pos)
+                if match is None:
+                    break
+                start = buf.rfind(b'\n', 0, match.start()) + 1
+                end = buf.find(b'\n', match.start())
+                if end < 0:
+                    end = size
+                lines[start] = end
+                pos = end + 1
+        return lines
+
+
+class ScanEngine:
+    """
+    多模式掃描引擎
+
+    Example:
+        engine = ScanEngine(RuleSet.from_yaml())
+        results = engine.scan_paths([("src/app.py", "/repo/src/app.py", 1024)], workers=4)
+        print(results['secret'])
+    """
+
+    def __init__(self, rule_set: Optional[RuleSet] = None):
+        self.rule_set = rule_set or RuleSet.from_yaml()
+        self._content: List[_CompiledCategory] = []
+        self._filename: List[Tuple[ScanRule, "re.Pattern[str]"]] = []
+        for category in self.rule_set.categories:
+            rules = [r for r in self.rule_set.rules if r.category == category.name and r.target == 'content']
+            self._content.append(_CompiledCategory(category, rules))
+        for rule in self.rule_set.rules:
+            if rule.target == 'filename':
+                flags = re.IGNORECASE if rule.ignore_case else 0
+                self._filename.append((rule, re.compile(rule.pattern, flags)))
+
+    def scans_content(self, suffix: str) -> bool:
+        """該後綴的文件是否需要掃描內容"""
+        return any(suffix in compiled.suffixes for compiled in self._content)
+
+    # ----- 單文件 -----
+
+    def scan_filename(self, rel: str, name: str) -> List[Finding]:
+        """文件名規則（每個類別只報告第一條命中）"""
+        findings = []
+        seen = set()
+        lowered = name.lower()
+        for rule, pattern in self._filename:
+            if rule.category not in seen and pattern.search(lowered):
+                seen.add(rule.category)
+                findings.append(Finding(rule.category, rel, rule.id, rule.severity))
+        return findings
+
+    def scan_buffer(self, rel: str, suffix: str, buf: Any, stats: Optional[ScanStats] = None) -> List[Finding]:
+        """
+        掃描文件內容
+
+        Args:
+            rel: 報告中使用的文件路徑
+            suffix: 文件後綴，決定適用的類別
+            buf: bytes 或 mmap
+        """
+        findings: List[Finding] = []
+        for compiled in self._content:
+            if suffix not in compiled.suffixes or not compiled.rules:
+                continue
+            lines = compiled.candidate_lines(buf)
+            if not lines:
+                if stats is not None:
+                    stats.prefiltered += 1
+                continue
+            findings.extend(self._confirm_lines(compiled, rel, buf, lines))
+        return findings
+
+    def _confirm_lines(self, compiled: _CompiledCategory, rel: str, buf: Any,
+                       lines: Dict[int, int]) -> List[Finding]:
+        findings = []
+        category = compiled.category
+        line_no = 1
+        counted_to = 0
+        for start in sorted(lines):
+            end = lines[start]
+            line_no += buf[counted_to:start].count(b'\n')
+            counted_to = start
+
+            raw_line = buf[start:end]
+            text = raw_line.decode('utf-8', errors='replace')
+            lowered = text.lower()
+            if any(marker in lowered for marker in category.line_allowlist):
+                continue
+            # 在候選行上逐條確認，結果與逐行逐規則掃描一致
+            for rule, pattern in zip(compiled.rules, compiled.rule_patterns):
+                if pattern.search(raw_line):
+                    findings.append(Finding(
+                        category=category.name,
+                        file=rel,
+                        type=rule.id,
+                        severity=rule.severity,
+                        line=line_no,
+                        content=_snippet(text, category.snippet_ellipsis),
+                    ))
+                    if category.first_match_per_line:
+                        break
+        return findings
+
+    def scan_file(self, rel: str, path: str, stats: Optional[ScanStats] = None) -> List[Finding]:
+        """掃描一個文件（文件名 + 內容）"""
+        stats = stats if stats is not None else ScanStats()
+        name = os.path.basename(path)
+        suffix = os.path.splitext(name)[1]
+        findings = self.scan_filename(rel, name)
+        stats.files += 1
+        if not self.scans_content(suffix):
+            return findings
+
+        try:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    return findings
+                if b'\0' in f.read(SNIFF_BYTES):
+                    stats.binary_files += 1
+                    return findings
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    findings.extend(self.scan_buffer(rel, suffix, buf, stats))
+                stats.bytes_scanned += size
+        except (OSError, ValueError):
+            stats.errors += 1
+        return findings
+
+    # ----- 批量 -----
+
+    def scan_paths(self, files: Sequence[Tuple[str, str, int]], workers: Optional[int] = None,
+                   shard_bytes: int = 16 * 1024 * 1024,
+                   parallel_threshold: int = 8 * 1024 * 1024) -> Dict[str, Any]:
+        """
+        掃描一組文件
+
+        Args:
+            files: (相對路徑, 絕對路徑, 大小) 列表
+            workers: 進程數；None 為 CPU 數，0 或 1 為在當前進程掃描
+            shard_bytes: 每個分片的目標字節數
+            parallel_threshold: 總大小低於此值時不使用進程池
+
+        Returns:
+            {類別名: [finding dict, ...], ..., 'stats': ScanStats}
+        """
+        files = list(files)
+        total = sum(size for _, _, size in files)
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        stats = ScanStats()
+        shard_results: List[Tuple[List[Finding], ScanStats]]
+        if workers <= 1 or total < parallel_threshold or len(files) < 2:
+            shard_results = [_scan_shard_with(self, files)]
+        else:
+            shards = _shard(files, max(shard_bytes, total // (workers * 4) + 1))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_scan_worker,
+                                     initargs=(self.rule_set,)) as pool:
+                shard_results = list(pool.map(_scan_shard, shards))
+
+        results: Dict[str, Any] = {category.name: [] for category in self.rule_set.categories}
+        for findings, shard_stats in shard_results:
+            stats.merge(shard_stats)
+            for finding in findings:
+                results[finding.category].append(finding.to_dict())
+        results['stats'] = stats
+        return results
+
+
+def _snippet(text: str, ellipsis: bool) -> str:
+    stripped = text.strip()
+    if ellipsis and len(stripped) > SNIPPET_LENGTH:
+        return stripped[:SNIPPET_LENGTH] + '...'
+    return stripped[:SNIPPET_LENGTH]
+
+
+def _shard(files: Sequence[Tuple[str, str, int]], shard_bytes: int) -> List[List[Tuple[str, str, int]]]:
+    """按大小連續分片（保持文件順序）"""
+    shards: List[List[Tuple[str, str, int]]] = []
+    current: List[Tuple[str, str, int]] = []
+    current_bytes = 0
+    for item in files:
+        current.append(item)
+        current_bytes += item[2]
+        if current_bytes >= shard_bytes:
+            shards.append(current)
+            current, current_bytes = [], 0
+    if current:
+        shards.append(current)
+    return shards
+
+
+def _scan_shard_with(engine: ScanEngine, files: Iterable[Tuple[str, str, int]]) -> Tuple[List[Finding], ScanStats]:
+    stats = ScanStats()
+    findings: List[Finding] = []
+    for rel, path, _ in files:
+        findings.extend(engine.scan_file(rel, path, stats))
+    return findings, stats
+
+
+_WORKER_ENGINE: Optional[ScanEngine] = None
+
+
+def _init_scan_worker(rule_set: RuleSet) -> None:
+    """工作進程初始化：每個進程只編譯一次規則"""
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = ScanEngine(rule_set)
+
+
+def _scan_shard(files: List[Tuple[str, str, int]]) -> Tuple[List[Finding], ScanStats]:
+    return _scan_shard_with(_WORKER_ENGINE, files)
@@ -13,6 +13,10 @@ Stage 4: SBOM + 漏洞/Secrets 掃描
 Stage 5: Sign(簽章) + Attest(provenance/in-toto)
 Stage 6: Admission Policy(OPA/Kyverno)門禁
 Stage 7: Runtime監控(Falco/審計) + 可追溯留存
+
+倉庫只遍歷一次（RepositoryInventory），文件內容經共用快取讀取；
+只讀取倉庫文件的階段按組在進程池中並行收集數據，依賴前序證據的階段
+（5、7）在主進程中等待其依賴完成後執行，證據按階段順序寫入證據鏈。
 """
 
 import os
@@ -21,16 +25,24 @@ import yaml
 import hashlib
 import subprocess
 import logging
-import re
 import base64
+import pickle
 import secrets
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Callable, Dict, List, Any, Set, Tuple, Optional
 from datetime import datetime, timezone
 from dataclasses import dataclass, asdict
 from enum import Enum
 import tempfile
 import shutil
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from repository_inventory import FileEntry, RepositoryInventory
+from scan_engine import ENGINE_VERSION, RuleSet, ScanEngine
+from verification_cache import CacheNamespace, VerificationCache, git_unchanged_blobs
 
 # Configure logging
 logging.basicConfig(
@@ -39,6 +51,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Stage 1/2 逐文件檢查的版本：檢查邏輯變更時遞增，使快取結果失效
+FILE_CHECK_VERSION = "1"
+
+
+def _json_round_trips(payload: Any) -> bool:
+    """結果經 JSON 序列化後是否保持不變（可安全寫入 VerificationCache）"""
+    try:
+        return json.loads(json.dumps(payload)) == payload
+    except (TypeError, ValueError):
+        return False
+
 class VerificationStage(Enum):
     """驗證階段枚舉"""
     LINT_FORMAT = 1
@@ -49,6 +72,35 @@ class VerificationStage(Enum):
     ADMISSION_POLICY = 6
     RUNTIME_MONITORING = 7
 
+@dataclass(frozen=True)
+class StageSpec:
+    """驗證階段定義"""
+    stage: int
+    stage_name: str
+    evidence_type: str
+    collector: str
+    depends_on: Tuple[int, ...] = ()
+    # 同組階段在同一工作進程中依次執行，共用內容快取；
+    # None 表示依賴證據鏈狀態，必須在主進程中執行
+    worker_group: Optional[str] = None
+
+STAGE_SPECS: Dict[int, StageSpec] = {
+    1: StageSpec(1, "Lint/格式驗證", "format_validation",
+                 "_collect_stage1_lint_format", worker_group="parse"),
+    2: StageSpec(2, "Schema/語意驗證", "schema_validation",
+                 "_collect_stage2_schema_semantic", worker_group="parse"),
+    3: StageSpec(3, "依賴鎖定與可重現建置", "dependency_reproducibility",
+                 "_collect_stage3_dependency_reproducible", worker_group="dependencies"),
+    4: StageSpec(4, "SBOM + 漏洞/Secrets 掃描", "security_scan",
+                 "_collect_stage4_sbom_vulnerability_scan", worker_group="scan"),
+    5: StageSpec(5, "簽章 + Attestation", "signature_attestation",
+                 "_collect_stage5_sign_attestation", depends_on=(1, 3, 4)),
+    6: StageSpec(6, "Admission Policy 門禁", "admission_policy",
+                 "_collect_stage6_admission_policy", worker_group="policy"),
+    7: StageSpec(7, "Runtime 監控 + 可追溯留存", "runtime_monitoring",
+                 "_collect_stage7_runtime_monitoring", depends_on=(1, 2, 3, 4, 5, 6)),
+}
+
 @dataclass
 class VerificationEvidence:
     """驗證證據數據結構"""
@@ -80,10 +132,26 @@ class ChainVerificationResult:
 class UltimateSupplyChainVerifier:
     """終極供應鏈驗證器 - 企業級完整實現"""
     
-    def __init__(self, repo_path: str = "."):
+    def __init__(self, repo_path: str = ".", inventory: Optional[RepositoryInventory] = None,
+                 scan_rules: Optional[str] = None, scan_workers: Optional[int] = None,
+                 use_cache: bool = True, cache_path: Optional[str] = None,
+                 changed_since: Optional[str] = None):
         self.repo_path = Path(repo_path)
         self.evidence_dir = self.repo_path / "outputs" / "supply-chain-evidence"
         self.evidence_dir.mkdir(parents=True, exist_ok=True)
+        self._inventory = inventory
+        
+        # Stage 4 掃描引擎：規則文件（預設 supply-chain-scan-rules.yaml）與進程數
+        self.scan_rules = scan_rules
+        self.scan_workers = scan_workers
+        self._scan_results: Optional[Dict[str, Any]] = None
+        
+        # 逐文件結果快取（Stage 1、2 與 4）：內容雜湊 + 驗證器版本 + 規則集雜湊為鍵；
+        # changed_since 為 git 版本時，追蹤且未變更的文件按 git blob id 查找雜湊
+        self.use_cache = use_cache
+        self.cache_path = cache_path or str(self.evidence_dir / "verification-cache.sqlite3")
+        self.changed_since = changed_since
+        self._blobs: Optional[Dict[str, str]] = None
         
         # 證據鏈
         self.evidence_chain: List[VerificationEvidence] = []
@@ -113,6 +181,14 @@ class UltimateSupplyChainVerifier:
             'policy_compliance': 95
         }
     
+    @property
+    def inventory(self) -> RepositoryInventory:
+        """倉庫文件清單（首次使用時遍歷）"""
+        if self._inventory is None:
+            self._inventory = RepositoryInventory(str(self.repo_path))
+            logger.info(f"📁 文件清單: {len(self._inventory)} 個文件")
+        return self._inventory
+    
     def _compute_dual_hash(self, data: str, stage: str) -> Tuple[str, str]:
         """計算雙Hash：驗證Hash + 重現Hash"""
         # 驗證Hash - 用於完整性檢查
@@ -200,10 +276,31 @@ class UltimateSupplyChainVerifier:
         
         return True
     
+    # ===== 階段執行 =====
+    def _collect_stage(self, stage: int) -> Dict[str, Any]:
+        """收集階段數據（不寫入證據鏈）"""
+        return getattr(self, STAGE_SPECS[stage].collector)()
+    
+    def _record_stage(self, stage: int, data: Dict[str, Any]) -> VerificationEvidence:
+        """將階段數據寫入證據鏈"""
+        spec = STAGE_SPECS[stage]
+        evidence = self._create_evidence(
+            stage=stage,
+            stage_name=spec.stage_name,
+            evidence_type=spec.evidence_type,
+            data=data
+        )
+        logger.info(f"✅ Stage {stage} 完成: {evidence.compliant and '通過' or '失敗'}")
+        return evidence
+    
     # ===== Stage 1: Lint/格式驗證 =====
     def verify_stage1_lint_format(self) -> VerificationEvidence:
         """Stage 1: Lint/格式驗證"""
+        return self._record_stage(1, self._collect_stage1_lint_format())
+    
+    def _collect_stage1_lint_format(self) -> Dict[str, Any]:
         logger.info("🔍 Stage 1: Lint/格式驗證開始")
+        inventory = self.inventory
         
         data = {
             'yaml_files': [],
@@ -214,103 +311,95 @@ class UltimateSupplyChainVerifier:
         }
         
         # YAML 格式驗證
-        yaml_files = list(self.repo_path.rglob("*.yaml")) + list(self.repo_path.rglob("*.yml"))
-        for yaml_file in yaml_files:
-            if any(skip in str(yaml_file) for skip in ['.git', '__pycache__', 'node_modules']):
-                continue
-            
-            try:
-                with open(yaml_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    docs = list(yaml.safe_load_all(content))
-                
-                # 檢查格式問題
-                format_issues = []
-                if '\t' in content:  # 使用 tab 而非 space
-                    format_issues.append("uses_tabs")
-                if content.strip() != content:  # 前後空白
-                    format_issues.append("leading_trailing_whitespace")
-                
-                data['yaml_files'].append({
-                    'file': str(yaml_file.relative_to(self.repo_path)),
-                    'status': 'valid' if not format_issues else 'format_issues',
-                    'issues': format_issues,
-                    'size': len(content)
-                })
-            except yaml.YAMLError as e:
-                data['yaml_files'].append({
-                    'file': str(yaml_file.relative_to(self.repo_path)),
-                    'status': 'invalid',
-                    'error': str(e)
-                })
+        yaml_files = inventory.with_suffix('.yaml') + inventory.with_suffix('.yml')
+        for _, result in self._check_files('lint_yaml', yaml_files, self._lint_yaml_file):
+            data['yaml_files'].append(result)
         
         # JSON 格式驗證
-        json_files = list(self.repo_path.rglob("*.json"))
-        for json_file in json_files:
-            if any(skip in str(json_file) for skip in ['.git', 'node_modules']):
-                continue
-            
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    json.load(f)
-                data['json_files'].append({
-                    'file': str(json_file.relative_to(self.repo_path)),
-                    'status': 'valid'
-                })
-            except json.JSONDecodeError as e:
-                data['json_files'].append({
-                    'file': str(json_file.relative_to(self.repo_path)),
-                    'status': 'invalid',
-                    'error': str(e)
-                })
+        for _, result in self._check_files('lint_json', inventory.with_suffix('.json'), self._lint_json_file):
+            data['json_files'].append(result)
         
         # Python 基本格式檢查
-        py_files = list(self.repo_path.rglob("*.py"))
-        for py_file in py_files:
-            if any(skip in str(py_file) for skip in ['.git', '__pycache__']):
-                continue
-            
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # 基本語法檢查
-                compile(content, str(py_file), 'exec')
-                
-                # 檢查基本格式
-                issues = []
-                if content.count('\t') > 0:
-                    issues.append("tabs_in_indentation")
-                if content and not content.endswith('\n'):
-                    issues.append("no_final_newline")
-                
-                data['python_files'].append({
-                    'file': str(py_file.relative_to(self.repo_path)),
-                    'status': 'valid' if not issues else 'format_issues',
-                    'issues': issues,
-                    'lines': content.count('\n')
-                })
-            except SyntaxError as e:
-                data['python_files'].append({
-                    'file': str(py_file.relative_to(self.repo_path)),
-                    'status': 'syntax_error',
-                    'error': str(e)
-                })
-        
-        evidence = self._create_evidence(
-            stage=1,
-            stage_name="Lint/格式驗證",
-            evidence_type="format_validation",
-            data=data
-        )
+        for _, result in self._check_files('lint_python', inventory.with_suffix('.py'), self._lint_python_file):
+            data['python_files'].append(result)
         
-        logger.info(f"✅ Stage 1 完成: {evidence.compliant and '通過' or '失敗'}")
-        return evidence
+        return data
+    
+    def _lint_yaml_file(self, yaml_file: FileEntry) -> Dict[str, Any]:
+        inventory = self.inventory
+        try:
+            content = inventory.read_text(yaml_file)
+            inventory.yaml_documents(yaml_file)
+            
+            # 檢查格式問題
+            format_issues = []
+            if '\t' in content:  # 使用 tab 而非 space
+                format_issues.append("uses_tabs")
+            if content.strip() != content:  # 前後空白
+                format_issues.append("leading_trailing_whitespace")
+            
+            return {
+                'file': yaml_file.rel,
+                'status': 'valid' if not format_issues else 'format_issues',
+                'issues': format_issues,
+                'size': len(content)
+            }
+        except yaml.YAMLError as e:
+            return {
+                'file': yaml_file.rel,
+                'status': 'invalid',
+                'error': str(e)
+            }
+    
+    def _lint_json_file(self, json_file: FileEntry) -> Dict[str, Any]:
+        try:
+            self.inventory.json_document(json_file)
+            return {
+                'file': json_file.rel,
+                'status': 'valid'
+            }
+        except json.JSONDecodeError as e:
+            return {
+                'file': json_file.rel,
+                'status': 'invalid',
+                'error': str(e)
+            }
+    
+    def _lint_python_file(self, py_file: FileEntry) -> Dict[str, Any]:
+        try:
+            content = self.inventory.read_text(py_file)
+            
+            # 基本語法檢查
+            compile(content, str(self.repo_path / py_file.rel), 'exec')
+            
+            # 檢查基本格式
+            issues = []
+            if content.count('\t') > 0:
+                issues.append("tabs_in_indentation")
+            if content and not content.endswith('\n'):
+                issues.append("no_final_newline")
+            
+            return {
+                'file': py_file.rel,
+                'status': 'valid' if not issues else 'format_issues',
+                'issues': issues,
+                'lines': content.count('\n')
+            }
+        except SyntaxError as e:
+            return {
+                'file': py_file.rel,
+                'status': 'syntax_error',
+                'error': str(e)
+            }
     
     # ===== Stage 2: Schema/語意驗證 =====
     def verify_stage2_schema_semantic(self) -> VerificationEvidence:
         """Stage 2: Schema/語意驗證"""
+        return self._record_stage(2, self._collect_stage2_schema_semantic())
+    
+    def _collect_stage2_schema_semantic(self) -> Dict[str, Any]:
         logger.info("🔍 Stage 2: Schema/語意驗證開始")
+        inventory = self.inventory
         
         data = {
             'k8s_resources': [],
@@ -319,97 +408,156 @@ class UltimateSupplyChainVerifier:
             'policy_violations': []
         }
         
-        # Kubernetes 資源驗證
-        k8s_patterns = ['*.yaml', '*.yml']
-        for pattern in k8s_patterns:
-            for k8s_file in self.repo_path.rglob(pattern):
-                if any(skip in str(k8s_file) for skip in ['.git', '__pycache__', 'node_modules']):
+        # Kubernetes 資源驗證（YAML 文檔與 Stage 1 共用解析結果）
+        yaml_files = inventory.with_suffix('.yaml') + inventory.with_suffix('.yml')
+        for k8s_file, checked in self._check_files('k8s_semantic', yaml_files, self._k8s_file_resources):
+            if checked['error'] is not None:
+                logger.warning(f"無法處理 {k8s_file.rel}: {checked['error']}")
+            
+            for resource in checked['resources']:
+                data['k8s_resources'].append(resource)
+                
+                # 收集違規
+                for violation in resource['violations']:
+                    if violation['severity'] == 'HIGH':
+                        data['semantic_violations'].append({
+                            'file': resource['file'],
+                            'violation': violation['violation'],
+                            'severity': 'HIGH'
+                        })
+        
+        return data
+    
+    def _k8s_file_resources(self, k8s_file: FileEntry) -> Dict[str, Any]:
+        """單個 YAML 文件中的 Kubernetes 資源及其語意違規（無法處理時保留已收集的資源並記錄錯誤）"""
+        resources = []
+        try:
+            docs = self.inventory.yaml_documents(k8s_file)
+            
+            for i, doc in enumerate(docs):
+                if not doc:
                     continue
                 
-                try:
-                    with open(k8s_file, 'r') as f:
-                        docs = list(yaml.safe_load_all(f))
+                if 'apiVersion' in doc and 'kind' in doc:
+                    resource = {
+                        'file': k8s_file.rel,
+                        'index': i,
+                        'apiVersion': doc['apiVersion'],
+                        'kind': doc['kind'],
+                        'metadata': doc.get('metadata', {}),
+                        'violations': []
+                    }
                     
-                    for i, doc in enumerate(docs):
-                        if not doc:
-                            continue
+                    # 語意驗證
+                    if doc['kind'] in ['Deployment', 'StatefulSet', 'DaemonSet']:
+                        spec = doc.get('spec', {}).get('template', {}).get('spec', {})
+                        containers = spec.get('containers', [])
                         
-                        if 'apiVersion' in doc and 'kind' in doc:
-                            resource = {
-                                'file': str(k8s_file.relative_to(self.repo_path)),
-                                'index': i,
-                                'apiVersion': doc['apiVersion'],
-                                'kind': doc['kind'],
-                                'metadata': doc.get('metadata', {}),
-                                'violations': []
-                            }
-                            
-                            # 語意驗證
-                            if doc['kind'] in ['Deployment', 'StatefulSet', 'DaemonSet']:
-                                spec = doc.get('spec', {}).get('template', {}).get('spec', {})
-                                containers = spec.get('containers', [])
-                                
-                                for j, container in enumerate(containers):
-                                    # 檢查 resource limits
-                                    if 'resources' not in container:
-                                        resource['violations'].append({
-                                            'container_index': j,
-                                            'violation': 'missing_resources',
-                                            'severity': 'HIGH'
-                                        })
-                                    elif 'limits' not in container.get('resources', {}):
-                                        resource['violations'].append({
-                                            'container_index': j,
-                                            'violation': 'missing_resource_limits',
-                                            'severity': 'MEDIUM'
-                                        })
-                                    
-                                    # 檢查 image tag
-                                    image = container.get('image', '')
-                                    if ':latest' in image or ':' not in image:
-                                        resource['violations'].append({
-                                            'container_index': j,
-                                            'violation': 'using_latest_tag',
-                                            'image': image,
-                                            'severity': 'HIGH'
-                                        })
-                                    
-                                    # 檢查 security context
-                                    if 'securityContext' not in container and 'securityContext' not in spec:
-                                        resource['violations'].append({
-                                            'container_index': j,
-                                            'violation': 'missing_security_context',
-                                            'severity': 'MEDIUM'
-                                        })
+                        for j, container in enumerate(containers):
+                            # 檢查 resource limits
+                            if 'resources' not in container:
+                                resource['violations'].append({
+                                    'container_index': j,
+                                    'violation': 'missing_resources',
+                                    'severity': 'HIGH'
+                                })
+                            elif 'limits' not in container.get('resources', {}):
+                                resource['violations'].append({
+                                    'container_index': j,
+                                    'violation': 'missing_resource_limits',
+                                    'severity': 'MEDIUM'
+                                })
                             
-                            data['k8s_resources'].append(resource)
+                            # 檢查 image tag
+                            image = container.get('image', '')
+                            if ':latest' in image or ':' not in image:
+                                resource['violations'].append({
+                                    'container_index': j,
+                                    'violation': 'using_latest_tag',
+                                    'image': image,
+                                    'severity': 'HIGH'
+                                })
                             
-                            # 收集違規
-                            for violation in resource['violations']:
-                                if violation['severity'] == 'HIGH':
-                                    data['semantic_violations'].append({
-                                        'file': resource['file'],
-                                        'violation': violation['violation'],
-                                        'severity': 'HIGH'
-                                    })
-                
-                except Exception as e:
-                    logger.warning(f"無法處理 {k8s_file}: {e}")
+                            # 檢查 security context
+                            if 'securityContext' not in container and 'securityContext' not in spec:
+                                resource['violations'].append({
+                                    'container_index': j,
+                                    'violation': 'missing_security_context',
+                                    'severity': 'MEDIUM'
+                                })
+                    
+                    resources.append(resource)
         
-        evidence = self._create_evidence(
-            stage=2,
-            stage_name="Schema/語意驗證",
-            evidence_type="schema_validation",
-            data=data
-        )
+        except Exception as e:
+            return {'resources': resources, 'error': str(e)}
         
-        logger.info(f"✅ Stage 2 完成: {evidence.compliant and '通過' or '失敗'}")
-        return evidence
+        return {'resources': resources, 'error': None}
+    
+    def _check_files(self, validator: str, entries: List[FileEntry],
+                     check: Callable[[FileEntry], Any]) -> List[Tuple[FileEntry, Any]]:
+        """
+        逐文件執行檢查，結果經由 VerificationCache 快取
+        
+        以 (驗證器, 檢查版本, 內容雜湊, 路徑) 為鍵；命中的文件不再讀取與解析。
+        無法按 JSON 原樣往返的結果（例如含 YAML 日期）不快取。
+        
+        Returns:
+            [(文件, 結果)]，按 entries 順序
+        """
+        if not self.use_cache:
+            return [(entry, check(entry)) for entry in entries]
+        
+        namespace = CacheNamespace(validator, FILE_CHECK_VERSION, '')
+        unchanged = self._unchanged_blobs()
+        cache = VerificationCache(self.cache_path)
+        try:
+            looked_up = []
+            for entry in entries:
+                name = str(self.repo_path / entry.rel)
+                try:
+                    digest = cache.content_digest(entry, blob=unchanged.get(entry.rel))
+                except OSError:
+                    looked_up.append((entry, name, None, None))
+                    continue
+                looked_up.append((entry, name, digest, cache.get(namespace, digest, name)))
+            # 檢查期間不持有寫入鎖（其他階段的工作進程共用同一快取）
+            cache.commit()
+            
+            results = []
+            for entry, name, digest, result in looked_up:
+                if result is None:
+                    result = check(entry)
+                    if digest is not None and _json_round_trips(result):
+                        cache.put(namespace, digest, name, result)
+                results.append((entry, result))
+            cache.prune(namespace)
+            cache.commit()
+        finally:
+            cache.close()
+        
+        logger.info(f"🗄️ {validator} 快取: 命中 {cache.stats.hits}，未命中 {cache.stats.misses}")
+        return results
+    
+    def _unchanged_blobs(self) -> Dict[str, str]:
+        """相對 --changed-since 未變更的 git 追蹤文件及其 blob id（未指定或無法取得時為空）"""
+        if self._blobs is None:
+            self._blobs = {}
+            if self.changed_since:
+                blobs = git_unchanged_blobs(str(self.repo_path), self.changed_since)
+                if blobs is None:
+                    logger.warning(f"無法取得相對 {self.changed_since} 的變更，改為按 stat 判斷")
+                else:
+                    self._blobs = blobs
+        return self._blobs
     
     # ===== Stage 3: 依賴鎖定與可重現建置 =====
     def verify_stage3_dependency_reproducible(self) -> VerificationEvidence:
         """Stage 3: 依賴鎖定與可重現建置驗證"""
+        return self._record_stage(3, self._collect_stage3_dependency_reproducible())
+    
+    def _collect_stage3_dependency_reproducible(self) -> Dict[str, Any]:
         logger.info("🔍 Stage 3: 依賴鎖定與可重現建置驗證開始")
+        inventory = self.inventory
         
         data = {
             'lock_files': [],
@@ -430,39 +578,38 @@ class UltimateSupplyChainVerifier:
         }
         
         for lock_file, (source_file, manager) in lock_files_map.items():
-            lock_path = self.repo_path / lock_file
-            source_path = self.repo_path / source_file
+            lock_entry = inventory.get(lock_file)
+            source_exists = inventory.get(source_file) is not None
             
             lock_info = {
                 'file': lock_file,
                 'manager': manager,
                 'source_file': source_file,
-                'exists': lock_path.exists(),
-                'source_exists': source_path.exists(),
-                'size': lock_path.stat().st_size if lock_path.exists() else 0,
-                'last_modified': lock_path.stat().st_mtime if lock_path.exists() else None
+                'exists': lock_entry is not None,
+                'source_exists': source_exists,
+                'size': lock_entry.size if lock_entry else 0,
+                'last_modified': lock_entry.mtime_ns / 1e9 if lock_entry else None
             }
             
             # 如果有源文件但沒有 lock 檔案，則是問題
-            if source_path.exists() and not lock_path.exists():
+            if source_exists and lock_entry is None:
                 lock_info['status'] = 'missing_lock'
                 data['dependency_checks'].append({
                     'file': lock_file,
                     'issue': 'missing_lock_file',
                     'severity': 'HIGH'
                 })
-            elif lock_path.exists():
+            elif lock_entry is not None:
                 lock_info['status'] = 'present'
                 
                 # 嘗試驗證 lock 檔案完整性
                 try:
-                    with open(lock_path, 'r') as f:
-                        content = f.read()
+                    content = inventory.read_bytes(lock_entry)
                     
                     # 基本完整性檢查
                     if len(content) > 0:
                         lock_info['integrity'] = 'valid'
-                        lock_info['content_hash'] = hashlib.sha256(content.encode()).hexdigest()
+                        lock_info['content_hash'] = hashlib.sha256(content).hexdigest()
                     else:
                         lock_info['integrity'] = 'invalid'
                         lock_info['issue'] = 'empty_file'
@@ -494,33 +641,24 @@ class UltimateSupplyChainVerifier:
         # 檢查建置產物目錄
         build_dirs = ['dist', 'build', 'target', 'bin', 'out']
         for build_dir in build_dirs:
-            path = self.repo_path / build_dir
-            if path.exists():
-                artifacts = []
-                if path.is_dir():
-                    for artifact in path.rglob('*'):
-                        if artifact.is_file():
-                            artifacts.append({
-                                'file': str(artifact.relative_to(self.repo_path)),
-                                'size': artifact.stat().st_size,
-                                'hash': self._file_hash(artifact)
-                            })
+            if inventory.has_dir(build_dir) or inventory.get(build_dir):
+                artifacts = inventory.under(build_dir)
                 
                 data['build_artifacts'].append({
                     'directory': build_dir,
                     'artifacts_count': len(artifacts),
-                    'artifacts': artifacts[:10]  # 限制數量
+                    # 只記錄（並雜湊）前 10 個產物
+                    'artifacts': [
+                        {
+                            'file': artifact.rel,
+                            'size': artifact.size,
+                            'hash': self._file_hash(Path(artifact.path))
+                        }
+                        for artifact in artifacts[:10]
+                    ]
                 })
         
-        evidence = self._create_evidence(
-            stage=3,
-            stage_name="依賴鎖定與可重現建置",
-            evidence_type="dependency_reproducibility",
-            data=data
-        )
-        
-        logger.info(f"✅ Stage 3 完成: {evidence.compliant and '通過' or '失敗'}")
-        return evidence
+        return data
     
     def _file_hash(self, file_path: Path) -> str:
         """計算檔案雜湊"""
@@ -533,24 +671,20 @@ class UltimateSupplyChainVerifier:
     # ===== Stage 4: SBOM + 漏洞/Secrets 掃描 =====
     def verify_stage4_sbom_vulnerability_scan(self) -> VerificationEvidence:
         """Stage 4: SBOM 生成與漏洞/Secrets 掃描"""
+        return self._record_stage(4, self._collect_stage4_sbom_vulnerability_scan())
+    
+    def _collect_stage4_sbom_vulnerability_scan(self) -> Dict[str, Any]:
         logger.info("🔍 Stage 4: SBOM + 漏洞/Secrets 掃描開始")
         
-        data = {
+        scan = self._scan_repository()
+        return {
             'sbom': self._generate_sbom(),
             'vulnerabilities': self._scan_vulnerabilities(),
             'secrets': self._scan_secrets(),
-            'malware': self._scan_malware()
+            'malware': self._scan_malware(),
+            'scan_stats': asdict(scan['stats']),
+            'scan_cache': asdict(scan['cache']) if 'cache' in scan else None
         }
-        
-        evidence = self._create_evidence(
-            stage=4,
-            stage_name="SBOM + 漏洞/Secrets 掃描",
-            evidence_type="security_scan",
-            data=data
-        )
-        
-        logger.info(f"✅ Stage 4 完成: {evidence.compliant and '通過' or '失敗'}")
-        return evidence
     
     def _generate_sbom(self) -> Dict[str, Any]:
         """生成軟體物料清單（SBOM）"""
@@ -573,62 +707,63 @@ class UltimateSupplyChainVerifier:
         }
         
         # 掃描依賴
+        inventory = self.inventory
         dependencies = []
         
         # Python 依賴
-        if (self.repo_path / 'requirements.txt').exists():
-            with open(self.repo_path / 'requirements.txt') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        parts = line.split('==')
-                        if len(parts) >= 1:
+        requirements = inventory.get('requirements.txt')
+        if requirements:
+            for line in inventory.read_text(requirements).splitlines():
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    parts = line.split('==')
+                    if len(parts) >= 1:
+                        name = parts[0].strip()
+                        version = parts[1].strip() if len(parts) > 1 else 'unknown'
+                        dependencies.append({
+                            'type': 'library',
+                            'name': name,
+                            'version': version,
+                            'purl': f'pkg:pypi/{name}@{version}',
+                            'language': 'python'
+                        })
+        
+        # Go 依賴
+        go_mod = inventory.get('go.mod')
+        if go_mod:
+            try:
+                content = inventory.read_text(go_mod)
+                # 簡單解析 go.mod
+                for line in content.split('\n'):
+                    if line.strip().startswith('require ') or (line.strip() and not line.startswith('\t') and ' ' in line):
+                        parts = line.strip().split()
+                        if len(parts) >= 2 and not parts[0].startswith('//'):
                             name = parts[0].strip()
-                            version = parts[1].strip() if len(parts) > 1 else 'unknown'
+                            version = parts[1].strip().replace('v', '')
                             dependencies.append({
                                 'type': 'library',
                                 'name': name,
                                 'version': version,
-                                'purl': f'pkg:pypi/{name}@{version}',
-                                'language': 'python'
+                                'purl': f'pkg:golang/{name}@{version}',
+                                'language': 'go'
                             })
-        
-        # Go 依賴
-        if (self.repo_path / 'go.mod').exists():
-            try:
-                with open(self.repo_path / 'go.mod') as f:
-                    content = f.read()
-                    # 簡單解析 go.mod
-                    for line in content.split('\n'):
-                        if line.strip().startswith('require ') or (line.strip() and not line.startswith('\t') and ' ' in line):
-                            parts = line.strip().split()
-                            if len(parts) >= 2 and not parts[0].startswith('//'):
-                                name = parts[0].strip()
-                                version = parts[1].strip().replace('v', '')
-                                dependencies.append({
-                                    'type': 'library',
-                                    'name': name,
-                                    'version': version,
-                                    'purl': f'pkg:golang/{name}@{version}',
-                                    'language': 'go'
-                                })
             except Exception as e:
                 logger.warning(f"無法解析 go.mod: {e}")
         
         # Node.js 依賴
-        if (self.repo_path / 'package.json').exists():
+        package_json = inventory.get('package.json')
+        if package_json:
             try:
-                with open(self.repo_path / 'package.json') as f:
-                    package_data = json.load(f)
-                    deps = package_data.get('dependencies', {})
-                    for name, version in deps.items():
-                        dependencies.append({
-                            'type': 'library',
-                            'name': name,
-                            'version': version.replace('^', ''),
-                            'purl': f'pkg:npm/{name}@{version.replace("^", "")}',
-                            'language': 'javascript'
-                        })
+                package_data = inventory.json_document(package_json)
+                deps = package_data.get('dependencies', {})
+                for name, version in deps.items():
+                    dependencies.append({
+                        'type': 'library',
+                        'name': name,
+                        'version': version.replace('^', ''),
+                        'purl': f'pkg:npm/{name}@{version.replace("^", "")}',
+                        'language': 'javascript'
+                    })
             except Exception as e:
                 logger.warning(f"無法解析 package.json: {e}")
         
@@ -661,121 +796,114 @@ class UltimateSupplyChainVerifier:
         
         return simulated_vulns
     
-    def _scan_secrets(self) -> List[Dict[str, Any]]:
-        """掃描 Secrets（模擬 gitleaks）"""
-        secrets = []
-        
-        secret_patterns = {
-            'aws_access_key': r'AKIA[0-9A-Z]{16}',
-            'aws_secret_key': r'[A-Za-z0-9/+=]{40}',
-            'github_token': r'ghp_[A-Za-z0-9_]{36,255}',
-            'github_pat': r'github_pat_[A-Za-z0-9_]{22}_[A-Za-z0-9_]{59}',
-            'private_key': r'-----BEGIN (RSA |DSA |EC |OPENSSH )?PRIVATE KEY-----',
-            'api_key': r'[Aa][Pp][Ii]_[Kk][Ee][Yy].*["\']?[A-Za-z0-9_]{16,}["\']?',
-            'password': r'[Pp][Aa][Ss][Ss][Ww][Oo][Rr][Dd].*["\']?[A-Za-z0-9_@#$%^&*]{8,}["\']?'
-        }
-        
-        # 掃描所有文本文件
-        text_extensions = ['.py', '.yaml', '.yml', '.json', '.sh', '.md', '.txt']
+    def _scan_repository(self) -> Dict[str, Any]:
+        """
+        以掃描引擎一次掃描所有文件（Secrets 與惡意程式共用同一次讀取）
+
+        啟用快取時只有內容、規則集或引擎版本變更的文件交給掃描引擎，
+        其餘文件沿用快取結果，按文件順序合併。
+        """
+        if self._scan_results is None:
+            engine = ScanEngine(RuleSet.from_yaml(self.scan_rules))
+            if self.use_cache:
+                self._scan_results = self._scan_with_cache(engine)
+            else:
+                files = [(entry.rel, entry.path, entry.size) for entry in self.inventory.files]
+                self._scan_results = engine.scan_paths(files, workers=self.scan_workers)
+            stats = self._scan_results['stats']
+            logger.info(
+                f"🔎 掃描 {stats.files} 個文件，{stats.bytes_scanned / 1e6:.1f} MB，"
+                f"跳過 {stats.binary_files} 個二進位文件"
+            )
+        return self._scan_results
+    
+    def _scan_with_cache(self, engine: ScanEngine) -> Dict[str, Any]:
+        """經由 VerificationCache 掃描：命中的文件不再讀取內容"""
+        namespace = CacheNamespace('scan_engine', ENGINE_VERSION, engine.rule_set.digest)
+        categories = [category.name for category in engine.rule_set.categories]
         
-        for ext in text_extensions:
-            for file_path in self.repo_path.rglob(f'*{ext}'):
-                if any(skip in str(file_path) for skip in ['.git', '__pycache__', 'node_modules']):
+        unchanged = self._unchanged_blobs()
+        cache = VerificationCache(self.cache_path)
+        try:
+            cached: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+            pending = []
+            for entry in self.inventory.files:
+                if not engine.scans_content(entry.suffix):
                     continue
-                
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        lines = content.split('\n')
-                        
-                        for line_num, line in enumerate(lines, 1):
-                            for secret_type, pattern in secret_patterns.items():
-                                if re.search(pattern, line, re.IGNORECASE):
-                                    # 檢查是否是註解或示例
-                                    if not any(skip in line.lower() for skip in ['#', '//', 'example', 'dummy', 'fake', 'test']):
-                                        secrets.append({
-                                            'file': str(file_path.relative_to(self.repo_path)),
-                                            'line': line_num,
-                                            'type': secret_type,
-                                            'content': line.strip()[:100] + '...' if len(line.strip()) > 100 else line.strip(),
-                                            'severity': 'CRITICAL' if 'key' in secret_type else 'HIGH'
-                                        })
-                except Exception as e:
-                    logger.warning(f"無法掃描 {file_path}: {e}")
-        
-        return secrets
+                    digest = cache.content_digest(entry, blob=unchanged.get(entry.rel))
+                except OSError:
+                    pending.append((entry, None))
+                    continue
+                payload = cache.get(namespace, digest, entry.name)
+                if payload is None:
+                    pending.append((entry, digest))
+                else:
+                    cached[entry.rel] = payload
+            # 掃描期間不持有寫入鎖（其他階段的工作進程共用同一快取）
+            cache.commit()
+            
+            scanned = engine.scan_paths(
+                [(entry.rel, entry.path, entry.size) for entry, _ in pending], workers=self.scan_workers
+            )
+            fresh = {entry.rel: {name: [] for name in categories} for entry, _ in pending}
+            for name in categories:
+                for finding in scanned[name]:
+                    fresh[finding['file']][name].append(
+                        {key: value for key, value in finding.items() if key != 'file'}
+                    )
+            for entry, digest in pending:
+                if digest is not None:
+                    cache.put(namespace, digest, entry.name, fresh[entry.rel])
+            cache.prune(namespace)
+            cache.commit()
+        finally:
+            cache.close()
+        
+        results: Dict[str, Any] = {name: [] for name in categories}
+        stats = scanned['stats']
+        for entry in self.inventory.files:
+            per_file = cached.get(entry.rel) or fresh.get(entry.rel)
+            if per_file is None:
+                # 不掃描內容的文件只檢查文件名
+                stats.files += 1
+                for finding in engine.scan_filename(entry.rel, entry.name):
+                    results[finding.category].append(finding.to_dict())
+                continue
+            if entry.rel in cached:
+                stats.files += 1
+            for name in categories:
+                results[name].extend({'file': entry.rel, **finding} for finding in per_file.get(name, []))
+        results['stats'] = stats
+        results['cache'] = cache.stats
+        logger.info(
+            f"🗄️ 掃描快取: 命中 {cache.stats.hits}，未命中 {cache.stats.misses}，"
+            f"計算雜湊 {cache.stats.hashed_files} 個文件"
+        )
+        return results
+    
+    def _scan_secrets(self) -> List[Dict[str, Any]]:
+        """掃描 Secrets（模擬 gitleaks）"""
+        return self._scan_repository().get('secret', [])
     
     def _scan_malware(self) -> List[Dict[str, Any]]:
         """掃描惡意程式（模擬 ClamAV/YARA）"""
-        malware = []
-        
-        # 檢查可疑的檔案模式
-        suspicious_patterns = {
-            'suspicious_executable': r'\.(exe|bat|cmd|scr|pif)$',
-            'obfuscated_code': r'(eval|base64_decode|chr\(|ord\()[&quot;\'][A-Za-z0-9+/=]{20,}[&quot;\']',
-            'suspicious_network': r'(curl|wget).*http.*\|.*sh',
-            'reverse_shell': r'(bash -i|/bin/sh|nc -e|python -c).*[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}'
-        }
-        
-        # 掃描所有文件
-        for file_path in self.repo_path.rglob('*'):
-            if file_path.is_file() and any(skip not in str(file_path) for skip in ['.git', '__pycache__']):
-                file_name = file_path.name.lower()
-                
-                for pattern_type, pattern in suspicious_patterns.items():
-                    if re.search(pattern, file_name, re.IGNORECASE):
-                        malware.append({
-                            'file': str(file_path.relative_to(self.repo_path)),
-                            'type': pattern_type,
-                            'severity': 'HIGH'
-                        })
-                        break
-                
-                # 檢查文件內容
-                if file_path.suffix in ['.py', '.sh', '.yaml', '.yml']:
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            lines = content.split('\n')
-                            
-                            for line_num, line in enumerate(lines, 1):
-                                for pattern_type, pattern in suspicious_patterns.items():
-                                    if pattern_type != 'suspicious_executable':  # 已經檢查了檔名
-                                        if re.search(pattern, line, re.IGNORECASE):
-                                            malware.append({
-                                                'file': str(file_path.relative_to(self.repo_path)),
-                                                'line': line_num,
-                                                'type': pattern_type,
-                                                'content': line.strip()[:100],
-                                                'severity': 'HIGH'
-                                            })
-                                            break
-                    except Exception:
-                        pass  # 忽略無法讀取的檔案
-        
-        return malware
+        return self._scan_repository().get('malware', [])
     
     # ===== Stage 5: Sign(簽章) + Attest(provenance/in-toto) =====
     def verify_stage5_sign_attestation(self) -> VerificationEvidence:
         """Stage 5: 簽章與 Attestation 驗證"""
+        return self._record_stage(5, self._collect_stage5_sign_attestation())
+    
+    def _collect_stage5_sign_attestation(self) -> Dict[str, Any]:
         logger.info("🔍 Stage 5: 簽章 + Attestation 驗證開始")
         
-        data = {
+        return {
             'signatures': self._verify_signatures(),
             'provenance': self._generate_provenance(),
             'attestations': self._generate_attestations(),
             'transparency_log': self._create_transparency_log()
         }
-        
-        evidence = self._create_evidence(
-            stage=5,
-            stage_name="簽章 + Attestation",
-            evidence_type="signature_attestation",
-            data=data
-        )
-        
-        logger.info(f"✅ Stage 5 完成: {evidence.compliant and '通過' or '失敗'}")
-        return evidence
     
     def _verify_signatures(self) -> List[Dict[str, Any]]:
         """驗證簽章（模擬 Cosign）"""
@@ -988,38 +1116,29 @@ class UltimateSupplyChainVerifier:
     # ===== Stage 6: Admission Policy(OPA/Kyverno)門禁 =====
     def verify_stage6_admission_policy(self) -> VerificationEvidence:
         """Stage 6: Admission Policy 門禁驗證"""
+        return self._record_stage(6, self._collect_stage6_admission_policy())
+    
+    def _collect_stage6_admission_policy(self) -> Dict[str, Any]:
         logger.info("🔍 Stage 6: Admission Policy 門禁驗證開始")
         
-        data = {
+        return {
             'opa_policies': self._validate_opa_policies(),
             'kyverno_policies': self._validate_kyverno_policies(),
             'admission_decisions': self._simulate_admission_decisions(),
             'policy_violations': []
         }
-        
-        evidence = self._create_evidence(
-            stage=6,
-            stage_name="Admission Policy 門禁",
-            evidence_type="admission_policy",
-            data=data
-        )
-        
-        logger.info(f"✅ Stage 6 完成: {evidence.compliant and '通過' or '失敗'}")
-        return evidence
     
     def _validate_opa_policies(self) -> List[Dict[str, Any]]:
         """驗證 OPA 政策"""
         policies = []
         
         # 檢查 OPA 政策文件
-        opa_files = list(self.repo_path.rglob("*.rego"))
-        for opa_file in opa_files:
+        for opa_file in self.inventory.with_suffix('.rego'):
             try:
-                with open(opa_file, 'r') as f:
-                    content = f.read()
+                content = self.inventory.read_text(opa_file)
                 
                 policy_info = {
-                    'file': str(opa_file.relative_to(self.repo_path)),
+                    'file': opa_file.rel,
                     'package': self._extract_rego_package(content),
                     'rules': self._extract_rego_rules(content),
                     'syntactically_valid': True,
@@ -1028,7 +1147,7 @@ class UltimateSupplyChainVerifier:
                 policies.append(policy_info)
             except Exception as e:
                 policies.append({
-                    'file': str(opa_file.relative_to(self.repo_path)),
+                    'file': opa_file.rel,
                     'error': str(e),
                     'syntactically_valid': False
                 })
@@ -1063,16 +1182,15 @@ class UltimateSupplyChainVerifier:
         policies = []
         
         # 檢查 Kyverno 政策文件
-        kyverno_files = list(self.repo_path.rglob("kyverno-*.yaml")) + list(self.repo_path.rglob("*-policy.yaml"))
+        kyverno_files = self.inventory.matching("kyverno-*.yaml") + self.inventory.matching("*-policy.yaml")
         for kyverno_file in kyverno_files:
             try:
-                with open(kyverno_file, 'r') as f:
-                    policy_docs = list(yaml.safe_load_all(f))
+                policy_docs = self.inventory.yaml_documents(kyverno_file)
                 
                 for doc in policy_docs:
                     if doc and doc.get('apiVersion') == 'kyverno.io/v1':
                         policy_info = {
-                            'file': str(kyverno_file.relative_to(self.repo_path)),
+                            'file': kyverno_file.rel,
                             'name': doc.get('metadata', {}).get('name', 'unknown'),
                             'rules_count': len(doc.get('spec', {}).get('rules', [])),
                             'validation_mode': doc.get('spec', {}).get('validationFailureAction', 'Audit'),
@@ -1081,7 +1199,7 @@ class UltimateSupplyChainVerifier:
                         policies.append(policy_info)
             except Exception as e:
                 policies.append({
-                    'file': str(kyverno_file.relative_to(self.repo_path)),
+                    'file': kyverno_file.rel,
                     'error': str(e),
                     'syntactically_valid': False
                 })
@@ -1136,24 +1254,17 @@ class UltimateSupplyChainVerifier:
     # ===== Stage 7: Runtime監控(Falco/審計) + 可追溯留存 =====
     def verify_stage7_runtime_monitoring(self) -> VerificationEvidence:
         """Stage 7: Runtime 監控與可追溯留存"""
+        return self._record_stage(7, self._collect_stage7_runtime_monitoring())
+    
+    def _collect_stage7_runtime_monitoring(self) -> Dict[str, Any]:
         logger.info("🔍 Stage 7: Runtime 監控 + 可追溯留存驗證開始")
         
-        data = {
+        return {
             'runtime_events': self._simulate_runtime_events(),
             'falco_rules': self._validate_falco_rules(),
             'audit_logs': self._collect_audit_logs(),
             'traceability_chain': self._build_traceability_chain()
         }
-        
-        evidence = self._create_evidence(
-            stage=7,
-            stage_name="Runtime 監控 + 可追溯留存",
-            evidence_type="runtime_monitoring",
-            data=data
-        )
-        
-        logger.info(f"✅ Stage 7 完成: {evidence.compliant and '通過' or '失敗'}")
-        return evidence
     
     def _simulate_runtime_events(self) -> List[Dict[str, Any]]:
         """模擬 Runtime 事件（Falco）"""
@@ -1204,14 +1315,13 @@ class UltimateSupplyChainVerifier:
         rules = []
         
         # 檢查 Falco 規則文件
-        falco_files = list(self.repo_path.rglob("falco-*.yaml")) + list(self.repo_path.rglob("*.falco"))
+        falco_files = self.inventory.matching("falco-*.yaml") + self.inventory.with_suffix(".falco")
         for falco_file in falco_files:
             try:
-                with open(falco_file, 'r') as f:
-                    content = f.read()
+                content = self.inventory.read_text(falco_file)
                 
                 rule_info = {
-                    'file': str(falco_file.relative_to(self.repo_path)),
+                    'file': falco_file.rel,
                     'rules_count': content.count('- rule:'),
                     'syntactically_valid': True,
                     'size': len(content)
@@ -1219,7 +1329,7 @@ class UltimateSupplyChainVerifier:
                 rules.append(rule_info)
             except Exception as e:
                 rules.append({
-                    'file': str(falco_file.relative_to(self.repo_path)),
+                    'file': falco_file.rel,
                     'error': str(e),
                     'syntactically_valid': False
                 })
@@ -1278,19 +1388,19 @@ class UltimateSupplyChainVerifier:
         return hashlib.sha3_512(chain_data.encode()).hexdigest()
     
     # ===== 主要執行方法 =====
-    def run_complete_verification(self) -> ChainVerificationResult:
-        """執行完整七段式驗證"""
+    def run_complete_verification(self, max_workers: Optional[int] = None) -> ChainVerificationResult:
+        """
+        執行完整七段式驗證
+        
+        Args:
+            max_workers: 進程池大小；0 或 1 表示在主進程中依次執行，
+                None 表示按 CPU 數與工作組數自動選擇
+        """
         logger.info("🚀 開始執行完整供應鏈驗證流程")
         
         try:
             # 執行所有七個階段
-            self.verify_stage1_lint_format()
-            self.verify_stage2_schema_semantic()
-            self.verify_stage3_dependency_reproducible()
-            self.verify_stage4_sbom_vulnerability_scan()
-            self.verify_stage5_sign_attestation()
-            self.verify_stage6_admission_policy()
-            self.verify_stage7_runtime_monitoring()
+            self._run_stages(max_workers)
             
             # 計算結果
             passed_stages = sum(1 for e in self.evidence_chain if e.compliant)
@@ -1326,6 +1436,74 @@ class UltimateSupplyChainVerifier:
             logger.error(f"❌ 驗證流程失敗: {e}")
             raise
     
+    def _run_stages(self, max_workers: Optional[int]) -> None:
+        """
+        按依賴圖執行各階段
+        
+        工作組在進程池中並行收集數據；證據按階段順序寫入，主進程階段在其
+        依賴的證據寫入後才收集。
+        """
+        groups: Dict[str, List[int]] = {}
+        for stage, spec in sorted(STAGE_SPECS.items()):
+            if spec.worker_group is not None:
+                groups.setdefault(spec.worker_group, []).append(stage)
+        
+        inventory = self.inventory
+        if max_workers is None:
+            max_workers = min(len(groups), os.cpu_count() or 1)
+        
+        results: Dict[int, Dict[str, Any]] = {}
+        pool = None
+        futures = {}
+        if max_workers > 1:
+            try:
+                # 以非常規方式載入本模塊時工作函數無法按引用序列化
+                pickle.dumps(_collect_stages_in_worker)
+                pool = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_stage_worker,
+                    initargs=(str(self.repo_path), inventory, {
+                        'scan_rules': self.scan_rules,
+                        'scan_workers': self.scan_workers,
+                        'use_cache': self.use_cache,
+                        'cache_path': self.cache_path,
+                        'changed_since': self.changed_since,
+                    })
+                )
+                futures = {
+                    pool.submit(_collect_stages_in_worker, stages): name
+                    for name, stages in groups.items()
+                }
+            except (OSError, NotImplementedError, pickle.PicklingError, AttributeError) as e:
+                logger.warning(f"無法建立進程池，改為依次執行: {e}")
+                pool = None
+                futures = {}
+        
+        try:
+            recorded: set = set()
+            for stage, spec in sorted(STAGE_SPECS.items()):
+                missing = set(spec.depends_on) - recorded
+                if missing:
+                    raise RuntimeError(f"Stage {stage} 的依賴尚未完成: {sorted(missing)}")
+                
+                if spec.worker_group is None:
+                    results[stage] = self._collect_stage(stage)
+                elif pool is None:
+                    if stage not in results:
+                        results.update({s: self._collect_stage(s) for s in groups[spec.worker_group]})
+                else:
+                    while stage not in results:
+                        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            del futures[future]
+                            results.update(future.result())
+                
+                self._record_stage(stage, results.pop(stage))
+                recorded.add(stage)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+    
     def _generate_recommendations(self) -> List[str]:
         """生成改進建議"""
         recommendations = []
@@ -1432,16 +1610,46 @@ class UltimateSupplyChainVerifier:
             f.write(md_content)
 
 
+_WORKER_VERIFIER: Optional[UltimateSupplyChainVerifier] = None
+
+
+def _init_stage_worker(repo_path: str, inventory: RepositoryInventory, options: Dict[str, Any]) -> None:
+    """工作進程初始化：每個進程持有一份文件清單與自己的內容快取"""
+    global _WORKER_VERIFIER
+    _WORKER_VERIFIER = UltimateSupplyChainVerifier(repo_path, inventory=inventory, **options)
+
+
+def _collect_stages_in_worker(stages: List[int]) -> Dict[int, Dict[str, Any]]:
+    """在工作進程中依次收集同組階段的數據"""
+    return {stage: _WORKER_VERIFIER._collect_stage(stage) for stage in stages}
+
+
 def main():
     """主執行函數"""
-    import sys
+    import argparse
     
-    repo_path = sys.argv[1] if len(sys.argv) > 1 else "."
+    parser = argparse.ArgumentParser(description="MachineNativeOps 供應鏈驗證")
+    parser.add_argument("repo_path", nargs="?", default=".", help="倉庫路徑")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="並行收集數據的進程數（0 或 1 表示依次執行）")
+    parser.add_argument("--scan-rules", default=None,
+                        help="Stage 4 掃描規則 YAML（預設 supply-chain-scan-rules.yaml）")
+    parser.add_argument("--scan-workers", type=int, default=None,
+                        help="Stage 4 掃描進程數（預設為 CPU 數）")
+    parser.add_argument("--cache", default=None,
+                        help="驗證快取路徑（預設 outputs/supply-chain-evidence/verification-cache.sqlite3）")
+    parser.add_argument("--no-cache", action="store_true", help="停用驗證快取，重新掃描所有文件")
+    parser.add_argument("--changed-since", default=None, metavar="GIT_REV",
+                        help="只重新計算相對 GIT_REV 有變更或未被 git 追蹤的文件的雜湊")
+    args = parser.parse_args()
     
-    verifier = UltimateSupplyChainVerifier(repo_path)
+    verifier = UltimateSupplyChainVerifier(
+        args.repo_path, scan_rules=args.scan_rules, scan_workers=args.scan_workers,
+        use_cache=not args.no_cache, cache_path=args.cache, changed_since=args.changed_since
+    )
     
     try:
-        result = verifier.run_complete_verification()
+        result = verifier.run_complete_verification(max_workers=args.workers)
         
         print(f"\n{'='*80}")
         print(f"🛡️ MachineNativeOps 供應鏈驗證完成")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the supply-chain verifier's shared inventory and stage pool
+"""
+
+import importlib.util
+import json
+import pickle
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+VALIDATION_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(VALIDATION_DIR))
+
+from repository_inventory import RepositoryInventory
+
+
+def _load_verifier_module():
+    name = "supply_chain_complete_verifier"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            name, VALIDATION_DIR / "supply-chain-complete-verifier.py"
+        )
+        module = importlib.util.module_from_spec(spec)
+        # 註冊後工作函數才能按引用序列化到進程池
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+verifier_module = _load_verifier_module()
+
+
+@pytest.fixture
+def sample_repo(tmp_path):
+    (tmp_path / "deploy").mkdir()
+    (tmp_path / "deploy" / "app.yaml").write_text(
+        "apiVersion: apps/v1\n"
+        "kind: Deployment\n"
+        "metadata:\n"
+        "  name: app\n"
+        "spec:\n"
+        "  template:\n"
+        "    spec:\n"
+        "      containers:\n"
+        "        - name: app\n"
+        "          image: app:latest\n"
+    )
+    (tmp_path / "deploy" / "broken.yml").write_text("key: [unclosed\n")
+    (tmp_path / "config.json").write_text(json.dumps({"a": 1}))
+    (tmp_path / "bad.json").write_text("{not json")
+    (tmp_path / "main.py").write_text("print('hi')")
+    (tmp_path / "broken.py").write_text("def f(:\n")
+    (tmp_path / "package.json").write_text("{}\n")
+    (tmp_path / "requirements.txt").write_text("requests==2.31.0\n")
+    (tmp_path / "Makefile").write_text("all:\n\techo ok\n")
+    (tmp_path / "dist").mkdir()
+    (tmp_path / "dist" / "app.whl").write_bytes(b"wheel")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "skipped.json").write_text("{")
+    return tmp_path
+
+
+def _stage_data(repo_path: Path, workers: int, cache_path=None):
+    shutil.rmtree(repo_path / "outputs", ignore_errors=True)
+    verifier = verifier_module.UltimateSupplyChainVerifier(
+        str(repo_path), scan_workers=0, use_cache=cache_path is not None,
+        cache_path=str(cache_path) if cache_path else None
+    )
+    verifier.run_complete_verification(max_workers=workers)
+    return {e.stage: e.data for e in verifier.evidence_chain if e.stage in (1, 2, 3)}
+
+
+class TestRepositoryInventory:
+    def test_walk_skips_excluded_dirs(self, sample_repo):
+        inventory = RepositoryInventory(str(sample_repo))
+
+        rels = {entry.rel for entry in inventory.with_suffix('.json')}
+        assert rels == {"config.json", "bad.json", "package.json"}
+
+    def test_content_read_once(self, sample_repo):
+        inventory = RepositoryInventory(str(sample_repo))
+        entry = inventory.get("deploy/app.yaml")
+
+        first = inventory.yaml_documents(entry)
+        second = inventory.yaml_documents(entry)
+
+        assert first == second
+        assert inventory.cache.reads == 1
+
+    def test_picklable_for_stage_pool(self, sample_repo):
+        inventory = RepositoryInventory(str(sample_repo))
+        clone = pickle.loads(pickle.dumps(inventory))
+
+        assert [e.rel for e in clone.with_suffix('.py')] == [e.rel for e in inventory.with_suffix('.py')]
+
+
+class TestStagePool:
+    def test_worker_function_is_picklable(self):
+        # 否則 _run_stages 會回退為依次執行，下面的比較便失去意義
+        pickle.dumps(verifier_module._collect_stages_in_worker)
+
+    @pytest.mark.parametrize("workers", [2, 4])
+    def test_parallel_matches_sequential(self, sample_repo, workers):
+        sequential = _stage_data(sample_repo, 0)
+        parallel = _stage_data(sample_repo, workers)
+
+        assert set(sequential) == {1, 2, 3}
+        assert parallel == sequential
+
+    def test_evidence_recorded_in_stage_order(self, sample_repo):
+        shutil.rmtree(sample_repo / "outputs", ignore_errors=True)
+        verifier = verifier_module.UltimateSupplyChainVerifier(
+            str(sample_repo), scan_workers=0, use_cache=False
+        )
+        verifier.run_complete_verification(max_workers=3)
+
+        assert [e.stage for e in verifier.evidence_chain] == sorted(verifier_module.STAGE_SPECS)
+
+
+class TestStageCache:
+    CHECKS = ('_lint_yaml_file', '_lint_json_file', '_lint_python_file', '_k8s_file_resources')
+
+    def _collect(self, repo_path: Path, cache_path: Path):
+        verifier = verifier_module.UltimateSupplyChainVerifier(str(repo_path), cache_path=str(cache_path))
+        checked = []
+        for name in self.CHECKS:
+            check = getattr(verifier, name)
+            setattr(verifier, name, lambda entry, check=check: checked.append(entry.rel) or check(entry))
+        return {stage: verifier._collect_stage(stage) for stage in (1, 2)}, checked
+
+    def test_reruns_only_check_changed_files(self, sample_repo, tmp_path):
+        cache_path = tmp_path / "cache.sqlite3"
+        cold, cold_checked = self._collect(sample_repo, cache_path)
+        assert len(cold_checked) == 9
+
+        warm, warm_checked = self._collect(sample_repo, cache_path)
+        assert warm_checked == []
+        assert warm == cold
+
+        (sample_repo / "main.py").write_text("def f(:\n")
+        changed, changed_checked = self._collect(sample_repo, cache_path)
+        assert changed_checked == ["main.py"]
+        uncached = _stage_data(sample_repo, 0)
+        assert changed == {stage: uncached[stage] for stage in (1, 2)}
+
+    def test_cached_parallel_run_matches_uncached(self, sample_repo, tmp_path):
+        uncached = _stage_data(sample_repo, 0)
+
+        assert _stage_data(sample_repo, 2, tmp_path / "cache.sqlite3") == uncached
+        assert _stage_data(sample_repo, 2, tmp_path / "cache.sqlite3") == uncached
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the supply-chain verification cache and --changed-since mode
+"""
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+VALIDATION_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(VALIDATION_DIR))
+
+from repository_inventory import RepositoryInventory
+from verification_cache import VerificationCache, git_unchanged_blobs
+
+
+def _load_verifier_module():
+    name = "supply_chain_complete_verifier"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            name, VALIDATION_DIR / "supply-chain-complete-verifier.py"
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+verifier_module = _load_verifier_module()
+
+CLEAN = "def handler():\n    return 'ok'\n"
+LEAKED = "def handler():\n    return 'AKIAQWERTYUIOPASDFGHJ'\n"
+
+
+def _git(repo: Path, *args: str) -> str:
+    completed = subprocess.run(
+        ['git', '-c', 'user.name=ci', '-c', 'user.email=ci@localhost', '-C', str(repo), *args],
+        capture_output=True, check=True, text=True
+    )
+    return completed.stdout.strip()
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / ".gitignore").write_text("outputs/\n")
+    (repo / "app.py").write_text(CLEAN)
+    _git(repo, 'init', '-q', '-b', 'master')
+    _git(repo, 'add', '.')
+    _git(repo, 'commit', '-q', '-m', 'initial')
+    return repo
+
+
+def _secrets(repo: Path, cache_path: Path, changed_since: str):
+    verifier = verifier_module.UltimateSupplyChainVerifier(
+        str(repo), scan_workers=0, cache_path=str(cache_path), changed_since=changed_since
+    )
+    return [finding['file'] for finding in verifier._scan_secrets()]
+
+
+class TestGitUnchangedBlobs:
+    def test_maps_unchanged_files_to_blob_ids(self, git_repo):
+        blobs = git_unchanged_blobs(str(git_repo), 'HEAD')
+
+        assert blobs['app.py'] == _git(git_repo, 'rev-parse', 'HEAD:app.py')
+
+    def test_excludes_modified_and_untracked(self, git_repo):
+        (git_repo / "app.py").write_text(LEAKED)
+        (git_repo / "new.py").write_text(CLEAN)
+
+        blobs = git_unchanged_blobs(str(git_repo), 'HEAD')
+
+        assert 'app.py' not in blobs
+        assert 'new.py' not in blobs
+
+    def test_invalid_rev(self, git_repo):
+        assert git_unchanged_blobs(str(git_repo), 'no-such-rev') is None
+
+
+class TestVerificationCache:
+    def test_stat_keyed_digest(self, git_repo, tmp_path):
+        cache = VerificationCache(str(tmp_path / "cache.sqlite3"))
+        entry = RepositoryInventory(str(git_repo)).get("app.py")
+
+        first = cache.content_digest(entry)
+        second = cache.content_digest(entry)
+
+        assert first == second
+        assert cache.stats.hashed_files == 1
+
+    def test_blob_keyed_digest_ignores_other_versions(self, git_repo, tmp_path):
+        cache = VerificationCache(str(tmp_path / "cache.sqlite3"))
+        clean = cache.content_digest(RepositoryInventory(str(git_repo)).get("app.py"))
+
+        (git_repo / "app.py").write_text(LEAKED)
+        entry = RepositoryInventory(str(git_repo)).get("app.py")
+        leaked = cache.content_digest(entry, blob="0" * 40)
+
+        assert leaked != clean
+        assert cache.content_digest(entry, blob="0" * 40) == leaked
+        assert cache.stats.trusted_files == 1
+
+
+class TestChangedSince:
+    def test_branch_switch(self, git_repo, tmp_path):
+        cache_path = tmp_path / "cache.sqlite3"
+        assert _secrets(git_repo, cache_path, None) == []
+
+        _git(git_repo, 'checkout', '-q', '-b', 'feature')
+        (git_repo / "app.py").write_text(LEAKED)
+        _git(git_repo, 'commit', '-q', '-am', 'leak')
+        assert _secrets(git_repo, cache_path, 'HEAD') == ['app.py']
+
+        _git(git_repo, 'checkout', '-q', 'master')
+        assert _secrets(git_repo, cache_path, 'master') == []
+
+        _git(git_repo, 'checkout', '-q', 'feature')
+        assert _secrets(git_repo, cache_path, 'feature') == ['app.py']
+
+    def test_uncommitted_change_is_rehashed(self, git_repo, tmp_path):
+        cache_path = tmp_path / "cache.sqlite3"
+        assert _secrets(git_repo, cache_path, 'HEAD') == []
+
+        (git_repo / "app.py").write_text(LEAKED)
+        assert _secrets(git_repo, cache_path, 'HEAD') == ['app.py']
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+驗證結果快取 - Verification Cache
+
+供應鏈驗證的持久化逐文件結果快取（SQLite）：
+- 結果以 (驗證器, 驗證器版本, 規則集雜湊, 內容雜湊, 文件名) 為鍵，
+  規則或驗證器版本變更時自動失效
+- 內容雜湊按 (路徑, mtime, 大小) 記憶，未修改的文件不再讀取
+- --changed-since 模式下，git 追蹤且未變更的文件按 git blob id 查找已記錄的雜湊；
+  blob id 唯一決定內容，切換分支或版本後不會沿用其他版本的雜湊
+"""
+
+import hashlib
+import json
+import sqlite3
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from repository_inventory import FileEntry
+
+SCHEMA_VERSION = 2
+
+
+@dataclass(frozen=True)
+class CacheNamespace:
+    """快取命名空間：同一驗證器、版本與規則集的結果共用"""
+    validator: str
+    version: str
+    rules_digest: str
+
+
+@dataclass
+class CacheStats:
+    """快取統計"""
+    hits: int = 0
+    misses: int = 0
+    hashed_files: int = 0
+    trusted_files: int = 0
+
+
+class VerificationCache:
+    """
+    持久化驗證快取
+
+    Example:
+        cache = VerificationCache("outputs/supply-chain-evidence/verification-cache.sqlite3")
+        namespace = CacheNamespace("scan_engine", "1", rule_set.digest)
+        digest = cache.content_digest(entry)
+        findings = cache.get(namespace, digest, entry.name)
+        if findings is None:
+            findings = scan(entry)
+            cache.put(namespace, digest, entry.name, findings)
+        cache.commit()
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stats = CacheStats()
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.executescript("""
+                DROP TABLE IF EXISTS file_digests;
+                DROP TABLE IF EXISTS blob_digests;
+                DROP TABLE IF EXISTS results;
+            """)
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS file_digests (
+                path     TEXT PRIMARY KEY,
+                size     INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest   TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS blob_digests (
+                blob   TEXT PRIMARY KEY,
+                digest TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                validator    TEXT NOT NULL,
+                version      TEXT NOT NULL,
+                rules_digest TEXT NOT NULL,
+                digest       TEXT NOT NULL,
+                name         TEXT NOT NULL,
+                payload      TEXT NOT NULL,
+                PRIMARY KEY (validator, version, rules_digest, digest, name)
+            );
+            PRAGMA user_version = {SCHEMA_VERSION};
+        """)
+        self._conn.commit()
+
+    # ----- 內容雜湊 -----
+
+    def content_digest(self, entry: FileEntry, blob: Optional[str] = None) -> str:
+        """
+        文件內容的 SHA-256
+
+        Args:
+            entry: 文件
+            blob: 文件內容對應的 git blob id（git 追蹤且相對 --changed-since 版本未變更）；
+                給出時按 blob id 查找已記錄的雜湊，不比較 stat
+        """
+        if blob is not None:
+            row = self._conn.execute(
+                "SELECT digest FROM blob_digests WHERE blob = ?", (blob,)
+            ).fetchone()
+            if row is not None:
+                self.stats.trusted_files += 1
+                return row[0]
+        else:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, digest FROM file_digests WHERE path = ?", (entry.path,)
+            ).fetchone()
+            if row is not None and row[0] == entry.size and row[1] == entry.mtime_ns:
+                return row[2]
+
+        sha = hashlib.sha256()
+        with open(entry.path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(block)
+        digest = sha.hexdigest()
+        self.stats.hashed_files += 1
+        self._conn.execute(
+            "INSERT OR REPLACE INTO file_digests (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+            (entry.path, entry.size, entry.mtime_ns, digest)
+        )
+        if blob is not None:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blob_digests (blob, digest) VALUES (?, ?)", (blob, digest)
+            )
+        return digest
+
+    # ----- 結果 -----
+
+    def get(self, namespace: CacheNamespace, digest: str, name: str) -> Optional[Any]:
+        """讀取快取結果（未命中返回 None）"""
+        row = self._conn.execute(
+            "SELECT payload FROM results WHERE validator = ? AND version = ? AND rules_digest = ? "
+            "AND digest = ? AND name = ?",
+            (namespace.validator, namespace.version, namespace.rules_digest, digest, name)
+        ).fetchone()
+        if row is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return json.loads(row[0])
+
+    def put(self, namespace: CacheNamespace, digest: str, name: str, payload: Any) -> None:
+        """寫入結果（payload 需可 JSON 序列化）"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (validator, version, rules_digest, digest, name, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (namespace.validator, namespace.version, namespace.rules_digest, digest, name,
+             json.dumps(payload, ensure_ascii=False))
+        )
+
+    def prune(self, namespace: CacheNamespace) -> int:
+        """刪除同一驗證器其他版本或規則集的結果，返回刪除行數"""
+        cursor = self._conn.execute(
+            "DELETE FROM results WHERE validator = ? AND (version != ? OR rules_digest != ?)",
+            (namespace.validator, namespace.version, namespace.rules_digest)
+        )
+        return cursor.rowcount
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+
+def git_unchanged_blobs(repo_path: str, rev: str) -> Optional[Dict[str, str]]:
+    """
+    git 追蹤且相對 rev 沒有變更（含未提交修改）的文件及其在 rev 中的 blob id
+
+    工作區內容與 rev 中的 blob 相同，blob id 因此可以代替內容雜湊作為快取鍵。
+
+    Returns:
+        相對 repo_path 的 POSIX 路徑到 blob id 的映射；不是 git 倉庫或 rev 無效時返回 None
+    """
+    def run(*args: str) -> List[str]:
+        completed = subprocess.run(['git', '-C', repo_path, *args], capture_output=True, check=True)
+        return [item for item in completed.stdout.decode('utf-8', 'surrogateescape').split('\0') if item]
+
+    try:
+        tree = run('ls-tree', '-r', '-z', rev)
+        changed = set(run('diff', '--name-only', '-z', '--relative', '--no-renames', rev, '--'))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    blobs: Dict[str, str] = {}
+    for item in tree:
+        # <mode> SP <type> SP <object> TAB <path>
+        meta, path = item.split('\t', 1)
+        _, kind, blob = meta.split(' ')
+        if kind == 'blob' and path not in changed:
+            blobs[path] = blob
+    return blobs
@@ -2,6 +2,7 @@
 Phase 13 Tests: Deep Verifiable YAML Module System
 """
 
+import multiprocessing
 import pytest
 from datetime import datetime
 from typing import Dict, Any
@@ -36,6 +37,10 @@ from core.yaml_module_system.policy_gate import (
     PolicyViolation,
     PolicyEvaluationResult,
 )
+from core.yaml_module_system.validation_plan import (
+    ValidationPlan,
+    ModuleValidationResult,
+)
 from core.yaml_module_system.ci_verification_pipeline import (
     CIVerificationPipeline,
     PipelineStage,
@@ -316,6 +321,136 @@ class TestPolicyGate:
         assert result.passed
 
 
+# ============ Validation Plan Tests ============
+
+class TestValidationPlan:
+    """Test fused schema + policy Validation Plan"""
+    
+    SCHEMA = {
+        "type": "object",
+        "required": ["name", "version"],
+        "additionalProperties": False,
+        "properties": {
+            "name": {"type": "string", "pattern": "^[a-z-]+$"},
+            "version": {"type": "string", "format": "semver"},
+            "debug": {"type": "boolean"},
+            "owner": {"type": "object", "properties": {"team": {"type": "string"}}},
+            "endpoints": {"type": "array", "items": {"type": "string", "format": "uri"}},
+            "authentication": {"type": "object"},
+            "description": {"type": "string"},
+        }
+    }
+    
+    def _gate(self) -> PolicyGate:
+        gate = PolicyGate()
+        for rule in PolicyGate.create_default_security_rules() + PolicyGate.create_default_compliance_rules():
+            gate.add_rule(rule)
+        gate.add_rule(PolicyRule(
+            id="ep-001",
+            name="First Endpoint HTTPS",
+            description="First endpoint must use HTTPS",
+            severity=PolicySeverity.LOW,
+            category=PolicyCategory.SECURITY,
+            action=PolicyAction.WARN,
+            condition="matches endpoints.0 ^https://",
+        ))
+        return gate
+    
+    def _modules(self) -> Dict[str, Any]:
+        return {
+            "valid": {"name": "payments", "version": "1.2.0", "debug": False,
+                      "owner": {"team": "core"}, "endpoints": ["https://a.example.com"],
+                      "authentication": {"enabled": True}, "description": "d"},
+            "invalid": {"name": "Bad", "version": "x", "debug": True, "extra": 1,
+                        "endpoints": ["http://a.example.com", 3], "secrets": {"plaintext": "p"}},
+            "empty": {},
+            "scalar": "not-a-module",
+        }
+    
+    def test_matches_separate_evaluation(self):
+        """Test fused results equal YAMLSchemaValidator + PolicyGate results"""
+        validator = YAMLSchemaValidator()
+        gate = self._gate()
+        gate.add_exception("sec-003", "invalid", "Debug allowed", "admin")
+        plan = ValidationPlan(self.SCHEMA, gate, validator)
+        
+        for module_id, data in self._modules().items():
+            fused = plan.validate(data, module_id)
+            schema_result = validator.validate(data, self.SCHEMA)
+            policy_result = gate.evaluate(data, module_id)
+            
+            assert isinstance(fused, ModuleValidationResult)
+            assert [(e.path, e.error_type) for e in fused.schema.errors] == \
+                [(e.path, e.error_type) for e in schema_result.errors]
+            assert [v.rule_id for v in fused.policy.violations] == [v.rule_id for v in policy_result.violations]
+            assert [w.rule_id for w in fused.policy.warnings] == [w.rule_id for w in policy_result.warnings]
+            assert fused.policy.evaluated_rules == policy_result.evaluated_rules
+            assert fused.passed == (schema_result.valid and policy_result.passed)
+    
+    def test_validate_many(self):
+        """Test batch validation in a process pool"""
+        plan = ValidationPlan(self.SCHEMA, self._gate())
+        modules = self._modules()
+        
+        results = plan.validate_many(modules, workers=2, parallel_threshold=1)
+        
+        assert list(results) == list(modules)
+        assert results["valid"].passed
+        assert not results["invalid"].passed
+        serial = plan.validate(modules["invalid"], "invalid")
+        assert results["invalid"].schema.to_dict() == serial.schema.to_dict()
+        assert [v.rule_id for v in results["invalid"].policy.violations] == \
+            [v.rule_id for v in serial.policy.violations]
+
+    def test_validate_many_spawn(self):
+        """Test batch validation with spawned workers (plan compiled from raw schema and rules)"""
+        gate = self._gate()
+        gate.add_exception("sec-003", "invalid", "Debug allowed", "admin")
+        plan = ValidationPlan(self.SCHEMA, gate)
+        plan.validate({}, "warm-up")  # 條件快取中的閉包不可序列化
+        modules = self._modules()
+
+        results = plan.validate_many(modules, workers=2, parallel_threshold=1,
+                                     mp_context=multiprocessing.get_context("spawn"))
+
+        assert list(results) == list(modules)
+        for module_id, data in modules.items():
+            assert results[module_id].to_dict()["schema"] == plan.validate(data, module_id).to_dict()["schema"]
+            assert [v.rule_id for v in results[module_id].policy.violations] == \
+                [v.rule_id for v in plan.validate(data, module_id).policy.violations]
+            assert [w.rule_id for w in results[module_id].policy.warnings] == \
+                [w.rule_id for w in plan.validate(data, module_id).policy.warnings]
+            assert results[module_id].policy.evaluated_rules == \
+                plan.validate(data, module_id).policy.evaluated_rules
+        # sec-002 的 validator 為 lambda，在主進程評估
+        assert "sec-002" in [v.rule_id for v in results["invalid"].policy.violations]
+        assert "sec-003" not in [v.rule_id for v in results["invalid"].policy.violations]
+
+    def test_excepted_rules_not_evaluated(self):
+        """Test predicates of excepted rules are skipped like in PolicyGate"""
+        gate = PolicyGate()
+        gate.add_rule(PolicyRule(
+            id="rep-001",
+            name="Replicas Positive",
+            description="Replicas must be positive",
+            severity=PolicySeverity.HIGH,
+            category=PolicyCategory.COMPLIANCE,
+            action=PolicyAction.BLOCK,
+            condition="greater_than spec.replicas 0",
+        ))
+        gate.add_exception("rep-001", "legacy", "Autoscaled", "admin")
+        plan = ValidationPlan(gate=gate)
+        data = {"spec": {"replicas": "auto"}}
+
+        fused = plan.validate(data, "legacy")
+        policy_result = gate.evaluate(data, "legacy")
+
+        assert fused.policy.passed and policy_result.passed
+        assert fused.policy.evaluated_rules == policy_result.evaluated_rules == 0
+        with pytest.raises(ValueError):
+            plan.validate(data, "payments")
+
+
 # ============ CI Verification Pipeline Tests ============
 
 class TestCIVerificationPipeline:
@@ -13,11 +13,14 @@
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Any, Optional, Callable
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Callable
 from datetime import datetime
 import asyncio
 import uuid
 
+if TYPE_CHECKING:
+    from ..safety.resilience import ResilienceRegistry
+
 
 class ConnectorType(Enum):
     """連接器類型"""
@@ -129,8 +132,16 @@ class ConnectorManager:
     - 連接器提供與真實世界的橋樑
     """
     
-    def __init__(self):
-        """初始化連接器管理器"""
+    def __init__(self, resilience: Optional["ResilienceRegistry"] = None):
+        """
+        初始化連接器管理器
+        
+        Args:
+            resilience: 可選的韌性防護註冊表（每個連接器一組斷路器、並發限制與重試預算）
+        """
+        
+        # 每個連接器的斷路器 / 並發限制
+        self._resilience = resilience
         
         # 連接器存儲
         self._connectors: Dict[str, Connector] = {}
@@ -406,6 +417,16 @@ class ConnectorManager:
                 "error": f"Connector not connected: {name}",
             }
         
+        guard = self._resilience.get(name) if self._resilience else None
+        if guard is not None:
+            rejection = guard.try_acquire()
+            if rejection is not None:
+                return {
+                    "success": False,
+                    "error": f"Connector call rejected ({rejection}): {name}",
+                    "rejected": rejection,
+                }
+        
         start_time = datetime.now()
         
         try:
@@ -415,6 +436,8 @@ class ConnectorManager:
             # 更新統計
             end_time = datetime.now()
             latency_ms = (end_time - start_time).total_seconds() * 1000
+            if guard is not None:
+                guard.release(latency_ms / 1000)
             
             connector.total_requests += 1
             connector.successful_requests += 1
@@ -435,6 +458,8 @@ class ConnectorManager:
             }
             
         except Exception as e:
+            if guard is not None:
+                guard.release((datetime.now() - start_time).total_seconds(), error=e)
             connector.total_requests += 1
             connector.failed_requests += 1
             connector.last_error = str(e)
@@ -553,8 +578,16 @@ class ConnectorManager:
                 round(successful_requests / total_requests, 4) * 100
                 if total_requests > 0 else 0
             ),
+            "resilience": self.get_resilience_metrics(),
         }
     
+    def get_resilience_metrics(self) -> Dict[str, Dict[str, float]]:
+        """獲取每個連接器的斷路器 / 並發限制指標"""
+        
+        if self._resilience is None:
+            return {}
+        return self._resilience.get_metrics()
+    
     def register_factory(
         self,
         connector_type: ConnectorType,
@@ -176,12 +176,15 @@ Last Updated: 2025-12-12
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
 from datetime import datetime
 import uuid
 import json
 import asyncio
 
+if TYPE_CHECKING:
+    from ..safety.resilience import ResilienceRegistry
+
 
 class FunctionCallStatus(Enum):
     """
@@ -1163,17 +1166,25 @@ class ToolCallRouter:
         - FunctionCallHandler: Basic executor without routing
     """
 
-    def __init__(self):
+    def __init__(self, resilience: Optional["ResilienceRegistry"] = None):
         """
         Initialize an empty tool call router.
 
         Creates empty registries for executors and rules, with no default executor.
 
+        Args:
+            resilience: Optional per-executor guards (circuit breaker,
+                adaptive concurrency limit, retry budget). When set, every
+                routed call goes through the guard of its executor ID. Only
+                errors matching the guard's ``retry_on`` (transient
+                connection and timeout errors by default) are retried.
+
         初始化工具調用路由器。
         """
         self._executors: Dict[str, Any] = {}
         self._rules: List[RoutingRule] = []
         self._default_executor: Optional[str] = None
+        self._resilience = resilience
     
     def register_executor(
         self,
@@ -1208,15 +1219,24 @@ class ToolCallRouter:
         params: Dict[str, Any]
     ) -> Optional[Any]:
         """Route a tool call to the appropriate executor"""
+        executor_id = self._route_id(tool_name, params)
+        return self._executors[executor_id] if executor_id is not None else None
+    
+    def _route_id(
+        self,
+        tool_name: str,
+        params: Dict[str, Any]
+    ) -> Optional[str]:
+        """Resolve the executor ID for a tool call"""
         # Check rules in priority order
         for rule in self._rules:
             if rule.condition(tool_name, params):
                 if rule.executor_id in self._executors:
-                    return self._executors[rule.executor_id]
+                    return rule.executor_id
         
         # Use default executor
         if self._default_executor and self._default_executor in self._executors:
-            return self._executors[self._default_executor]
+            return self._default_executor
         
         return None
     
@@ -1226,11 +1246,26 @@ class ToolCallRouter:
         params: Dict[str, Any]
     ) -> Any:
         """Route and execute a tool call"""
-        executor = self.route(tool_name, params)
+        executor_id = self._route_id(tool_name, params)
         
-        if executor is None:
+        if executor_id is None:
             raise ValueError(f"No executor found for tool: {tool_name}")
         
+        executor = self._executors[executor_id]
+        if self._resilience is None:
+            return await self._invoke(executor, tool_name, params)
+        return await self._resilience.call(
+            executor_id,
+            lambda: self._invoke(executor, tool_name, params)
+        )
+    
+    async def _invoke(
+        self,
+        executor: Any,
+        tool_name: str,
+        params: Dict[str, Any]
+    ) -> Any:
+        """Invoke an executor"""
         # Execute based on executor type
         if hasattr(executor, 'execute'):
             if asyncio.iscoroutinefunction(executor.execute):
@@ -1252,6 +1287,12 @@ class ToolCallRouter:
     def list_rules(self) -> List[RoutingRule]:
         """List all routing rules"""
         return self._rules.copy()
+    
+    def get_executor_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-executor circuit breaker / concurrency limit metrics"""
+        if self._resilience is None:
+            return {}
+        return self._resilience.get_metrics()
 
 
 # Helper functions for creating common function definitions
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Gateway Middleware - 閘道中介層
+Response Cache, Request Coalescing, Micro-Batching and Rate Limiting
+
+ModelGateway 在把請求轉發給提供者之前依次經過：
+1. 精確匹配回應快取（正規化請求哈希、TTL、LRU、可選磁碟層）
+2. 單飛合併（相同的進行中請求只發送一次）
+3. 每模型令牌桶限速與並發限制
+4. 微批次（支援批次端點的提供者，在短時間窗內按模型合併請求）
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from .model_gateway import CompletionRequest, CompletionResponse
+
+T = TypeVar("T")
+
+
+def request_cache_key(request: "CompletionRequest", model: str) -> str:
+    """
+    正規化請求哈希
+
+    訊息內容去除首尾空白、鍵排序後序列化，模型使用解析後的 ID。
+    """
+    normalized = {
+        "model": model,
+        "messages": [
+            {key: value.strip() if isinstance(value, str) else value for key, value in sorted(m.items())}
+            for m in request.messages
+        ],
+        "temperature": round(request.temperature, 4),
+        "max_tokens": request.max_tokens,
+    }
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _copy_response(response: "CompletionResponse") -> "CompletionResponse":
+    return replace(response, usage=dict(response.usage))
+
+
+@dataclass
+class CacheStats:
+    """快取統計"""
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class ResponseCache:
+    """
+    回應快取
+
+    記憶體層為 LRU（OrderedDict），條目帶過期時間；可選磁碟層以 JSON 文件
+    保存，記憶體未命中時讀取並提升到記憶體層。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300.0,
+        disk_dir: str | Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, "CompletionResponse"]] = OrderedDict()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> "CompletionResponse | None":
+        """讀取未過期的快取回應"""
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return _copy_response(response)
+            del self._entries[key]
+
+        disk_entry = self._read_disk(key)
+        if disk_entry is not None and disk_entry[0] > now:
+            self._store(key, *disk_entry)
+            self.stats.disk_hits += 1
+            return _copy_response(disk_entry[1])
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, key: str, response: "CompletionResponse") -> None:
+        """寫入快取"""
+        expires_at = self._clock() + self.ttl_seconds
+        self._store(key, expires_at, _copy_response(response))
+        self._write_disk(key, expires_at, response)
+
+    def clear(self) -> None:
+        """清空記憶體層"""
+        self._entries.clear()
+
+    def _store(self, key: str, expires_at: float, response: "CompletionResponse") -> None:
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> "tuple[float, CompletionResponse] | None":
+        if self.disk_dir is None:
+            return None
+        from .model_gateway import CompletionResponse
+
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as f:
+                data = json.load(f)
+            return data["expires_at"], CompletionResponse(**data["response"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_disk(self, key: str, expires_at: float, response: "CompletionResponse") -> None:
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 先寫臨時文件再原子替換，避免讀到半寫入的條目
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"expires_at": expires_at, "response": asdict(response)}, f)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+
+class SingleFlight:
+    """
+    單飛合併
+
+    同一個鍵同時只執行一次；其他呼叫者等待並共享結果（或異常）。
+    """
+
+    def __init__(self):
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 沒有等待者時避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+
+
+class TokenBucket:
+    """
+    令牌桶限速
+
+    以 rate 個/秒補充令牌，最多累積 capacity 個；令牌不足時等待。
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """立即嘗試取得令牌"""
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """取得令牌，必要時等待（按到達順序）"""
+        async with self._lock:
+            while not self.try_acquire(tokens):
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class ModelLimiter:
+    """每模型並發限制與限速"""
+
+    def __init__(self, concurrency: int | None = None, bucket: TokenBucket | None = None):
+        self._semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+        self._bucket = bucket
+
+    async def __aenter__(self) -> "ModelLimiter":
+        if self._bucket is not None:
+            await self._bucket.acquire()
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+
+class MicroBatcher:
+    """
+    微批次
+
+    同一模型的請求在 window_seconds 內累積，達到 max_batch_size 或時間窗
+    結束時一次性送往批次端點，結果按順序分發給各呼叫者。
+    """
+
+    def __init__(
+        self,
+        submit_batch: Callable[[str, "list[CompletionRequest]"], "Awaitable[list[CompletionResponse]]"],
+        max_batch_size: int = 16,
+        window_seconds: float = 0.005,
+    ):
+        self._submit_batch = submit_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.window_seconds = window_seconds
+        self._pending: dict[str, list[tuple["CompletionRequest", asyncio.Future]]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.batches_sent = 0
+
+    async def submit(self, model: str, request: "CompletionRequest") -> "CompletionResponse":
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(model, [])
+        pending.append((request, future))
+
+        if len(pending) >= self.max_batch_size:
+            self._flush(model)
+        elif model not in self._timers:
+            self._timers[model] = loop.call_later(self.window_seconds, self._flush, model)
+        return await future
+
+    def _flush(self, model: str) -> None:
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(model, [])
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._send(model, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, model: str, batch: list[tuple["CompletionRequest", asyncio.Future]]) -> None:
+        self.batches_sent += 1
+        try:
+            responses = await self._submit_batch(model, [request for request, _ in batch])
+            if len(responses) != len(batch):
+                raise RuntimeError(
+                    f"Batch endpoint returned {len(responses)} responses for {len(batch)} requests"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
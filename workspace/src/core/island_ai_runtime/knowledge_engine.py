@@ -6,11 +6,19 @@ Repository Graph, Embeddings, and Vector Search
 提供代碼庫理解和語義搜索能力
 """
 
+import asyncio
 import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 
 class NodeType(Enum):
     """節點類型"""
@@ -72,11 +80,25 @@ class RepoGraph:
     倉庫圖
 
     建立代碼庫的圖結構表示。
+
+    邊按來源與目標各建一份鄰接表（節點 -> 邊類型 -> 邊），鄰居查詢只觸及
+    該節點自身的邊；k_hop 以廣度優先搜索配合已訪問集合做多跳遍歷。
     """
 
     def __init__(self):
         self.nodes: dict[str, GraphNode] = {}
-        self.edges: list[GraphEdge] = []
+        self._out: dict[str, dict[EdgeType, list[GraphEdge]]] = {}
+        self._in: dict[str, dict[EdgeType, list[GraphEdge]]] = {}
+        self._edge_count = 0
+
+    @property
+    def edges(self) -> list[GraphEdge]:
+        """所有邊"""
+        return [edge for by_type in self._out.values() for edges in by_type.values() for edge in edges]
+
+    @property
+    def edge_count(self) -> int:
+        return self._edge_count
 
     def add_node(self, node: GraphNode) -> None:
         """添加節點"""
@@ -84,23 +106,98 @@ class RepoGraph:
 
     def add_edge(self, edge: GraphEdge) -> None:
         """添加邊"""
-        self.edges.append(edge)
+        self._out.setdefault(edge.source_id, {}).setdefault(edge.edge_type, []).append(edge)
+        self._in.setdefault(edge.target_id, {}).setdefault(edge.edge_type, []).append(edge)
+        self._edge_count += 1
+
+    def remove_edges(self, node_id: str, edge_type: EdgeType | None = None) -> int:
+        """
+        刪除節點的出邊
+
+        Returns:
+            刪除的邊數
+        """
+        by_type = self._out.get(node_id)
+        if not by_type:
+            return 0
+        types = [edge_type] if edge_type is not None else list(by_type)
+        removed = 0
+        for t in types:
+            for edge in by_type.pop(t, []):
+                self._discard(self._in, edge.target_id, edge)
+                removed += 1
+        if not by_type:
+            del self._out[node_id]
+        self._edge_count -= removed
+        return removed
+
+    def remove_node(self, node_id: str) -> GraphNode | None:
+        """刪除節點及其所有出入邊"""
+        self.remove_edges(node_id)
+        for edges in self._in.pop(node_id, {}).values():
+            for edge in edges:
+                self._discard(self._out, edge.source_id, edge)
+                self._edge_count -= 1
+        return self.nodes.pop(node_id, None)
 
     def get_node(self, node_id: str) -> GraphNode | None:
         """獲取節點"""
         return self.nodes.get(node_id)
 
-    def get_neighbors(self, node_id: str, edge_type: EdgeType | None = None) -> list[GraphNode]:
-        """獲取鄰居節點"""
+    def get_neighbors(
+        self, node_id: str, edge_type: EdgeType | None = None, reverse: bool = False
+    ) -> list[GraphNode]:
+        """
+        獲取鄰居節點
+
+        Args:
+            node_id: 節點 ID
+            edge_type: 只跟隨此類型的邊
+            reverse: True 時返回指向此節點的來源節點
+        """
         neighbors = []
-        for edge in self.edges:
-            if edge.source_id == node_id:
-                if edge_type is None or edge.edge_type == edge_type:
-                    neighbor = self.nodes.get(edge.target_id)
-                    if neighbor:
-                        neighbors.append(neighbor)
+        for neighbor_id in self._adjacent(node_id, edge_type, reverse):
+            neighbor = self.nodes.get(neighbor_id)
+            if neighbor:
+                neighbors.append(neighbor)
         return neighbors
 
+    def k_hop(
+        self,
+        node_id: str,
+        depth: int,
+        edge_types: set[EdgeType] | None = None,
+        direction: str = "out",
+    ) -> dict[str, int]:
+        """
+        多跳遍歷（廣度優先）
+
+        Args:
+            node_id: 起始節點
+            depth: 最大跳數
+            edge_types: 只跟隨這些類型的邊（None 表示全部）
+            direction: "out"、"in" 或 "both"
+
+        Returns:
+            可達節點 ID -> 距離（不含起始節點）
+        """
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Invalid direction: {direction}")
+        distances = {node_id: 0}
+        frontier = [node_id]
+        for hop in range(1, depth + 1):
+            next_frontier = []
+            for current in frontier:
+                for neighbor_id in self._step(current, edge_types, direction):
+                    if neighbor_id not in distances:
+                        distances[neighbor_id] = hop
+                        next_frontier.append(neighbor_id)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        del distances[node_id]
+        return distances
+
     def to_dict(self) -> dict[str, Any]:
         """轉換為字典"""
         return {
@@ -114,6 +211,37 @@ class RepoGraph:
             ],
         }
 
+    def _adjacent(self, node_id: str, edge_type: EdgeType | None, reverse: bool) -> list[str]:
+        by_type = (self._in if reverse else self._out).get(node_id, {})
+        edge_lists = [by_type.get(edge_type, [])] if edge_type is not None else by_type.values()
+        attr = "source_id" if reverse else "target_id"
+        return [getattr(edge, attr) for edges in edge_lists for edge in edges]
+
+    def _step(self, node_id: str, edge_types: set[EdgeType] | None, direction: str) -> list[str]:
+        result = []
+        for reverse in {"out": (False,), "in": (True,), "both": (False, True)}[direction]:
+            if edge_types is None:
+                result.extend(self._adjacent(node_id, None, reverse))
+            else:
+                for edge_type in edge_types:
+                    result.extend(self._adjacent(node_id, edge_type, reverse))
+        return result
+
+    @staticmethod
+    def _discard(index: dict[str, dict[EdgeType, list[GraphEdge]]], node_id: str, edge: GraphEdge) -> None:
+        by_type = index.get(node_id)
+        if not by_type:
+            return
+        edges = by_type.get(edge.edge_type, [])
+        for i, candidate in enumerate(edges):
+            if candidate is edge:
+                del edges[i]
+                break
+        if not edges:
+            by_type.pop(edge.edge_type, None)
+        if not by_type:
+            del index[node_id]
+
 
 class EmbeddingProvider:
     """
@@ -161,47 +289,273 @@ class VectorStore:
     向量存儲
 
     存儲和搜索向量嵌入。
+
+    向量以預先歸一化的 float32 行保存在連續矩陣中，刪除的行進入空閒列表
+    供重用；搜索是一次矩陣乘法加 argpartition 取 top-k。語料較大時可建立
+    IVF 粗量化分區（build_ivf），只掃描最接近查詢的若干分區。索引可保存為
+    .npy 文件並以記憶體映射方式載入，熱啟動時無需重新嵌入。
     """
 
-    def __init__(self):
-        self.vectors: dict[str, list[float]] = {}
+    _VECTORS_FILE = "vectors.npy"
+    _NORMS_FILE = "norms.npy"
+    _CENTROIDS_FILE = "centroids.npy"
+    _ASSIGNMENTS_FILE = "assignments.npy"
+    _META_FILE = "index.json"
+
+    def __init__(self, dimension: int | None = None, initial_capacity: int = 1024):
+        self.dimension = dimension
         self.metadata: dict[str, dict[str, Any]] = {}
+        self._capacity = max(1, initial_capacity)
+        self._matrix: np.ndarray | None = None  # (capacity, dimension), 歸一化行
+        self._norms = np.zeros(self._capacity, dtype=np.float32)
+        self._active = np.zeros(self._capacity, dtype=bool)
+        self._ids: list[str | None] = []
+        self._rows: dict[str, int] = {}
+        self._free: list[int] = []
+        # IVF 粗量化
+        self._centroids: np.ndarray | None = None
+        self._assignments = np.full(self._capacity, -1, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._rows
+
+    @property
+    def vectors(self) -> dict[str, list[float]]:
+        """以 id -> 原始向量 的字典形式返回所有向量"""
+        return {id: self.get_vector(id) for id in self._rows}
+
+    @property
+    def has_ivf(self) -> bool:
+        return self._centroids is not None
+
+    def get_vector(self, id: str) -> list[float] | None:
+        """獲取原始（未歸一化）向量"""
+        row = self._rows.get(id)
+        if row is None or self._matrix is None:
+            return None
+        return (self._matrix[row] * self._norms[row]).tolist()
 
     def upsert(self, id: str, vector: list[float], metadata: dict[str, Any] | None = None) -> None:
         """插入或更新向量"""
-        self.vectors[id] = vector
+        array = np.asarray(vector, dtype=np.float32)
+        if self.dimension is None:
+            self.dimension = int(array.shape[0])
+        if array.shape != (self.dimension,):
+            raise ValueError(
+                f"Vector dimension {array.shape[-1]} does not match store dimension {self.dimension}"
+            )
+
+        row = self._rows.get(id)
+        if row is None:
+            row = self._allocate_row()
+            self._rows[id] = row
+            self._ids[row] = id
+
+        norm = float(np.linalg.norm(array))
+        self._matrix[row] = array / norm if norm > 0 else 0.0
+        self._norms[row] = norm
+        self._active[row] = True
+        if self._centroids is not None:
+            self._assignments[row] = int(np.argmax(self._centroids @ self._matrix[row]))
         self.metadata[id] = metadata or {}
 
     def delete(self, id: str) -> None:
         """刪除向量"""
-        self.vectors.pop(id, None)
+        row = self._rows.pop(id, None)
         self.metadata.pop(id, None)
+        if row is None:
+            return
+        self._ids[row] = None
+        self._active[row] = False
+        self._assignments[row] = -1
+        self._free.append(row)
+
+    def search(
+        self, query_vector: list[float], top_k: int = 10, n_probe: int | None = None
+    ) -> list[tuple[str, float]]:
+        """
+        搜索最相似的向量
+
+        Args:
+            query_vector: 查詢向量
+            top_k: 返回結果數
+            n_probe: 建立 IVF 後掃描的分區數（None 表示精確搜索）
+        """
+        return self.search_many([query_vector], top_k, n_probe)[0]
+
+    def search_many(
+        self, queries: list[list[float]], top_k: int = 10, n_probe: int | None = None
+    ) -> list[list[tuple[str, float]]]:
+        """批量搜索：所有查詢共用一次矩陣乘法"""
+        if not queries:
+            return []
+        if not self._rows or top_k <= 0:
+            return [[] for _ in queries]
+
+        q = self._normalize_queries(queries)
+        used = len(self._ids)
+
+        if n_probe is not None and self._centroids is not None:
+            return [self._search_ivf(q[i], top_k, n_probe) for i in range(len(q))]
+
+        scores = q @ self._matrix[:used].T
+        scores[:, ~self._active[:used]] = -np.inf
+        return [self._top_k(scores[i], np.arange(used), top_k) for i in range(len(q))]
+
+    def build_ivf(self, n_lists: int | None = None, n_iter: int = 10, seed: int = 0) -> None:
+        """
+        建立 IVF 粗量化分區（球面 k-means）
+
+        Args:
+            n_lists: 分區數，預設為 sqrt(向量數)
+            n_iter: k-means 迭代次數
+            seed: 初始中心的隨機種子
+        """
+        rows = np.flatnonzero(self._active[: len(self._ids)])
+        if len(rows) == 0:
+            self._centroids = None
+            return
+
+        n_lists = min(len(rows), n_lists or max(1, int(np.sqrt(len(rows)))))
+        data = self._matrix[rows]
+        rng = np.random.default_rng(seed)
+        centroids = data[rng.choice(len(rows), size=n_lists, replace=False)].copy()
+
+        for _ in range(n_iter):
+            assignment = np.argmax(data @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = data[assignment == c]
+                if len(members):
+                    center = members.sum(axis=0)
+                    norm = np.linalg.norm(center)
+                    if norm > 0:
+                        centroids[c] = center / norm
+
+        self._centroids = centroids.astype(np.float32)
+        self._assignments[:] = -1
+        self._assignments[rows] = np.argmax(data @ self._centroids.T, axis=1)
+
+    def save(self, directory: str | Path) -> None:
+        """將索引保存為 .npy 文件（僅保存有效行）"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        rows = np.flatnonzero(self._active[: len(self._ids)])
+        dimension = self.dimension or 0
+        matrix = self._matrix[rows] if self._matrix is not None else np.zeros((0, dimension), np.float32)
+
+        np.save(directory / self._VECTORS_FILE, matrix)
+        np.save(directory / self._NORMS_FILE, self._norms[rows])
+        np.save(directory / self._ASSIGNMENTS_FILE, self._assignments[rows])
+        centroids_path = directory / self._CENTROIDS_FILE
+        if self._centroids is not None:
+            np.save(centroids_path, self._centroids)
+        elif centroids_path.exists():
+            centroids_path.unlink()
+
+        ids = [self._ids[row] for row in rows]
+        with open(directory / self._META_FILE, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "dimension": self.dimension,
+                    "ids": ids,
+                    "metadata": [self.metadata.get(id, {}) for id in ids],
+                },
+                f,
+            )
 
-    def search(self, query_vector: list[float], top_k: int = 10) -> list[tuple[str, float]]:
-        """搜索最相似的向量"""
-        scores = []
-        for id, vector in self.vectors.items():
-            score = self._cosine_similarity(query_vector, vector)
-            scores.append((id, score))
-
-        # 按分數排序
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:top_k]
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "VectorStore":
+        """
+        從 .npy 文件載入索引
+
+        Args:
+            directory: save() 寫入的目錄
+            mmap: 以寫時複製的記憶體映射方式載入矩陣，避免一次讀入全部數據
+        """
+        directory = Path(directory)
+        with open(directory / cls._META_FILE, encoding="utf-8") as f:
+            meta = json.load(f)
+
+        mmap_mode = "c" if mmap else None
+        matrix = np.load(directory / cls._VECTORS_FILE, mmap_mode=mmap_mode)
+        ids = meta["ids"]
+
+        store = cls(dimension=meta["dimension"], initial_capacity=max(len(ids), 1))
+        store._matrix = matrix if len(ids) else None
+        count = len(ids)
+        store._norms[:count] = np.load(directory / cls._NORMS_FILE)
+        store._active[:count] = True
+        store._assignments[:count] = np.load(directory / cls._ASSIGNMENTS_FILE)
+        store._ids = list(ids)
+        store._rows = {id: row for row, id in enumerate(ids)}
+        store.metadata = dict(zip(ids, meta["metadata"]))
+        centroids_path = directory / cls._CENTROIDS_FILE
+        if centroids_path.exists():
+            store._centroids = np.load(centroids_path)
+        return store
+
+    def _allocate_row(self) -> int:
+        if self._free:
+            return self._free.pop()
+        row = len(self._ids)
+        self._ids.append(None)
+        if self._matrix is None or row >= len(self._matrix):
+            self._grow(max(self._capacity, row + 1))
+        return row
+
+    def _grow(self, minimum: int) -> None:
+        """擴容（倍增），同時將記憶體映射的矩陣轉為普通陣列"""
+        capacity = self._capacity
+        while capacity < minimum or (self._matrix is not None and capacity <= len(self._matrix)):
+            capacity *= 2
+        matrix = np.zeros((capacity, self.dimension), dtype=np.float32)
+        used = 0 if self._matrix is None else len(self._matrix)
+        if used:
+            matrix[:used] = self._matrix
+        self._matrix = matrix
+        self._norms = self._resize(self._norms, capacity, 0)
+        self._active = self._resize(self._active, capacity, False)
+        self._assignments = self._resize(self._assignments, capacity, -1)
+        self._capacity = capacity
 
     @staticmethod
-    def _cosine_similarity(a: list[float], b: list[float]) -> float:
-        """計算餘弦相似度"""
-        if len(a) != len(b):
-            return 0.0
-
-        dot_product = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5
-        norm_b = sum(x * x for x in b) ** 0.5
-
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-
-        return dot_product / (norm_a * norm_b)
+    def _resize(array: np.ndarray, capacity: int, fill: Any) -> np.ndarray:
+        if len(array) >= capacity:
+            return array
+        resized = np.full(capacity, fill, dtype=array.dtype)
+        resized[: len(array)] = array
+        return resized
+
+    def _normalize_queries(self, queries: list[list[float]]) -> np.ndarray:
+        q = np.asarray(queries, dtype=np.float32)
+        if q.ndim != 2 or q.shape[1] != self.dimension:
+            raise ValueError(f"Query dimension does not match store dimension {self.dimension}")
+        norms = np.linalg.norm(q, axis=1, keepdims=True)
+        return np.divide(q, norms, out=np.zeros_like(q), where=norms > 0)
+
+    def _search_ivf(self, query: np.ndarray, top_k: int, n_probe: int) -> list[tuple[str, float]]:
+        n_probe = min(n_probe, len(self._centroids))
+        probes = np.argpartition(-(self._centroids @ query), n_probe - 1)[:n_probe]
+        used = len(self._ids)
+        candidates = np.flatnonzero(np.isin(self._assignments[:used], probes) & self._active[:used])
+        if len(candidates) == 0:
+            return []
+        return self._top_k(self._matrix[candidates] @ query, candidates, top_k)
+
+    def _top_k(self, scores: np.ndarray, rows: np.ndarray, top_k: int) -> list[tuple[str, float]]:
+        valid = int(np.count_nonzero(scores > -np.inf))
+        k = min(top_k, valid)
+        if k == 0:
+            return []
+        if k < len(scores):
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind="stable")][:k]
+        return [(self._ids[rows[i]], float(scores[i])) for i in best]
 
 
 class KnowledgeEngine:
@@ -215,8 +569,28 @@ class KnowledgeEngine:
     - Embeddings 向量嵌入
     - Vector Search 向量搜索
     - Context Retrieval 上下文檢索
+
+    配置：
+    - embedding_model: 嵌入模型
+    - ivf_min_vectors: 向量數達到此值時自動建立 IVF 分區（預設不建立）
+    - ivf_n_probe: IVF 搜索掃描的分區數（預設 8）
+    - index_extensions: index_tree 索引的文件副檔名
+    - index_max_file_bytes: index_tree 跳過大於此大小的文件（預設 1 MiB）
+
+    增量索引：每個文件節點記錄內容哈希，內容未變的文件不重新嵌入也不重新
+    連邊；Python 文件的 import 解析為 IMPORTS 邊，尚未索引的模組先掛起，
+    模組出現時再補連。
     """
 
+    DEFAULT_EXTENSIONS = frozenset({
+        ".py", ".pyi", ".js", ".ts", ".tsx", ".go", ".rs", ".java", ".sh",
+        ".md", ".rst", ".yaml", ".yml", ".toml", ".json",
+    })
+    SKIP_DIRS = frozenset({"node_modules", "__pycache__", "venv", ".venv", "dist", "build"})
+
+    _FROM_IMPORT = re.compile(r"^[ \t]*from[ \t]+([A-Za-z_][\w.]*)[ \t]+import[ \t]+\(?([^\n#]+)", re.M)
+    _IMPORT = re.compile(r"^[ \t]*import[ \t]+([^\n#]+)", re.M)
+
     def __init__(self, config: dict[str, Any] | None = None):
         self.config = config or {}
         self.repo_graph = RepoGraph()
@@ -224,32 +598,130 @@ class KnowledgeEngine:
             model=self.config.get("embedding_model", "text-embedding-3-small")
         )
         self.vector_store = VectorStore()
-
-    async def index_file(self, path: str, content: str) -> None:
-        """索引文件"""
-        # 創建節點
+        # 模組名 -> 文件節點 ID
+        self._modules: dict[str, str] = {}
+        # 未解析的 import：模組名 -> 導入者節點 ID
+        self._unresolved: dict[str, set[str]] = {}
+        # 導入者節點 ID -> 其掛起的模組名
+        self._pending: dict[str, set[str]] = {}
+
+    def save_index(self, directory: str | Path) -> None:
+        """保存向量索引"""
+        self.vector_store.save(directory)
+
+    def load_index(self, directory: str | Path) -> None:
+        """
+        載入向量索引（記憶體映射）
+
+        之後對內容未變的文件調用 index_file 會直接重用已保存的嵌入。
+        """
+        self.vector_store = VectorStore.load(directory)
+
+    async def index_file(self, path: str, content: str) -> bool:
+        """
+        索引文件
+
+        Returns:
+            文件是否有變化（False 表示內容未變，已跳過）
+        """
         node_id = self._generate_id(path)
+        content_hash = self._content_hash(content)
+        if not self._is_changed(node_id, content_hash):
+            return False
+
+        # 內容未變時重用已有嵌入，否則生成嵌入
+        embedding = self._stored_embedding(node_id, content_hash)
+        if embedding is None:
+            embedding = await self.embedding_provider.embed(content)
+
+        self._apply_file(path, content, content_hash, embedding)
+        return True
+
+    async def index_tree(
+        self, root: str | Path, max_workers: int = 4, batch_size: int = 32
+    ) -> dict[str, int]:
+        """
+        增量索引目錄樹
+
+        節點路徑為相對 root 的 POSIX 路徑。只有內容變化的文件會重新嵌入與
+        連邊；嵌入請求按 batch_size 分批，最多 max_workers 批並發；上次索引
+        後已刪除的文件會從圖與向量存儲中移除。
+
+        Returns:
+            統計：scanned / changed / embedded / unchanged / removed
+        """
+        root_path = Path(root)
+        root_key = str(root_path.resolve())
+        loop = asyncio.get_running_loop()
+        files = await loop.run_in_executor(None, self._read_tree, root_path, max_workers)
+
+        changed = []
+        to_embed = []
+        seen = set()
+        for path, content in files:
+            node_id = self._generate_id(path)
+            seen.add(node_id)
+            content_hash = self._content_hash(content)
+            if not self._is_changed(node_id, content_hash):
+                continue
+            embedding = self._stored_embedding(node_id, content_hash)
+            changed.append([path, content, content_hash, embedding])
+            if embedding is None:
+                to_embed.append(changed[-1])
+
+        # 分批並發嵌入
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def embed_chunk(chunk: list[list[Any]]) -> None:
+            async with semaphore:
+                embeddings = await self.embedding_provider.embed_batch([item[1] for item in chunk])
+            for item, embedding in zip(chunk, embeddings):
+                item[3] = embedding
+
+        size = max(1, batch_size)
+        await asyncio.gather(
+            *(embed_chunk(to_embed[i : i + size]) for i in range(0, len(to_embed), size))
+        )
 
-        # 生成嵌入
-        embedding = await self.embedding_provider.embed(content)
+        for path, content, content_hash, embedding in changed:
+            self._apply_file(path, content, content_hash, embedding, root=root_key)
 
-        # 創建圖節點
-        node = GraphNode(
-            id=node_id,
-            name=path.split("/")[-1],
-            node_type=NodeType.FILE,
-            path=path,
-            content=content,
-            embedding=embedding,
-        )
+        removed = [
+            node.path
+            for node_id, node in self.repo_graph.nodes.items()
+            if node.node_type == NodeType.FILE
+            and node.metadata.get("root") == root_key
+            and node_id not in seen
+        ]
+        for path in removed:
+            self.remove_file(path)
 
-        # 添加到圖
-        self.repo_graph.add_node(node)
+        return {
+            "scanned": len(files),
+            "changed": len(changed),
+            "embedded": len(to_embed),
+            "unchanged": len(files) - len(changed),
+            "removed": len(removed),
+        }
 
-        # 添加到向量存儲
-        self.vector_store.upsert(
-            id=node_id, vector=embedding, metadata={"path": path, "type": "file"}
-        )
+    def remove_file(self, path: str) -> bool:
+        """從圖與向量存儲中移除文件"""
+        node_id = self._generate_id(path)
+        if node_id not in self.repo_graph.nodes:
+            return False
+
+        # 導入此文件的節點改為掛起，文件重新出現時再連邊
+        importers = [n.id for n in self.repo_graph.get_neighbors(node_id, EdgeType.IMPORTS, reverse=True)]
+        owned = [module for module, owner in self._modules.items() if owner == node_id]
+        for module in owned:
+            del self._modules[module]
+            for importer in importers:
+                self._add_pending(importer, module)
+
+        self._clear_pending(node_id)
+        self.repo_graph.remove_node(node_id)
+        self.vector_store.delete(node_id)
+        return True
 
     async def search(self, query: str, top_k: int = 10) -> list[SearchResult]:
         """語義搜索"""
@@ -257,7 +729,7 @@ class KnowledgeEngine:
         query_embedding = await self.embedding_provider.embed(query)
 
         # 搜索向量存儲
-        results = self.vector_store.search(query_embedding, top_k)
+        results = self.vector_store.search(query_embedding, top_k, n_probe=self._n_probe())
 
         # 構建搜索結果
         search_results = []
@@ -298,8 +770,197 @@ class KnowledgeEngine:
                 {"id": neighbor.id, "name": neighbor.name, "type": neighbor.node_type.value}
             )
 
+        # 多跳相關節點（雙向）
+        direct = {n["id"] for n in context["neighbors"]}
+        reachable = self.repo_graph.k_hop(node_id, depth, direction="both")
+        for related_id, distance in sorted(reachable.items(), key=lambda item: item[1]):
+            related = self.repo_graph.get_node(related_id)
+            if related and related_id not in direct:
+                context["related"].append(
+                    {
+                        "id": related.id,
+                        "name": related.name,
+                        "type": related.node_type.value,
+                        "distance": distance,
+                    }
+                )
+
         return context
 
+    def _n_probe(self) -> int | None:
+        """需要時建立 IVF，返回搜索應掃描的分區數（None 表示精確搜索）"""
+        min_vectors = self.config.get("ivf_min_vectors")
+        if min_vectors is None or len(self.vector_store) < min_vectors:
+            return None
+        if not self.vector_store.has_ivf:
+            self.vector_store.build_ivf()
+        return self.config.get("ivf_n_probe", 8)
+
+    def _is_changed(self, node_id: str, content_hash: str) -> bool:
+        node = self.repo_graph.get_node(node_id)
+        return node is None or node.metadata.get("content_hash") != content_hash
+
+    def _stored_embedding(self, node_id: str, content_hash: str) -> list[float] | None:
+        """向量存儲中內容哈希相同的嵌入（例如 load_index 之後）"""
+        stored = self.vector_store.metadata.get(node_id)
+        if stored and stored.get("content_hash") == content_hash:
+            return self.vector_store.get_vector(node_id)
+        return None
+
+    def _apply_file(
+        self,
+        path: str,
+        content: str,
+        content_hash: str,
+        embedding: list[float],
+        root: str | None = None,
+    ) -> None:
+        """寫入節點、向量並重新連邊"""
+        node_id = self._generate_id(path)
+        is_new = node_id not in self.repo_graph.nodes
+        metadata = {"content_hash": content_hash}
+        if root is not None:
+            metadata["root"] = root
+
+        # 創建圖節點
+        node = GraphNode(
+            id=node_id,
+            name=path.split("/")[-1],
+            node_type=NodeType.FILE,
+            path=path,
+            content=content,
+            metadata=metadata,
+            embedding=embedding,
+        )
+        self.repo_graph.add_node(node)
+
+        # 添加到向量存儲
+        self.vector_store.upsert(
+            id=node_id,
+            vector=embedding,
+            metadata={"path": path, "type": "file", "content_hash": content_hash},
+        )
+
+        if is_new:
+            self._link_directories(path, node_id)
+        self._link_imports(node)
+
+    def _link_directories(self, path: str, node_id: str) -> None:
+        """為新文件建立目錄節點與 CONTAINS 邊"""
+        child_id = node_id
+        parts = path.split("/")[:-1]
+        while parts:
+            dir_path = "/".join(parts)
+            dir_id = self._generate_id(dir_path + "/")
+            exists = dir_id in self.repo_graph.nodes
+            if not exists:
+                self.repo_graph.add_node(
+                    GraphNode(id=dir_id, name=parts[-1], node_type=NodeType.DIRECTORY, path=dir_path)
+                )
+            self.repo_graph.add_edge(GraphEdge(dir_id, child_id, EdgeType.CONTAINS))
+            if exists:
+                break
+            child_id = dir_id
+            parts.pop()
+
+    def _link_imports(self, node: GraphNode) -> None:
+        """重新建立文件的 IMPORTS 邊"""
+        self.repo_graph.remove_edges(node.id, EdgeType.IMPORTS)
+        self._clear_pending(node.id)
+        if not node.path.endswith((".py", ".pyi")):
+            return
+
+        # 註冊此文件提供的模組，並補連等待它的導入者
+        for module in self._module_names(node.path):
+            owner = self._modules.setdefault(module, node.id)
+            if owner != node.id:
+                continue
+            for importer in self._unresolved.pop(module, set()):
+                self._pending.get(importer, set()).discard(module)
+                if importer in self.repo_graph.nodes:
+                    self._add_import_edge(importer, node.id)
+
+        for candidates in self._parse_imports(node.content):
+            target = next((self._modules[m] for m in candidates if m in self._modules), None)
+            if target is not None:
+                if target != node.id:
+                    self._add_import_edge(node.id, target)
+            else:
+                for module in candidates:
+                    self._add_pending(node.id, module)
+
+    def _add_import_edge(self, source_id: str, target_id: str) -> None:
+        if target_id not in {n.id for n in self.repo_graph.get_neighbors(source_id, EdgeType.IMPORTS)}:
+            self.repo_graph.add_edge(GraphEdge(source_id, target_id, EdgeType.IMPORTS))
+
+    def _add_pending(self, node_id: str, module: str) -> None:
+        self._unresolved.setdefault(module, set()).add(node_id)
+        self._pending.setdefault(node_id, set()).add(module)
+
+    def _clear_pending(self, node_id: str) -> None:
+        for module in self._pending.pop(node_id, set()):
+            waiting = self._unresolved.get(module)
+            if waiting is not None:
+                waiting.discard(node_id)
+                if not waiting:
+                    del self._unresolved[module]
+
+    @staticmethod
+    def _module_names(path: str) -> list[str]:
+        """文件路徑可被導入的模組名（所有後綴，如 a.b.c、b.c、c）"""
+        parts = path.rsplit(".", 1)[0].split("/")
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        return [".".join(parts[i:]) for i in range(len(parts)) if parts[i:]]
+
+    @classmethod
+    def _parse_imports(cls, content: str) -> list[list[str]]:
+        """解析 import 語句，每項為按優先順序排列的候選模組名"""
+        imports = []
+        for match in cls._FROM_IMPORT.finditer(content):
+            module = match.group(1)
+            for name in match.group(2).split(","):
+                name = name.strip(" ()\\").split(" as ")[0].strip()
+                if name and name != "*":
+                    imports.append([f"{module}.{name}", module])
+                else:
+                    imports.append([module])
+        for match in cls._IMPORT.finditer(content):
+            for name in match.group(1).split(","):
+                module = name.split(" as ")[0].strip()
+                if re.fullmatch(r"[A-Za-z_][\w.]*", module):
+                    imports.append([module])
+        return imports
+
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _read_tree(self, root: Path, max_workers: int) -> list[tuple[str, str]]:
+        """遍歷並（多線程）讀取可索引的文本文件"""
+        extensions = self.config.get("index_extensions", self.DEFAULT_EXTENSIONS)
+        max_bytes = self.config.get("index_max_file_bytes", 1 << 20)
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(
+                d for d in dirnames if not d.startswith(".") and d not in self.SKIP_DIRS
+            )
+            for filename in sorted(filenames):
+                if os.path.splitext(filename)[1] in extensions:
+                    paths.append(Path(dirpath) / filename)
+
+        def read(path: Path) -> tuple[str, str] | None:
+            try:
+                if path.stat().st_size > max_bytes:
+                    return None
+                content = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                return None
+            return path.relative_to(root).as_posix(), content
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            return [item for item in pool.map(read, paths) if item is not None]
+
     @staticmethod
     def _generate_id(path: str) -> str:
         """生成節點 ID"""
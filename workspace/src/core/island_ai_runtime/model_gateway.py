@@ -6,13 +6,24 @@ LLM Provider Selection and Routing
 支援多種 LLM 提供者：OpenAI, Anthropic, Local, BYOM
 """
 
+import asyncio
+import hashlib
 import os
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import Enum
 from typing import Any
 
+from .gateway_middleware import (
+    MicroBatcher,
+    ModelLimiter,
+    ResponseCache,
+    SingleFlight,
+    TokenBucket,
+    request_cache_key,
+)
+
 
 class ModelProvider(Enum):
     """模型提供者枚舉"""
@@ -66,11 +77,18 @@ class CompletionResponse:
 class BaseModelClient(ABC):
     """模型客戶端基類"""
 
+    # 提供者有批次端點時設為 True，閘道會對並發請求做微批次
+    supports_batch: bool = False
+
     @abstractmethod
     async def complete(self, request: CompletionRequest) -> CompletionResponse:
         """執行完成請求"""
         pass
 
+    async def complete_batch(self, requests: list[CompletionRequest]) -> list[CompletionResponse]:
+        """執行批次完成請求（預設逐個並發執行）"""
+        return list(await asyncio.gather(*(self.complete(r) for r in requests)))
+
     @abstractmethod
     async def stream(self, request: CompletionRequest) -> AsyncIterator[str]:
         """執行串流完成請求"""
@@ -118,6 +136,52 @@ class AnthropicClient(BaseModelClient):
         yield ""
 
 
+class FakeModelClient(BaseModelClient):
+    """
+    本地假提供者（用於測試）
+
+    回應內容由請求確定性地生成，並記錄呼叫次數與批次大小。
+    """
+
+    supports_batch = True
+
+    def __init__(self, latency: float = 0.0, model: str = "fake-model"):
+        self.latency = latency
+        self.model = model
+        self.calls = 0
+        self.batch_sizes: list[int] = []
+
+    async def complete(self, request: CompletionRequest) -> CompletionResponse:
+        """執行假完成請求"""
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(request)
+
+    async def complete_batch(self, requests: list[CompletionRequest]) -> list[CompletionResponse]:
+        """執行假批次請求（一次呼叫）"""
+        self.calls += 1
+        self.batch_sizes.append(len(requests))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [self._respond(r) for r in requests]
+
+    async def stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        """執行假串流請求"""
+        for word in self._respond(request).content.split():
+            yield word
+
+    def _respond(self, request: CompletionRequest) -> CompletionResponse:
+        prompt = "\n".join(m.get("content", "") for m in request.messages)
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:12]
+        return CompletionResponse(
+            content=f"fake:{digest}",
+            model=request.model or self.model,
+            usage={"prompt_tokens": len(prompt.split()), "completion_tokens": 1},
+            finish_reason="stop",
+        )
+
+
 class ModelGateway:
     """
     模型閘道
@@ -130,6 +194,16 @@ class ModelGateway:
     - 模型切換
     - 成本優化
     - 故障轉移
+    - 回應快取、請求合併、微批次、每模型限速（config["middleware"]）
+
+    middleware 配置：
+    - cache: {enabled, max_entries, ttl_seconds, disk_dir}
+    - single_flight: 是否合併相同的進行中請求（預設 True）
+    - share_sampled: 快取與請求合併是否也用於 temperature > 0 的採樣請求
+      （預設 False：只有 temperature == 0 的確定性請求會共用回應）
+    - batching: {enabled, max_batch_size, window_ms}，僅用於 supports_batch 的客戶端
+    - concurrency: {model_id: 最大並發}，default_concurrency 為其他模型的上限
+    - rate_limits: {model_id: {requests_per_second, burst}}
     """
 
     def __init__(self, config: dict[str, Any] | None = None):
@@ -137,6 +211,7 @@ class ModelGateway:
         self.clients: dict[ModelProvider, BaseModelClient] = {}
         self.models: dict[str, ModelConfig] = {}
         self._initialize_clients()
+        self._initialize_middleware()
 
     def _initialize_clients(self) -> None:
         """初始化模型客戶端"""
@@ -148,6 +223,49 @@ class ModelGateway:
         if providers.get("anthropic", {}).get("enabled", True):
             self.clients[ModelProvider.ANTHROPIC] = AnthropicClient()
 
+        if providers.get("local", {}).get("fake", False):
+            self.clients[ModelProvider.LOCAL] = FakeModelClient()
+
+    def _initialize_middleware(self) -> None:
+        """初始化中介層"""
+        middleware = self.config.get("middleware", {})
+
+        cache_config = middleware.get("cache", {})
+        self.response_cache: ResponseCache | None = None
+        if cache_config.get("enabled", True):
+            self.response_cache = ResponseCache(
+                max_entries=cache_config.get("max_entries", 1024),
+                ttl_seconds=cache_config.get("ttl_seconds", 300.0),
+                disk_dir=cache_config.get("disk_dir"),
+            )
+
+        self.single_flight: SingleFlight | None = (
+            SingleFlight() if middleware.get("single_flight", True) else None
+        )
+        self._share_sampled: bool = middleware.get("share_sampled", False)
+
+        batching = middleware.get("batching", {})
+        self.batcher: MicroBatcher | None = None
+        if batching.get("enabled", True):
+            self.batcher = MicroBatcher(
+                self._submit_batch,
+                max_batch_size=batching.get("max_batch_size", 16),
+                window_seconds=batching.get("window_ms", 5) / 1000,
+            )
+
+        self._concurrency: dict[str, int] = middleware.get("concurrency", {})
+        self._default_concurrency: int | None = middleware.get("default_concurrency")
+        self._rate_limits: dict[str, dict[str, float]] = middleware.get("rate_limits", {})
+        self._limiters: dict[str, ModelLimiter] = {}
+
+    def register_client(self, provider: ModelProvider, client: BaseModelClient) -> None:
+        """註冊（或替換）提供者客戶端"""
+        self.clients[provider] = client
+
+    def register_model(self, model: ModelConfig) -> None:
+        """註冊模型，路由時優先使用其提供者"""
+        self.models[model.id] = model
+
     def get_default_model(self) -> str:
         """獲取預設模型"""
         return self.config.get("default_provider", "openai")
@@ -175,7 +293,67 @@ class ModelGateway:
         if not client:
             raise ValueError(f"Provider not available: {provider}")
 
-        return await client.complete(request)
+        model_key = model or provider.value
+        if request.temperature != 0 and not self._share_sampled:
+            # 採樣請求每次應得到獨立的回應，不經快取與請求合併
+            return await self._dispatch(client, model_key, request)
+
+        key = request_cache_key(request, model_key)
+        if self.response_cache is not None:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        async def dispatch() -> CompletionResponse:
+            response = await self._dispatch(client, model_key, request)
+            if self.response_cache is not None:
+                self.response_cache.put(key, response)
+            return response
+
+        if self.single_flight is not None:
+            return await self.single_flight.do(key, dispatch)
+        return await dispatch()
+
+    async def _dispatch(
+        self, client: BaseModelClient, model_key: str, request: CompletionRequest
+    ) -> CompletionResponse:
+        """經過限速與並發限制後發送（可批次）"""
+        async with self._limiter(model_key):
+            if self.batcher is not None and client.supports_batch:
+                return await self.batcher.submit(model_key, request)
+            return await client.complete(request)
+
+    async def _submit_batch(
+        self, model_key: str, requests: list[CompletionRequest]
+    ) -> list[CompletionResponse]:
+        """微批次的批次端點"""
+        client = self.clients[self._get_provider_for_model(requests[0].model)]
+        return await client.complete_batch(requests)
+
+    def _limiter(self, model_key: str) -> ModelLimiter:
+        limiter = self._limiters.get(model_key)
+        if limiter is None:
+            rate = self._rate_limits.get(model_key)
+            bucket = None
+            if rate:
+                bucket = TokenBucket(rate["requests_per_second"], rate.get("burst"))
+            limiter = ModelLimiter(
+                concurrency=self._concurrency.get(model_key, self._default_concurrency),
+                bucket=bucket,
+            )
+            self._limiters[model_key] = limiter
+        return limiter
+
+    def get_middleware_stats(self) -> dict[str, Any]:
+        """中介層統計"""
+        stats: dict[str, Any] = {}
+        if self.response_cache is not None:
+            stats["cache"] = {"entries": len(self.response_cache), **asdict(self.response_cache.stats)}
+        if self.single_flight is not None:
+            stats["coalesced_requests"] = self.single_flight.coalesced
+        if self.batcher is not None:
+            stats["batches_sent"] = self.batcher.batches_sent
+        return stats
 
     async def stream(
         self, messages: list[dict[str, str]], model: str | None = None, **kwargs: Any
@@ -197,6 +375,9 @@ class ModelGateway:
         if not model:
             return ModelProvider.OPENAI
 
+        if model in self.models:
+            return self.models[model].provider
+
         if model.startswith("gpt") or model.startswith("o1"):
             return ModelProvider.OPENAI
         elif model.startswith("claude"):
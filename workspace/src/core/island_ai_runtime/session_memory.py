@@ -3,15 +3,36 @@
 Session Memory - 會話記憶
 Short-term Memory, Context Management, and Planning
 
-管理 AI 會話上下文和任務規劃
+管理 AI 會話上下文和任務規劃。
+
+每條訊息加入時計算一次 token 數並建立索引，之後每輪的成本只與新訊息相關：
+- 上下文窗口按 token 預算維護，超出的舊訊息增量折疊進滾動摘要
+- 短期記憶以三字元組倒排索引支援子字串搜索
 """
 
+import itertools
+import re
 import time
-from collections import deque
+from collections import Counter, deque
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
+Tokenizer = Callable[[str], int]
+
+_WORD_PATTERN = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "the and for are but not you your with this that from have was were will would "
+    "can could should what when where which who how why into about then than them "
+    "they its our out all any has had been being also just like".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token 數（約 4 字元一個 token）"""
+    return max(1, (len(text) + 3) // 4)
+
 
 class MemoryType(Enum):
     """記憶類型"""
@@ -38,6 +59,7 @@ class Message:
     content: str
     timestamp: float = field(default_factory=time.time)
     metadata: dict[str, Any] = field(default_factory=dict)
+    token_count: int | None = None  # 加入記憶時由分詞器計算並快取
 
 
 @dataclass
@@ -62,46 +84,191 @@ class Plan:
     created_at: float = field(default_factory=time.time)
 
 
+@dataclass
+class RollingSummary:
+    """
+    滾動摘要
+
+    被移出上下文窗口的訊息逐條折疊進來：累計角色與詞頻，保留最近的要點。
+    折疊單條訊息的成本只與該訊息長度相關。
+    """
+
+    max_points: int = 10
+    max_topics: int = 8
+    point_words: int = 12
+    message_count: int = 0
+    token_count: int = 0
+    role_counts: Counter = field(default_factory=Counter)
+    term_counts: Counter = field(default_factory=Counter)
+    points: deque = field(default_factory=deque)
+    _text: str | None = field(default=None, repr=False)
+
+    def fold(self, message: Message) -> None:
+        """折疊一條訊息"""
+        self.message_count += 1
+        self.token_count += message.token_count or 0
+        self.role_counts[message.role.value] += 1
+        words = message.content.split()
+        self.term_counts.update(
+            term
+            for term in _WORD_PATTERN.findall(message.content.lower())
+            if len(term) > 2 and term not in _STOPWORDS and not term.isdigit()
+        )
+        if words:
+            self.points.append(f"{message.role.value}: {' '.join(words[: self.point_words])}")
+            if len(self.points) > self.max_points:
+                self.points.popleft()
+        self._text = None
+
+    def topics(self) -> list[str]:
+        """最常出現的詞"""
+        return [term for term, _ in self.term_counts.most_common(self.max_topics)]
+
+    def render(self) -> str:
+        """摘要文本（折疊新訊息前快取）"""
+        if not self.message_count:
+            return ""
+        if self._text is None:
+            lines = [
+                f"Summary of {self.message_count} earlier messages "
+                f"(~{self.token_count} tokens, "
+                + ", ".join(f"{role}: {count}" for role, count in sorted(self.role_counts.items()))
+                + ")."
+            ]
+            topics = self.topics()
+            if topics:
+                lines.append("Topics: " + ", ".join(topics) + ".")
+            lines.extend(f"- {point}" for point in self.points)
+            self._text = "\n".join(lines)
+        return self._text
+
+    def clear(self) -> None:
+        """清空摘要"""
+        self.message_count = 0
+        self.token_count = 0
+        self.role_counts.clear()
+        self.term_counts.clear()
+        self.points.clear()
+        self._text = None
+
+
 @dataclass
 class ContextWindow:
-    """上下文窗口"""
+    """
+    上下文窗口
+
+    保留最近的訊息，總 token 數不超過 max_tokens - reserved_tokens（預留給摘要），
+    訊息數不超過 max_messages；被擠出的訊息折疊進 summary。
+    """
 
     max_tokens: int
     current_tokens: int = 0
-    messages: list[Message] = field(default_factory=list)
+    messages: deque[Message] = field(default_factory=deque)
+    max_messages: int | None = None
+    reserved_tokens: int = 0
+    summary: RollingSummary = field(default_factory=RollingSummary)
+
+    def add(self, message: Message) -> list[Message]:
+        """加入訊息，返回被移出窗口的訊息（至少保留最新一條）"""
+        self.messages.append(message)
+        self.current_tokens += message.token_count or 0
+
+        budget = self.max_tokens - self.reserved_tokens
+        evicted = []
+        while len(self.messages) > 1 and (
+            self.current_tokens > budget
+            or (self.max_messages is not None and len(self.messages) > self.max_messages)
+        ):
+            old = self.messages.popleft()
+            self.current_tokens -= old.token_count or 0
+            self.summary.fold(old)
+            evicted.append(old)
+        return evicted
+
+    def clear(self) -> None:
+        """清空窗口與摘要"""
+        self.messages.clear()
+        self.current_tokens = 0
+        self.summary.clear()
 
 
 class ShortTermMemory:
     """
     短期記憶
 
-    管理會話內的即時記憶。
+    管理會話內的即時記憶。搜索使用小寫內容的三字元組倒排索引篩選候選，
+    再以子字串比對確認，結果與逐條掃描一致。
     """
 
     def __init__(self, max_messages: int = 100):
         self.max_messages = max_messages
         self.messages: deque[Message] = deque(maxlen=max_messages)
+        self._seqs: deque[int] = deque()
+        self._next_seq = 0
+        self._lowered: dict[int, tuple[Message, str]] = {}
+        self._index: dict[str, set[int]] = {}
 
     def add(self, message: Message) -> None:
         """添加訊息"""
+        if self.max_messages and len(self.messages) >= self.max_messages:
+            self._unindex(self._seqs.popleft())
         self.messages.append(message)
 
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seqs.append(seq)
+        lowered = message.content.lower()
+        self._lowered[seq] = (message, lowered)
+        for gram in self._grams(lowered):
+            self._index.setdefault(gram, set()).add(seq)
+
+    def _unindex(self, seq: int) -> None:
+        _, lowered = self._lowered.pop(seq)
+        for gram in self._grams(lowered):
+            postings = self._index.get(gram)
+            if postings is not None:
+                postings.discard(seq)
+                if not postings:
+                    del self._index[gram]
+
+    @staticmethod
+    def _grams(text: str) -> set[str]:
+        return {text[i : i + 3] for i in range(len(text) - 2)}
+
     def get_recent(self, n: int = 10) -> list[Message]:
         """獲取最近的訊息"""
-        return list(self.messages)[-n:]
+        if n <= 0:
+            return []
+        recent = list(itertools.islice(reversed(self.messages), n))
+        recent.reverse()
+        return recent
 
     def search(self, query: str) -> list[Message]:
-        """搜索訊息"""
-        results = []
+        """搜索訊息（不區分大小寫的子字串比對，按時間順序）"""
         query_lower = query.lower()
-        for msg in self.messages:
-            if query_lower in msg.content.lower():
-                results.append(msg)
+        if len(query_lower) < 3:
+            candidates = list(self._lowered)
+        else:
+            postings = sorted(
+                (self._index.get(gram, set()) for gram in self._grams(query_lower)), key=len
+            )
+            if not postings[0]:
+                return []
+            candidates = sorted(set.intersection(*postings))
+
+        results = []
+        for seq in candidates:
+            message, lowered = self._lowered[seq]
+            if query_lower in lowered:
+                results.append(message)
         return results
 
     def clear(self) -> None:
         """清空記憶"""
         self.messages.clear()
+        self._seqs.clear()
+        self._lowered.clear()
+        self._index.clear()
 
     def to_messages(self) -> list[dict[str, str]]:
         """轉換為 LLM 訊息格式"""
@@ -236,14 +403,26 @@ class SessionMemory:
     - Working Memory 工作記憶
     - Context Management 上下文管理
     - Task Planning 任務規劃
+
+    配置：
+    - max_messages: 短期記憶與上下文窗口的訊息上限
+    - max_tokens: 上下文窗口的 token 預算
+    - summary_tokens: 為滾動摘要預留的 token 數
+    - include_summary: get_context 是否在開頭附上滾動摘要
     """
 
-    def __init__(self, config: dict[str, Any] | None = None):
+    def __init__(self, config: dict[str, Any] | None = None, tokenizer: Tokenizer | None = None):
         self.config = config or {}
-        self.short_term = ShortTermMemory(max_messages=self.config.get("max_messages", 100))
+        self.tokenizer: Tokenizer = tokenizer or estimate_tokens
+        max_messages = self.config.get("max_messages", 100)
+        self.short_term = ShortTermMemory(max_messages=max_messages)
         self.working = WorkingMemory()
         self.planner = Planner()
-        self.context_window = ContextWindow(max_tokens=self.config.get("max_tokens", 128000))
+        self.context_window = ContextWindow(
+            max_tokens=self.config.get("max_tokens", 128000),
+            max_messages=max_messages,
+            reserved_tokens=self.config.get("summary_tokens", 512),
+        )
 
     def add_message(
         self, role: str | MessageRole, content: str, metadata: dict[str, Any] | None = None
@@ -253,16 +432,36 @@ class SessionMemory:
             role = MessageRole(role)
 
         message = Message(role=role, content=content, metadata=metadata or {})
+        message.token_count = self.tokenizer(content)
 
         self.short_term.add(message)
-        self.context_window.messages.append(message)
+        self.context_window.add(message)
+
+    def get_context(
+        self, max_messages: int | None = None, max_tokens: int | None = None
+    ) -> list[dict[str, str]]:
+        """
+        獲取上下文
+
+        從最新訊息往回取，直到達到 max_messages 或 max_tokens（使用快取的 token 數）；
+        若有訊息已折疊進滾動摘要，摘要作為第一條 system 訊息。
+        """
+        selected: list[Message] = []
+        tokens = 0
+        for message in reversed(self.context_window.messages):
+            if max_messages and len(selected) >= max_messages:
+                break
+            if max_tokens is not None and selected and tokens + (message.token_count or 0) > max_tokens:
+                break
+            tokens += message.token_count or 0
+            selected.append(message)
+        selected.reverse()
 
-    def get_context(self, max_messages: int | None = None) -> list[dict[str, str]]:
-        """獲取上下文"""
-        messages = self.short_term.to_messages()
-        if max_messages:
-            messages = messages[-max_messages:]
-        return messages
+        context = [{"role": msg.role.value, "content": msg.content} for msg in selected]
+        summary = self.context_window.summary.render()
+        if summary and self.config.get("include_summary", True):
+            context.insert(0, {"role": MessageRole.SYSTEM.value, "content": summary})
+        return context
 
     def set_working_data(self, key: str, value: Any) -> None:
         """設置工作記憶數據"""
@@ -291,6 +490,13 @@ class SessionMemory:
                 "message_count": len(self.short_term.messages),
                 "recent_topics": self._extract_topics(),
             },
+            "context_window": {
+                "message_count": len(self.context_window.messages),
+                "tokens": self.context_window.current_tokens,
+                "max_tokens": self.context_window.max_tokens,
+                "summarized_messages": self.context_window.summary.message_count,
+                "summary_topics": self.context_window.summary.topics(),
+            },
             "working": {"focus": self.working.focus, "data_keys": list(self.working.data.keys())},
             "planning": {
                 "current_plan": (
@@ -317,4 +523,4 @@ class SessionMemory:
         self.working.clear()
         self.planner.plans.clear()
         self.planner.current_plan = None
-        self.context_window.messages.clear()
+        self.context_window.clear()
@@ -7,13 +7,23 @@ Responsibilities:
 - Merkle tree construction and verification
 - State integrity proofs
 - Tamper-evident logging
+
+The tree follows RFC 6962 (Certificate Transparency) hashing: leaves are
+H(0x00 || data), interior nodes H(0x01 || left || right), and a tree of n
+leaves splits at the largest power of two below n. It is append-only:
+- Appends only hash the nodes they complete (O(1) amortized, O(log n) worst)
+- Node hashes of complete subtrees are stored per level in bytearrays
+- Root, inclusion proofs and consistency proofs take O(log n) node lookups
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any
 from dataclasses import dataclass
 import hashlib
 import json
 
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
 
 @dataclass
 class MerkleNode:
@@ -24,79 +34,384 @@ class MerkleNode:
     data: Optional[Any] = None
 
 
+def _split(n: int) -> int:
+    """Largest power of two strictly smaller than n (n >= 2)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+
 class MerkleTree:
     """
     Merkle tree implementation for state verification.
 
     Part of L0 Immutable Foundation layer.
+
+    Args:
+        hash_func: Legacy hook taking bytes and returning a hex digest; the
+            tree stores raw digests, so it is converted with bytes.fromhex
+        retain_nodes: Keep every complete-subtree hash (needed for proofs);
+            when False only the O(log n) frontier is kept
+
+    Example:
+        tree = MerkleTree()
+        tree.add_leaves([{"n": i} for i in range(5)])
+        proof = tree.inclusion_proof(3)
+        assert MerkleTree.verify_inclusion(
+            bytes.fromhex(tree.leaf_hash(3)), 3, len(tree), proof,
+            bytes.fromhex(tree.get_root_hash()))
     """
 
-    VERSION = "2.0.0"
+    VERSION = "3.0.0"
     LAYER = "L0_immutable_foundation"
 
-    def __init__(self, hash_func=None):
+    def __init__(self, hash_func: Optional[Callable[[bytes], str]] = None,
+                 retain_nodes: bool = True):
+        if hash_func is None:
+            self._digest: Callable[[bytes], bytes] = lambda data: hashlib.sha256(data).digest()
+        else:
+            self._digest = lambda data: bytes.fromhex(hash_func(data))
         self.hash_func = hash_func or self._default_hash
-        self.root: Optional[MerkleNode] = None
-        self.leaves: List[MerkleNode] = []
+        self.retain_nodes = retain_nodes
+        self.digest_size = len(self._digest(b""))
+        self._size = 0
+        # _levels[k] holds the hashes of the complete subtrees of 2**k leaves
+        self._levels: List[bytearray] = [bytearray()]
+        # Frontier-only mode: _frontier[k] is the pending subtree of 2**k leaves
+        self._frontier: List[Optional[bytes]] = []
 
     def _default_hash(self, data: bytes) -> str:
         """Default SHA-256 hash function."""
         return hashlib.sha256(data).hexdigest()
 
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def size(self) -> int:
+        """Number of leaves."""
+        return self._size
+
+    # ------------------------------------------------------------------
+    # Hashing
+    # ------------------------------------------------------------------
+
+    def hash_leaf(self, data: bytes) -> bytes:
+        """RFC 6962 leaf hash of raw bytes."""
+        return self._digest(LEAF_PREFIX + data)
+
+    def hash_node(self, left: bytes, right: bytes) -> bytes:
+        """RFC 6962 interior node hash."""
+        return self._digest(NODE_PREFIX + left + right)
+
+    @staticmethod
+    def serialize(data: Any) -> bytes:
+        """Canonical leaf encoding for structured data."""
+        return json.dumps(data, sort_keys=True).encode()
+
+    # ------------------------------------------------------------------
+    # Appends
+    # ------------------------------------------------------------------
+
     def add_leaf(self, data: Any) -> str:
         """Add a leaf to the tree."""
-        serialized = json.dumps(data, sort_keys=True).encode()
-        leaf_hash = self.hash_func(serialized)
-        node = MerkleNode(hash=leaf_hash, data=data)
-        self.leaves.append(node)
-        return leaf_hash
+        leaf_hash = self.hash_leaf(self.serialize(data))
+        self._extend(leaf_hash, 1)
+        return leaf_hash.hex()
+
+    def add_leaves(self, items: Iterable[Any]) -> List[str]:
+        """Add several structured leaves, hashing them as one batch."""
+        hashes = [self.hash_leaf(self.serialize(item)) for item in items]
+        self._extend(b"".join(hashes), len(hashes))
+        return [leaf_hash.hex() for leaf_hash in hashes]
+
+    def add_raw_leaves(self, blobs: Iterable[bytes]) -> int:
+        """
+        Add already-encoded leaves as one batch.
+
+        Returns:
+            Index of the first added leaf
+        """
+        first = self._size
+        digest = self._digest
+        joined = b"".join([digest(LEAF_PREFIX + blob) for blob in blobs])
+        self._extend(joined, len(joined) // self.digest_size)
+        return first
+
+    def add_leaf_hashes(self, hashes: bytes) -> int:
+        """
+        Append precomputed leaf hashes (concatenated raw digests).
+
+        Returns:
+            Index of the first added leaf
+        """
+        if len(hashes) % self.digest_size:
+            raise ValueError("Leaf hashes must be a multiple of the digest size")
+        first = self._size
+        self._extend(bytes(hashes), len(hashes) // self.digest_size)
+        return first
+
+    def _extend(self, joined: bytes, count: int) -> None:
+        """Append count leaf hashes and hash every subtree they complete."""
+        if count == 0:
+            return
+        if not self.retain_nodes:
+            size = self.digest_size
+            for i in range(count):
+                self._push_frontier(joined[i * size:(i + 1) * size])
+            self._size += count
+            return
+
+        d = self.digest_size
+        digest = self._digest
+        prefix = NODE_PREFIX
+        old_size = self._size
+        new_size = old_size + count
+        self._levels[0] += joined
+        level = 0
+        while True:
+            old_parents = old_size >> (level + 1)
+            new_parents = new_size >> (level + 1)
+            if new_parents == old_parents:
+                break
+            if len(self._levels) == level + 1:
+                self._levels.append(bytearray())
+            children = memoryview(self._levels[level])
+            parents = bytearray()
+            for i in range(old_parents, new_parents):
+                parents += digest(prefix + children[2 * i * d:(2 * i + 2) * d])
+            children.release()
+            self._levels[level + 1] += parents
+            level += 1
+        self._size = new_size
+
+    def _push_frontier(self, node: bytes) -> None:
+        frontier = self._frontier
+        level = 0
+        while level < len(frontier) and frontier[level] is not None:
+            node = self.hash_node(frontier[level], node)
+            frontier[level] = None
+            level += 1
+        if level == len(frontier):
+            frontier.append(node)
+        else:
+            frontier[level] = node
+
+    # ------------------------------------------------------------------
+    # Roots
+    # ------------------------------------------------------------------
+
+    def _peaks(self) -> Iterator[bytes]:
+        """Perfect-subtree roots covering all leaves, smallest first."""
+        if not self.retain_nodes:
+            for node in self._frontier:
+                if node is not None:
+                    yield node
+            return
+        d = self.digest_size
+        for level, hashes in enumerate(self._levels):
+            if (self._size >> level) & 1:
+                end = len(hashes)
+                yield bytes(hashes[end - d:end])
+
+    def root(self, tree_size: Optional[int] = None) -> Optional[bytes]:
+        """
+        Raw root hash of the first tree_size leaves (default: all).
+
+        Historical sizes require retain_nodes.
+        """
+        if tree_size is None or tree_size == self._size:
+            acc = None
+            for peak in self._peaks():
+                acc = peak if acc is None else self.hash_node(peak, acc)
+            return acc
+        self._check_size(tree_size)
+        return self._subtree(0, tree_size) if tree_size else None
 
     def build(self) -> Optional[str]:
-        """Build the Merkle tree and return root hash."""
-        if not self.leaves:
-            return None
+        """Return the root hash (kept for API compatibility; O(log n))."""
+        return self.get_root_hash()
 
-        nodes = self.leaves.copy()
+    def get_root_hash(self) -> Optional[str]:
+        """Get the root hash."""
+        root = self.root()
+        return root.hex() if root is not None else None
+
+    @property
+    def root_node(self) -> Optional[MerkleNode]:
+        """Root as a MerkleNode (hash only)."""
+        root_hash = self.get_root_hash()
+        return MerkleNode(hash=root_hash) if root_hash else None
+
+    def leaf_hash(self, index: int) -> str:
+        """Hex leaf hash at index."""
+        self._require_nodes()
+        if not 0 <= index < self._size:
+            raise IndexError(f"Leaf index {index} out of range")
+        d = self.digest_size
+        return bytes(self._levels[0][index * d:(index + 1) * d]).hex()
+
+    # ------------------------------------------------------------------
+    # Proofs
+    # ------------------------------------------------------------------
+
+    def _require_nodes(self) -> None:
+        if not self.retain_nodes:
+            raise ValueError("Proofs require retain_nodes=True")
+
+    def _check_size(self, tree_size: int) -> None:
+        self._require_nodes()
+        if not 0 <= tree_size <= self._size:
+            raise ValueError(f"Tree size {tree_size} out of range (size {self._size})")
+
+    def _subtree(self, start: int, end: int) -> bytes:
+        """Hash of leaves [start, end); perfect aligned subtrees are stored."""
+        n = end - start
+        if n & (n - 1) == 0 and start % n == 0:
+            level = n.bit_length() - 1
+            d = self.digest_size
+            index = start >> level
+            return bytes(self._levels[level][index * d:(index + 1) * d])
+        k = _split(n)
+        return self.hash_node(self._subtree(start, start + k), self._subtree(start + k, end))
+
+    def inclusion_proof(self, index: int, tree_size: Optional[int] = None) -> List[bytes]:
+        """
+        RFC 6962 audit path for leaf index in the tree of tree_size leaves.
+
+        Returns:
+            Sibling hashes from the leaf upwards
+        """
+        tree_size = self._size if tree_size is None else tree_size
+        self._check_size(tree_size)
+        if not 0 <= index < tree_size:
+            raise IndexError(f"Leaf index {index} out of range for tree size {tree_size}")
+        path: List[bytes] = []
+        start, end = 0, tree_size
+        while end - start > 1:
+            k = _split(end - start)
+            if index < start + k:
+                path.append(self._subtree(start + k, end))
+                end = start + k
+            else:
+                path.append(self._subtree(start, start + k))
+                start += k
+        path.reverse()
+        return path
+
+    def consistency_proof(self, old_size: int, new_size: Optional[int] = None) -> List[bytes]:
+        """RFC 6962 consistency proof between tree sizes old_size and new_size."""
+        new_size = self._size if new_size is None else new_size
+        self._check_size(new_size)
+        if not 0 < old_size <= new_size:
+            raise ValueError(f"Invalid old size {old_size} for new size {new_size}")
+        proof: List[bytes] = []
+        m, start, end, complete = old_size, 0, new_size, True
+        while m != end - start:
+            k = _split(end - start)
+            if m <= k:
+                proof.append(self._subtree(start + k, end))
+                end = start + k
+            else:
+                proof.append(self._subtree(start, start + k))
+                m -= k
+                start += k
+                complete = False
+        if not complete:
+            proof.append(self._subtree(start, end))
+        proof.reverse()
+        return proof
 
-        while len(nodes) > 1:
-            next_level = []
-            for i in range(0, len(nodes), 2):
-                left = nodes[i]
-                right = nodes[i + 1] if i + 1 < len(nodes) else left
+    def verify_inclusion_proof(self, leaf_hash: bytes, index: int, tree_size: int,
+                               proof: List[bytes], root_hash: bytes) -> bool:
+        """Verify an inclusion proof with this tree's hash function."""
+        if not 0 <= index < tree_size:
+            return False
+        fn, sn = index, tree_size - 1
+        current = leaf_hash
+        for sibling in proof:
+            if sn == 0:
+                return False
+            if fn & 1 or fn == sn:
+                current = self.hash_node(sibling, current)
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+            else:
+                current = self.hash_node(current, sibling)
+            fn >>= 1
+            sn >>= 1
+        return sn == 0 and current == root_hash
+
+    def verify_consistency_proof(self, old_size: int, new_size: int, old_root: bytes,
+                                 new_root: bytes, proof: List[bytes]) -> bool:
+        """Verify a consistency proof with this tree's hash function."""
+        if old_size == new_size:
+            return not proof and old_root == new_root
+        if not 0 < old_size < new_size or not proof:
+            return False
+        if old_size & (old_size - 1) == 0:
+            proof = [old_root] + list(proof)
+        fn, sn = old_size - 1, new_size - 1
+        while fn & 1:
+            fn >>= 1
+            sn >>= 1
+        first = second = proof[0]
+        for node in proof[1:]:
+            if sn == 0:
+                return False
+            if fn & 1 or fn == sn:
+                first = self.hash_node(node, first)
+                second = self.hash_node(node, second)
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+            else:
+                second = self.hash_node(second, node)
+            fn >>= 1
+            sn >>= 1
+        return first == old_root and second == new_root and sn == 0
 
-                combined = (left.hash + right.hash).encode()
-                parent_hash = self.hash_func(combined)
-                parent = MerkleNode(hash=parent_hash, left=left, right=right)
-                next_level.append(parent)
-            nodes = next_level
+    @classmethod
+    def verify_inclusion(cls, leaf_hash: bytes, index: int, tree_size: int,
+                         proof: List[bytes], root_hash: bytes) -> bool:
+        """Verify an inclusion proof for a default SHA-256 tree."""
+        return cls().verify_inclusion_proof(leaf_hash, index, tree_size, proof, root_hash)
 
-        self.root = nodes[0]
-        return self.root.hash
+    @classmethod
+    def verify_consistency(cls, old_size: int, new_size: int, old_root: bytes,
+                           new_root: bytes, proof: List[bytes]) -> bool:
+        """Verify a consistency proof for a default SHA-256 tree."""
+        return cls().verify_consistency_proof(old_size, new_size, old_root, new_root, proof)
 
     def get_proof(self, leaf_index: int) -> List[Dict[str, str]]:
         """Get Merkle proof for a leaf."""
-        if not self.root or leaf_index >= len(self.leaves):
+        if leaf_index < 0 or leaf_index >= self._size or not self.retain_nodes:
             return []
 
         proof = []
-        # Simplified proof generation
-        # Full implementation would traverse tree
+        fn, sn = leaf_index, self._size - 1
+        for sibling in self.inclusion_proof(leaf_index):
+            if fn & 1 or fn == sn:
+                proof.append({"position": "left", "hash": sibling.hex()})
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+            else:
+                proof.append({"position": "right", "hash": sibling.hex()})
+            fn >>= 1
+            sn >>= 1
         return proof
 
     def verify_proof(self, leaf_hash: str, proof: List[Dict[str, str]],
                      root_hash: str) -> bool:
         """Verify a Merkle proof."""
-        current = leaf_hash
+        current = bytes.fromhex(leaf_hash)
         for step in proof:
+            sibling = bytes.fromhex(step["hash"])
             if step.get("position") == "left":
-                current = self.hash_func((step["hash"] + current).encode())
+                current = self.hash_node(sibling, current)
             else:
-                current = self.hash_func((current + step["hash"]).encode())
-        return current == root_hash
-
-    def get_root_hash(self) -> Optional[str]:
-        """Get the root hash."""
-        return self.root.hash if self.root else None
+                current = self.hash_node(current, sibling)
+        return current.hex() == root_hash
 
 
 class StateVerifier:
@@ -125,6 +440,26 @@ class StateVerifier:
         """Finalize and get root hash."""
         return self.tree.build()
 
+    def prove_state(self, index: int) -> Dict[str, Any]:
+        """Inclusion proof that state_log[index] is part of the current root."""
+        return {
+            "index": index,
+            "tree_size": len(self.tree),
+            "leaf_hash": self.state_log[index]["hash"],
+            "root_hash": self.tree.get_root_hash(),
+            "proof": [node.hex() for node in self.tree.inclusion_proof(index)],
+        }
+
+    def prove_append_only(self, old_size: int) -> Dict[str, Any]:
+        """Consistency proof that the log only grew since it had old_size states."""
+        return {
+            "old_size": old_size,
+            "new_size": len(self.tree),
+            "old_root": self.tree.root(old_size).hex(),
+            "new_root": self.tree.get_root_hash(),
+            "proof": [node.hex() for node in self.tree.consistency_proof(old_size)],
+        }
+
     def _get_timestamp(self) -> str:
         """Get current timestamp."""
         from datetime import datetime, timezone
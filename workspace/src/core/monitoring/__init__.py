@@ -4,6 +4,7 @@ SynergyMesh Intelligent Monitoring and Auto-Remediation System (Phase 11)
 Core modules:
 - intelligent_monitoring: 24/7 intelligent monitoring system
 - smart_anomaly_detector: AI-driven anomaly detection
+- streaming_baselines: O(1) seasonal/robust/change-point baseline models
 - auto_diagnosis: Automatic root cause analysis
 - auto_remediation: Self-healing capabilities
 - self_learning: Continuous improvement from incidents
@@ -25,6 +26,13 @@ from .smart_anomaly_detector import (
     SmartAnomalyDetector,
     AnomalyClassifier
 )
+from .streaming_baselines import (
+    P2Quantile,
+    HoltWintersModel,
+    CusumDetector,
+    StreamingBaseline,
+    BaselineScore
+)
 from .auto_diagnosis import (
     DiagnosisResult,
     RootCause,
@@ -51,7 +59,10 @@ from .observability_platform import (
     TraceSpan,
     CorrelatedEvent,
     ObservabilityPlatform,
-    CorrelationEngine
+    CorrelationEngine,
+    TimeIndex,
+    TelemetryIndex,
+    ServiceRollup
 )
 
 __all__ = [
@@ -68,6 +79,12 @@ __all__ = [
     'DetectedAnomaly',
     'SmartAnomalyDetector',
     'AnomalyClassifier',
+    # Streaming Baselines
+    'P2Quantile',
+    'HoltWintersModel',
+    'CusumDetector',
+    'StreamingBaseline',
+    'BaselineScore',
     # Auto Diagnosis
     'DiagnosisResult',
     'RootCause',
@@ -92,4 +109,7 @@ __all__ = [
     'CorrelatedEvent',
     'ObservabilityPlatform',
     'CorrelationEngine',
+    'TimeIndex',
+    'TelemetryIndex',
+    'ServiceRollup',
 ]
@@ -6,12 +6,17 @@ Unified observability with metrics, logs, and traces
 Reference: Uber's uMonitor - AI anomaly detection pinpoints faulty services in real-time [10]
 """
 
+from bisect import bisect_left, bisect_right
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from operator import itemgetter
+from typing import Any, Callable, Deque, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
 import uuid
 
+T = TypeVar('T')
+
 
 class LogLevel(Enum):
     """Log levels"""
@@ -150,76 +155,361 @@ class CorrelatedEvent:
         }
 
 
+class TimeIndex(Generic[T]):
+    """
+    Timestamp-sorted, bounded index with bisect-based range queries
+
+    Items are kept in parallel sorted lists of POSIX timestamps and items.
+    In-order inserts append in O(1); window queries cost O(log n + k).
+    When ``max_size`` is exceeded the earliest items are evicted ring-buffer
+    style by advancing a head offset, with periodic compaction.
+    """
+    
+    _COMPACT_THRESHOLD = 1024
+    
+    def __init__(self, key: Callable[[T], datetime], max_size: Optional[int] = None):
+        self._key = key
+        self._max_size = max_size
+        self._keys: List[float] = []
+        self._items: List[Optional[T]] = []
+        self._head = 0
+    
+    def __len__(self) -> int:
+        return len(self._keys) - self._head
+    
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items[self._head:])  # type: ignore[arg-type]
+    
+    def add(self, item: T) -> List[T]:
+        """
+        Insert an item
+        
+        Returns:
+            Items evicted to stay within ``max_size``
+        """
+        ts = self._key(item).timestamp()
+        if len(self._keys) == self._head or ts >= self._keys[-1]:
+            self._keys.append(ts)
+            self._items.append(item)
+        else:
+            i = bisect_right(self._keys, ts, lo=self._head)
+            self._keys.insert(i, ts)
+            self._items.insert(i, item)
+        
+        evicted: List[T] = []
+        if self._max_size is not None:
+            while len(self) > self._max_size:
+                evicted.append(self._items[self._head])  # type: ignore[arg-type]
+                self._items[self._head] = None
+                self._head += 1
+            if self._head > self._COMPACT_THRESHOLD and self._head * 2 > len(self._keys):
+                del self._keys[:self._head]
+                del self._items[:self._head]
+                self._head = 0
+        return evicted
+    
+    def range(self, start: datetime, end: datetime) -> List[T]:
+        """Items with start <= timestamp <= end, in timestamp order"""
+        lo = bisect_left(self._keys, start.timestamp(), lo=self._head)
+        hi = bisect_right(self._keys, end.timestamp(), lo=lo)
+        return self._items[lo:hi]  # type: ignore[return-value]
+    
+    def since(self, start: datetime) -> List[T]:
+        """Items with timestamp >= start, in timestamp order"""
+        lo = bisect_left(self._keys, start.timestamp(), lo=self._head)
+        return self._items[lo:]  # type: ignore[return-value]
+
+
+@dataclass
+class ServiceRollup:
+    """Per-service counters maintained as telemetry is written"""
+    service: str
+    log_counts: Dict[LogLevel, int] = field(default_factory=dict)
+    total_traces: int = 0
+    error_traces: int = 0
+    
+    def is_empty(self) -> bool:
+        return self.total_traces == 0 and not any(self.log_counts.values())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'service': self.service,
+            'log_counts': {level.value: count for level, count in self.log_counts.items()},
+            'total_traces': self.total_traces,
+            'error_traces': self.error_traces
+        }
+
+
+class TelemetryIndex:
+    """
+    Indexed, bounded store for logs and trace spans
+    
+    Maintains on every write:
+    - sorted time indexes over logs (timestamp) and spans (start time)
+    - trace_id -> spans / logs hash indexes
+    - per-service rollups (log counts by level, traces, error traces)
+    - a duration-sorted index of ended root spans for slow-trace queries
+    
+    Spans should be ended through ``span_ended`` (as ObservabilityPlatform
+    does) so the rollups and duration index see the final status.
+    """
+    
+    def __init__(self, max_logs: int = 10000, max_spans: int = 10000):
+        self.logs: TimeIndex[LogEntry] = TimeIndex(lambda entry: entry.timestamp, max_logs)
+        self.spans: TimeIndex[TraceSpan] = TimeIndex(lambda s: s.start_time, max_spans)
+        self._spans_by_trace: Dict[str, List[TraceSpan]] = {}
+        self._logs_by_trace: Dict[str, Deque[LogEntry]] = {}
+        self._rollups: Dict[str, ServiceRollup] = {}
+        # First span per (trace, service), the one counted in the rollup
+        self._representatives: Dict[Tuple[str, str], TraceSpan] = {}
+        # First root span per trace
+        self._roots: Dict[str, TraceSpan] = {}
+        # Ended root spans sorted by (duration, span_id); keys by trace for removal
+        self._duration_keys: List[Tuple[float, str]] = []
+        self._duration_spans: List[TraceSpan] = []
+        self._duration_key_by_trace: Dict[str, Tuple[float, str]] = {}
+    
+    # === Writes ===
+    
+    def add_log(self, entry: LogEntry) -> None:
+        """Index a log entry"""
+        if entry.service:
+            counts = self._rollup(entry.service).log_counts
+            counts[entry.level] = counts.get(entry.level, 0) + 1
+        if entry.trace_id:
+            self._logs_by_trace.setdefault(entry.trace_id, deque()).append(entry)
+        for evicted in self.logs.add(entry):
+            self._forget_log(evicted)
+    
+    def add_span(self, span: TraceSpan) -> None:
+        """Index a newly started span"""
+        self._spans_by_trace.setdefault(span.trace_id, []).append(span)
+        if span.parent_span_id is None and span.trace_id not in self._roots:
+            self._set_root(span.trace_id, span)
+        if span.service:
+            key = (span.trace_id, span.service)
+            if key not in self._representatives:
+                self._set_representative(key, span)
+        for evicted in self.spans.add(span):
+            self._forget_span(evicted)
+    
+    def span_ended(self, span: TraceSpan, previous_status: TraceStatus) -> None:
+        """Update rollups and the duration index after a span ends"""
+        if span.service and self._representatives.get((span.trace_id, span.service)) is span:
+            rollup = self._rollup(span.service)
+            if previous_status == TraceStatus.ERROR:
+                rollup.error_traces -= 1
+            if span.status == TraceStatus.ERROR:
+                rollup.error_traces += 1
+        if self._roots.get(span.trace_id) is span:
+            self._unindex_duration(span)
+            self._index_duration(span)
+    
+    # === Queries ===
+    
+    def trace_spans(self, trace_id: str) -> List[TraceSpan]:
+        return list(self._spans_by_trace.get(trace_id, []))
+    
+    def trace_logs(self, trace_id: str) -> List[LogEntry]:
+        return list(self._logs_by_trace.get(trace_id, ()))
+    
+    def trace_count(self) -> int:
+        return len(self._spans_by_trace)
+    
+    def rollup(self, service: str) -> ServiceRollup:
+        """Rollup for a service (empty if nothing was recorded)"""
+        return self._rollups.get(service) or ServiceRollup(service=service)
+    
+    def services(self) -> List[str]:
+        return list(self._rollups)
+    
+    def slow_roots(self, threshold_ms: float) -> List[TraceSpan]:
+        """Ended root spans slower than the threshold, slowest first"""
+        i = bisect_right(self._duration_keys, threshold_ms, key=itemgetter(0))
+        return self._duration_spans[i:][::-1]
+    
+    # === Internals ===
+    
+    def _rollup(self, service: str) -> ServiceRollup:
+        rollup = self._rollups.get(service)
+        if rollup is None:
+            rollup = self._rollups[service] = ServiceRollup(service=service)
+        return rollup
+    
+    def _release_rollup(self, service: str) -> None:
+        rollup = self._rollups.get(service)
+        if rollup is not None and rollup.is_empty():
+            del self._rollups[service]
+    
+    def _set_representative(self, key: Tuple[str, str], span: TraceSpan) -> None:
+        self._representatives[key] = span
+        rollup = self._rollup(key[1])
+        rollup.total_traces += 1
+        if span.status == TraceStatus.ERROR:
+            rollup.error_traces += 1
+    
+    def _set_root(self, trace_id: str, span: TraceSpan) -> None:
+        self._roots[trace_id] = span
+        self._index_duration(span)
+    
+    def _index_duration(self, span: TraceSpan) -> None:
+        duration = span.duration_ms()
+        if duration is None:
+            return
+        key = (duration, span.span_id)
+        i = bisect_right(self._duration_keys, key)
+        self._duration_keys.insert(i, key)
+        self._duration_spans.insert(i, span)
+        self._duration_key_by_trace[span.trace_id] = key
+    
+    def _unindex_duration(self, span: TraceSpan) -> None:
+        key = self._duration_key_by_trace.get(span.trace_id)
+        if key is None:
+            return
+        i = bisect_left(self._duration_keys, key)
+        while i < len(self._duration_keys) and self._duration_keys[i] == key:
+            if self._duration_spans[i] is span:
+                del self._duration_keys[i]
+                del self._duration_spans[i]
+                del self._duration_key_by_trace[span.trace_id]
+                return
+            i += 1
+    
+    def _forget_log(self, entry: LogEntry) -> None:
+        if entry.service:
+            rollup = self._rollup(entry.service)
+            rollup.log_counts[entry.level] = rollup.log_counts.get(entry.level, 1) - 1
+            self._release_rollup(entry.service)
+        if entry.trace_id:
+            trace_logs = self._logs_by_trace.get(entry.trace_id)
+            if trace_logs:
+                if trace_logs[0] is entry:
+                    trace_logs.popleft()
+                else:
+                    trace_logs.remove(entry)
+                if not trace_logs:
+                    del self._logs_by_trace[entry.trace_id]
+    
+    def _forget_span(self, span: TraceSpan) -> None:
+        trace_spans = self._spans_by_trace.get(span.trace_id, [])
+        if span in trace_spans:
+            trace_spans.remove(span)
+        
+        key = (span.trace_id, span.service)
+        if span.service and self._representatives.get(key) is span:
+            del self._representatives[key]
+            rollup = self._rollup(span.service)
+            rollup.total_traces -= 1
+            if span.status == TraceStatus.ERROR:
+                rollup.error_traces -= 1
+            successor = next((s for s in trace_spans if s.service == span.service), None)
+            if successor is not None:
+                self._set_representative(key, successor)
+            self._release_rollup(span.service)
+        
+        if self._roots.get(span.trace_id) is span:
+            del self._roots[span.trace_id]
+            self._unindex_duration(span)
+            successor = next((s for s in trace_spans if s.parent_span_id is None), None)
+            if successor is not None:
+                self._set_root(span.trace_id, successor)
+        
+        if not trace_spans:
+            self._spans_by_trace.pop(span.trace_id, None)
+
+
 class CorrelationEngine:
     """
     Correlation Engine
     
     Correlates events across metrics, logs, and traces
+    
+    When bound to a TelemetryIndex, logs and traces may be omitted and the
+    index answers the window / trace lookups directly instead of scanning.
     """
     
-    def __init__(self, time_window_seconds: int = 300):
+    def __init__(self, time_window_seconds: int = 300, index: Optional[TelemetryIndex] = None):
         self._time_window = time_window_seconds
+        self._index = index
         self._events: List[CorrelatedEvent] = []
     
     def correlate_by_time(
         self,
-        logs: List[LogEntry],
-        traces: List[TraceSpan],
-        metric_names: List[str],
-        reference_time: datetime
+        logs: Optional[List[LogEntry]] = None,
+        traces: Optional[List[TraceSpan]] = None,
+        metric_names: Optional[List[str]] = None,
+        reference_time: Optional[datetime] = None
     ) -> CorrelatedEvent:
         """Correlate events by time proximity"""
+        reference_time = reference_time or datetime.now()
+        window = timedelta(seconds=self._time_window)
+        start, end = reference_time - window, reference_time + window
+        
+        if logs is None:
+            logs = self._index.logs.range(start, end) if self._index else []
+        else:
+            logs = [entry for entry in logs if start <= entry.timestamp <= end]
+        if traces is None:
+            traces = self._index.spans.range(start, end) if self._index else []
+        else:
+            traces = [t for t in traces if start <= t.start_time <= end]
+        
         event = CorrelatedEvent(
             event_type=EventType.INCIDENT,
             title="Time-correlated event",
             timestamp=reference_time
         )
+        seen_services = set()
         
-        # Find logs within time window
         for log in logs:
-            time_diff = abs((log.timestamp - reference_time).total_seconds())
-            if time_diff <= self._time_window:
-                event.related_logs.append(log.log_id)
-                if log.service and log.service not in event.related_services:
-                    event.related_services.append(log.service)
+            event.related_logs.append(log.log_id)
+            if log.service and log.service not in seen_services:
+                seen_services.add(log.service)
+                event.related_services.append(log.service)
         
-        # Find traces within time window
         for trace in traces:
-            time_diff = abs((trace.start_time - reference_time).total_seconds())
-            if time_diff <= self._time_window:
-                event.related_traces.append(trace.trace_id)
-                if trace.service and trace.service not in event.related_services:
-                    event.related_services.append(trace.service)
+            event.related_traces.append(trace.trace_id)
+            if trace.service and trace.service not in seen_services:
+                seen_services.add(trace.service)
+                event.related_services.append(trace.service)
         
-        event.related_metrics = metric_names
+        event.related_metrics = metric_names or []
         
         self._events.append(event)
         return event
     
     def correlate_by_trace(
         self,
-        logs: List[LogEntry],
-        traces: List[TraceSpan],
-        trace_id: str
+        logs: Optional[List[LogEntry]] = None,
+        traces: Optional[List[TraceSpan]] = None,
+        trace_id: str = ""
     ) -> CorrelatedEvent:
         """Correlate events by trace ID"""
+        if traces is None:
+            trace_spans = self._index.trace_spans(trace_id) if self._index else []
+        else:
+            trace_spans = [t for t in traces if t.trace_id == trace_id]
+        if logs is None:
+            trace_logs = self._index.trace_logs(trace_id) if self._index else []
+        else:
+            trace_logs = [entry for entry in logs if entry.trace_id == trace_id]
+        
         event = CorrelatedEvent(
             event_type=EventType.INCIDENT,
             title=f"Trace-correlated event: {trace_id}"
         )
+        seen_spans = set()
+        seen_services = set()
         
-        # Find all spans in trace
-        trace_spans = [t for t in traces if t.trace_id == trace_id]
         for span in trace_spans:
-            if span.span_id not in event.related_traces:
+            if span.span_id not in seen_spans:
+                seen_spans.add(span.span_id)
                 event.related_traces.append(span.span_id)
-            if span.service and span.service not in event.related_services:
+            if span.service and span.service not in seen_services:
+                seen_services.add(span.service)
                 event.related_services.append(span.service)
         
-        # Find logs with matching trace ID
-        for log in logs:
-            if log.trace_id == trace_id:
-                event.related_logs.append(log.log_id)
+        event.related_logs = [entry.log_id for entry in trace_logs]
         
         self._events.append(event)
         return event
@@ -236,19 +526,29 @@ class ObservabilityPlatform:
     Unified observability with metrics, logs, and traces
     
     Reference: Uber's uMonitor for real-time AI anomaly detection [10]
+    
+    Logs and spans live in a TelemetryIndex, so time-window, trace and
+    service queries are answered from indexes and write-time rollups
+    rather than scans over the retained telemetry.
     """
     
-    def __init__(self):
-        self._logs: List[LogEntry] = []
-        self._traces: Dict[str, List[TraceSpan]] = {}  # trace_id -> spans
+    def __init__(self, max_retention: int = 10000, correlation_window_seconds: int = 300):
+        self._max_retention = max_retention  # Max logs / spans to retain
+        self._index = TelemetryIndex(max_logs=max_retention, max_spans=max_retention)
         self._events: List[CorrelatedEvent] = []
-        self._correlation_engine = CorrelationEngine()
-        self._max_retention = 10000  # Max entries to retain
+        self._correlation_engine = CorrelationEngine(
+            time_window_seconds=correlation_window_seconds,
+            index=self._index
+        )
     
     @property
     def correlation_engine(self) -> CorrelationEngine:
         return self._correlation_engine
     
+    @property
+    def telemetry_index(self) -> TelemetryIndex:
+        return self._index
+    
     # === Logging ===
     
     def log(
@@ -271,8 +571,7 @@ class ObservabilityPlatform:
             span_id=span_id,
             attributes=attributes or {}
         )
-        self._logs.append(entry)
-        self._cleanup_logs()
+        self._index.add_log(entry)
         return entry
     
     def log_info(self, message: str, **kwargs) -> LogEntry:
@@ -291,22 +590,15 @@ class ObservabilityPlatform:
         since: Optional[datetime] = None
     ) -> List[LogEntry]:
         """Get logs with optional filters"""
-        logs = self._logs
+        logs = self._index.logs.since(since) if since else list(self._index.logs)
         
         if service:
             logs = [l for l in logs if l.service == service]
         if level:
             logs = [l for l in logs if l.level == level]
-        if since:
-            logs = [l for l in logs if l.timestamp >= since]
         
         return logs
     
-    def _cleanup_logs(self) -> None:
-        """Clean up old logs"""
-        if len(self._logs) > self._max_retention:
-            self._logs = self._logs[-self._max_retention:]
-    
     # === Tracing ===
     
     def start_trace(
@@ -323,11 +615,7 @@ class ObservabilityPlatform:
             operation=operation,
             attributes=attributes or {}
         )
-        
-        if span.trace_id not in self._traces:
-            self._traces[span.trace_id] = []
-        self._traces[span.trace_id].append(span)
-        
+        self._index.add_span(span)
         return span
     
     def start_span(
@@ -348,30 +636,39 @@ class ObservabilityPlatform:
             operation=operation,
             attributes=attributes or {}
         )
-        
-        if trace_id not in self._traces:
-            self._traces[trace_id] = []
-        self._traces[trace_id].append(span)
-        
+        self._index.add_span(span)
         return span
     
     def end_span(self, span: TraceSpan, status: TraceStatus = TraceStatus.OK) -> None:
         """End a span"""
+        previous_status = span.status
         span.end(status)
+        self._index.span_ended(span, previous_status)
     
     def get_trace(self, trace_id: str) -> List[TraceSpan]:
         """Get all spans in a trace"""
-        return self._traces.get(trace_id, [])
+        return self._index.trace_spans(trace_id)
     
     def get_slow_traces(self, threshold_ms: float = 1000) -> List[TraceSpan]:
-        """Get traces slower than threshold"""
-        slow = []
-        for trace_id, spans in self._traces.items():
-            # Find root span
-            root = next((s for s in spans if s.parent_span_id is None), None)
-            if root and root.duration_ms() and root.duration_ms() > threshold_ms:
-                slow.append(root)
-        return slow
+        """Get root spans of traces slower than threshold, slowest first"""
+        return self._index.slow_roots(threshold_ms)
+    
+    # === Correlation ===
+    
+    def correlate_by_time(
+        self,
+        reference_time: Optional[datetime] = None,
+        metric_names: Optional[List[str]] = None
+    ) -> CorrelatedEvent:
+        """Correlate retained logs and spans around a point in time"""
+        return self._correlation_engine.correlate_by_time(
+            metric_names=metric_names,
+            reference_time=reference_time
+        )
+    
+    def correlate_by_trace(self, trace_id: str) -> CorrelatedEvent:
+        """Correlate retained logs and spans sharing a trace ID"""
+        return self._correlation_engine.correlate_by_trace(trace_id=trace_id)
     
     # === Events ===
     
@@ -417,27 +714,18 @@ class ObservabilityPlatform:
     
     def get_service_health(self, service: str) -> Dict[str, Any]:
         """Get health summary for a service"""
-        # Count error logs
-        error_logs = self.get_logs(service=service, level=LogLevel.ERROR)
-        warning_logs = self.get_logs(service=service, level=LogLevel.WARNING)
+        rollup = self._index.rollup(service)
+        error_logs = rollup.log_counts.get(LogLevel.ERROR, 0)
+        warning_logs = rollup.log_counts.get(LogLevel.WARNING, 0)
         
-        # Get traces for service
-        service_traces = []
-        for trace_id, spans in self._traces.items():
-            for span in spans:
-                if span.service == service:
-                    service_traces.append(span)
-                    break
+        # Traces are counted by the first span of each trace for the service
+        total_traces = rollup.total_traces
+        error_traces = rollup.error_traces
+        error_rate = error_traces / total_traces if total_traces > 0 else 0
         
-        error_traces = [t for t in service_traces if t.status == TraceStatus.ERROR]
-        
-        # Calculate health score
-        total_traces = len(service_traces)
-        error_rate = len(error_traces) / total_traces if total_traces > 0 else 0
-        
-        if error_rate > 0.1 or len(error_logs) > 10:
+        if error_rate > 0.1 or error_logs > 10:
             status = "UNHEALTHY"
-        elif error_rate > 0.05 or len(warning_logs) > 10:
+        elif error_rate > 0.05 or warning_logs > 10:
             status = "DEGRADED"
         else:
             status = "HEALTHY"
@@ -445,29 +733,20 @@ class ObservabilityPlatform:
         return {
             'service': service,
             'status': status,
-            'error_logs': len(error_logs),
-            'warning_logs': len(warning_logs),
+            'error_logs': error_logs,
+            'warning_logs': warning_logs,
             'total_traces': total_traces,
-            'error_traces': len(error_traces),
+            'error_traces': error_traces,
             'error_rate': error_rate,
             'timestamp': datetime.now().isoformat()
         }
     
     def get_platform_summary(self) -> Dict[str, Any]:
         """Get overall platform summary"""
-        services = set()
-        for spans in self._traces.values():
-            for span in spans:
-                if span.service:
-                    services.add(span.service)
-        for log in self._logs:
-            if log.service:
-                services.add(log.service)
-        
         return {
-            'total_logs': len(self._logs),
-            'total_traces': len(self._traces),
+            'total_logs': len(self._index.logs),
+            'total_traces': self._index.trace_count(),
             'total_events': len(self._events),
-            'services': list(services),
+            'services': self._index.services(),
             'timestamp': datetime.now().isoformat()
         }
@@ -6,14 +6,20 @@ AI-driven anomaly detection without manual thresholds
 Reference: AI-enhanced observability with automatic anomaly detection [4]
 """
 
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
 import uuid
 import statistics
 import math
 
+import numpy as np
+
+from ..safety.anomaly_detector import MetricWindow
+from .streaming_baselines import StreamingBaseline, to_epoch
+
 
 class AnomalyDetectionStrategy(Enum):
     """Strategies for detecting anomalies"""
@@ -85,6 +91,11 @@ class SmartAnomalyDetector:
     
     AI-driven anomaly detection without manual thresholds
     
+    Each metric carries a streaming, seasonality-aware baseline
+    (Holt-Winters + robust residual scale + CUSUM) that is updated in O(1)
+    per sample. Until that baseline is warm, samples are scored against the
+    flat mean/stdev baseline of the recent window.
+
     Reference: AI-enhanced observability with automatic anomaly detection [4]
     """
     
@@ -92,13 +103,21 @@ class SmartAnomalyDetector:
         self,
         default_strategy: AnomalyDetectionStrategy = AnomalyDetectionStrategy.STATISTICAL,
         sensitivity: float = 2.0,  # Z-score threshold
-        min_samples: int = 10
+        min_samples: int = 10,
+        season_length: int = 24,
+        season_period_seconds: float = 86400.0,
+        max_samples: int = 1000
     ):
         self._default_strategy = default_strategy
         self._sensitivity = sensitivity
         self._min_samples = min_samples
+        self._season_length = season_length
+        self._season_period_seconds = season_period_seconds
+        self._max_samples = max_samples
         self._baselines: Dict[str, Dict[str, float]] = {}
-        self._history: Dict[str, List[float]] = {}
+        self._windows: Dict[str, MetricWindow] = {}
+        self._streaming: Dict[str, StreamingBaseline] = {}
+        self._history: Dict[str, Deque[float]] = {}
         self._anomalies: List[DetectedAnomaly] = []
         self._category_rules: Dict[str, AnomalyCategory] = {}
     
@@ -118,8 +137,18 @@ class SmartAnomalyDetector:
             'max': max_val
         }
     
-    def learn_baseline(self, metric_name: str, values: List[float]) -> Dict[str, float]:
-        """Learn baseline from historical data"""
+    def learn_baseline(
+        self,
+        metric_name: str,
+        values: List[float],
+        timestamps: Optional[Sequence[datetime]] = None
+    ) -> Dict[str, float]:
+        """
+        Learn baseline from historical data
+
+        The values also warm up the streaming baseline; pass timestamps so
+        the seasonal buckets are populated.
+        """
         if not values:
             return {}
         
@@ -130,23 +159,104 @@ class SmartAnomalyDetector:
             'max': max(values)
         }
         self._baselines[metric_name] = baseline
-        self._history[metric_name] = values.copy()
+
+        window = MetricWindow(max_size=self._max_samples)
+        window.extend(values)
+        self._windows[metric_name] = window
+        self._history[metric_name] = deque(values, maxlen=self._max_samples)
+
+        streaming = self._new_streaming_baseline()
+        for i, value in enumerate(values):
+            streaming.update(value, to_epoch(timestamps[i]) if timestamps else None)
+        self._streaming[metric_name] = streaming
         return baseline
     
-    def add_sample(self, metric_name: str, value: float) -> None:
-        """Add a sample to the history"""
+    def _new_streaming_baseline(self) -> StreamingBaseline:
+        return StreamingBaseline(
+            season_length=self._season_length,
+            season_period_seconds=self._season_period_seconds
+        )
+
+    def add_sample(
+        self,
+        metric_name: str,
+        value: float,
+        timestamp: Optional[datetime] = None
+    ) -> None:
+        """Add a sample to the history and update its baselines in O(1)"""
         if metric_name not in self._history:
-            self._history[metric_name] = []
+            self._history[metric_name] = deque(maxlen=self._max_samples)
+            self._windows[metric_name] = MetricWindow(max_size=self._max_samples)
+            self._streaming[metric_name] = self._new_streaming_baseline()
         self._history[metric_name].append(value)
-        
-        # Keep only recent samples
-        max_samples = 1000
-        if len(self._history[metric_name]) > max_samples:
-            self._history[metric_name] = self._history[metric_name][-max_samples:]
-        
-        # Update baseline if enough samples
-        if len(self._history[metric_name]) >= self._min_samples:
-            self.learn_baseline(metric_name, self._history[metric_name])
+        self._windows[metric_name].add(value, timestamp)
+        self._streaming[metric_name].update(value, to_epoch(timestamp or datetime.now()))
+
+    def _fold_batch(
+        self,
+        metric_name: str,
+        vals: np.ndarray,
+        ts: np.ndarray
+    ) -> List[Tuple[int, str, float]]:
+        """
+        Add a batch of samples to the history and baselines
+
+        Returns:
+            (batch index, direction, level) of each CUSUM change point
+        """
+        offset = 0
+        if metric_name not in self._history:
+            self.add_sample(metric_name, float(vals[0]), datetime.fromtimestamp(ts[0]))
+            vals, ts = vals[1:], ts[1:]
+            offset = 1
+        self._history[metric_name].extend(vals.tolist())
+        self._windows[metric_name].extend_epoch(vals, ts)
+        streaming = self._streaming[metric_name]
+        changes = []
+        for i, (value, t) in enumerate(zip(vals.tolist(), ts.tolist(), strict=True)):
+            direction = streaming.update(value, t).change_point
+            if direction:
+                changes.append((i + offset, direction, streaming.model.level or 0.0))
+        return changes
+
+    def get_baseline(self, metric_name: str) -> Optional[Dict[str, float]]:
+        """
+        Current flat baseline for a metric
+
+        Derived from the recent sample window once it holds ``min_samples``
+        values, otherwise the explicitly set or learned baseline.
+        """
+        window = self._windows.get(metric_name)
+        if window is not None and len(window) >= self._min_samples:
+            values = window.values
+            return {
+                'mean': window.mean,
+                'stdev': window.std_dev,
+                'min': float(values.min()),
+                'max': float(values.max())
+            }
+        return self._baselines.get(metric_name)
+
+    def export_state(self) -> Dict[str, Any]:
+        """Serialize the streaming baselines so a restart needs no replay"""
+        return {
+            'baselines': {
+                name: baseline.to_dict() for name, baseline in self._streaming.items()
+            },
+            'flat': {
+                name: self.get_baseline(name) for name in self._streaming
+                if self.get_baseline(name)
+            }
+        }
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        """Restore streaming baselines produced by ``export_state``"""
+        for name, data in state.get('baselines', {}).items():
+            self._streaming[name] = StreamingBaseline.from_dict(data)
+            self._history.setdefault(name, deque(maxlen=self._max_samples))
+            self._windows.setdefault(name, MetricWindow(max_size=self._max_samples))
+        for name, baseline in state.get('flat', {}).items():
+            self._baselines[name] = baseline
     
     def set_category_rule(self, metric_pattern: str, category: AnomalyCategory) -> None:
         """Set category rule for metric patterns"""
@@ -190,35 +300,134 @@ class SmartAnomalyDetector:
         else:
             return AnomalySeverity.LOW
     
+    def _statistical_anomaly(
+        self,
+        metric_name: str,
+        value: float,
+        expected: float,
+        z_score: float,
+        seasonal: bool
+    ) -> DetectedAnomaly:
+        deviation = z_score
+        confidence = min(1.0, z_score / 5.0)
+        kind = "Seasonal anomaly" if seasonal else "Statistical anomaly"
+        return DetectedAnomaly(
+            metric_name=metric_name,
+            category=self._get_category(metric_name),
+            severity=self._calculate_severity(deviation, confidence),
+            strategy_used=AnomalyDetectionStrategy.STATISTICAL,
+            current_value=value,
+            expected_value=expected,
+            deviation=deviation,
+            confidence=confidence,
+            description=f"{kind}: {metric_name} = {value:.2f} (expected {expected:.2f}, z-score {z_score:.2f})"
+        )
+
+    def _threshold_anomaly(
+        self,
+        metric_name: str,
+        value: float,
+        direction: str,
+        threshold: float
+    ) -> DetectedAnomaly:
+        deviation = abs(value - threshold) / max(abs(threshold), 1.0)
+        return DetectedAnomaly(
+            metric_name=metric_name,
+            category=self._get_category(metric_name),
+            severity=self._calculate_severity(deviation, 0.9),
+            strategy_used=AnomalyDetectionStrategy.THRESHOLD,
+            current_value=value,
+            expected_value=threshold,
+            deviation=deviation,
+            confidence=0.9,
+            description=f"Threshold violation: {metric_name} = {value:.2f} is {direction} threshold {threshold:.2f}"
+        )
+
+    def _rate_anomaly(
+        self,
+        metric_name: str,
+        value: float,
+        prev_value: float,
+        rate_change: float
+    ) -> DetectedAnomaly:
+        return DetectedAnomaly(
+            metric_name=metric_name,
+            category=self._get_category(metric_name),
+            severity=self._calculate_severity(rate_change * 2, 0.8),
+            strategy_used=AnomalyDetectionStrategy.RATE_LIMIT,
+            current_value=value,
+            expected_value=prev_value,
+            deviation=rate_change,
+            confidence=0.8,
+            description=f"Rate change anomaly: {metric_name} changed {rate_change*100:.1f}% from {prev_value:.2f} to {value:.2f}"
+        )
+
     def detect_statistical(
         self,
         metric_name: str,
-        value: float
+        value: float,
+        timestamp: Optional[datetime] = None
     ) -> Optional[DetectedAnomaly]:
-        """Detect anomaly using statistical method (Z-score)"""
-        baseline = self._baselines.get(metric_name)
+        """
+        Detect anomaly using statistical method (Z-score)
+
+        Uses the seasonal streaming baseline once warm, otherwise the flat
+        mean/stdev baseline.
+        """
+        streaming = self._streaming.get(metric_name)
+        if streaming is not None and streaming.is_warm(self._min_samples):
+            result = streaming.score(value, to_epoch(timestamp or datetime.now()))
+            z_score = abs(result.z_score)
+            if z_score > self._sensitivity:
+                return self._statistical_anomaly(
+                    metric_name, value, result.expected, z_score, seasonal=True
+                )
+            return None
+
+        baseline = self.get_baseline(metric_name)
         if not baseline or baseline['stdev'] == 0:
             return None
         
         z_score = abs((value - baseline['mean']) / baseline['stdev'])
         
         if z_score > self._sensitivity:
-            deviation = z_score
-            confidence = min(1.0, z_score / 5.0)
-            
-            return DetectedAnomaly(
-                metric_name=metric_name,
-                category=self._get_category(metric_name),
-                severity=self._calculate_severity(deviation, confidence),
-                strategy_used=AnomalyDetectionStrategy.STATISTICAL,
-                current_value=value,
-                expected_value=baseline['mean'],
-                deviation=deviation,
-                confidence=confidence,
-                description=f"Statistical anomaly: {metric_name} = {value:.2f} (expected {baseline['mean']:.2f}, z-score {z_score:.2f})"
+            return self._statistical_anomaly(
+                metric_name, value, baseline['mean'], z_score, seasonal=False
             )
         
         return None
+
+    def detect_change_point(self, metric_name: str) -> Optional[DetectedAnomaly]:
+        """Report a level shift flagged by the CUSUM detector, if any"""
+        streaming = self._streaming.get(metric_name)
+        if streaming is None or streaming.cusum.last_change is None:
+            return None
+        changed_at, direction = streaming.cusum.last_change
+        streaming.cusum.last_change = None
+        anomaly = self._change_point_anomaly(
+            metric_name, direction, streaming.model.level or 0.0, streaming.cusum.threshold
+        )
+        anomaly.timestamp = datetime.fromtimestamp(changed_at) if changed_at else datetime.now()
+        return anomaly
+
+    def _change_point_anomaly(
+        self,
+        metric_name: str,
+        direction: str,
+        level: float,
+        threshold: float
+    ) -> DetectedAnomaly:
+        return DetectedAnomaly(
+            metric_name=metric_name,
+            category=self._get_category(metric_name),
+            severity=self._calculate_severity(threshold, 0.7),
+            strategy_used=AnomalyDetectionStrategy.STATISTICAL,
+            current_value=level,
+            expected_value=level,
+            deviation=threshold,
+            confidence=0.7,
+            description=f"Change point: {metric_name} level shifted {direction}"
+        )
     
     def detect_threshold(
         self,
@@ -228,32 +437,15 @@ class SmartAnomalyDetector:
         max_threshold: Optional[float] = None
     ) -> Optional[DetectedAnomaly]:
         """Detect anomaly using threshold-based method"""
-        baseline = self._baselines.get(metric_name, {})
+        baseline = self.get_baseline(metric_name) or {}
         
         min_val = min_threshold if min_threshold is not None else baseline.get('min')
         max_val = max_threshold if max_threshold is not None else baseline.get('max')
         
-        violation = None
         if min_val is not None and value < min_val:
-            violation = ('below', min_val)
+            return self._threshold_anomaly(metric_name, value, 'below', min_val)
         elif max_val is not None and value > max_val:
-            violation = ('above', max_val)
-        
-        if violation:
-            direction, threshold = violation
-            deviation = abs(value - threshold) / max(abs(threshold), 1.0)
-            
-            return DetectedAnomaly(
-                metric_name=metric_name,
-                category=self._get_category(metric_name),
-                severity=self._calculate_severity(deviation, 0.9),
-                strategy_used=AnomalyDetectionStrategy.THRESHOLD,
-                current_value=value,
-                expected_value=threshold,
-                deviation=deviation,
-                confidence=0.9,
-                description=f"Threshold violation: {metric_name} = {value:.2f} is {direction} threshold {threshold:.2f}"
-            )
+            return self._threshold_anomaly(metric_name, value, 'above', max_val)
         
         return None
     
@@ -275,17 +467,7 @@ class SmartAnomalyDetector:
         rate_change = abs(value - prev_value) / abs(prev_value)
         
         if rate_change > max_rate_change:
-            return DetectedAnomaly(
-                metric_name=metric_name,
-                category=self._get_category(metric_name),
-                severity=self._calculate_severity(rate_change * 2, 0.8),
-                strategy_used=AnomalyDetectionStrategy.RATE_LIMIT,
-                current_value=value,
-                expected_value=prev_value,
-                deviation=rate_change,
-                confidence=0.8,
-                description=f"Rate change anomaly: {metric_name} changed {rate_change*100:.1f}% from {prev_value:.2f} to {value:.2f}"
-            )
+            return self._rate_anomaly(metric_name, value, prev_value, rate_change)
         
         return None
     
@@ -293,7 +475,8 @@ class SmartAnomalyDetector:
         self,
         metric_name: str,
         value: float,
-        strategy: Optional[AnomalyDetectionStrategy] = None
+        strategy: Optional[AnomalyDetectionStrategy] = None,
+        timestamp: Optional[datetime] = None
     ) -> Optional[DetectedAnomaly]:
         """
         Detect anomaly using specified or default strategy
@@ -301,37 +484,136 @@ class SmartAnomalyDetector:
         For HYBRID strategy, uses all available methods and returns most confident result
         """
         strategy = strategy or self._default_strategy
+        timestamp = timestamp or datetime.now()
         
         # Add sample to history
-        self.add_sample(metric_name, value)
+        self.add_sample(metric_name, value, timestamp)
         
         if strategy == AnomalyDetectionStrategy.STATISTICAL:
-            return self.detect_statistical(metric_name, value)
+            return self.detect_statistical(metric_name, value, timestamp)
         elif strategy == AnomalyDetectionStrategy.THRESHOLD:
             return self.detect_threshold(metric_name, value)
         elif strategy == AnomalyDetectionStrategy.RATE_LIMIT:
             return self.detect_rate_change(metric_name, value)
         elif strategy == AnomalyDetectionStrategy.HYBRID:
             # Try all strategies and return most confident
-            anomalies = []
-            
-            result = self.detect_statistical(metric_name, value)
-            if result:
-                anomalies.append(result)
-            
-            result = self.detect_threshold(metric_name, value)
-            if result:
-                anomalies.append(result)
-            
-            result = self.detect_rate_change(metric_name, value)
-            if result:
-                anomalies.append(result)
+            anomalies = [
+                result for result in (
+                    self.detect_statistical(metric_name, value, timestamp),
+                    self.detect_change_point(metric_name),
+                    self.detect_threshold(metric_name, value),
+                    self.detect_rate_change(metric_name, value),
+                )
+                if result
+            ]
             
             if anomalies:
                 # Return most confident
                 return max(anomalies, key=lambda a: a.confidence)
         
         return None
+
+    def detect_batch(
+        self,
+        metric_name: str,
+        values: Sequence[float],
+        timestamps: Optional[Sequence[datetime]] = None,
+        strategy: Optional[AnomalyDetectionStrategy] = None,
+        max_rate_change: float = 0.5
+    ) -> List[DetectedAnomaly]:
+        """
+        Score an array of samples at once
+
+        All samples are scored with vectorized NumPy operations against the
+        baselines as they stood before the batch, then folded into the
+        streaming baseline. Returned anomalies carry their batch position in
+        ``context['index']``.
+
+        This differs from calling ``detect`` per value, which folds each value
+        in before scoring it: statistical and threshold results use the
+        pre-batch baselines, and rate changes compare each value with the
+        previous sample. HYBRID also reports the CUSUM change points raised
+        while folding the batch in, like ``detect`` does.
+        """
+        strategy = strategy or self._default_strategy
+        vals = np.asarray(values, dtype=np.float64).ravel()
+        if vals.size == 0:
+            return []
+        if timestamps is None:
+            ts = np.full(vals.size, datetime.now().timestamp())
+        else:
+            ts = np.fromiter((t.timestamp() for t in timestamps), dtype=np.float64)
+
+        hybrid = strategy == AnomalyDetectionStrategy.HYBRID
+        candidates: Dict[int, List[DetectedAnomaly]] = {}
+
+        def flag(index: int, anomaly: DetectedAnomaly) -> None:
+            anomaly.timestamp = datetime.fromtimestamp(ts[index])
+            anomaly.context['index'] = index
+            candidates.setdefault(index, []).append(anomaly)
+
+        if hybrid or strategy == AnomalyDetectionStrategy.STATISTICAL:
+            streaming = self._streaming.get(metric_name)
+            baseline = self.get_baseline(metric_name)
+            if streaming is not None and streaming.is_warm(self._min_samples):
+                expected, z = streaming.score_many(vals, ts)
+                seasonal = True
+            elif baseline and baseline['stdev'] != 0:
+                expected = np.full(vals.size, baseline['mean'])
+                z = (vals - baseline['mean']) / baseline['stdev']
+                seasonal = False
+            else:
+                expected = z = None
+            if z is not None:
+                z = np.abs(z)
+                for i in np.flatnonzero(z > self._sensitivity).tolist():
+                    flag(i, self._statistical_anomaly(
+                        metric_name, float(vals[i]), float(expected[i]), float(z[i]), seasonal
+                    ))
+
+        if hybrid or strategy == AnomalyDetectionStrategy.THRESHOLD:
+            baseline = self.get_baseline(metric_name) or {}
+            min_val, max_val = baseline.get('min'), baseline.get('max')
+            if min_val is not None:
+                for i in np.flatnonzero(vals < min_val).tolist():
+                    flag(i, self._threshold_anomaly(metric_name, float(vals[i]), 'below', min_val))
+            if max_val is not None:
+                below = vals < min_val if min_val is not None else np.zeros(vals.size, bool)
+                for i in np.flatnonzero((vals > max_val) & ~below).tolist():
+                    flag(i, self._threshold_anomaly(metric_name, float(vals[i]), 'above', max_val))
+
+        if hybrid or strategy == AnomalyDetectionStrategy.RATE_LIMIT:
+            history = self._history.get(metric_name)
+            prev = np.empty(vals.size)
+            prev[1:] = vals[:-1]
+            prev[0] = history[-1] if history else np.nan
+            with np.errstate(invalid="ignore", divide="ignore"):
+                change = np.abs(vals - prev) / np.abs(prev)
+            valid = ~np.isnan(prev) & (prev != 0)
+            for i in np.flatnonzero(valid & (change > max_rate_change)).tolist():
+                flag(i, self._rate_anomaly(
+                    metric_name, float(vals[i]), float(prev[i]), float(change[i])
+                ))
+
+        if hybrid:
+            # A change point raised before the batch surfaces on its first sample
+            pending = self.detect_change_point(metric_name)
+            if pending is not None:
+                flag(0, pending)
+
+        changes = self._fold_batch(metric_name, vals, ts)
+        if hybrid and changes:
+            streaming = self._streaming[metric_name]
+            streaming.cusum.last_change = None
+            for i, direction, level in changes:
+                flag(i, self._change_point_anomaly(
+                    metric_name, direction, level, streaming.cusum.threshold
+                ))
+
+        return [
+            max(found, key=lambda a: a.confidence)
+            for _, found in sorted(candidates.items())
+        ]
     
     def get_anomalies(self) -> List[DetectedAnomaly]:
         """Get all detected anomalies"""
@@ -4,6 +4,8 @@ SynergyMesh Safety Mechanisms System (Phase 10)
 
 Core Components:
 - CircuitBreaker - 斷路器系統
+- AdaptiveConcurrencyLimiter - 自適應並發限制器
+- ResilienceRegistry - 目標韌性防護
 - EscalationLadder - 升級階梯系統
 - RollbackSystem - 回滾系統
 - AnomalyDetector - 異常檢測器
@@ -22,6 +24,29 @@ from .circuit_breaker import (
     CircuitBreakerState,
     CircuitBreakerConfig,
     CircuitBreakerRegistry,
+    CircuitBreakerOpenError,
+    SlidingWindow,
+    SlidingWindowType,
+)
+
+from .concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiterConfig,
+    ConcurrencyLimitExceededError,
+    LimitAlgorithm,
+)
+
+from .retry_policies import (
+    RetryBudget,
+    RetryConfig,
+    RetryPolicy,
+)
+
+from .resilience import (
+    ResilienceConfig,
+    ResilienceRegistry,
+    TargetGuard,
+    TRANSIENT_ERRORS,
 )
 
 from .escalation_ladder import (
@@ -45,6 +70,7 @@ from .anomaly_detector import (
     AnomalySeverity,
     AnomalyAlert,
     DetectionStrategy,
+    MetricWindow,
 )
 
 from .emergency_stop import (
@@ -68,6 +94,23 @@ __all__ = [
     'CircuitBreakerState',
     'CircuitBreakerConfig',
     'CircuitBreakerRegistry',
+    'CircuitBreakerOpenError',
+    'SlidingWindow',
+    'SlidingWindowType',
+    # Concurrency Limiter
+    'AdaptiveConcurrencyLimiter',
+    'ConcurrencyLimiterConfig',
+    'ConcurrencyLimitExceededError',
+    'LimitAlgorithm',
+    # Retry Policies
+    'RetryBudget',
+    'RetryConfig',
+    'RetryPolicy',
+    # Resilience
+    'ResilienceConfig',
+    'ResilienceRegistry',
+    'TargetGuard',
+    'TRANSIENT_ERRORS',
     # Escalation Ladder
     'EscalationLadder',
     'EscalationLevel',
@@ -85,6 +128,7 @@ __all__ = [
     'AnomalySeverity',
     'AnomalyAlert',
     'DetectionStrategy',
+    'MetricWindow',
     # Emergency Stop
     'EmergencyStop',
     'StopReason',
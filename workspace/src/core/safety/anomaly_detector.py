@@ -8,11 +8,14 @@ detect anomalies, neutralize risks, and learn from each incident [5]
 """
 
 from enum import Enum, auto
-from typing import Any, Callable, Dict, List, Optional, Tuple
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-import statistics
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from datetime import datetime
+from collections import deque
 import asyncio
+import math
+
+import numpy as np
 
 
 class AnomalyType(Enum):
@@ -59,40 +62,538 @@ class AnomalyAlert:
     acknowledged: bool = False
 
 
-@dataclass
 class MetricWindow:
-    """Sliding window of metric values"""
-    values: List[float] = field(default_factory=list)
-    timestamps: List[datetime] = field(default_factory=list)
-    max_size: int = 1000
-    
+    """
+    Sliding window of metric values backed by a NumPy ring buffer
+
+    Mean and variance are maintained incrementally with Welford's algorithm,
+    so ``mean`` and ``std_dev`` are O(1) reads. Samples evicted from the ring
+    are removed from the running moments, which are re-derived from the
+    buffer once every ``max_size`` evictions to bound floating-point drift.
+
+    Event counts are additionally kept in coarse time buckets so rate
+    queries remain answerable for samples that were already evicted.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ewma_alpha: float = 0.1,
+        bucket_seconds: float = 1.0,
+        bucket_retention: int = 3600
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ewma_alpha = ewma_alpha
+        self.bucket_seconds = bucket_seconds
+        self.bucket_retention = bucket_retention
+
+        self._values = np.zeros(max_size, dtype=np.float64)
+        self._timestamps = np.zeros(max_size, dtype=np.float64)
+        self._head = 0          # Next write position
+        self._count = 0
+        self._evictions = 0
+        self._evictions_since_resync = 0
+        self._needs_resync = False
+        self._monotonic = True
+        self._last_ts = float("-inf")
+
+        # Welford running moments
+        self._mean = 0.0
+        self._m2 = 0.0
+
+        # Exponentially weighted moments
+        self._ewma: Optional[float] = None
+        self._ewma_sq: Optional[float] = None
+
+        # Time-bucketed event counts: [bucket_id, count], oldest first
+        self._buckets: Deque[List[int]] = deque()
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
     def add(self, value: float, timestamp: Optional[datetime] = None) -> None:
         """Add a value to the window"""
-        self.values.append(value)
-        self.timestamps.append(timestamp or datetime.now())
-        
-        # Trim if needed
-        if len(self.values) > self.max_size:
-            self.values = self.values[-self.max_size:]
-            self.timestamps = self.timestamps[-self.max_size:]
-    
-    def get_recent(self, seconds: float) -> List[float]:
+        value = float(value)
+        ts = (timestamp or datetime.now()).timestamp()
+
+        if self._count == self.max_size:
+            self._evict(self._values[self._head])
+        self._values[self._head] = value
+        self._timestamps[self._head] = ts
+        self._head = (self._head + 1) % self.max_size
+        self._count += 1
+
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+        if self._ewma is None:
+            self._ewma, self._ewma_sq = value, value * value
+        else:
+            a = self.ewma_alpha
+            self._ewma += a * (value - self._ewma)
+            self._ewma_sq += a * (value * value - self._ewma_sq)
+
+        self._track_time(ts)
+        self._bucket_add([(int(ts // self.bucket_seconds), 1)])
+
+    def extend(
+        self,
+        values: Sequence[float],
+        timestamps: Optional[Sequence[datetime]] = None
+    ) -> None:
+        """
+        Add many values at once
+
+        Args:
+            values: Values in arrival order
+            timestamps: Optional per-value timestamps (default: now)
+        """
+        vals = np.asarray(values, dtype=np.float64).ravel()
+        if vals.size == 0:
+            return
+        self.extend_epoch(vals, _to_epoch_array(timestamps, vals.size))
+
+    def extend_epoch(self, vals: np.ndarray, ts: np.ndarray) -> None:
+        """Add many values with float64 POSIX timestamps"""
+        k = vals.size
+        if k == 0:
+            return
+        overflow = max(0, self._count + k - self.max_size)
+        if k >= self.max_size:
+            self._values[:] = vals[-self.max_size:]
+            self._timestamps[:] = ts[-self.max_size:]
+            self._head = 0
+        else:
+            idx = (self._head + np.arange(k)) % self.max_size
+            self._values[idx] = vals
+            self._timestamps[idx] = ts
+            self._head = (self._head + k) % self.max_size
+        self._count = min(self._count + k, self.max_size)
+        self._evictions += overflow
+
+        self._resync_moments()
+        self._ewma, self._ewma_sq = _ewma_fold(
+            vals, self.ewma_alpha, self._ewma, self._ewma_sq
+        )
+
+        if np.any(np.diff(ts) < 0):
+            self._monotonic = False
+        self._track_time(float(ts[0]))
+        self._last_ts = max(self._last_ts, float(ts.max()))
+        ids, counts = np.unique(
+            np.floor(ts / self.bucket_seconds).astype(np.int64), return_counts=True
+        )
+        self._bucket_add(zip(ids.tolist(), counts.tolist(), strict=True))
+
+    def _evict(self, value: float) -> None:
+        """Remove the oldest value from the running moments"""
+        self._evictions += 1
+        self._evictions_since_resync += 1
+        n = self._count - 1
+        if n == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+        else:
+            old_mean = self._mean
+            self._mean = (self._count * old_mean - value) / n
+            self._m2 -= (value - old_mean) * (value - self._mean)
+        self._count = n
+
+        if self._evictions_since_resync >= self.max_size:
+            # Re-derive after the upcoming insert lands in the buffer
+            self._evictions_since_resync = 0
+            self._needs_resync = True
+
+    def _resync_moments(self) -> None:
+        """Recompute the running moments from the buffer contents"""
+        vals = self._live_values()
+        if vals.size == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+        else:
+            self._mean = float(vals.mean())
+            self._m2 = float(((vals - self._mean) ** 2).sum())
+        self._evictions_since_resync = 0
+        self._needs_resync = False
+
+    def _track_time(self, ts: float) -> None:
+        if ts < self._last_ts:
+            self._monotonic = False
+        else:
+            self._last_ts = ts
+
+    def _bucket_add(self, increments: Iterable[Tuple[int, int]]) -> None:
+        """Fold (bucket_id, count) increments into the bucketed event counts"""
+        for bucket_id, count in increments:
+            if self._buckets and self._buckets[-1][0] == bucket_id:
+                self._buckets[-1][1] += count
+            elif not self._buckets or self._buckets[-1][0] < bucket_id:
+                self._buckets.append([bucket_id, count])
+            else:
+                # Out-of-order sample: locate (or insert) its bucket
+                for i in range(len(self._buckets) - 1, -1, -1):
+                    if self._buckets[i][0] == bucket_id:
+                        self._buckets[i][1] += count
+                        break
+                    if self._buckets[i][0] < bucket_id:
+                        self._buckets.insert(i + 1, [bucket_id, count])
+                        break
+                else:
+                    self._buckets.appendleft([bucket_id, count])
+
+        horizon = self._buckets[-1][0] - self.bucket_retention
+        while self._buckets and self._buckets[0][0] < horizon:
+            self._buckets.popleft()
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def _live_values(self) -> np.ndarray:
+        """Buffer contents in storage order (not chronological)"""
+        if self._count < self.max_size:
+            start = (self._head - self._count) % self.max_size
+            if start + self._count <= self.max_size:
+                return self._values[start:start + self._count]
+            return np.concatenate(
+                (self._values[start:], self._values[:self._head])
+            )
+        return self._values
+
+    def _segments(self) -> List[slice]:
+        """Ring slices covering the live samples, oldest first"""
+        if self._count == 0:
+            return []
+        start = (self._head - self._count) % self.max_size
+        if start + self._count <= self.max_size:
+            return [slice(start, start + self._count)]
+        return [slice(start, self.max_size), slice(0, self._head)]
+
+    def _ordered(self, buffer: np.ndarray) -> np.ndarray:
+        segments = self._segments()
+        if not segments:
+            return np.empty(0, dtype=np.float64)
+        if len(segments) == 1:
+            return buffer[segments[0]].copy()
+        return np.concatenate([buffer[s] for s in segments])
+
+    @property
+    def values(self) -> np.ndarray:
+        """Values in chronological order"""
+        return self._ordered(self._values)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """POSIX timestamps in chronological order"""
+        return self._ordered(self._timestamps)
+
+    @property
+    def latest(self) -> Optional[float]:
+        """Most recently recorded value"""
+        if self._count == 0:
+            return None
+        return float(self._values[(self._head - 1) % self.max_size])
+
+    def get_recent(self, seconds: float, now: Optional[datetime] = None) -> List[float]:
         """Get values from the last N seconds"""
-        cutoff = datetime.now() - timedelta(seconds=seconds)
-        return [
-            v for v, t in zip(self.values, self.timestamps)
-            if t >= cutoff
-        ]
-    
+        cutoff = (now or datetime.now()).timestamp() - seconds
+        if not self._monotonic:
+            ts = self.timestamps
+            return self.values[ts >= cutoff].tolist()
+
+        result: List[float] = []
+        for seg in self._segments():
+            ts = self._timestamps[seg]
+            i = int(np.searchsorted(ts, cutoff, side="left"))
+            result.extend(self._values[seg][i:].tolist())
+        return result
+
+    def count_recent(self, seconds: float, now: Optional[datetime] = None) -> int:
+        """
+        Count events recorded in the last N seconds
+
+        Exact while the ring still holds every sample in the window;
+        otherwise answered from the time buckets, which may over-count by
+        up to one bucket at the window edge.
+        """
+        cutoff = (now or datetime.now()).timestamp() - seconds
+        return int(self.count_since(np.array([cutoff]))[0])
+
+    def count_since(self, cutoffs: np.ndarray) -> np.ndarray:
+        """Vectorized event counts at or after each cutoff timestamp"""
+        cutoffs = np.asarray(cutoffs, dtype=np.float64)
+        if self._count == 0:
+            return np.zeros(cutoffs.shape, dtype=np.int64)
+
+        ts = self.timestamps
+        if not self._monotonic:
+            ts = np.sort(ts)
+        exact = self._count - np.searchsorted(ts, cutoffs, side="left")
+        if self._evictions == 0:
+            return exact
+
+        # Cutoffs that predate the oldest retained sample need the buckets
+        uncovered = cutoffs <= ts[0]
+        if not np.any(uncovered) or not self._buckets:
+            return exact
+        bucket_ids = np.fromiter((b[0] for b in self._buckets), dtype=np.int64)
+        bucket_counts = np.fromiter((b[1] for b in self._buckets), dtype=np.int64)
+        suffix = np.concatenate((np.cumsum(bucket_counts[::-1])[::-1], [0]))
+        idx = np.searchsorted(
+            bucket_ids,
+            np.floor(cutoffs / self.bucket_seconds).astype(np.int64),
+            side="left",
+        )
+        return np.where(uncovered, np.maximum(exact, suffix[idx]), exact)
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
     @property
     def mean(self) -> float:
-        """Calculate mean of values"""
-        return statistics.mean(self.values) if self.values else 0.0
-    
+        """Mean of values (O(1))"""
+        self._maybe_resync()
+        return self._mean if self._count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of values (O(1))"""
+        self._maybe_resync()
+        if self._count < 2:
+            return 0.0
+        return max(self._m2, 0.0) / (self._count - 1)
+
     @property
     def std_dev(self) -> float:
-        """Calculate standard deviation"""
-        return statistics.stdev(self.values) if len(self.values) > 1 else 0.0
+        """Sample standard deviation (O(1))"""
+        return math.sqrt(self.variance)
+
+    @property
+    def ewma(self) -> float:
+        """Exponentially weighted moving average"""
+        return self._ewma if self._ewma is not None else 0.0
+
+    @property
+    def ewma_std_dev(self) -> float:
+        """Exponentially weighted standard deviation"""
+        if self._ewma is None or self._ewma_sq is None:
+            return 0.0
+        return math.sqrt(max(self._ewma_sq - self._ewma * self._ewma, 0.0))
+
+    def _maybe_resync(self) -> None:
+        if self._needs_resync:
+            self._resync_moments()
+
+    def rolling_moments(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Window statistics as they would be after appending each value
+
+        Equivalent to calling ``add`` for each value and reading
+        ``len``/``mean``/``std_dev`` after every call, but computed with
+        prefix sums in a single vectorized pass.
+
+        Returns:
+            Tuple of (counts, means, std_devs) arrays aligned with ``values``
+        """
+        values = np.asarray(values, dtype=np.float64)
+        window = self.values
+        combined = np.concatenate((window, values))
+        shift = float(combined.mean()) if combined.size else 0.0
+        centered = combined - shift
+        prefix = np.concatenate(([0.0], np.cumsum(centered)))
+        prefix_sq = np.concatenate(([0.0], np.cumsum(centered * centered)))
+
+        ends = window.size + np.arange(values.size) + 1
+        starts = np.maximum(ends - self.max_size, 0)
+        counts = ends - starts
+        sums = prefix[ends] - prefix[starts]
+        sums_sq = prefix_sq[ends] - prefix_sq[starts]
+
+        means = shift + sums / counts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = (sums_sq - sums * sums / counts) / (counts - 1)
+        var = np.where(counts > 1, np.maximum(var, 0.0), 0.0)
+        return counts, means, np.sqrt(var)
+
+
+def _to_epoch_array(
+    timestamps: Optional[Sequence[datetime]],
+    size: int
+) -> np.ndarray:
+    """Convert datetimes to a float64 POSIX timestamp array"""
+    if timestamps is None:
+        return np.full(size, datetime.now().timestamp(), dtype=np.float64)
+    ts = np.fromiter((t.timestamp() for t in timestamps), dtype=np.float64)
+    if ts.size != size:
+        raise ValueError("timestamps must align with values")
+    return ts
+
+
+def _ewma_fold(
+    values: np.ndarray,
+    alpha: float,
+    ewma: Optional[float],
+    ewma_sq: Optional[float]
+) -> Tuple[float, float]:
+    """Fold a batch into EWMA state using the closed-form weights"""
+    if ewma is None or ewma_sq is None:
+        ewma, ewma_sq = float(values[0]), float(values[0]) ** 2
+        values = values[1:]
+    if values.size == 0:
+        return ewma, ewma_sq
+    k = values.size
+    decay = (1.0 - alpha) ** k
+    weights = alpha * (1.0 - alpha) ** np.arange(k - 1, -1, -1)
+    return (
+        decay * ewma + float(weights @ values),
+        decay * ewma_sq + float(weights @ (values * values)),
+    )
+
+
+# ============ Batch evaluators ============
+
+@dataclass
+class BatchContext:
+    """Precomputed per-sample window state shared by the evaluators"""
+    counts: Optional[np.ndarray] = None
+    means: Optional[np.ndarray] = None
+    std_devs: Optional[np.ndarray] = None
+    rate_counts: Optional[np.ndarray] = None
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one evaluator over a batch of values"""
+    mask: np.ndarray
+    anomaly_type: AnomalyType
+    describe: Callable[[int], str]
+    details: Callable[[int], Dict[str, Any]]
+
+
+BatchEvaluator = Callable[[np.ndarray, Dict[str, Any], BatchContext], Optional[CheckResult]]
+
+
+def evaluate_threshold(
+    values: np.ndarray,
+    config: Dict[str, Any],
+    _ctx: BatchContext
+) -> Optional[CheckResult]:
+    """Flag values above the simple threshold"""
+    threshold = config.get("threshold")
+    if threshold is None:
+        return None
+    return CheckResult(
+        mask=values > threshold,
+        anomaly_type=AnomalyType.VALUE_ANOMALY,
+        describe=lambda i: f"Value {values[i]} exceeds threshold {threshold}",
+        details=lambda _: {"threshold": threshold},
+    )
+
+
+def evaluate_min(
+    values: np.ndarray,
+    config: Dict[str, Any],
+    _ctx: BatchContext
+) -> Optional[CheckResult]:
+    """Flag values below the minimum bound"""
+    min_val = config.get("min")
+    if min_val is None:
+        return None
+    return CheckResult(
+        mask=values < min_val,
+        anomaly_type=AnomalyType.VALUE_ANOMALY,
+        describe=lambda i: f"Value {values[i]} below minimum {min_val}",
+        details=lambda _: {"min_threshold": min_val},
+    )
+
+
+def evaluate_max(
+    values: np.ndarray,
+    config: Dict[str, Any],
+    _ctx: BatchContext
+) -> Optional[CheckResult]:
+    """Flag values above the maximum bound"""
+    max_val = config.get("max")
+    if max_val is None:
+        return None
+    return CheckResult(
+        mask=values > max_val,
+        anomaly_type=AnomalyType.VALUE_ANOMALY,
+        describe=lambda i: f"Value {values[i]} above maximum {max_val}",
+        details=lambda _: {"max_threshold": max_val},
+    )
+
+
+def evaluate_statistical(
+    values: np.ndarray,
+    config: Dict[str, Any],
+    ctx: BatchContext
+) -> Optional[CheckResult]:
+    """Flag values whose z-score against the window exceeds the factor"""
+    strategy = config.get("strategy", DetectionStrategy.STATISTICAL)
+    if strategy not in (DetectionStrategy.STATISTICAL, DetectionStrategy.HYBRID):
+        return None
+    if ctx.counts is None or ctx.means is None or ctx.std_devs is None:
+        return None
+
+    factor = config.get("std_dev_factor", 2.0)
+    means, stds = ctx.means, ctx.std_devs
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z_scores = np.where(stds > 0, np.abs(values - means) / stds, 0.0)
+    mask = (ctx.counts >= 10) & (stds > 0) & (z_scores > factor)
+    return CheckResult(
+        mask=mask,
+        anomaly_type=AnomalyType.VALUE_ANOMALY,
+        describe=lambda i: f"Value {values[i]} is {z_scores[i]:.2f} std devs from mean",
+        details=lambda i: {
+            "z_score": float(z_scores[i]),
+            "mean": float(means[i]),
+            "std_dev": float(stds[i]),
+        },
+    )
+
+
+def evaluate_rate(
+    _values: np.ndarray,
+    config: Dict[str, Any],
+    ctx: BatchContext
+) -> Optional[CheckResult]:
+    """Flag samples that push the event rate over the configured limit"""
+    rate_limit = config.get("rate_limit")
+    if not rate_limit or ctx.rate_counts is None:
+        return None
+    count, seconds = rate_limit
+    rate_counts = ctx.rate_counts
+    return CheckResult(
+        mask=rate_counts > count,
+        anomaly_type=AnomalyType.RATE_ANOMALY,
+        describe=lambda i: (
+            f"Rate limit exceeded: {rate_counts[i]} events in {seconds}s (limit: {count})"
+        ),
+        details=lambda i: {
+            "rate_count": int(rate_counts[i]),
+            "rate_limit": count,
+            "rate_window": seconds,
+        },
+    )
+
+
+# Evaluated in order; later checks take precedence for description and type
+DEFAULT_EVALUATORS: List[BatchEvaluator] = [
+    evaluate_threshold,
+    evaluate_min,
+    evaluate_max,
+    evaluate_statistical,
+    evaluate_rate,
+]
 
 
 class AnomalyDetector:
@@ -107,6 +608,7 @@ class AnomalyDetector:
     - Configurable thresholds
     - Severity classification
     - Automatic alerting
+    - Vectorized bulk ingestion via ``record_many``
     
     Example:
         detector = AnomalyDetector()
@@ -123,6 +625,7 @@ class AnomalyDetector:
         }
         self._global_handlers: List[Callable[[AnomalyAlert], None]] = []
         self._alert_counter = 0
+        self._evaluators: List[BatchEvaluator] = list(DEFAULT_EVALUATORS)
     
     def add_metric(
         self,
@@ -175,6 +678,16 @@ class AnomalyDetector:
         else:
             self._global_handlers.append(handler)
     
+    def _ensure_metric(self, metric_name: str) -> Tuple[MetricWindow, Dict[str, Any]]:
+        """Get (or lazily create) the window and config for a metric"""
+        if metric_name not in self._metrics:
+            self._metrics[metric_name] = MetricWindow()
+            self._thresholds[metric_name] = {
+                "strategy": DetectionStrategy.STATISTICAL,
+                "std_dev_factor": 2.0
+            }
+        return self._metrics[metric_name], self._thresholds[metric_name]
+    
     async def record(
         self,
         metric_name: str,
@@ -192,15 +705,7 @@ class AnomalyDetector:
         Returns:
             AnomalyAlert if anomaly detected, None otherwise
         """
-        if metric_name not in self._metrics:
-            self._metrics[metric_name] = MetricWindow()
-            self._thresholds[metric_name] = {
-                "strategy": DetectionStrategy.STATISTICAL,
-                "std_dev_factor": 2.0
-            }
-        
-        window = self._metrics[metric_name]
-        config = self._thresholds[metric_name]
+        window, config = self._ensure_metric(metric_name)
         
         # Record the value
         window.add(value)
@@ -214,6 +719,106 @@ class AnomalyDetector:
         
         return anomaly
     
+    async def record_many(
+        self,
+        metric_name: str,
+        values: Sequence[float],
+        timestamps: Optional[Sequence[datetime]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[AnomalyAlert]:
+        """
+        Record a batch of metric values and check them for anomalies
+        
+        Every detection strategy is evaluated over the whole batch with
+        vectorized NumPy operations. For timestamps in ascending order and
+        no older than the samples already in the window, the alerts match
+        recording each value at its timestamp with ``record``. Otherwise
+        they can differ:
+        
+        - Out-of-order timestamps are stable-sorted first, so values are
+          evaluated, stored and alerted in timestamp order.
+        - A value's rate count includes every window sample at or after
+          its timestamp minus the rate window, including samples newer than
+          the value itself; ``record`` only ever counts back from now.
+        
+        Args:
+            metric_name: Name of the metric
+            values: Values in arrival order
+            timestamps: Optional per-value timestamps (default: now)
+            metadata: Optional metadata attached to every alert
+            
+        Returns:
+            Alerts raised by the batch, in timestamp order
+        """
+        window, config = self._ensure_metric(metric_name)
+        vals = np.asarray(values, dtype=np.float64).ravel()
+        if vals.size == 0:
+            return []
+        ts = _to_epoch_array(timestamps, vals.size)
+        
+        order = None
+        if np.any(np.diff(ts) < 0):
+            order = np.argsort(ts, kind="stable")
+            vals, ts = vals[order], ts[order]
+        
+        ctx = self._batch_context(window, vals, ts, config)
+        indices, results = self._evaluate(vals, config, ctx)
+        
+        window.extend_epoch(vals, ts)
+        
+        alerts = []
+        for i in indices:
+            alert = self._build_alert(
+                metric_name, float(vals[i]), config, metadata, i, results
+            )
+            self._alerts.append(alert)
+            await self._notify_handlers(alert)
+            alerts.append(alert)
+        return alerts
+    
+    def _batch_context(
+        self,
+        window: MetricWindow,
+        values: np.ndarray,
+        timestamps: np.ndarray,
+        config: Dict[str, Any]
+    ) -> BatchContext:
+        """Precompute the window state each sample would observe"""
+        ctx = BatchContext()
+        strategy = config.get("strategy", DetectionStrategy.STATISTICAL)
+        if strategy in (DetectionStrategy.STATISTICAL, DetectionStrategy.HYBRID):
+            ctx.counts, ctx.means, ctx.std_devs = window.rolling_moments(values)
+        
+        rate_limit = config.get("rate_limit")
+        if rate_limit:
+            _, seconds = rate_limit
+            cutoffs = timestamps - seconds
+            # Prior window events plus in-batch events up to and including i
+            in_batch = (
+                np.arange(values.size) + 1
+                - np.searchsorted(timestamps, cutoffs, side="left")
+            )
+            ctx.rate_counts = window.count_since(cutoffs) + in_batch
+        return ctx
+    
+    def _evaluate(
+        self,
+        values: np.ndarray,
+        config: Dict[str, Any],
+        ctx: BatchContext
+    ) -> Tuple[List[int], List[CheckResult]]:
+        """Run every evaluator and return the flagged sample indices"""
+        results = [
+            result for result in (
+                evaluator(values, config, ctx) for evaluator in self._evaluators
+            )
+            if result is not None
+        ]
+        if not results:
+            return [], results
+        flagged = np.logical_or.reduce([r.mask for r in results])
+        return np.flatnonzero(flagged).tolist(), results
+    
     async def _detect_anomaly(
         self,
         metric_name: str,
@@ -222,71 +827,53 @@ class AnomalyDetector:
         metadata: Optional[Dict[str, Any]]
     ) -> Optional[AnomalyAlert]:
         """Detect if value is anomalous"""
-        strategy = config.get("strategy", DetectionStrategy.STATISTICAL)
         window = self._metrics[metric_name]
         
-        is_anomaly = False
-        anomaly_type = AnomalyType.VALUE_ANOMALY
-        description = ""
-        details = {"value": value, "metric": metric_name}
-        
-        # Threshold check
-        threshold = config.get("threshold")
-        if threshold is not None and value > threshold:
-            is_anomaly = True
-            description = f"Value {value} exceeds threshold {threshold}"
-            details["threshold"] = threshold
-        
-        # Min/max check
-        min_val = config.get("min")
-        max_val = config.get("max")
-        if min_val is not None and value < min_val:
-            is_anomaly = True
-            description = f"Value {value} below minimum {min_val}"
-            details["min_threshold"] = min_val
-        if max_val is not None and value > max_val:
-            is_anomaly = True
-            description = f"Value {value} above maximum {max_val}"
-            details["max_threshold"] = max_val
-        
-        # Statistical check
-        if strategy in [DetectionStrategy.STATISTICAL, DetectionStrategy.HYBRID]:
-            if len(window.values) >= 10:
-                mean = window.mean
-                std_dev = window.std_dev
-                factor = config.get("std_dev_factor", 2.0)
-                
-                if std_dev > 0:
-                    z_score = abs(value - mean) / std_dev
-                    if z_score > factor:
-                        is_anomaly = True
-                        description = f"Value {value} is {z_score:.2f} std devs from mean"
-                        details["z_score"] = z_score
-                        details["mean"] = mean
-                        details["std_dev"] = std_dev
-        
-        # Rate limit check
+        # The value has already been added, so the O(1) window moments are
+        # exactly what the batch path computes with prefix sums
+        ctx = BatchContext()
+        strategy = config.get("strategy", DetectionStrategy.STATISTICAL)
+        if strategy in (DetectionStrategy.STATISTICAL, DetectionStrategy.HYBRID):
+            ctx.counts = np.array([len(window)])
+            ctx.means = np.array([window.mean])
+            ctx.std_devs = np.array([window.std_dev])
         rate_limit = config.get("rate_limit")
         if rate_limit:
-            count, seconds = rate_limit
-            recent = window.get_recent(seconds)
-            if len(recent) > count:
-                is_anomaly = True
-                anomaly_type = AnomalyType.RATE_ANOMALY
-                description = f"Rate limit exceeded: {len(recent)} events in {seconds}s (limit: {count})"
-                details["rate_count"] = len(recent)
-                details["rate_limit"] = count
-                details["rate_window"] = seconds
+            ctx.rate_counts = np.array([window.count_recent(rate_limit[1])])
         
-        if not is_anomaly:
+        values = np.array([float(value)])
+        indices, results = self._evaluate(values, config, ctx)
+        if not indices:
             return None
+        return self._build_alert(metric_name, value, config, metadata, 0, results)
+    
+    def _build_alert(
+        self,
+        metric_name: str,
+        value: float,
+        config: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]],
+        index: int,
+        results: List[CheckResult]
+    ) -> AnomalyAlert:
+        """Create an alert for one flagged sample"""
+        anomaly_type = AnomalyType.VALUE_ANOMALY
+        description = ""
+        details: Dict[str, Any] = {"value": value, "metric": metric_name}
+        
+        # Later checks take precedence for the description and type
+        for result in results:
+            if result.mask[index]:
+                anomaly_type = result.anomaly_type
+                description = result.describe(index)
+                details.update(result.details(index))
         
         # Determine severity
         severity = self._classify_severity(value, config, details)
         
         # Create alert
         self._alert_counter += 1
-        alert = AnomalyAlert(
+        return AnomalyAlert(
             id=f"ANOMALY-{self._alert_counter:06d}",
             type=anomaly_type,
             severity=severity,
@@ -294,11 +881,9 @@ class AnomalyDetector:
             source=metric_name,
             description=description,
             details={**details, **(metadata or {})},
-            strategy_used=strategy,
+            strategy_used=config.get("strategy", DetectionStrategy.STATISTICAL),
             recommended_action=self._get_recommended_action(anomaly_type, severity)
         )
-        
-        return alert
     
     def _classify_severity(
         self,
@@ -403,14 +988,16 @@ class AnomalyDetector:
         """Get summary of all monitored metrics"""
         summary = {}
         for name, window in self._metrics.items():
-            if window.values:
+            if len(window):
+                values = window.values
                 summary[name] = {
-                    "count": len(window.values),
+                    "count": len(window),
                     "mean": window.mean,
                     "std_dev": window.std_dev,
-                    "min": min(window.values),
-                    "max": max(window.values),
-                    "latest": window.values[-1] if window.values else None
+                    "ewma": window.ewma,
+                    "min": float(values.min()),
+                    "max": float(values.max()),
+                    "latest": window.latest
                 }
         return summary
     
@@ -2,22 +2,35 @@
 Checkpoint Manager for HLP Executor Core
 
 Implements checkpoint creation, compression, restoration, and cleanup
-functionality with copy-on-write strategy and retention policies.
+functionality with a content-addressed chunk store and retention policies.
+
+States are split into structural chunks shared across checkpoints; each
+checkpoint records only the chunks that changed since its parent, with a
+full snapshot every few checkpoints to bound the restore chain.
 
 This module provides checkpoint management for safe state restoration
 in case of failures during execution.
 """
 
-import gzip
 import hashlib
 import json
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from .checkpoint_store import (
+    ChunkStore,
+    LazyState,
+    Manifest,
+    manifest_checksum,
+    split_state,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,17 +50,22 @@ class Checkpoint:
     execution_id: str
     phase_id: str
     timestamp: datetime
-    state: dict[str, Any]
+    state: dict[str, Any] | None
     status: CheckpointStatus = CheckpointStatus.CREATED
     compressed: bool = False
     compressed_size: int | None = None
     original_size: int = 0
     checksum: str = ""
     metadata: dict[str, Any] = field(default_factory=dict)
+    parent_id: str | None = None
+    delta: Manifest = field(default_factory=dict, repr=False)
+    removed_paths: list[tuple[str, ...]] = field(default_factory=list, repr=False)
+    is_snapshot: bool = True
+    chain_length: int = 0
 
     def __post_init__(self):
         """Calculate checksum after initialization."""
-        if not self.checksum:
+        if not self.checksum and self.state is not None:
             state_str = json.dumps(self.state, sort_keys=True)
             self.checksum = hashlib.sha256(state_str.encode()).hexdigest()
             self.original_size = len(state_str.encode())
@@ -59,8 +77,9 @@ class CheckpointManager:
     and cleanup with configurable retention policies.
     
     Features:
-    - Copy-on-Write strategy for efficient storage
-    - Automatic compression with gzip
+    - Content-addressed chunk storage shared across checkpoints
+    - Delta checkpoints against the parent with periodic full snapshots
+    - Background gzip compression of newly written chunks
     - Retention policy (keep last N checkpoints)
     - Checksum verification
     - Automatic cleanup of old checkpoints
@@ -71,7 +90,9 @@ class CheckpointManager:
         storage_path: Path | None = None,
         retention_count: int = 5,
         compression_enabled: bool = True,
-        auto_cleanup: bool = True
+        auto_cleanup: bool = True,
+        snapshot_interval: int = 10,
+        chunk_depth: int = 2
     ):
         """
         Initialize the CheckpointManager.
@@ -81,14 +102,26 @@ class CheckpointManager:
             retention_count: Number of recent checkpoints to retain per execution
             compression_enabled: Whether to compress checkpoints automatically
             auto_cleanup: Whether to automatically clean up old checkpoints
+            snapshot_interval: Maximum delta chain length before a full snapshot
+            chunk_depth: Key-path depth at which state is split into chunks
         """
         self.storage_path = storage_path
         self.retention_count = retention_count
         self.compression_enabled = compression_enabled
         self.auto_cleanup = auto_cleanup
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.chunk_depth = max(1, chunk_depth)
         
         # In-memory storage
+        self._store = ChunkStore()
         self._checkpoints: dict[str, list[Checkpoint]] = {}
+        self._index: dict[str, Checkpoint] = {}
+        # Resolved manifest of the newest checkpoint per execution
+        self._heads: dict[str, Manifest] = {}
+        self._lock = threading.RLock()
+
+        self._compressor: ThreadPoolExecutor | None = None
+        self._pending: dict[str, Future] = {}
         
         logger.info(
             "CheckpointManager initialized: storage_path=%s, retention=%d, compression=%s",
@@ -106,51 +139,82 @@ class CheckpointManager:
         """
         Create a checkpoint for the current state.
         
-        Uses copy-on-write strategy to avoid unnecessary data duplication.
-        Automatically compresses if enabled.
+        The state is split into structural chunks; only chunks not already
+        in the store are kept, and the checkpoint records just the chunks
+        that differ from its parent. Compression runs in the background.
         
         Args:
             execution_id: Unique execution identifier
             phase_id: Phase identifier
-            state: Current state to checkpoint (will be deep copied)
+            state: Current state to checkpoint (serialized, never referenced)
         
         Returns:
             Checkpoint ID
         """
-        checkpoint_id = self._generate_checkpoint_id(execution_id, phase_id)
-        
-        # Deep copy state using copy-on-write strategy
-        state_copy = self._copy_on_write(state)
-        
-        checkpoint = Checkpoint(
-            checkpoint_id=checkpoint_id,
-            execution_id=execution_id,
-            phase_id=phase_id,
-            timestamp=datetime.utcnow(),
-            state=state_copy,
-            status=CheckpointStatus.CREATED
-        )
-        
-        # Store checkpoint
-        if execution_id not in self._checkpoints:
-            self._checkpoints[execution_id] = []
-        
-        self._checkpoints[execution_id].append(checkpoint)
-        
-        # Compress if enabled
+        chunks = split_state(state, self.chunk_depth)
+        original_size = sum(len(payload) for _, payload in chunks)
+
+        with self._lock:
+            checkpoint_id = self._generate_checkpoint_id(execution_id, phase_id)
+            manifest: Manifest = {
+                path: self._store.put(payload) for path, payload in chunks
+            }
+            self._store.incref(manifest.values())
+
+            history = self._checkpoints.setdefault(execution_id, [])
+            parent = history[-1] if history else None
+            parent_manifest = self._heads.get(execution_id)
+
+            if (
+                parent is not None
+                and parent_manifest is not None
+                and parent.chain_length + 1 < self.snapshot_interval
+            ):
+                delta = {
+                    path: digest for path, digest in manifest.items()
+                    if parent_manifest.get(path) != digest
+                }
+                removed = [path for path in parent_manifest if path not in manifest]
+                is_snapshot = False
+                chain_length = parent.chain_length + 1
+            else:
+                delta, removed, is_snapshot, chain_length = dict(manifest), [], True, 0
+
+            checkpoint = Checkpoint(
+                checkpoint_id=checkpoint_id,
+                execution_id=execution_id,
+                phase_id=phase_id,
+                timestamp=datetime.utcnow(),
+                state=None,
+                status=CheckpointStatus.CREATED,
+                original_size=original_size,
+                checksum=manifest_checksum(manifest),
+                parent_id=parent.checkpoint_id if parent else None,
+                delta=delta,
+                removed_paths=removed,
+                is_snapshot=is_snapshot,
+                chain_length=chain_length
+            )
+
+            history.append(checkpoint)
+            self._index[checkpoint_id] = checkpoint
+            self._heads[execution_id] = manifest
+
+        # Compress new chunks off the creation path
         if self.compression_enabled:
-            self.compress_checkpoint(checkpoint_id)
+            self._schedule_compression(checkpoint, delta.values(), list(manifest.values()))
         
         # Auto cleanup if enabled
         if self.auto_cleanup:
             self.cleanup_old_checkpoints(execution_id, self.retention_count)
         
         logger.info(
-            "Created checkpoint: %s for execution=%s, phase=%s (size=%d bytes)",
+            "Created checkpoint: %s for execution=%s, phase=%s (size=%d bytes, new chunks=%d)",
             checkpoint_id,
             execution_id,
             phase_id,
-            checkpoint.original_size
+            checkpoint.original_size,
+            len(delta)
         )
         
         return checkpoint_id
@@ -168,11 +232,33 @@ class CheckpointManager:
         checkpoints = self._checkpoints.get(execution_id, [])
         return sorted(checkpoints, key=lambda cp: cp.timestamp, reverse=True)
     
+    def open_checkpoint(self, checkpoint_id: str) -> LazyState:
+        """
+        Open a checkpoint as a lazily decoded, read-only mapping.
+
+        Only the delta chain is walked up front; chunk data is decoded
+        (and verified) the first time each top-level key is read.
+
+        Raises:
+            ValueError: If checkpoint not found or checksum verification fails
+        """
+        checkpoint = self._find_checkpoint_by_id(checkpoint_id)
+
+        if not checkpoint:
+            raise ValueError(f"Checkpoint not found: {checkpoint_id}")
+
+        manifest = self._resolve_manifest(checkpoint)
+        if manifest_checksum(manifest) != checkpoint.checksum:
+            raise ValueError(f"Checksum verification failed for checkpoint: {checkpoint_id}")
+
+        return LazyState(manifest, self._store, verify=True)
+
     def restore_checkpoint(self, checkpoint_id: str) -> dict[str, Any]:
         """
         Restore state from a checkpoint.
         
-        Verifies checksum before restoration.
+        Rebuilds the state from the delta chain and verifies the manifest
+        checksum and every chunk digest before returning.
         
         Args:
             checkpoint_id: Checkpoint identifier
@@ -183,18 +269,15 @@ class CheckpointManager:
         Raises:
             ValueError: If checkpoint not found or checksum verification fails
         """
-        checkpoint = self._find_checkpoint_by_id(checkpoint_id)
-        
-        if not checkpoint:
-            raise ValueError(f"Checkpoint not found: {checkpoint_id}")
-        
-        # Decompress if compressed
-        if checkpoint.compressed:
-            self._decompress_checkpoint(checkpoint)
-        
-        # Verify checksum
-        if not self._verify_checksum(checkpoint):
-            raise ValueError(f"Checksum verification failed for checkpoint: {checkpoint_id}")
+        lazy_state = self.open_checkpoint(checkpoint_id)
+        try:
+            state = lazy_state.to_dict()
+        except (KeyError, ValueError) as e:
+            raise ValueError(
+                f"Checksum verification failed for checkpoint: {checkpoint_id}"
+            ) from e
+
+        checkpoint = self._index[checkpoint_id]
         
         # Update status
         checkpoint.status = CheckpointStatus.RESTORED
@@ -206,8 +289,8 @@ class CheckpointManager:
             checkpoint.phase_id
         )
         
-        # Return deep copy to prevent modification
-        return self._copy_on_write(checkpoint.state)
+        # Freshly decoded, so callers may modify it freely
+        return state
     
     def cleanup_old_checkpoints(
         self,
@@ -226,26 +309,20 @@ class CheckpointManager:
         Returns:
             Number of checkpoints removed
         """
-        if execution_id not in self._checkpoints:
-            return 0
-        
-        checkpoints = self._checkpoints[execution_id]
-        if len(checkpoints) <= keep_count:
-            return 0
-        
-        # Sort by timestamp (newest first)
-        checkpoints.sort(key=lambda cp: cp.timestamp, reverse=True)
-        
-        # Keep only the most recent
-        to_keep = checkpoints[:keep_count]
-        to_remove = checkpoints[keep_count:]
-        
-        # Update storage
-        self._checkpoints[execution_id] = to_keep
-        
-        # Mark removed checkpoints as deleted
-        for checkpoint in to_remove:
-            checkpoint.status = CheckpointStatus.DELETED
+        with self._lock:
+            if execution_id not in self._checkpoints:
+                return 0
+
+            checkpoints = self._checkpoints[execution_id]
+            if len(checkpoints) <= keep_count:
+                return 0
+
+            # Sort by timestamp (newest first)
+            ordered = sorted(checkpoints, key=lambda cp: cp.timestamp, reverse=True)
+            to_remove = ordered[keep_count:]
+
+            for checkpoint in to_remove:
+                self._remove_checkpoint(checkpoint, CheckpointStatus.DELETED)
         
         removed_count = len(to_remove)
         
@@ -260,7 +337,10 @@ class CheckpointManager:
     
     def compress_checkpoint(self, checkpoint_id: str) -> int:
         """
-        Compress a checkpoint using gzip.
+        Compress a checkpoint's chunks using gzip.
+
+        Runs synchronously; chunks already compressed (by the background
+        worker or shared with another checkpoint) are skipped.
         
         Args:
             checkpoint_id: Checkpoint identifier
@@ -280,30 +360,21 @@ class CheckpointManager:
             logger.debug("Checkpoint already compressed: %s", checkpoint_id)
             return checkpoint.compressed_size or 0
         
-        # Serialize state
-        state_json = json.dumps(checkpoint.state, sort_keys=True)
-        state_bytes = state_json.encode('utf-8')
-        
-        # Compress
-        compressed_data = gzip.compress(state_bytes, compresslevel=6)
-        compressed_size = len(compressed_data)
-        
-        # Update checkpoint
-        checkpoint.compressed = True
-        checkpoint.compressed_size = compressed_size
-        checkpoint.status = CheckpointStatus.COMPRESSED
-        
-        compression_ratio = (1 - compressed_size / checkpoint.original_size) * 100
-        
-        logger.info(
-            "Compressed checkpoint: %s (original=%d bytes, compressed=%d bytes, ratio=%.1f%%)",
-            checkpoint_id,
-            checkpoint.original_size,
-            compressed_size,
-            compression_ratio
-        )
-        
-        return compressed_size
+        digests = list(self._resolve_manifest(checkpoint).values())
+        return self._compress_chunks(checkpoint, digests, digests)
+
+    def wait_for_compression(self, timeout: float | None = None) -> None:
+        """Block until all scheduled background compression has finished."""
+        with self._lock:
+            pending = list(self._pending.values())
+        for future in pending:
+            future.result(timeout=timeout)
+
+    def close(self) -> None:
+        """Finish pending compression and stop the background worker."""
+        if self._compressor is not None:
+            self._compressor.shutdown(wait=True)
+            self._compressor = None
     
     def get_checkpoint_stats(self, execution_id: str) -> dict[str, Any]:
         """
@@ -328,14 +399,20 @@ class CheckpointManager:
         total_size = sum(cp.original_size for cp in checkpoints)
         compressed_size = sum(cp.compressed_size or 0 for cp in checkpoints if cp.compressed)
         compressed_count = sum(1 for cp in checkpoints if cp.compressed)
+        snapshot_count = sum(1 for cp in checkpoints if cp.is_snapshot)
+        store_stats = self._store.stats()
         
         return {
             "execution_id": execution_id,
             "total_checkpoints": len(checkpoints),
             "compressed_checkpoints": compressed_count,
+            "snapshot_checkpoints": snapshot_count,
+            "delta_checkpoints": len(checkpoints) - snapshot_count,
             "total_size": total_size,
             "compressed_size": compressed_size,
             "compression_ratio": (1 - compressed_size / total_size) * 100 if total_size > 0 else 0,
+            "unique_chunks": store_stats["unique_chunks"],
+            "stored_bytes": store_stats["stored_bytes"],
             "oldest_checkpoint": min(cp.timestamp for cp in checkpoints),
             "newest_checkpoint": max(cp.timestamp for cp in checkpoints)
         }
@@ -343,49 +420,146 @@ class CheckpointManager:
     def _generate_checkpoint_id(self, execution_id: str, phase_id: str) -> str:
         """Generate a unique checkpoint ID."""
         timestamp = int(datetime.utcnow().timestamp() * 1000)
-        return f"cp_{execution_id}_{phase_id}_{timestamp}"
-    
-    def _copy_on_write(self, state: dict[str, Any]) -> dict[str, Any]:
-        """
-        Implement copy-on-write strategy for state.
-        
-        Creates a deep copy of the state to prevent shared references.
-        """
-        return json.loads(json.dumps(state))
+        checkpoint_id = f"cp_{execution_id}_{phase_id}_{timestamp}"
+        suffix = 1
+        candidate = checkpoint_id
+        while candidate in self._index:
+            candidate = f"{checkpoint_id}_{suffix}"
+            suffix += 1
+        return candidate
     
     def _find_checkpoint_by_id(self, checkpoint_id: str) -> Checkpoint | None:
         """Find a checkpoint by its ID across all executions."""
-        for checkpoints in self._checkpoints.values():
-            for checkpoint in checkpoints:
-                if checkpoint.checkpoint_id == checkpoint_id:
-                    return checkpoint
-        return None
+        return self._index.get(checkpoint_id)
+
+    def _resolve_manifest(self, checkpoint: Checkpoint) -> Manifest:
+        """Rebuild a checkpoint's full manifest from its delta chain."""
+        with self._lock:
+            history = self._checkpoints.get(checkpoint.execution_id)
+            if history and history[-1] is checkpoint:
+                head = self._heads.get(checkpoint.execution_id)
+                if head is not None:
+                    return dict(head)
+
+            chain = [checkpoint]
+            while not chain[-1].is_snapshot:
+                parent = self._index.get(chain[-1].parent_id or "")
+                if parent is None:
+                    raise ValueError(
+                        f"Broken checkpoint chain at: {chain[-1].checkpoint_id}"
+                    )
+                chain.append(parent)
+
+            manifest: Manifest = {}
+            for link in reversed(chain):
+                for path in link.removed_paths:
+                    manifest.pop(path, None)
+                manifest.update(link.delta)
+            return manifest
     
     def _verify_checksum(self, checkpoint: Checkpoint) -> bool:
         """Verify the checksum of a checkpoint."""
-        state_str = json.dumps(checkpoint.state, sort_keys=True)
-        calculated_checksum = hashlib.sha256(state_str.encode()).hexdigest()
-        return calculated_checksum == checkpoint.checksum
-    
-    def _decompress_checkpoint(self, checkpoint: Checkpoint) -> None:
+        try:
+            manifest = self._resolve_manifest(checkpoint)
+            if manifest_checksum(manifest) != checkpoint.checksum:
+                return False
+            for digest in manifest.values():
+                self._store.get(digest, verify=True)
+        except (KeyError, ValueError):
+            return False
+        return True
+
+    def _remove_checkpoint(self, checkpoint: Checkpoint, status: CheckpointStatus) -> None:
         """
-        Decompress a checkpoint state.
-        
-        In a production implementation with persistent storage, this would:
-        1. Read compressed data from storage
-        2. Decompress using gzip.decompress()
-        3. Deserialize JSON back to state dict
-        
-        For in-memory storage, state is already decompressed.
+        Remove a checkpoint, rebasing any delta that depends on it onto a
+        full snapshot and releasing its chunk references.
         """
-        # For in-memory storage, state is already available
-        # In production with file storage, implement:
-        # 1. Read compressed file from self.storage_path
-        # 2. compressed_data = read_file(checkpoint_file)
-        # 3. decompressed = gzip.decompress(compressed_data)
-        # 4. checkpoint.state = json.loads(decompressed)
-        logger.debug("Decompressing checkpoint: %s", checkpoint.checkpoint_id)
-        checkpoint.compressed = False
+        with self._lock:
+            manifest = self._resolve_manifest(checkpoint)
+            history = self._checkpoints.get(checkpoint.execution_id, [])
+            was_head = bool(history) and history[-1] is checkpoint
+
+            for child in history:
+                if child.parent_id == checkpoint.checkpoint_id:
+                    child.delta = self._resolve_manifest(child)
+                    child.removed_paths = []
+                    child.is_snapshot = True
+                    child.parent_id = None
+
+            if checkpoint in history:
+                history.remove(checkpoint)
+            self._index.pop(checkpoint.checkpoint_id, None)
+            self._pending.pop(checkpoint.checkpoint_id, None)
+
+            # Chain lengths are relative to the nearest snapshot
+            for link in history:
+                parent = self._index.get(link.parent_id or "")
+                if link.is_snapshot or parent is None:
+                    link.chain_length = 0
+                else:
+                    link.chain_length = parent.chain_length + 1
+
+            if was_head:
+                self._heads.pop(checkpoint.execution_id, None)
+                if history:
+                    self._heads[checkpoint.execution_id] = self._resolve_manifest(history[-1])
+            if not history:
+                self._checkpoints.pop(checkpoint.execution_id, None)
+
+            self._store.decref(manifest.values())
+            checkpoint.status = status
+
+    def _schedule_compression(
+        self,
+        checkpoint: Checkpoint,
+        new_digests: Any,
+        all_digests: list[str]
+    ) -> None:
+        """Queue compression of a checkpoint's new chunks on the worker."""
+        with self._lock:
+            if self._compressor is None:
+                self._compressor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="checkpoint-compress"
+                )
+            future = self._compressor.submit(
+                self._compress_chunks, checkpoint, list(new_digests), all_digests
+            )
+            self._pending[checkpoint.checkpoint_id] = future
+            future.add_done_callback(
+                lambda _f, cid=checkpoint.checkpoint_id: self._pending.pop(cid, None)
+            )
+
+    def _compress_chunks(
+        self,
+        checkpoint: Checkpoint,
+        new_digests: list[str],
+        all_digests: list[str]
+    ) -> int:
+        """Compress chunks and record the checkpoint's compressed size."""
+        for digest in new_digests:
+            self._store.compress(digest)
+        compressed_size = sum(self._store.stored_size(d) for d in all_digests)
+
+        with self._lock:
+            if checkpoint.status == CheckpointStatus.CREATED:
+                checkpoint.status = CheckpointStatus.COMPRESSED
+            checkpoint.compressed = True
+            checkpoint.compressed_size = compressed_size
+
+        compression_ratio = (
+            (1 - compressed_size / checkpoint.original_size) * 100
+            if checkpoint.original_size else 0.0
+        )
+
+        logger.info(
+            "Compressed checkpoint: %s (original=%d bytes, compressed=%d bytes, ratio=%.1f%%)",
+            checkpoint.checkpoint_id,
+            checkpoint.original_size,
+            compressed_size,
+            compression_ratio
+        )
+
+        return compressed_size
     
     def delete_checkpoint(self, checkpoint_id: str) -> bool:
         """
@@ -397,14 +571,12 @@ class CheckpointManager:
         Returns:
             True if deleted, False if not found
         """
-        for execution_id, checkpoints in self._checkpoints.items():
-            for i, checkpoint in enumerate(checkpoints):
-                if checkpoint.checkpoint_id == checkpoint_id:
-                    checkpoint.status = CheckpointStatus.DELETED
-                    checkpoints.pop(i)
-                    logger.info("Deleted checkpoint: %s", checkpoint_id)
-                    return True
-        return False
+        checkpoint = self._find_checkpoint_by_id(checkpoint_id)
+        if checkpoint is None:
+            return False
+        self._remove_checkpoint(checkpoint, CheckpointStatus.DELETED)
+        logger.info("Deleted checkpoint: %s", checkpoint_id)
+        return True
     
     def cleanup_expired_checkpoints(self, max_age_days: int = 7) -> int:
         """
@@ -419,17 +591,13 @@ class CheckpointManager:
         cutoff_time = datetime.utcnow() - timedelta(days=max_age_days)
         removed_count = 0
         
-        for execution_id, checkpoints in list(self._checkpoints.items()):
-            expired = [cp for cp in checkpoints if cp.timestamp < cutoff_time]
-            
-            for checkpoint in expired:
-                checkpoint.status = CheckpointStatus.EXPIRED
-                checkpoints.remove(checkpoint)
-                removed_count += 1
-            
-            # Remove empty execution entries
-            if not checkpoints:
-                del self._checkpoints[execution_id]
+        with self._lock:
+            for checkpoints in list(self._checkpoints.values()):
+                expired = [cp for cp in checkpoints if cp.timestamp < cutoff_time]
+
+                for checkpoint in expired:
+                    self._remove_checkpoint(checkpoint, CheckpointStatus.EXPIRED)
+                    removed_count += 1
         
         logger.info(
             "Cleaned up %d expired checkpoints (older than %d days)",
@@ -0,0 +1,244 @@
+"""
+Content-Addressed Checkpoint Store
+
+Storage primitives used by the CheckpointManager:
+
+- State is split into structural chunks (one per key path down to a fixed
+  depth), each serialized canonically and addressed by its SHA-256 digest.
+- Chunks are stored once and shared by every checkpoint that references
+  them; reference counts free a chunk when its last checkpoint goes away.
+- Chunks can be compressed in place after they are written, so compression
+  never sits on the checkpoint creation path.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+ChunkPath = tuple[str, ...]
+Manifest = dict[ChunkPath, str]
+
+
+@dataclass
+class StoredChunk:
+    """A single content-addressed chunk."""
+    data: bytes
+    size: int
+    compressed: bool = False
+    refcount: int = 0
+
+
+class ChunkStore:
+    """
+    Thread-safe content-addressed chunk storage with reference counting.
+    """
+
+    def __init__(self, compression_level: int = 6):
+        self.compression_level = compression_level
+        self._chunks: dict[str, StoredChunk] = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._chunks
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def put(self, payload: bytes) -> str:
+        """
+        Store a payload and return its digest.
+
+        Payloads already present are not stored again.
+        """
+        digest = hashlib.sha256(payload).hexdigest()
+        with self._lock:
+            if digest not in self._chunks:
+                self._chunks[digest] = StoredChunk(data=payload, size=len(payload))
+        return digest
+
+    def incref(self, digests: Iterable[str]) -> None:
+        """Add a reference to each digest."""
+        with self._lock:
+            for digest in digests:
+                self._chunks[digest].refcount += 1
+
+    def decref(self, digests: Iterable[str]) -> int:
+        """
+        Drop a reference to each digest, freeing unreferenced chunks.
+
+        Returns:
+            Number of chunks freed
+        """
+        freed = 0
+        with self._lock:
+            for digest in digests:
+                chunk = self._chunks.get(digest)
+                if chunk is None:
+                    continue
+                chunk.refcount -= 1
+                if chunk.refcount <= 0:
+                    del self._chunks[digest]
+                    freed += 1
+        return freed
+
+    def get(self, digest: str, verify: bool = False) -> bytes:
+        """
+        Read a chunk's uncompressed payload.
+
+        Raises:
+            KeyError: If the chunk is unknown
+            ValueError: If verification is requested and the digest mismatches
+        """
+        with self._lock:
+            chunk = self._chunks[digest]
+            data, compressed = chunk.data, chunk.compressed
+        payload = gzip.decompress(data) if compressed else data
+        if verify and hashlib.sha256(payload).hexdigest() != digest:
+            raise ValueError(f"Chunk digest mismatch: {digest}")
+        return payload
+
+    def load(self, digest: str, verify: bool = False) -> Any:
+        """Read and decode a chunk's JSON value."""
+        return json.loads(self.get(digest, verify=verify))
+
+    def compress(self, digest: str) -> int:
+        """
+        Compress a chunk in place (no-op if already compressed or if
+        compression would not shrink it).
+
+        Returns:
+            Stored size in bytes
+        """
+        with self._lock:
+            chunk = self._chunks.get(digest)
+            if chunk is None:
+                return 0
+            if chunk.compressed:
+                return len(chunk.data)
+            raw = chunk.data
+        packed = gzip.compress(raw, compresslevel=self.compression_level)
+        with self._lock:
+            chunk = self._chunks.get(digest)
+            if chunk is None:
+                return 0
+            if not chunk.compressed and len(packed) < len(raw):
+                chunk.data = packed
+                chunk.compressed = True
+            return len(chunk.data)
+
+    def stored_size(self, digest: str) -> int:
+        """Bytes currently held for a chunk."""
+        chunk = self._chunks.get(digest)
+        return len(chunk.data) if chunk else 0
+
+    def logical_size(self, digest: str) -> int:
+        """Uncompressed size of a chunk."""
+        chunk = self._chunks.get(digest)
+        return chunk.size if chunk else 0
+
+    def is_compressed(self, digest: str) -> bool:
+        chunk = self._chunks.get(digest)
+        return bool(chunk and chunk.compressed)
+
+    def stats(self) -> dict[str, Any]:
+        """Store-wide statistics."""
+        with self._lock:
+            return {
+                "unique_chunks": len(self._chunks),
+                "logical_bytes": sum(c.size for c in self._chunks.values()),
+                "stored_bytes": sum(len(c.data) for c in self._chunks.values()),
+                "compressed_chunks": sum(1 for c in self._chunks.values() if c.compressed),
+            }
+
+
+def encode_chunk(value: Any) -> bytes:
+    """Canonical JSON encoding so equal values share a digest."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def split_state(state: dict[str, Any], max_depth: int = 2) -> list[tuple[ChunkPath, bytes]]:
+    """
+    Split a state dict into structural chunks.
+
+    Non-empty dicts above ``max_depth`` are descended into; everything else
+    becomes a leaf chunk keyed by its key path.
+    """
+    chunks: list[tuple[ChunkPath, bytes]] = []
+
+    def walk(node: dict[str, Any], path: ChunkPath) -> None:
+        for key, value in node.items():
+            child = path + (str(key),)
+            if isinstance(value, dict) and value and len(child) < max_depth:
+                walk(value, child)
+            else:
+                chunks.append((child, encode_chunk(value)))
+
+    walk(state, ())
+    return chunks
+
+
+def assemble_state(items: Iterable[tuple[ChunkPath, Any]]) -> dict[str, Any]:
+    """Rebuild a nested dict from (key path, value) pairs."""
+    state: dict[str, Any] = {}
+    for path, value in items:
+        node = state
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return state
+
+
+def manifest_checksum(manifest: Manifest) -> str:
+    """Checksum over a manifest's (path, digest) pairs."""
+    hasher = hashlib.sha256()
+    for path, digest in sorted(manifest.items()):
+        hasher.update("\x1f".join(path).encode("utf-8"))
+        hasher.update(b"\x00")
+        hasher.update(digest.encode("ascii"))
+        hasher.update(b"\n")
+    return hasher.hexdigest()
+
+
+class LazyState(Mapping):
+    """
+    Read-only view of a checkpointed state that decodes chunks on access.
+
+    Top-level values are materialized the first time they are read, so
+    callers that only need part of a large state never decode the rest.
+    """
+
+    def __init__(self, manifest: Manifest, store: ChunkStore, verify: bool = True):
+        self._store = store
+        self._verify = verify
+        self._groups: dict[str, list[tuple[ChunkPath, str]]] = {}
+        for path, digest in manifest.items():
+            self._groups.setdefault(path[0], []).append((path, digest))
+        self._cache: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._cache:
+            return self._cache[key]
+        entries = self._groups[key]
+        if len(entries) == 1 and len(entries[0][0]) == 1:
+            value = self._store.load(entries[0][1], verify=self._verify)
+        else:
+            value = assemble_state(
+                (path[1:], self._store.load(digest, verify=self._verify))
+                for path, digest in entries
+            )
+        self._cache[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._groups)
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Materialize the full state."""
+        return {key: self[key] for key in self._groups}
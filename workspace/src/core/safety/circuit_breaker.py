@@ -4,6 +4,10 @@ Circuit Breaker System (斷路器系統)
 When anomalies are detected, automatically cut off operations to prevent disaster spread.
 
 Reference: Circuit breakers trigger automatically when AI executes unauthorized operations [2]
+
+Besides the classic consecutive-failure threshold, breakers can evaluate
+failure and slow-call *rates* over a sliding window (count- or time-based
+ring buffer), so they react to the share of bad calls rather than raw counts.
 """
 
 from enum import Enum
@@ -21,6 +25,119 @@ class CircuitBreakerState(Enum):
     HALF_OPEN = "half_open"  # Testing - allowing limited requests
 
 
+class SlidingWindowType(Enum):
+    """How the sliding window is bounded"""
+    COUNT_BASED = "count_based"  # Last N calls
+    TIME_BASED = "time_based"    # Calls in the last N seconds
+
+
+@dataclass
+class WindowSnapshot:
+    """Aggregated outcomes currently inside a sliding window"""
+    total_calls: int = 0
+    failed_calls: int = 0
+    slow_calls: int = 0
+    
+    @property
+    def failure_rate(self) -> float:
+        return self.failed_calls / self.total_calls if self.total_calls else 0.0
+    
+    @property
+    def slow_call_rate(self) -> float:
+        return self.slow_calls / self.total_calls if self.total_calls else 0.0
+
+
+class SlidingWindow:
+    """
+    Ring buffer of call outcomes with O(1) record and aggregate
+    
+    COUNT_BASED keeps the last ``size`` outcomes. TIME_BASED keeps one
+    bucket per second for the last ``size`` seconds; expired buckets are
+    subtracted from the running totals as the clock advances.
+    """
+    
+    _FAILED = 1
+    _SLOW = 2
+    
+    def __init__(
+        self,
+        size: int = 100,
+        window_type: SlidingWindowType = SlidingWindowType.COUNT_BASED,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if size < 1:
+            raise ValueError("Sliding window size must be at least 1")
+        self.size = size
+        self.window_type = window_type
+        self._clock = clock
+        self.reset()
+    
+    def reset(self) -> None:
+        """Drop all recorded outcomes"""
+        self._total = 0
+        self._failed = 0
+        self._slow = 0
+        if self.window_type == SlidingWindowType.COUNT_BASED:
+            self._outcomes = [0] * self.size
+            self._cursor = 0
+        else:
+            self._bucket_epochs = [-1] * self.size
+            self._bucket_calls = [0] * self.size
+            self._bucket_failed = [0] * self.size
+            self._bucket_slow = [0] * self.size
+    
+    def record(self, failed: bool, slow: bool) -> None:
+        """Record one call outcome"""
+        if self.window_type == SlidingWindowType.COUNT_BASED:
+            outcome = (self._FAILED if failed else 0) | (self._SLOW if slow else 0)
+            if self._total == self.size:
+                evicted = self._outcomes[self._cursor]
+                self._failed -= evicted & self._FAILED
+                self._slow -= (evicted & self._SLOW) >> 1
+            else:
+                self._total += 1
+            self._outcomes[self._cursor] = outcome
+            self._cursor = (self._cursor + 1) % self.size
+        else:
+            epoch = int(self._clock())
+            i = epoch % self.size
+            if self._bucket_epochs[i] != epoch:
+                self._evict_bucket(i)
+                self._bucket_epochs[i] = epoch
+            self._bucket_calls[i] += 1
+            self._total += 1
+            if failed:
+                self._bucket_failed[i] += 1
+            if slow:
+                self._bucket_slow[i] += 1
+        if failed:
+            self._failed += 1
+        if slow:
+            self._slow += 1
+    
+    def snapshot(self) -> WindowSnapshot:
+        """Aggregate outcomes currently inside the window"""
+        if self.window_type == SlidingWindowType.TIME_BASED:
+            oldest = int(self._clock()) - self.size + 1
+            for i, epoch in enumerate(self._bucket_epochs):
+                if 0 <= epoch < oldest:
+                    self._evict_bucket(i)
+        return WindowSnapshot(
+            total_calls=self._total,
+            failed_calls=self._failed,
+            slow_calls=self._slow
+        )
+    
+    def _evict_bucket(self, i: int) -> None:
+        self._total -= self._bucket_calls[i]
+        self._failed -= self._bucket_failed[i]
+        self._slow -= self._bucket_slow[i]
+        self._bucket_epochs[i] = -1
+        self._bucket_calls[i] = 0
+        self._bucket_failed[i] = 0
+        self._bucket_slow[i] = 0
+
+
 @dataclass
 class CircuitBreakerConfig:
     """Configuration for circuit breaker"""
@@ -32,6 +149,13 @@ class CircuitBreakerConfig:
     slow_call_threshold: float = 5.0    # Seconds to consider a call "slow"
     slow_call_rate_threshold: float = 0.5  # Rate of slow calls to trigger
     excluded_exceptions: List[type] = field(default_factory=list)
+    # Rate-based evaluation; enabled when failure_rate_threshold is set, in
+    # which case slow_call_rate_threshold also trips the breaker
+    failure_rate_threshold: Optional[float] = None  # Failure rate (0-1) to trigger
+    sliding_window_type: SlidingWindowType = SlidingWindowType.COUNT_BASED
+    sliding_window_size: int = 100      # Calls (count-based) or seconds (time-based)
+    minimum_number_of_calls: int = 10   # Calls in window before rates are evaluated
+    permitted_calls_in_half_open: Optional[int] = None  # Defaults to success_threshold
 
 
 @dataclass
@@ -63,6 +187,12 @@ class CircuitBreaker(Generic[T]):
     - OPEN: Tripped, all requests are blocked
     - HALF_OPEN: Testing recovery, limited requests allowed
     
+    The operation itself runs outside any lock, so concurrent callers are
+    not serialized; only permission checks and outcome recording are.
+    Callers that cannot wrap an operation (e.g. results reported as
+    values rather than exceptions) can drive the breaker directly with
+    ``try_acquire_permission`` / ``on_success`` / ``on_error``.
+    
     Example:
         breaker = CircuitBreaker(CircuitBreakerConfig(name="database"))
         result = await breaker.execute(lambda: db.query("SELECT * FROM users"))
@@ -73,11 +203,15 @@ class CircuitBreaker(Generic[T]):
         self._state = CircuitBreakerState.CLOSED
         self._failure_count = 0
         self._success_count = 0
+        self._half_open_in_flight = 0
         self._last_failure_time: Optional[float] = None
         self._last_state_change_time = time.time()
         self._metrics = CircuitBreakerMetrics()
+        self._window = SlidingWindow(
+            self.config.sliding_window_size,
+            self.config.sliding_window_type
+        )
         self._listeners: List[Callable[[CircuitBreakerState, CircuitBreakerState], None]] = []
-        self._lock = asyncio.Lock()
     
     @property
     def state(self) -> CircuitBreakerState:
@@ -89,6 +223,11 @@ class CircuitBreaker(Generic[T]):
         """Get current metrics"""
         return self._metrics
     
+    @property
+    def window(self) -> WindowSnapshot:
+        """Outcomes inside the sliding window"""
+        return self._window.snapshot()
+    
     @property
     def is_closed(self) -> bool:
         """Check if circuit is closed (normal operation)"""
@@ -135,8 +274,10 @@ class CircuitBreaker(Generic[T]):
             # Reset counters on state change
             if new_state == CircuitBreakerState.HALF_OPEN:
                 self._success_count = 0
+                self._half_open_in_flight = 0
             elif new_state == CircuitBreakerState.CLOSED:
                 self._failure_count = 0
+                self._window.reset()
             
             self._notify_state_change(old_state, new_state)
     
@@ -157,13 +298,11 @@ class CircuitBreaker(Generic[T]):
             self._success_count += 1
             if self._success_count >= self.config.success_threshold:
                 self._transition_to(CircuitBreakerState.CLOSED)
+        elif self._state == CircuitBreakerState.CLOSED:
+            self._evaluate_rates()
     
     def _record_failure(self, exception: Exception) -> None:
         """Record a failed call"""
-        # Check if exception is excluded
-        if any(isinstance(exception, exc) for exc in self.config.excluded_exceptions):
-            return
-        
         self._metrics.failed_calls += 1
         self._metrics.last_failure_time = datetime.now()
         self._last_failure_time = time.time()
@@ -173,13 +312,80 @@ class CircuitBreaker(Generic[T]):
             self._transition_to(CircuitBreakerState.OPEN)
         elif self._state == CircuitBreakerState.CLOSED:
             self._failure_count += 1
-            if self._failure_count >= self.config.failure_threshold:
+            if self.config.failure_rate_threshold is not None:
+                self._evaluate_rates()
+            elif self._failure_count >= self.config.failure_threshold:
                 self._transition_to(CircuitBreakerState.OPEN)
     
-    def _record_slow_call(self, duration: float) -> None:
+    def _record_slow_call(self, duration: float) -> bool:
         """Record a slow call"""
         if duration >= self.config.slow_call_threshold:
             self._metrics.slow_calls += 1
+            return True
+        return False
+    
+    def _evaluate_rates(self) -> None:
+        """Open the circuit if windowed failure or slow-call rates are too high"""
+        if self.config.failure_rate_threshold is None:
+            return
+        snapshot = self._window.snapshot()
+        if snapshot.total_calls < self.config.minimum_number_of_calls:
+            return
+        if (snapshot.failure_rate >= self.config.failure_rate_threshold or
+                snapshot.slow_call_rate >= self.config.slow_call_rate_threshold):
+            self._transition_to(CircuitBreakerState.OPEN)
+    
+    def try_acquire_permission(self) -> bool:
+        """
+        Ask to let one call through
+        
+        Returns:
+            False if the call must be rejected (circuit open, or the
+            half-open trial slots are all in use)
+        """
+        self._metrics.total_calls += 1
+        
+        # Check if we should try to reset
+        if self._should_attempt_reset():
+            self._transition_to(CircuitBreakerState.HALF_OPEN)
+        
+        if self._state == CircuitBreakerState.OPEN:
+            self._metrics.rejected_calls += 1
+            return False
+        
+        if self._state == CircuitBreakerState.HALF_OPEN:
+            permitted = self.config.permitted_calls_in_half_open or self.config.success_threshold
+            if self._half_open_in_flight >= permitted:
+                self._metrics.rejected_calls += 1
+                return False
+            self._half_open_in_flight += 1
+        
+        return True
+    
+    def _release_half_open_slot(self) -> None:
+        if self._state == CircuitBreakerState.HALF_OPEN and self._half_open_in_flight > 0:
+            self._half_open_in_flight -= 1
+    
+    def release_permission(self) -> None:
+        """Return a permission without recording an outcome (e.g. cancelled call)"""
+        self._release_half_open_slot()
+    
+    def on_success(self, duration: float = 0.0) -> None:
+        """Report a permitted call that succeeded after ``duration`` seconds"""
+        self._release_half_open_slot()
+        slow = self._record_slow_call(duration)
+        self._window.record(failed=False, slow=slow)
+        self._record_success()
+    
+    def on_error(self, exception: Exception, duration: float = 0.0) -> None:
+        """Report a permitted call that failed after ``duration`` seconds"""
+        self._release_half_open_slot()
+        # Excluded exceptions count as neither success nor failure
+        if any(isinstance(exception, exc) for exc in self.config.excluded_exceptions):
+            return
+        slow = self._record_slow_call(duration)
+        self._window.record(failed=True, slow=slow)
+        self._record_failure(exception)
     
     async def execute(
         self, 
@@ -199,40 +405,29 @@ class CircuitBreaker(Generic[T]):
         Raises:
             CircuitBreakerOpenError: If circuit is open and no fallback provided
         """
-        async with self._lock:
-            self._metrics.total_calls += 1
-            
-            # Check if we should try to reset
-            if self._should_attempt_reset():
-                self._transition_to(CircuitBreakerState.HALF_OPEN)
-            
-            # If open, reject or use fallback
-            if self._state == CircuitBreakerState.OPEN:
-                self._metrics.rejected_calls += 1
-                if fallback:
-                    return fallback()
-                raise CircuitBreakerOpenError(
-                    f"Circuit breaker '{self.config.name}' is OPEN"
-                )
-            
-            # Execute the operation
-            start_time = time.time()
-            try:
-                if asyncio.iscoroutinefunction(operation):
-                    result = await operation()
-                else:
-                    result = operation()
-                
-                duration = time.time() - start_time
-                self._record_slow_call(duration)
-                self._record_success()
-                return result
-                
-            except Exception as e:
-                self._record_failure(e)
-                if fallback:
-                    return fallback()
-                raise
+        # If open, reject or use fallback
+        if not self.try_acquire_permission():
+            if fallback:
+                return fallback()
+            raise CircuitBreakerOpenError(
+                f"Circuit breaker '{self.config.name}' is {self._state.value.upper()}"
+            )
+        
+        # Execute the operation
+        start_time = time.monotonic()
+        try:
+            if asyncio.iscoroutinefunction(operation):
+                result = await operation()
+            else:
+                result = operation()
+        except Exception as e:
+            self.on_error(e, time.monotonic() - start_time)
+            if fallback:
+                return fallback()
+            raise
+        
+        self.on_success(time.monotonic() - start_time)
+        return result
     
     def reset(self) -> None:
         """Manually reset the circuit breaker to CLOSED state"""
@@ -246,11 +441,18 @@ class CircuitBreaker(Generic[T]):
     
     def get_stats(self) -> Dict[str, Any]:
         """Get circuit breaker statistics"""
+        snapshot = self._window.snapshot()
         return {
             "name": self.config.name,
             "state": self._state.value,
             "failure_count": self._failure_count,
             "success_count": self._success_count,
+            "window": {
+                "type": self._window.window_type.value,
+                "calls": snapshot.total_calls,
+                "failure_rate": snapshot.failure_rate,
+                "slow_call_rate": snapshot.slow_call_rate,
+            },
             "metrics": {
                 "total_calls": self._metrics.total_calls,
                 "successful_calls": self._metrics.successful_calls,
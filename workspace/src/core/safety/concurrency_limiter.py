@@ -0,0 +1,208 @@
+"""
+Adaptive Concurrency Limiter (自適應並發限制器)
+
+Bounds the number of in-flight calls to a target and adapts that bound to
+observed latency, shedding load before a slow dependency drags callers down.
+
+Algorithms:
+- AIMD: additive increase while latency is healthy, multiplicative decrease
+  when a call is slower than the latency threshold or is dropped
+- GRADIENT: scales the limit by the ratio of long-term to short-term latency,
+  shrinking it as latency rises above its baseline
+"""
+
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, TypeVar
+from dataclasses import dataclass
+import asyncio
+import math
+import time
+
+
+class LimitAlgorithm(Enum):
+    """Concurrency limit adaptation algorithms"""
+    AIMD = "aimd"
+    GRADIENT = "gradient"
+
+
+@dataclass
+class ConcurrencyLimiterConfig:
+    """Configuration for adaptive concurrency limiter"""
+    name: str = "default"
+    algorithm: LimitAlgorithm = LimitAlgorithm.GRADIENT
+    initial_limit: int = 20
+    min_limit: int = 1
+    max_limit: int = 200
+    # AIMD
+    latency_threshold: float = 1.0   # Seconds above which a call counts as congestion
+    backoff_ratio: float = 0.9       # Multiplier applied to the limit on congestion
+    # GRADIENT
+    smoothing: float = 0.2           # Weight of each new limit estimate
+    long_window: int = 600           # Samples in the long-term latency average
+    tolerance: float = 2.0           # Latency growth tolerated before shrinking
+
+
+@dataclass
+class ConcurrencyLimiterMetrics:
+    """Metrics for concurrency limiter"""
+    total_calls: int = 0
+    rejected_calls: int = 0
+    dropped_calls: int = 0
+    limit_changes: int = 0
+
+
+class ConcurrencyLimitExceededError(Exception):
+    """Raised when the in-flight limit is reached and the call is rejected"""
+    pass
+
+
+T = TypeVar('T')
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Adaptive Concurrency Limiter
+
+    Admits a call only while in-flight calls are below the current limit;
+    each completed call feeds its latency back into the limit algorithm.
+
+    Example:
+        limiter = AdaptiveConcurrencyLimiter(ConcurrencyLimiterConfig(name="api"))
+        result = await limiter.execute(lambda: client.get("/users"))
+    """
+
+    def __init__(self, config: Optional[ConcurrencyLimiterConfig] = None):
+        self.config = config or ConcurrencyLimiterConfig()
+        self._limit = float(self.config.initial_limit)
+        self._in_flight = 0
+        self._long_rtt: Optional[float] = None
+        self._short_rtt: Optional[float] = None
+        self._metrics = ConcurrencyLimiterMetrics()
+
+    @property
+    def limit(self) -> int:
+        """Current in-flight limit"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently in flight"""
+        return self._in_flight
+
+    @property
+    def metrics(self) -> ConcurrencyLimiterMetrics:
+        return self._metrics
+
+    def try_acquire(self) -> bool:
+        """
+        Ask to start one call
+
+        Returns:
+            False if the limit is reached and the call must be rejected
+        """
+        self._metrics.total_calls += 1
+        if self._in_flight >= self.limit:
+            self._metrics.rejected_calls += 1
+            return False
+        self._in_flight += 1
+        return True
+
+    def release(self, latency: float, dropped: bool = False) -> None:
+        """
+        Finish a call admitted by ``try_acquire``
+
+        Args:
+            latency: Call duration in seconds
+            dropped: True if the call timed out or was shed downstream
+        """
+        in_flight = self._in_flight
+        self._in_flight = max(0, self._in_flight - 1)
+        if dropped:
+            self._metrics.dropped_calls += 1
+
+        if self.config.algorithm == LimitAlgorithm.AIMD:
+            new_limit = self._aimd(latency, dropped, in_flight)
+        else:
+            new_limit = self._gradient(latency, dropped, in_flight)
+
+        new_limit = min(float(self.config.max_limit), max(float(self.config.min_limit), new_limit))
+        if int(new_limit) != self.limit:
+            self._metrics.limit_changes += 1
+        self._limit = new_limit
+
+    def cancel(self) -> None:
+        """Finish an admitted call without feeding a latency sample"""
+        self._in_flight = max(0, self._in_flight - 1)
+
+    def _aimd(self, latency: float, dropped: bool, in_flight: int) -> float:
+        if dropped or latency > self.config.latency_threshold:
+            return self._limit * self.config.backoff_ratio
+        # Only grow while the limit is actually being used
+        if in_flight * 2 >= self._limit:
+            return self._limit + 1
+        return self._limit
+
+    def _gradient(self, latency: float, dropped: bool, in_flight: int) -> float:
+        if dropped:
+            return self._limit * 0.5
+
+        long_alpha = 2.0 / (self.config.long_window + 1)
+        if self._long_rtt is None:
+            self._long_rtt = self._short_rtt = latency
+        else:
+            self._long_rtt += long_alpha * (latency - self._long_rtt)
+            self._short_rtt += 0.5 * (latency - self._short_rtt)
+
+        short_rtt = max(self._short_rtt, 1e-9)
+
+        # Let the baseline drift back down quickly once latency recovers
+        if self._long_rtt / short_rtt > 2:
+            self._long_rtt *= 0.95
+
+        # Don't grow an under-utilized limit
+        if in_flight < self._limit / 2:
+            return self._limit
+
+        gradient = max(0.5, min(1.0, self.config.tolerance * self._long_rtt / short_rtt))
+        queue_size = math.sqrt(self._limit)
+        estimate = self._limit * gradient + queue_size
+        return self._limit * (1 - self.config.smoothing) + estimate * self.config.smoothing
+
+    async def execute(self, operation: Callable[[], T]) -> T:
+        """
+        Execute operation if the in-flight limit allows it
+
+        Raises:
+            ConcurrencyLimitExceededError: If the limit is reached
+        """
+        if not self.try_acquire():
+            raise ConcurrencyLimitExceededError(
+                f"Concurrency limit {self.limit} reached for '{self.config.name}'"
+            )
+
+        start_time = time.monotonic()
+        dropped = False
+        try:
+            if asyncio.iscoroutinefunction(operation):
+                return await operation()
+            return operation()
+        except asyncio.TimeoutError:
+            dropped = True
+            raise
+        finally:
+            self.release(time.monotonic() - start_time, dropped=dropped)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics"""
+        return {
+            "name": self.config.name,
+            "algorithm": self.config.algorithm.value,
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "metrics": {
+                "total_calls": self._metrics.total_calls,
+                "rejected_calls": self._metrics.rejected_calls,
+                "dropped_calls": self._metrics.dropped_calls,
+                "limit_changes": self._metrics.limit_changes,
+            }
+        }
@@ -0,0 +1,239 @@
+"""
+Per-Target Resilience Guards (目標韌性防護)
+
+Combines a rate-based circuit breaker, an adaptive concurrency limiter and
+a retry budget for each call target (executor, connector, service), and
+exports their state as metrics.
+
+Example:
+    registry = ResilienceRegistry()
+    result = await registry.call("payments-api", lambda: client.charge(order))
+    print(registry.render_prometheus())
+"""
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from .circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerOpenError,
+    CircuitBreakerState,
+)
+from .concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiterConfig,
+    ConcurrencyLimitExceededError,
+)
+from .retry_policies import RetryBudget
+
+T = TypeVar('T')
+
+_STATE_VALUES = {
+    CircuitBreakerState.CLOSED: 0,
+    CircuitBreakerState.HALF_OPEN: 1,
+    CircuitBreakerState.OPEN: 2,
+}
+
+
+# Errors retried by default: the call may succeed unchanged on another attempt
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (
+    ConnectionError,
+    TimeoutError,
+    asyncio.TimeoutError,
+)
+
+
+def _default_breaker_config() -> CircuitBreakerConfig:
+    return CircuitBreakerConfig(
+        failure_rate_threshold=0.5,
+        sliding_window_size=50,
+        minimum_number_of_calls=10,
+        timeout=30.0,
+    )
+
+
+@dataclass
+class ResilienceConfig:
+    """Configuration applied to each guarded target"""
+    breaker: CircuitBreakerConfig = field(default_factory=_default_breaker_config)
+    limiter: Optional[ConcurrencyLimiterConfig] = field(default_factory=ConcurrencyLimiterConfig)
+    max_retries: int = 2
+    retry_delay: float = 0.05           # Seconds before the first retry
+    retry_backoff_multiplier: float = 2.0
+    retry_ratio: float = 0.2            # Retry budget: retries per request
+    min_retries_per_second: float = 1.0
+    retry_budget_ttl_seconds: int = 10
+    retry_on: Tuple[Type[BaseException], ...] = TRANSIENT_ERRORS  # (Exception,) retries everything
+
+
+class TargetGuard:
+    """
+    Breaker, limiter and retry budget for one target
+
+    ``call`` wraps an operation end to end. Callers that report failures as
+    values can use ``try_acquire`` / ``release`` directly.
+    """
+
+    def __init__(self, target: str, config: Optional[ResilienceConfig] = None):
+        self.target = target
+        self.config = config or ResilienceConfig()
+        self.breaker: CircuitBreaker = CircuitBreaker(replace(self.config.breaker, name=target))
+        self.limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        if self.config.limiter is not None:
+            self.limiter = AdaptiveConcurrencyLimiter(replace(self.config.limiter, name=target))
+        self.budget = RetryBudget(
+            retry_ratio=self.config.retry_ratio,
+            min_retries_per_second=self.config.min_retries_per_second,
+            ttl_seconds=self.config.retry_budget_ttl_seconds,
+        )
+
+    def try_acquire(self) -> Optional[str]:
+        """
+        Admit one attempt
+
+        Returns:
+            None if admitted, otherwise the rejection reason
+            ("circuit_open" or "concurrency_limit")
+        """
+        if self.limiter is not None and not self.limiter.try_acquire():
+            return "concurrency_limit"
+        if not self.breaker.try_acquire_permission():
+            if self.limiter is not None:
+                self.limiter.cancel()
+            return "circuit_open"
+        return None
+
+    def release(self, latency: float, error: Optional[Exception] = None) -> None:
+        """Finish an attempt admitted by ``try_acquire``"""
+        if error is None:
+            self.breaker.on_success(latency)
+        else:
+            self.breaker.on_error(error, latency)
+        if self.limiter is not None:
+            self.limiter.release(latency, dropped=isinstance(error, asyncio.TimeoutError))
+
+    def _rejection_error(self, reason: str) -> Exception:
+        if reason == "circuit_open":
+            return CircuitBreakerOpenError(f"Circuit breaker '{self.target}' is OPEN")
+        return ConcurrencyLimitExceededError(f"Concurrency limit reached for '{self.target}'")
+
+    async def call(self, operation: Callable[[], T]) -> T:
+        """
+        Execute operation with breaker, limiter and budgeted retries
+
+        Rejections are raised immediately and never retried. Other errors
+        are retried only if they match ``config.retry_on``.
+
+        Raises:
+            CircuitBreakerOpenError: If the circuit is open
+            ConcurrencyLimitExceededError: If the in-flight limit is reached
+        """
+        self.budget.record_request()
+        delay = self.config.retry_delay
+        attempt = 0
+        while True:
+            reason = self.try_acquire()
+            if reason is not None:
+                raise self._rejection_error(reason)
+
+            start_time = time.monotonic()
+            try:
+                result = operation()
+                if inspect.isawaitable(result):
+                    result = await result
+            except self.config.retry_on as e:
+                self.release(time.monotonic() - start_time, error=e)
+                if attempt >= self.config.max_retries or not self.budget.try_acquire_retry():
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                delay *= self.config.retry_backoff_multiplier
+                continue
+            except Exception as e:
+                self.release(time.monotonic() - start_time, error=e)
+                raise
+            except BaseException:
+                # Cancelled: return the slots without recording an outcome
+                self.breaker.release_permission()
+                if self.limiter is not None:
+                    self.limiter.cancel()
+                raise
+
+            self.release(time.monotonic() - start_time)
+            return result
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Flat numeric metrics for this target"""
+        window = self.breaker.window
+        breaker_metrics = self.breaker.metrics
+        metrics = {
+            "circuit_state": _STATE_VALUES[self.breaker.state],
+            "circuit_failure_rate": window.failure_rate,
+            "circuit_slow_call_rate": window.slow_call_rate,
+            "circuit_window_calls": window.total_calls,
+            "circuit_rejected_calls": breaker_metrics.rejected_calls,
+            "calls_total": breaker_metrics.successful_calls + breaker_metrics.failed_calls,
+            "calls_failed": breaker_metrics.failed_calls,
+            "retry_budget_remaining": self.budget.remaining(),
+        }
+        if self.limiter is not None:
+            metrics.update({
+                "concurrency_limit": self.limiter.limit,
+                "concurrency_in_flight": self.limiter.in_flight,
+                "concurrency_rejected_calls": self.limiter.metrics.rejected_calls,
+            })
+        return metrics
+
+
+class ResilienceRegistry:
+    """
+    Registry of per-target guards
+
+    Targets are created on first use with the default config unless
+    configured explicitly.
+    """
+
+    def __init__(self, default_config: Optional[ResilienceConfig] = None):
+        self.default_config = default_config or ResilienceConfig()
+        self._guards: Dict[str, TargetGuard] = {}
+
+    def configure(self, target: str, config: ResilienceConfig) -> TargetGuard:
+        """Create (or replace) the guard for a target"""
+        guard = TargetGuard(target, config)
+        self._guards[target] = guard
+        return guard
+
+    def get(self, target: str) -> TargetGuard:
+        """Get the guard for a target, creating it if needed"""
+        guard = self._guards.get(target)
+        if guard is None:
+            guard = self._guards[target] = TargetGuard(target, self.default_config)
+        return guard
+
+    async def call(self, target: str, operation: Callable[[], T]) -> T:
+        """Execute operation through the target's guard"""
+        return await self.get(target).call(operation)
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Metrics for every target"""
+        return {target: guard.get_metrics() for target, guard in self._guards.items()}
+
+    def render_prometheus(self, prefix: str = "resilience") -> str:
+        """Render per-target metrics in Prometheus text exposition format"""
+        by_metric: Dict[str, Dict[str, float]] = {}
+        for target, metrics in self.get_metrics().items():
+            for name, value in metrics.items():
+                by_metric.setdefault(name, {})[target] = value
+
+        lines = []
+        for name, values in by_metric.items():
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            for target, value in values.items():
+                escaped = target.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{metric}{{target="{escaped}"}} {value}')
+        return "\n".join(lines) + "\n" if lines else ""
@@ -5,11 +5,14 @@ Implements intelligent retry strategies with exponential backoff, jitter,
 and risk-adaptive delays for robust error handling.
 
 This module provides retry policies that adapt to system conditions and
-risk levels to optimize recovery from transient failures.
+risk levels to optimize recovery from transient failures. A shared
+RetryBudget caps retries to a fraction of recent requests so that a
+struggling dependency does not get hit by a retry storm.
 """
 
 import logging
 import random
+import threading
 import time
 from collections.abc import Callable
 from dataclasses import dataclass, field
@@ -50,6 +53,7 @@ class RetryConfig:
     backoff_multiplier: float = 2.0
     risk_adaptive: bool = True
     timeout_ms: int | None = None
+    budget: "RetryBudget | None" = None
 
 
 @dataclass
@@ -63,6 +67,107 @@ class RetryResult:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
+class RetryBudget:
+    """
+    Caps retries to a fraction of recent requests.
+    
+    Requests and retries are counted in one-second buckets over a sliding
+    ``ttl_seconds`` window. A retry is allowed while the retries in the
+    window stay below ``retry_ratio`` of the requests, plus a floor of
+    ``min_retries_per_second`` so low-traffic callers can still retry.
+    A budget is meant to be shared by every policy calling the same target.
+    """
+    
+    def __init__(
+        self,
+        retry_ratio: float = 0.2,
+        min_retries_per_second: float = 1.0,
+        ttl_seconds: int = 10,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the RetryBudget.
+        
+        Args:
+            retry_ratio: Allowed retries per request (0.2 = one retry per five requests)
+            min_retries_per_second: Retries always allowed regardless of traffic
+            ttl_seconds: Length of the sliding window in seconds
+            clock: Monotonic clock in seconds
+        """
+        if ttl_seconds < 1:
+            raise ValueError("ttl_seconds must be at least 1")
+        self.retry_ratio = retry_ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._epochs = [-1] * ttl_seconds
+        self._requests = [0] * ttl_seconds
+        self._retries = [0] * ttl_seconds
+        self._total_requests = 0
+        self._total_retries = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+    
+    def record_request(self) -> None:
+        """Count one original (non-retry) request."""
+        with self._lock:
+            i = self._advance()
+            self._requests[i] += 1
+            self._total_requests += 1
+    
+    def try_acquire_retry(self) -> bool:
+        """
+        Withdraw one retry from the budget.
+        
+        Returns:
+            True if the retry may proceed, False if the budget is exhausted
+        """
+        with self._lock:
+            i = self._advance()
+            if self._total_retries >= self._allowance():
+                self._rejected += 1
+                return False
+            self._retries[i] += 1
+            self._total_retries += 1
+            return True
+    
+    def remaining(self) -> float:
+        """Retries still available in the current window."""
+        with self._lock:
+            self._advance()
+            return max(0.0, self._allowance() - self._total_retries)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Budget statistics for the current window."""
+        with self._lock:
+            self._advance()
+            return {
+                "requests": self._total_requests,
+                "retries": self._total_retries,
+                "remaining": max(0.0, self._allowance() - self._total_retries),
+                "rejected_retries": self._rejected,
+            }
+    
+    def _allowance(self) -> float:
+        return self.min_retries_per_second * self.ttl_seconds + self.retry_ratio * self._total_requests
+    
+    def _advance(self) -> int:
+        """Expire stale buckets and return the index of the current one."""
+        epoch = int(self._clock())
+        i = epoch % self.ttl_seconds
+        if self._epochs[i] != epoch:
+            oldest = epoch - self.ttl_seconds + 1
+            for j, bucket_epoch in enumerate(self._epochs):
+                if 0 <= bucket_epoch < oldest or j == i:
+                    self._total_requests -= self._requests[j]
+                    self._total_retries -= self._retries[j]
+                    self._requests[j] = 0
+                    self._retries[j] = 0
+                    self._epochs[j] = -1
+            self._epochs[i] = epoch
+        return i
+
+
 class RetryPolicy:
     """
     Implements various retry policies with intelligent backoff strategies.
@@ -73,6 +178,7 @@ class RetryPolicy:
     - Risk-adaptive delays based on system risk score
     - Multiple retry strategies (exponential, linear, fixed, Fibonacci)
     - Configurable maximum attempts and delays
+    - Optional shared retry budget to prevent retry storms
     """
     
     def __init__(self, config: RetryConfig | None = None):
@@ -153,6 +259,9 @@ class RetryPolicy:
         last_error = None
         
         start_time = datetime.utcnow()
+        budget = self.config.budget
+        if budget is not None:
+            budget.record_request()
         
         while attempts < self.config.max_attempts:
             try:
@@ -200,6 +309,21 @@ class RetryPolicy:
                             metadata={"reason": "timeout", "elapsed_ms": elapsed}
                         )
                 
+                # Check the shared retry budget
+                if budget is not None and not budget.try_acquire_retry():
+                    logger.warning("Retry budget exhausted after %d attempts", attempts)
+                    return RetryResult(
+                        outcome=RetryOutcome.ABORT,
+                        attempts=attempts,
+                        total_delay_ms=total_delay_ms,
+                        last_error=last_error,
+                        success=False,
+                        metadata={
+                            "reason": "retry_budget_exhausted",
+                            "elapsed_ms": self._elapsed_ms(start_time)
+                        }
+                    )
+                
                 # Calculate delay and wait
                 delay = self.calculate_delay(attempts - 1, risk_score)
                 total_delay_ms += delay
@@ -9,12 +9,15 @@ import hashlib
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
+from .digest_cache import DigestCache, default_algorithms, hash_content
+
 logger = logging.getLogger(__name__)
 
 
@@ -144,15 +147,21 @@ class ArtifactVerifier:
     
     def __init__(
         self,
-        default_policy: Optional[VerificationPolicy] = None
+        default_policy: Optional[VerificationPolicy] = None,
+        digest_cache: Optional[DigestCache] = None,
+        max_workers: Optional[int] = None
     ):
         """
         Initialize the verifier
         
         Args:
             default_policy: Default verification policy
+            digest_cache: Stat-keyed digest cache (in-memory cache if None)
+            max_workers: Thread pool size for batch verification
         """
         self.default_policy = default_policy or self._create_default_policy()
+        self.digest_cache = digest_cache or DigestCache()
+        self.max_workers = max_workers
         self._verification_cache: Dict[str, VerificationResult] = {}
         
     def verify_artifact(
@@ -179,14 +188,16 @@ class ArtifactVerifier:
             VerificationResult with verification status
         """
         active_policy = policy or self.default_policy
+        algorithms = default_algorithms(active_policy.digest_algorithms, expected_digest)
         
         # Get artifact metadata
         if artifact_path:
-            metadata = self._get_file_metadata(artifact_path)
+            metadata = self._get_file_metadata(artifact_path, algorithms)
         elif artifact_content:
             metadata = self._get_content_metadata(
                 artifact_content,
-                artifact_name or 'unknown'
+                artifact_name or 'unknown',
+                algorithms
             )
         elif expected_digest and artifact_name:
             metadata = ArtifactMetadata(
@@ -247,21 +258,26 @@ class ArtifactVerifier:
     def verify_artifact_batch(
         self,
         artifacts: List[Dict[str, Any]],
-        policy: Optional[VerificationPolicy] = None
+        policy: Optional[VerificationPolicy] = None,
+        max_workers: Optional[int] = None
     ) -> List[VerificationResult]:
         """
         Verify multiple artifacts
         
+        Artifacts are verified across a thread pool (hashlib releases the GIL
+        while hashing); results are returned in input order.
+        
         Args:
             artifacts: List of artifact specifications
             policy: Verification policy
+            max_workers: Thread pool size (defaults to the verifier setting;
+                1 verifies serially)
             
         Returns:
             List of verification results
         """
-        results = []
-        for artifact in artifacts:
-            result = self.verify_artifact(
+        def verify(artifact: Dict[str, Any]) -> VerificationResult:
+            return self.verify_artifact(
                 artifact_path=artifact.get('path'),
                 artifact_content=artifact.get('content'),
                 artifact_name=artifact.get('name'),
@@ -269,8 +285,12 @@ class ArtifactVerifier:
                 provenance=artifact.get('provenance'),
                 policy=policy
             )
-            results.append(result)
-        return results
+            
+        workers = max_workers or self.max_workers or min(32, (os.cpu_count() or 1) + 4)
+        if workers <= 1 or len(artifacts) <= 1:
+            return [verify(artifact) for artifact in artifacts]
+        with ThreadPoolExecutor(max_workers=min(workers, len(artifacts))) as pool:
+            return list(pool.map(verify, artifacts))
         
     def verify_provenance_chain(
         self,
@@ -403,34 +423,32 @@ class ArtifactVerifier:
             digest_algorithms=['sha256']
         )
         
-    def _get_file_metadata(self, file_path: str) -> ArtifactMetadata:
-        """Get metadata for a file"""
+    def _get_file_metadata(
+        self,
+        file_path: str,
+        algorithms: Optional[List[str]] = None
+    ) -> ArtifactMetadata:
+        """Get metadata for a file (streamed, digests served from the cache)"""
         if not os.path.exists(file_path):
             raise FileNotFoundError(f'File not found: {file_path}')
             
-        with open(file_path, 'rb') as f:
-            content = f.read()
-            
-        digest = {
-            'sha256': hashlib.sha256(content).hexdigest()
-        }
+        digest = self.digest_cache.get_digests(file_path, algorithms or ['sha256'])
         
         return ArtifactMetadata(
             name=os.path.basename(file_path),
             digest=digest,
-            size=len(content),
+            size=os.path.getsize(file_path),
             uri=f'file://{os.path.abspath(file_path)}'
         )
         
     def _get_content_metadata(
         self,
         content: bytes,
-        name: str
+        name: str,
+        algorithms: Optional[List[str]] = None
     ) -> ArtifactMetadata:
         """Get metadata for content bytes"""
-        digest = {
-            'sha256': hashlib.sha256(content).hexdigest()
-        }
+        digest = hash_content(content, algorithms or ['sha256'])
         
         return ArtifactMetadata(
             name=name,
@@ -651,10 +669,11 @@ class ArtifactVerifier:
 
 # Factory functions
 def create_artifact_verifier(
-    policy: Optional[VerificationPolicy] = None
+    policy: Optional[VerificationPolicy] = None,
+    digest_cache_path: Optional[str] = None
 ) -> ArtifactVerifier:
     """Create a new ArtifactVerifier instance"""
-    return ArtifactVerifier(policy)
+    return ArtifactVerifier(policy, digest_cache=DigestCache(digest_cache_path))
 
 
 def create_verification_policy(name: str, **kwargs) -> VerificationPolicy:
@@ -0,0 +1,220 @@
+"""
+Digest Cache - Streaming multi-digest hashing with a stat-keyed cache
+
+This module computes artifact digests without loading artifacts into memory:
+- Files are read in fixed-size chunks into one reusable buffer and every
+  requested algorithm is fed from the same pass
+- Digests are cached (optionally persisted to SQLite) under the file's
+  (device, inode, size, mtime_ns), so unchanged artifacts are not rehashed
+- A file that changes while it is being hashed is not cached
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+StatKey = Tuple[int, int, int, int]
+
+
+def hash_stream(
+    stream,
+    algorithms: Iterable[str] = ('sha256',),
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Tuple[Dict[str, str], int]:
+    """
+    Hash a binary stream with several algorithms in one pass
+
+    Args:
+        stream: Binary file object supporting readinto()
+        algorithms: hashlib algorithm names
+        chunk_size: Read buffer size (peak memory per call)
+
+    Returns:
+        Tuple of ({algorithm: hexdigest}, bytes read)
+    """
+    hashers = {alg: hashlib.new(alg) for alg in dict.fromkeys(algorithms)}
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    total = 0
+    while True:
+        count = stream.readinto(buffer)
+        if not count:
+            break
+        chunk = view[:count]
+        for hasher in hashers.values():
+            hasher.update(chunk)
+        total += count
+    return {alg: hasher.hexdigest() for alg, hasher in hashers.items()}, total
+
+
+def hash_file(
+    file_path: str,
+    algorithms: Iterable[str] = ('sha256',),
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, str]:
+    """Hash a file with several algorithms in one streaming pass"""
+    with open(file_path, 'rb', buffering=0) as f:
+        digests, _ = hash_stream(f, algorithms, chunk_size)
+    return digests
+
+
+def hash_content(content: bytes, algorithms: Iterable[str] = ('sha256',)) -> Dict[str, str]:
+    """Hash in-memory content with several algorithms"""
+    return {alg: hashlib.new(alg, content).hexdigest() for alg in dict.fromkeys(algorithms)}
+
+
+def stat_key(st: os.stat_result) -> StatKey:
+    """Cache key identifying one version of a file"""
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+@dataclass
+class DigestCacheStats:
+    """Digest cache counters"""
+    hits: int = 0
+    misses: int = 0
+    bytes_hashed: int = 0
+
+
+class DigestCache:
+    """
+    Stat-keyed artifact digest cache
+
+    Entries are keyed on (device, inode, size, mtime_ns); any rewrite of a file
+    changes at least one of these, so stale digests are never returned. With a
+    path the cache is persisted to SQLite and shared across runs; without one
+    it lives in memory only. Safe to use from multiple threads.
+
+    Example:
+        cache = DigestCache('/var/cache/slsa/digests.db')
+        digests = cache.get_digests('dist/app.tar.gz', ['sha256', 'sha512'])
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite database path (None for an in-memory cache)
+            chunk_size: Read buffer size used when hashing
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.stats = DigestCacheStats()
+        self._lock = threading.Lock()
+        self._memory: Dict[StatKey, Dict[str, str]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS digests ('
+                ' dev INTEGER, ino INTEGER, size INTEGER, mtime_ns INTEGER,'
+                ' digests TEXT NOT NULL,'
+                ' PRIMARY KEY (dev, ino, size, mtime_ns))'
+            )
+            self._conn.commit()
+
+    def get_digests(
+        self,
+        file_path: str,
+        algorithms: Iterable[str] = ('sha256',)
+    ) -> Dict[str, str]:
+        """
+        Get digests of a file, hashing only when not cached
+
+        Args:
+            file_path: Path to the file
+            algorithms: hashlib algorithm names
+
+        Returns:
+            {algorithm: hexdigest} for the requested algorithms
+        """
+        algorithms = list(dict.fromkeys(algorithms))
+        key = stat_key(os.stat(file_path))
+        cached = self._lookup(key)
+        missing = [alg for alg in algorithms if alg not in cached]
+        if not missing:
+            with self._lock:
+                self.stats.hits += 1
+            return {alg: cached[alg] for alg in algorithms}
+
+        with open(file_path, 'rb', buffering=0) as f:
+            computed, size = hash_stream(f, missing, self.chunk_size)
+            after = stat_key(os.fstat(f.fileno()))
+        with self._lock:
+            self.stats.misses += 1
+            self.stats.bytes_hashed += size
+
+        merged = {**cached, **computed}
+        if after == key and size == key[2]:
+            self._store(key, merged)
+        else:
+            logger.warning(f'File changed while hashing, digest not cached: {file_path}')
+        return {alg: merged[alg] for alg in algorithms}
+
+    def clear(self) -> None:
+        """Remove all cached digests"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute('DELETE FROM digests')
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _lookup(self, key: StatKey) -> Dict[str, str]:
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is None and self._conn is not None:
+                row = self._conn.execute(
+                    'SELECT digests FROM digests WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?',
+                    key
+                ).fetchone()
+                if row is not None:
+                    cached = json.loads(row[0])
+                    self._memory[key] = cached
+            return dict(cached) if cached else {}
+
+    def _store(self, key: StatKey, digests: Dict[str, str]) -> None:
+        with self._lock:
+            self._memory[key] = digests
+            if self._conn is not None:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?)',
+                    (*key, json.dumps(digests, sort_keys=True))
+                )
+                self._conn.commit()
+
+
+def default_algorithms(*groups: Optional[Iterable[str]]) -> List[str]:
+    """
+    Merge algorithm lists, keeping order; sha256 is always included
+
+    Names hashlib does not provide (e.g. 'gitCommit' digests) are skipped.
+    """
+    return list(dict.fromkeys(['sha256'] + [
+        alg for group in groups if group for alg in group
+        if alg in hashlib.algorithms_available
+    ]))
@@ -37,6 +37,11 @@ from .policy_gate import (
     PolicyViolation,
 )
 
+from .validation_plan import (
+    ValidationPlan,
+    ModuleValidationResult,
+)
+
 from .ci_verification_pipeline import (
     CIVerificationPipeline,
     PipelineStage,
@@ -88,6 +93,10 @@ __all__ = [
     'PolicyEvaluationResult',
     'PolicyViolation',
     
+    # Fused Validation
+    'ValidationPlan',
+    'ModuleValidationResult',
+    
     # CI Verification
     'CIVerificationPipeline',
     'PipelineStage',
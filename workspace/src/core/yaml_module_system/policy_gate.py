@@ -7,7 +7,7 @@ Reference: DevSecOps best practices [3] [5]
 """
 
 from enum import Enum
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 import re
@@ -69,6 +69,42 @@ class PolicyViolation:
         }
 
 
+def _compile_predicate(operator: str, value: Optional[str]) -> Callable[[Any], bool]:
+    """將條件運算符與比較值編譯為謂詞（未知運算符或缺少比較值時恆為符合）"""
+    if operator == 'exists':
+        return lambda actual: actual is not None
+    if operator == 'not_exists':
+        return lambda actual: actual is None
+    if not value:
+        return lambda actual: True
+    if operator == 'equals':
+        return lambda actual: str(actual) == value
+    if operator == 'not_equals':
+        return lambda actual: str(actual) != value
+    if operator == 'contains':
+        return lambda actual: value in str(actual)
+    if operator == 'matches':
+        try:
+            pattern = re.compile(value)
+        except re.error:
+            # 與逐次評估一致：無效正則在評估時才報錯
+            return lambda actual: bool(re.match(value, str(actual)))
+        return lambda actual: bool(pattern.match(str(actual)))
+    if operator in ('greater_than', 'less_than'):
+        try:
+            threshold = float(value)
+        except ValueError:
+            threshold = None
+        
+        def compare(actual: Any) -> bool:
+            if not actual:
+                return False
+            limit = float(value) if threshold is None else threshold
+            return float(actual) > limit if operator == 'greater_than' else float(actual) < limit
+        return compare
+    return lambda actual: True
+
+
 @dataclass
 class PolicyRule:
     """
@@ -98,6 +134,11 @@ class PolicyRule:
     remediation: Optional[str] = None
     documentation_url: Optional[str] = None
     
+    # 已編譯條件快取: (條件字符串, 編譯結果)
+    _compiled_condition: Optional[Tuple[Optional[str], Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
     def evaluate(self, data: Any, context: Optional[Dict[str, Any]] = None) -> Optional[PolicyViolation]:
         """
         評估數據是否符合策略
@@ -123,56 +164,55 @@ class PolicyRule:
             violated = not self._evaluate_condition(data, context)
         
         if violated:
-            return PolicyViolation(
-                rule_id=self.id,
-                rule_name=self.name,
-                severity=self.severity,
-                category=self.category,
-                message=self.description,
-                remediation=self.remediation,
-            )
+            return self.create_violation()
         
         return None
     
+    def create_violation(self) -> PolicyViolation:
+        """創建本規則的違規記錄"""
+        return PolicyViolation(
+            rule_id=self.id,
+            rule_name=self.name,
+            severity=self.severity,
+            category=self.category,
+            message=self.description,
+            remediation=self.remediation,
+        )
+    
+    def compile_condition(self) -> Optional[Tuple[List[str], Callable[[Any], bool]]]:
+        """
+        編譯條件表達式
+        
+        條件字符串只解析一次（按條件字符串快取），正則預先編譯。
+        
+        Returns:
+            (路徑片段, 謂詞) — 謂詞接收路徑上的值並返回是否符合；
+            無條件或條件不完整（恆為符合）時返回 None
+        """
+        if self._compiled_condition is not None and self._compiled_condition[0] == self.condition:
+            return self._compiled_condition[1]
+        
+        compiled = None
+        parts = self.condition.split() if self.condition else []
+        if len(parts) >= 2:
+            compiled = (parts[1].split('.'), _compile_predicate(parts[0], parts[2] if len(parts) > 2 else None))
+        self._compiled_condition = (self.condition, compiled)
+        return compiled
+    
     def _evaluate_condition(self, data: Any, context: Optional[Dict[str, Any]] = None) -> bool:
         """評估條件表達式"""
         # 簡單的條件評估
         # 支持: exists, equals, contains, matches, etc.
-        if not self.condition:
+        compiled = self.compile_condition()
+        if compiled is None:
             return True
         
-        parts = self.condition.split()
-        if len(parts) < 2:
-            return True
-        
-        operator = parts[0]
-        path = parts[1]
-        value = parts[2] if len(parts) > 2 else None
-        
-        actual = self._get_value_by_path(data, path)
-        
-        if operator == 'exists':
-            return actual is not None
-        elif operator == 'not_exists':
-            return actual is None
-        elif operator == 'equals' and value:
-            return str(actual) == value
-        elif operator == 'not_equals' and value:
-            return str(actual) != value
-        elif operator == 'contains' and value:
-            return value in str(actual)
-        elif operator == 'matches' and value:
-            return bool(re.match(value, str(actual)))
-        elif operator == 'greater_than' and value:
-            return float(actual) > float(value) if actual else False
-        elif operator == 'less_than' and value:
-            return float(actual) < float(value) if actual else False
-        
-        return True
+        parts, predicate = compiled
+        return predicate(self._get_value_by_path(data, parts))
     
-    def _get_value_by_path(self, data: Any, path: str) -> Any:
+    def _get_value_by_path(self, data: Any, path: Union[str, List[str]]) -> Any:
         """根據路徑獲取值"""
-        parts = path.split('.')
+        parts = path.split('.') if isinstance(path, str) else path
         current = data
         
         for part in parts:
@@ -322,22 +362,27 @@ class PolicyGate:
             result.evaluated_rules += 1
             
             violation = rule.evaluate(data, context)
-            
-            if violation:
-                if rule.action == PolicyAction.BLOCK:
-                    result.violations.append(violation)
-                    result.passed = False
-                elif rule.action == PolicyAction.WARN:
-                    result.warnings.append(violation)
-                elif rule.action == PolicyAction.AUDIT:
-                    result.warnings.append(violation)
-                elif rule.action == PolicyAction.NOTIFY:
-                    result.warnings.append(violation)
-            else:
-                result.passed_rules += 1
+            self._record_outcome(result, rule, violation)
         
         return result
     
+    @staticmethod
+    def _record_outcome(result: PolicyEvaluationResult, rule: PolicyRule,
+                        violation: Optional[PolicyViolation]) -> None:
+        """按規則動作記錄評估結果"""
+        if violation:
+            if rule.action == PolicyAction.BLOCK:
+                result.violations.append(violation)
+                result.passed = False
+            elif rule.action == PolicyAction.WARN:
+                result.warnings.append(violation)
+            elif rule.action == PolicyAction.AUDIT:
+                result.warnings.append(violation)
+            elif rule.action == PolicyAction.NOTIFY:
+                result.warnings.append(violation)
+        else:
+            result.passed_rules += 1
+    
     def evaluate_by_category(self, data: Any, category: PolicyCategory, 
                             module_id: Optional[str] = None) -> PolicyEvaluationResult:
         """按類別評估策略"""
@@ -0,0 +1,373 @@
+"""
+Validation Plan (融合驗證計劃)
+
+將 Schema 與策略規則一次性編譯為路徑前綴樹，單次遍歷文檔即完成
+YAMLSchemaValidator 與 PolicyGate 的全部檢查：
+- Schema 預先編譯為節點樹（正則預編譯、關鍵字預先判定）
+- 策略條件按點分路徑掛載到前綴樹節點，遍歷到該節點時直接評估謂詞，
+  不再逐規則重新拆分條件與解析路徑
+- validate_many 使用進程池批量驗證模組；工作進程由原始 Schema 與規則自行編譯計劃，
+  不依賴 fork（spawn / forkserver 下同樣可用）
+
+結果與分別調用 YAMLSchemaValidator.validate 和 PolicyGate.evaluate 一致
+（錯誤順序與違規順序相同）。規則或 Schema 變更後需重新編譯。
+"""
+
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from multiprocessing.context import BaseContext
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from .policy_gate import PolicyEvaluationResult, PolicyGate, PolicyRule
+from .yaml_schema_validator import ValidationResult, YAMLSchemaValidator
+
+
+class _SchemaNode:
+    """已編譯的 Schema 節點"""
+
+    __slots__ = (
+        'schema', 'has_type', 'has_enum', 'has_const', 'checks_string', 'checks_number',
+        'checks_array', 'items', 'checks_required', 'properties', 'checks_shape', 'custom',
+    )
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self.has_type = 'type' in schema
+        self.has_enum = 'enum' in schema
+        self.has_const = 'const' in schema
+        self.checks_string = any(k in schema for k in ('minLength', 'maxLength', 'pattern', 'format'))
+        self.checks_number = any(k in schema for k in ('minimum', 'maximum', 'multipleOf'))
+        self.checks_array = 'minItems' in schema or 'maxItems' in schema or bool(schema.get('uniqueItems', False))
+        self.items = _SchemaNode(schema['items']) if 'items' in schema else None
+        self.checks_required = 'required' in schema
+        self.properties = (
+            {name: _SchemaNode(sub) for name, sub in schema['properties'].items()}
+            if 'properties' in schema else {}
+        )
+        self.checks_shape = (
+            schema.get('additionalProperties') is False
+            or 'minProperties' in schema or 'maxProperties' in schema
+        )
+        self.custom = schema.get('x-custom-validator') if 'x-custom-validator' in schema else None
+
+
+class _TrieNode:
+    """策略路徑前綴樹節點"""
+
+    __slots__ = ('children', 'predicates')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.predicates: List[Tuple[int, Callable[[Any], bool]]] = []
+
+    def child(self, part: str) -> '_TrieNode':
+        node = self.children.get(part)
+        if node is None:
+            node = self.children[part] = _TrieNode()
+        return node
+
+
+@dataclass
+class ModuleValidationResult:
+    """單個模組的融合驗證結果"""
+    module_id: Optional[str]
+    schema: ValidationResult
+    policy: PolicyEvaluationResult
+
+    @property
+    def passed(self) -> bool:
+        """Schema 與阻斷級策略均通過"""
+        return self.schema.valid and self.policy.passed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            'module_id': self.module_id,
+            'passed': self.passed,
+            'schema': self.schema.to_dict(),
+            'policy': self.policy.to_dict(),
+        }
+
+
+class ValidationPlan:
+    """
+    融合驗證計劃
+
+    Example:
+        plan = ValidationPlan(schema, gate)
+        result = plan.validate(module_data, module_id="payments")
+        results = plan.validate_many({"payments": data1, "billing": data2})
+    """
+
+    def __init__(self, schema: Optional[Dict[str, Any]] = None, gate: Optional[PolicyGate] = None,
+                 validator: Optional[YAMLSchemaValidator] = None):
+        """
+        編譯驗證計劃
+
+        Args:
+            schema: JSON Schema（None 時僅評估策略）
+            gate: 策略閘門（None 時僅驗證 Schema）
+            validator: Schema 驗證器（提供自定義驗證器與正則快取）
+        """
+        self.validator = validator or YAMLSchemaValidator()
+        self.gate = gate
+        self.schema = schema
+        self._root_schema = _SchemaNode(schema) if schema is not None else None
+        self._schema_version = schema.get('$schema', 'unknown') if schema is not None else None
+
+        # 已啟用規則按閘門順序編號；無路徑的規則（validator 回調）在根節點整體評估
+        self._rules: List[PolicyRule] = []
+        self._root_rules: List[int] = []
+        self._trie = _TrieNode()
+        for rule in (gate.get_rules() if gate else []):
+            if not rule.enabled:
+                continue
+            index = len(self._rules)
+            self._rules.append(rule)
+            if rule.validator or not rule.condition:
+                self._root_rules.append(index)
+                continue
+            compiled = rule.compile_condition()
+            if compiled is None:
+                continue
+            parts, predicate = compiled
+            node = self._trie
+            for part in parts:
+                node = node.child(part)
+            node.predicates.append((index, predicate))
+
+    def validate(self, data: Any, module_id: Optional[str] = None,
+                 context: Optional[Dict[str, Any]] = None) -> ModuleValidationResult:
+        """
+        單次遍歷驗證模組
+
+        Args:
+            data: 模組數據
+            module_id: 模組 ID（用於檢查策略例外）
+            context: 傳給 validator 回調規則的上下文
+
+        Returns:
+            ModuleValidationResult: Schema 與策略結果
+        """
+        schema_result, outcomes = self._check(data, module_id, context)
+        return self._result(module_id, schema_result, outcomes)
+
+    def validate_many(self, modules: Mapping[str, Any], workers: Optional[int] = None,
+                      parallel_threshold: int = 64,
+                      mp_context: Optional[BaseContext] = None) -> Dict[str, ModuleValidationResult]:
+        """
+        批量驗證模組
+
+        工作進程接收原始 Schema、規則與例外並各自編譯計劃。無法序列化的 validator
+        回調規則在主進程評估；自定義 Schema 驗證器無法序列化時整批在主進程驗證。
+
+        Args:
+            modules: {模組 ID: 模組數據}
+            workers: 進程數（預設 CPU 數；1 表示單進程）
+            parallel_threshold: 模組數少於此值時不啟動進程池
+            mp_context: 進程池的 multiprocessing 上下文（預設為平台預設啟動方式）
+
+        Returns:
+            {模組 ID: ModuleValidationResult}，順序與輸入一致
+        """
+        items = list(modules.items())
+        workers = workers or os.cpu_count() or 1
+        spec, local_rules = (None, [])
+        if workers > 1 and len(items) >= parallel_threshold:
+            spec, local_rules = self._worker_spec()
+        if spec is None:
+            return {module_id: self.validate(data, module_id) for module_id, data in items}
+
+        chunksize = max(1, len(items) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                 initializer=_init_plan_worker, initargs=spec) as pool:
+            checked = list(pool.map(_check_item, items, chunksize=chunksize))
+
+        results = {}
+        for (module_id, data), (schema_result, outcomes) in zip(items, checked, strict=True):
+            for index in local_rules:
+                if outcomes[index] is not None:
+                    outcomes[index] = self._rules[index].evaluate(data) is None
+            results[module_id] = self._result(module_id, schema_result, outcomes)
+        return results
+
+    def _check(self, data: Any, module_id: Optional[str],
+               context: Optional[Dict[str, Any]]) -> Tuple[ValidationResult, List[Optional[bool]]]:
+        """遍歷文檔：返回 Schema 結果與各規則結果（True 符合、False 違規、None 例外）"""
+        schema_result = ValidationResult(valid=True)
+        schema_result.schema_version = self._schema_version
+
+        # 未觸及的路徑規則恆為符合；模組例外的規則標記為 None，
+        # 遍歷時不評估其謂詞（與 PolicyGate.evaluate 一致）
+        outcomes: List[Optional[bool]] = [True] * len(self._rules)
+        for index in self._excepted_rules(module_id):
+            outcomes[index] = None
+        tries = [self._trie] if self._trie.children or self._trie.predicates else []
+        self._walk(data, self._root_schema, tries, "$", schema_result, outcomes)
+
+        for index in self._root_rules:
+            if outcomes[index] is not None:
+                outcomes[index] = self._rules[index].evaluate(data, context) is None
+        return schema_result, outcomes
+
+    def _result(self, module_id: Optional[str], schema_result: ValidationResult,
+                outcomes: List[Optional[bool]]) -> ModuleValidationResult:
+        """按閘門順序彙總規則結果"""
+        policy_result = PolicyEvaluationResult(passed=True)
+        for rule, passed in zip(self._rules, outcomes, strict=True):
+            if passed is None:
+                continue
+            policy_result.evaluated_rules += 1
+            PolicyGate._record_outcome(policy_result, rule, None if passed else rule.create_violation())
+        return ModuleValidationResult(module_id=module_id, schema=schema_result, policy=policy_result)
+
+    def _worker_spec(self) -> Tuple[Optional[Tuple[Any, ...]], List[int]]:
+        """
+        工作進程的計劃原料
+
+        Returns:
+            (Schema, 規則, 例外, Schema 驗證器)，無法序列化時為 None；
+            以及需在主進程評估的規則編號（validator 回調無法序列化，工作進程中以恆符合的佔位規則代替）
+        """
+        rules: List[PolicyRule] = []
+        local_rules: List[int] = []
+        for index, rule in enumerate(self._rules):
+            if rule.validator is not None and not _picklable(rule.validator):
+                local_rules.append(index)
+                rule = replace(rule, validator=None, condition=None)
+            else:
+                # replace 不複製已編譯條件快取（謂詞為閉包，無法序列化）
+                rule = replace(rule)
+            rules.append(rule)
+
+        exceptions = (
+            {rule_id: list(module_ids) for rule_id, module_ids in self.gate._exceptions.items()}
+            if self.gate else {}
+        )
+        spec = (self.schema, rules, exceptions, self.validator)
+        return (spec if _picklable(spec) else None), local_rules
+
+    def _excepted_rules(self, module_id: Optional[str]) -> List[int]:
+        """模組例外規則的編號"""
+        if not module_id or self.gate is None:
+            return []
+        return [index for index, rule in enumerate(self._rules) if self.gate.is_excepted(rule.id, module_id)]
+
+    def _walk(self, data: Any, node: Optional[_SchemaNode], tries: List[_TrieNode], path: str,
+              result: ValidationResult, outcomes: List[Optional[bool]]) -> None:
+        """同時執行當前節點的 Schema 檢查與策略謂詞，並遞歸到需要的子節點"""
+        for trie in tries:
+            for index, predicate in trie.predicates:
+                if outcomes[index] is not None:
+                    outcomes[index] = predicate(data)
+
+        validator = self.validator
+        if node is not None:
+            schema = node.schema
+            if node.has_type:
+                validator._validate_type(data, schema['type'], path, result)
+            if node.has_enum:
+                validator._validate_enum(data, schema['enum'], path, result)
+            if node.has_const:
+                validator._validate_const(data, schema['const'], path, result)
+            if node.checks_string and isinstance(data, str):
+                validator._validate_string(data, schema, path, result)
+            if node.checks_number and isinstance(data, (int, float)) and not isinstance(data, bool):
+                validator._validate_number(data, schema, path, result)
+
+        if isinstance(data, list):
+            self._walk_list(data, node, tries, path, result, outcomes)
+        elif isinstance(data, dict):
+            self._walk_dict(data, node, tries, path, result, outcomes)
+        else:
+            for trie in tries:
+                for child in trie.children.values():
+                    _resolve_missing(child, outcomes)
+
+        if node is not None and node.custom is not None:
+            validator._run_custom_validator(node.custom, data, path, result)
+
+    def _walk_list(self, data: list, node: Optional[_SchemaNode], tries: List[_TrieNode], path: str,
+                   result: ValidationResult, outcomes: List[Optional[bool]]) -> None:
+        if node is not None and node.checks_array:
+            self.validator._validate_array_bounds(data, node.schema, path, result)
+
+        # 路徑片段為數字時按索引取值（與 PolicyRule._get_value_by_path 一致）
+        by_index: Dict[int, List[_TrieNode]] = {}
+        for trie in tries:
+            for part, child in trie.children.items():
+                if part.isdigit() and int(part) < len(data):
+                    by_index.setdefault(int(part), []).append(child)
+                else:
+                    _resolve_missing(child, outcomes)
+
+        items = node.items if node is not None else None
+        if items is not None:
+            for i, item in enumerate(data):
+                self._walk(item, items, by_index.get(i, []), f"{path}[{i}]", result, outcomes)
+        else:
+            for i, children in by_index.items():
+                self._walk(data[i], None, children, f"{path}[{i}]", result, outcomes)
+
+    def _walk_dict(self, data: dict, node: Optional[_SchemaNode], tries: List[_TrieNode], path: str,
+                   result: ValidationResult, outcomes: List[Optional[bool]]) -> None:
+        validator = self.validator
+        properties = node.properties if node is not None else {}
+        if node is not None and node.checks_required:
+            validator._validate_required(data, node.schema, path, result)
+
+        for prop_name, prop_node in properties.items():
+            if prop_name in data:
+                children = [trie.children[prop_name] for trie in tries if prop_name in trie.children]
+                self._walk(data[prop_name], prop_node, children, f"{path}.{prop_name}", result, outcomes)
+
+        for trie in tries:
+            for part, child in trie.children.items():
+                if part in properties and part in data:
+                    continue
+                value = data.get(part)
+                if value is None:
+                    _resolve_missing(child, outcomes)
+                else:
+                    self._walk(value, None, [child], f"{path}.{part}", result, outcomes)
+
+        if node is not None and node.checks_shape:
+            validator._validate_object_shape(data, node.schema, path, result)
+
+
+def _resolve_missing(trie: _TrieNode, outcomes: List[Optional[bool]]) -> None:
+    """路徑不存在：子樹內所有謂詞以 None 評估"""
+    for index, predicate in trie.predicates:
+        if outcomes[index] is not None:
+            outcomes[index] = predicate(None)
+    for child in trie.children.values():
+        _resolve_missing(child, outcomes)
+
+
+def _picklable(obj: Any) -> bool:
+    try:
+        pickle.dumps(obj)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+_WORKER_PLAN: Optional[ValidationPlan] = None
+
+
+def _init_plan_worker(schema: Optional[Dict[str, Any]], rules: List[PolicyRule],
+                      exceptions: Dict[str, List[str]], validator: YAMLSchemaValidator) -> None:
+    """進程池初始化：每個進程由原始 Schema 與規則編譯一份計劃"""
+    global _WORKER_PLAN
+    gate = PolicyGate()
+    for rule in rules:
+        gate.add_rule(rule)
+    gate._exceptions = exceptions
+    _WORKER_PLAN = ValidationPlan(schema, gate, validator)
+
+
+def _check_item(item: Tuple[str, Any]) -> Tuple[ValidationResult, List[Optional[bool]]]:
+    module_id, data = item
+    return _WORKER_PLAN._check(data, module_id, None)
@@ -6,7 +6,7 @@ JSON Schema 驗證系統，用於驗證 YAML 模組的結構和內容。
 Reference: Schema validation best practices [8]
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Pattern
 from dataclasses import dataclass, field
 from enum import Enum
 import re
@@ -148,9 +148,13 @@ class YAMLSchemaValidator:
         'semver': r'^\d+\.\d+\.\d+(-[a-zA-Z0-9.]+)?(\+[a-zA-Z0-9.]+)?$',
     }
     
+    # 預編譯的格式正則
+    _FORMAT_REGEXES = {name: re.compile(pattern) for name, pattern in FORMAT_PATTERNS.items()}
+    
     def __init__(self, registry: Optional[SchemaRegistry] = None):
         self.registry = registry or SchemaRegistry()
         self._custom_validators: Dict[str, callable] = {}
+        self._pattern_cache: Dict[str, Pattern] = {}
     
     def register_custom_validator(self, name: str, validator: callable) -> None:
         """註冊自定義驗證器"""
@@ -188,14 +192,7 @@ class YAMLSchemaValidator:
         
         # 檢查 const
         if 'const' in schema:
-            if data != schema['const']:
-                result.add_error(ValidationError(
-                    path=path,
-                    error_type=ValidationErrorType.ENUM_VIOLATION,
-                    message=f"Value must be exactly {schema['const']}",
-                    expected=schema['const'],
-                    actual=data,
-                ))
+            self._validate_const(data, schema['const'], path, result)
         
         # 字符串驗證
         if isinstance(data, str):
@@ -215,16 +212,37 @@ class YAMLSchemaValidator:
         
         # 自定義驗證
         if 'x-custom-validator' in schema:
-            validator_name = schema['x-custom-validator']
-            if validator_name in self._custom_validators:
-                try:
-                    self._custom_validators[validator_name](data, path, result)
-                except Exception as e:
-                    result.add_error(ValidationError(
-                        path=path,
-                        error_type=ValidationErrorType.CUSTOM_VALIDATION_FAILED,
-                        message=f"Custom validator '{validator_name}' failed: {str(e)}",
-                    ))
+            self._run_custom_validator(schema['x-custom-validator'], data, path, result)
+    
+    def _validate_const(self, data: Any, expected: Any, path: str, result: ValidationResult) -> None:
+        """驗證 const"""
+        if data != expected:
+            result.add_error(ValidationError(
+                path=path,
+                error_type=ValidationErrorType.ENUM_VIOLATION,
+                message=f"Value must be exactly {expected}",
+                expected=expected,
+                actual=data,
+            ))
+    
+    def _run_custom_validator(self, validator_name: str, data: Any, path: str, result: ValidationResult) -> None:
+        """執行自定義驗證器"""
+        if validator_name in self._custom_validators:
+            try:
+                self._custom_validators[validator_name](data, path, result)
+            except Exception as e:
+                result.add_error(ValidationError(
+                    path=path,
+                    error_type=ValidationErrorType.CUSTOM_VALIDATION_FAILED,
+                    message=f"Custom validator '{validator_name}' failed: {str(e)}",
+                ))
+    
+    def _compiled_pattern(self, pattern: str) -> Pattern:
+        """獲取預編譯的正則"""
+        compiled = self._pattern_cache.get(pattern)
+        if compiled is None:
+            compiled = self._pattern_cache[pattern] = re.compile(pattern)
+        return compiled
     
     def _validate_type(self, data: Any, expected_type: str, path: str, result: ValidationResult) -> None:
         """驗證類型"""
@@ -292,7 +310,7 @@ class YAMLSchemaValidator:
         
         # 模式匹配
         if 'pattern' in schema:
-            if not re.match(schema['pattern'], data):
+            if not self._compiled_pattern(schema['pattern']).match(data):
                 result.add_error(ValidationError(
                     path=path,
                     error_type=ValidationErrorType.PATTERN_MISMATCH,
@@ -305,7 +323,7 @@ class YAMLSchemaValidator:
         if 'format' in schema:
             format_name = schema['format']
             if format_name in self.FORMAT_PATTERNS:
-                if not re.match(self.FORMAT_PATTERNS[format_name], data):
+                if not self._FORMAT_REGEXES[format_name].match(data):
                     result.add_error(ValidationError(
                         path=path,
                         error_type=ValidationErrorType.FORMAT_ERROR,
@@ -369,6 +387,16 @@ class YAMLSchemaValidator:
     
     def _validate_array(self, data: list, schema: Dict[str, Any], path: str, result: ValidationResult) -> None:
         """驗證數組"""
+        self._validate_array_bounds(data, schema, path, result)
+        
+        # 項目驗證
+        if 'items' in schema:
+            for i, item in enumerate(data):
+                item_path = f"{path}[{i}]"
+                self._validate_node(item, schema['items'], item_path, result)
+    
+    def _validate_array_bounds(self, data: list, schema: Dict[str, Any], path: str, result: ValidationResult) -> None:
+        """驗證數組長度與唯一性（不含項目）"""
         # 最小項目數
         if 'minItems' in schema and len(data) < schema['minItems']:
             result.add_error(ValidationError(
@@ -403,16 +431,22 @@ class YAMLSchemaValidator:
                     ))
                     break
                 seen.append(item_json)
-        
-        # 項目驗證
-        if 'items' in schema:
-            for i, item in enumerate(data):
-                item_path = f"{path}[{i}]"
-                self._validate_node(item, schema['items'], item_path, result)
     
     def _validate_object(self, data: dict, schema: Dict[str, Any], path: str, result: ValidationResult) -> None:
         """驗證對象"""
-        # 必需屬性
+        self._validate_required(data, schema, path, result)
+        
+        # 屬性驗證
+        if 'properties' in schema:
+            for prop_name, prop_schema in schema['properties'].items():
+                if prop_name in data:
+                    prop_path = f"{path}.{prop_name}"
+                    self._validate_node(data[prop_name], prop_schema, prop_path, result)
+        
+        self._validate_object_shape(data, schema, path, result)
+    
+    def _validate_required(self, data: dict, schema: Dict[str, Any], path: str, result: ValidationResult) -> None:
+        """驗證必需屬性"""
         if 'required' in schema:
             for required_prop in schema['required']:
                 if required_prop not in data:
@@ -422,14 +456,9 @@ class YAMLSchemaValidator:
                         message=f"Required property '{required_prop}' is missing",
                         expected=required_prop,
                     ))
-        
-        # 屬性驗證
-        if 'properties' in schema:
-            for prop_name, prop_schema in schema['properties'].items():
-                if prop_name in data:
-                    prop_path = f"{path}.{prop_name}"
-                    self._validate_node(data[prop_name], prop_schema, prop_path, result)
-        
+    
+    def _validate_object_shape(self, data: dict, schema: Dict[str, Any], path: str, result: ValidationResult) -> None:
+        """驗證額外屬性與屬性數量"""
         # 額外屬性
         if schema.get('additionalProperties') is False:
             allowed_props = set(schema.get('properties', {}).keys())
@@ -5,6 +5,8 @@
 
 from .base_analyzer import BaseAnalyzer
 from .go_analyzer import GoAnalyzer
+from .manifest_cache import ManifestCache
+from .manifest_discovery import DEFAULT_EXCLUDED_DIRS, discover_manifests, parse_manifests
 from .npm_analyzer import NpmAnalyzer
 from .pip_analyzer import PipAnalyzer
 
@@ -12,5 +14,9 @@ __all__ = [
     "BaseAnalyzer",
     "NpmAnalyzer",
     "PipAnalyzer",
-    "GoAnalyzer"
+    "GoAnalyzer",
+    "ManifestCache",
+    "DEFAULT_EXCLUDED_DIRS",
+    "discover_manifests",
+    "parse_manifests"
 ]
@@ -104,6 +104,25 @@ class BaseAnalyzer(ABC):
         # 解析清單文件
         dependencies = await self.parse_manifest(manifest_path)
 
+        return await self.build_analysis(project_path, analysis_id, {manifest_path: dependencies})
+
+    async def build_analysis(
+        self,
+        project_path: Path,
+        analysis_id: str,
+        parsed: dict[Path, list[Dependency]]
+    ) -> DependencyAnalysis:
+        """
+        由已解析的清單文件建立分析結果
+
+        Args:
+            project_path: 專案路徑
+            analysis_id: 分析 ID
+            parsed: {清單文件路徑: 依賴項列表}
+
+        Returns:
+            依賴分析結果（依賴項標記來源清單的相對路徑）
+        """
         # 創建分析結果
         analysis = DependencyAnalysis(
             analysis_id=analysis_id,
@@ -111,13 +130,24 @@ class BaseAnalyzer(ABC):
             ecosystem=self.ecosystem
         )
 
-        # 檢查每個依賴的最新版本
-        for dep in dependencies:
-            latest = await self.get_latest_version(dep.name)
-            if latest:
-                dep.latest_version = latest
-
-            analysis.add_dependency(dep)
+        # 檢查每個依賴的最新版本（同名套件只查詢一次）
+        latest_versions: dict[str, str | None] = {}
+        for manifest_path, dependencies in parsed.items():
+            if manifest_path.is_relative_to(project_path):
+                manifest = manifest_path.relative_to(project_path).as_posix()
+            else:
+                manifest = str(manifest_path)
+            analysis.manifests.append(manifest)
+
+            for dep in dependencies:
+                if dep.name not in latest_versions:
+                    latest_versions[dep.name] = await self.get_latest_version(dep.name)
+                latest = latest_versions[dep.name]
+                if latest:
+                    dep.latest_version = latest
+
+                dep.manifest = manifest
+                analysis.add_dependency(dep)
 
         logger.info(f"分析完成: 共 {analysis.total_count} 個依賴項, {analysis.outdated_count} 個過時")
 
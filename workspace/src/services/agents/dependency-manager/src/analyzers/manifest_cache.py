@@ -0,0 +1,198 @@
+"""
+清單解析快取 - Manifest Cache
+以 (路徑, mtime, 大小, 內容雜湊) 為鍵快取清單文件的解析結果
+
+- mtime 與大小未變時直接命中，不讀取文件
+- mtime 或大小改變時計算 SHA-256；內容未變（例如僅 touch 或重新 checkout）
+  仍視為命中並刷新 stat 資訊，只有內容改變的文件才需要重新解析
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+
+from ..models.dependency import Dependency, DependencyType, Ecosystem
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+_Fingerprint = tuple[int, int, str]
+_DEPENDENCY_TYPES = {t.value: t for t in DependencyType}
+
+
+def file_digest(path: Path) -> str:
+    """計算文件內容的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ManifestCache:
+    """
+    清單解析結果快取（SQLite）
+
+    使用方式:
+        cache = ManifestCache(".dependency-manager/manifests.sqlite3")
+        dependencies = cache.get(Ecosystem.NPM, path)
+        if dependencies is None:
+            dependencies = await analyzer.parse_manifest(path)
+            cache.put_many([(Ecosystem.NPM, path, dependencies)])
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        初始化快取
+
+        Args:
+            path: SQLite 數據庫路徑（預設為內存數據庫）
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+        # get 未命中時計算的指紋，供 put_many 直接使用，避免重複讀取文件
+        self._fingerprints: dict[tuple[str, str], _Fingerprint] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _init_schema(self) -> None:
+        """建立或升級表結構（版本不符時清空快取）"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+        self._conn.executescript(f"""
+            DROP TABLE IF EXISTS manifests;
+            CREATE TABLE manifests (
+                ecosystem TEXT NOT NULL,
+                path TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                dependencies TEXT NOT NULL,
+                PRIMARY KEY (ecosystem, path)
+            );
+            PRAGMA user_version = {SCHEMA_VERSION};
+        """)
+
+    def get(self, ecosystem: Ecosystem, path: Path) -> list[Dependency] | None:
+        """
+        查詢清單文件的快取解析結果
+
+        Args:
+            ecosystem: 生態系統
+            path: 清單文件路徑
+
+        Returns:
+            依賴項列表；文件已改變或不在快取中時返回 None
+        """
+        key = (ecosystem.value, str(Path(path).resolve()))
+        try:
+            stat = os.stat(key[1])
+        except OSError:
+            return None
+
+        row = self._conn.execute(
+            "SELECT mtime_ns, size, sha256, dependencies FROM manifests WHERE ecosystem = ? AND path = ?",
+            key
+        ).fetchone()
+        if row and (row[0], row[1]) == (stat.st_mtime_ns, stat.st_size):
+            self.hits += 1
+            return self._load(ecosystem, row[3])
+
+        fingerprint = (stat.st_mtime_ns, stat.st_size, file_digest(Path(key[1])))
+        if row and row[2] == fingerprint[2]:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE manifests SET mtime_ns = ?, size = ? WHERE ecosystem = ? AND path = ?",
+                    (fingerprint[0], fingerprint[1], *key)
+                )
+            self.hits += 1
+            return self._load(ecosystem, row[3])
+
+        self._fingerprints[key] = fingerprint
+        self.misses += 1
+        return None
+
+    def put_many(self, entries: Iterable[tuple[Ecosystem, Path, list[Dependency]]]) -> None:
+        """
+        寫入解析結果（單一事務）
+
+        Args:
+            entries: (生態系統, 清單文件路徑, 依賴項列表)
+        """
+        rows = []
+        for ecosystem, path, dependencies in entries:
+            key = (ecosystem.value, str(Path(path).resolve()))
+            fingerprint = self._fingerprints.pop(key, None)
+            if fingerprint is None:
+                try:
+                    stat = os.stat(key[1])
+                    fingerprint = (stat.st_mtime_ns, stat.st_size, file_digest(Path(key[1])))
+                except OSError:
+                    continue
+            rows.append((*key, *fingerprint, self._dump(dependencies)))
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO manifests VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def prune(self, root: Path, keep: Iterable[Path]) -> int:
+        """
+        刪除 root 下已不存在於本次掃描結果中的條目
+
+        Args:
+            root: 掃描根目錄
+            keep: 本次發現的清單文件
+
+        Returns:
+            刪除的條目數
+        """
+        prefix = str(Path(root).resolve()).rstrip(os.sep) + os.sep
+        kept = {str(Path(p).resolve()) for p in keep}
+        stale = [
+            (ecosystem, path) for ecosystem, path in self._conn.execute(
+                "SELECT ecosystem, path FROM manifests WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix)
+            )
+            if path not in kept
+        ]
+        with self._conn:
+            self._conn.executemany("DELETE FROM manifests WHERE ecosystem = ? AND path = ?", stale)
+        return len(stale)
+
+    @staticmethod
+    def _dump(dependencies: list[Dependency]) -> str:
+        return json.dumps([
+            [d.name, d.current_version, d.dep_type.value] for d in dependencies
+        ])
+
+    @staticmethod
+    def _load(ecosystem: Ecosystem, payload: str) -> list[Dependency]:
+        return [
+            Dependency(
+                name=name,
+                current_version=version,
+                ecosystem=ecosystem,
+                dep_type=_DEPENDENCY_TYPES[dep_type]
+            )
+            for name, version, dep_type in json.loads(payload)
+        ]
+
+    def stats(self) -> dict[str, int]:
+        """快取統計"""
+        entries = self._conn.execute("SELECT COUNT(*) FROM manifests").fetchone()[0]
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """關閉數據庫連接"""
+        self._conn.close()
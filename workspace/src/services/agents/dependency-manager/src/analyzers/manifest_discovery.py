@@ -0,0 +1,157 @@
+"""
+清單發現與並行解析 - Manifest Discovery
+單次遍歷整個倉庫找出所有生態系統的清單文件，並在有界進程池中並行解析
+
+- 每個目錄內各生態系統按分析器 get_manifest_files() 的優先順序取第一個清單，
+  與 BaseAnalyzer.find_manifest 對單一專案的語義一致
+- node_modules、.git、虛擬環境等目錄在遍歷時直接剪枝
+- 解析前先查詢 ManifestCache，只有新增或內容改變的清單才送入進程池
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ..models.dependency import Dependency, Ecosystem
+from .base_analyzer import BaseAnalyzer
+from .manifest_cache import ManifestCache
+
+logger = logging.getLogger(__name__)
+
+# 遍歷時跳過的目錄（依賴安裝目錄、版本控制與構建產物）
+DEFAULT_EXCLUDED_DIRS: frozenset[str] = frozenset({
+    ".git", ".hg", ".svn",
+    "node_modules", "bower_components", "vendor",
+    ".venv", "venv", "env", ".tox", ".nox", "__pycache__", "site-packages",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache",
+    "dist", "build", "target", ".next", ".cache",
+})
+
+
+def discover_manifests(
+    root: Path,
+    analyzers: Mapping[Ecosystem, BaseAnalyzer],
+    exclude_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS
+) -> dict[Ecosystem, list[Path]]:
+    """
+    單次遍歷發現所有清單文件
+
+    Args:
+        root: 倉庫根目錄
+        analyzers: 各生態系統的分析器
+        exclude_dirs: 跳過的目錄名稱
+
+    Returns:
+        {生態系統: 清單文件路徑列表}，按路徑排序
+    """
+    excluded = frozenset(exclude_dirs)
+    candidates = {
+        ecosystem: analyzer.get_manifest_files()
+        for ecosystem, analyzer in analyzers.items()
+    }
+    names = {name for manifest_names in candidates.values() for name in manifest_names}
+    found: dict[Ecosystem, list[Path]] = {ecosystem: [] for ecosystem in analyzers}
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in excluded)
+        present = names.intersection(filenames)
+        if not present:
+            continue
+        for ecosystem, manifest_names in candidates.items():
+            for name in manifest_names:
+                if name in present:
+                    found[ecosystem].append(Path(dirpath) / name)
+                    break
+
+    for ecosystem, paths in found.items():
+        logger.info(f"發現 {len(paths)} 個 {ecosystem.value} 清單文件")
+    return found
+
+
+async def parse_manifests(
+    manifests: Mapping[Ecosystem, list[Path]],
+    analyzers: Mapping[Ecosystem, BaseAnalyzer],
+    cache: ManifestCache | None = None,
+    max_workers: int = 8,
+    parallel: bool = True,
+    parallel_threshold: int = 32
+) -> dict[Ecosystem, dict[Path, list[Dependency]]]:
+    """
+    解析清單文件（快取未命中的文件在進程池中並行解析）
+
+    Args:
+        manifests: discover_manifests 的結果
+        analyzers: 各生態系統的分析器
+        cache: 解析結果快取
+        max_workers: 最大工作進程數
+        parallel: 是否並行解析
+        parallel_threshold: 待解析文件少於此值時在當前進程中解析
+
+    Returns:
+        {生態系統: {清單文件路徑: 依賴項列表}}，順序與輸入一致
+    """
+    results: dict[Ecosystem, dict[Path, list[Dependency] | None]] = {}
+    pending: list[tuple[Ecosystem, Path]] = []
+    for ecosystem, paths in manifests.items():
+        parsed = results[ecosystem] = {}
+        for path in paths:
+            parsed[path] = cache.get(ecosystem, path) if cache else None
+            if parsed[path] is None:
+                pending.append((ecosystem, path))
+
+    if pending:
+        logger.info(f"解析 {len(pending)} 個清單文件（快取命中 "
+                    f"{sum(len(p) for p in manifests.values()) - len(pending)} 個）")
+        workers = min(max_workers, len(pending)) if parallel else 1
+        if workers > 1 and len(pending) >= parallel_threshold:
+            parsed_lists = await _parse_in_pool(pending, analyzers, workers)
+        else:
+            parsed_lists = [await analyzers[ecosystem].parse_manifest(path) for ecosystem, path in pending]
+
+        for (ecosystem, path), dependencies in zip(pending, parsed_lists):
+            results[ecosystem][path] = dependencies
+        if cache:
+            cache.put_many(
+                (ecosystem, path, dependencies)
+                for (ecosystem, path), dependencies in zip(pending, parsed_lists)
+            )
+
+    return results
+
+
+async def _parse_in_pool(
+    pending: list[tuple[Ecosystem, Path]],
+    analyzers: Mapping[Ecosystem, BaseAnalyzer],
+    workers: int
+) -> list[list[Dependency]]:
+    """將待解析文件分塊送入進程池"""
+    chunksize = max(1, len(pending) // (workers * 4))
+    chunks = [pending[i:i + chunksize] for i in range(0, len(pending), chunksize)]
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker,
+                             initargs=(dict(analyzers),)) as pool:
+        parsed_chunks = await asyncio.gather(*(
+            loop.run_in_executor(pool, _parse_chunk, chunk) for chunk in chunks
+        ))
+    return [dependencies for chunk in parsed_chunks for dependencies in chunk]
+
+
+_WORKER_ANALYZERS: dict[Ecosystem, BaseAnalyzer] = {}
+
+
+def _init_parse_worker(analyzers: dict[Ecosystem, BaseAnalyzer]) -> None:
+    """進程池初始化：每個進程持有一份分析器"""
+    global _WORKER_ANALYZERS
+    _WORKER_ANALYZERS = analyzers
+    # 逐文件的解析日誌在多進程中交錯輸出，工作進程只保留警告
+    logging.getLogger(__package__).setLevel(logging.WARNING)
+
+
+def _parse_chunk(chunk: list[tuple[Ecosystem, Path]]) -> list[list[Dependency]]:
+    async def parse() -> list[list[Dependency]]:
+        return [await _WORKER_ANALYZERS[ecosystem].parse_manifest(path) for ecosystem, path in chunk]
+    return asyncio.run(parse())
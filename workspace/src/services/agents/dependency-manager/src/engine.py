@@ -3,6 +3,7 @@
 整合所有功能的主引擎類
 """
 
+import asyncio
 import logging
 import uuid
 from dataclasses import dataclass, field
@@ -11,7 +12,16 @@ from typing import Any
 
 import yaml
 
-from .analyzers import BaseAnalyzer, GoAnalyzer, NpmAnalyzer, PipAnalyzer
+from .analyzers import (
+    DEFAULT_EXCLUDED_DIRS,
+    BaseAnalyzer,
+    GoAnalyzer,
+    ManifestCache,
+    NpmAnalyzer,
+    PipAnalyzer,
+    discover_manifests,
+    parse_manifests,
+)
 from .models.dependency import DependencyAnalysis, Ecosystem
 from .models.update import UpdateResult
 from .models.vulnerability import VulnerabilityScanResult
@@ -37,6 +47,8 @@ class ManagerConfig:
         parallel: 是否並行處理
         max_workers: 最大工作線程數
         ecosystems: 啟用的生態系統
+        cache_path: 清單解析快取路徑（None 時僅在進程內快取）
+        exclude_dirs: 清單發現時跳過的目錄名稱
     """
     enabled: bool = True
     parallel: bool = True
@@ -46,6 +58,8 @@ class ManagerConfig:
         Ecosystem.PIP,
         Ecosystem.GO
     ])
+    cache_path: str | None = None
+    exclude_dirs: list[str] = field(default_factory=lambda: sorted(DEFAULT_EXCLUDED_DIRS))
 
 
 class DependencyManager:
@@ -72,6 +86,7 @@ class DependencyManager:
         # 初始化各個組件
         self._analyzers: dict[Ecosystem, BaseAnalyzer] = {}
         self._init_analyzers()
+        self._manifest_cache = ManifestCache(self.config.cache_path or ":memory:")
 
         self._vulnerability_scanner = VulnerabilityScanner()
         self._license_scanner = LicenseScanner()
@@ -100,7 +115,9 @@ class DependencyManager:
                     max_workers=yaml_config.get('max_workers', 8),
                     ecosystems=[
                         Ecosystem(e) for e in yaml_config.get('ecosystems', ['npm'])
-                    ]
+                    ],
+                    cache_path=yaml_config.get('cache_path'),
+                    exclude_dirs=yaml_config.get('exclude_dirs', sorted(DEFAULT_EXCLUDED_DIRS))
                 )
             except Exception as e:
                 logger.warning(f"載入配置失敗: {e}，使用默認配置")
@@ -128,6 +145,9 @@ class DependencyManager:
         """
         分析專案依賴
         
+        單次遍歷找出專案（含 monorepo 子目錄）中所有生態系統的清單文件，
+        未命中快取的清單在進程池中並行解析，各生態系統的依賴合併為一個分析結果。
+        
         Args:
             project_path: 專案路徑
             scan_type: 掃描類型 ("full" 或 "quick")
@@ -144,10 +164,25 @@ class DependencyManager:
         results: dict[Ecosystem, DependencyAnalysis] = {}
         analysis_id = f"analysis-{uuid.uuid4().hex[:8]}"
 
-        for ecosystem, analyzer in self._analyzers.items():
-            analysis = await analyzer.analyze(path, analysis_id)
-            if analysis:
-                results[ecosystem] = analysis
+        manifests = await asyncio.to_thread(
+            discover_manifests, path, self._analyzers, self.config.exclude_dirs
+        )
+        manifests = {ecosystem: paths for ecosystem, paths in manifests.items() if paths}
+        parsed = await parse_manifests(
+            manifests,
+            self._analyzers,
+            cache=self._manifest_cache,
+            max_workers=self.config.max_workers,
+            parallel=self.config.parallel
+        )
+        self._manifest_cache.prune(path, [p for paths in manifests.values() for p in paths])
+
+        analyses = await asyncio.gather(*(
+            self._analyzers[ecosystem].build_analysis(path, analysis_id, parsed[ecosystem])
+            for ecosystem in manifests
+        ))
+        for ecosystem, analysis in zip(manifests, analyses):
+            results[ecosystem] = analysis
 
         if not results:
             logger.warning("未找到任何支援的依賴清單文件")
@@ -245,18 +280,18 @@ class DependencyManager:
         # 分析各生態系統
         analyses = await self.analyze_project(project_path)
 
-        for ecosystem, analysis in analyses.items():
+        # 各生態系統的漏洞掃描與許可證掃描並行執行
+        scans = await asyncio.gather(*(
+            asyncio.gather(self.scan_vulnerabilities(analysis), self.scan_licenses(analysis))
+            for analysis in analyses.values()
+        ))
+
+        for (ecosystem, analysis), (vuln_result, license_result) in zip(analyses.items(), scans):
             eco_name = ecosystem.value
 
             # 儲存分析結果
             result["analyses"][eco_name] = analysis.to_dict()
-
-            # 漏洞掃描
-            vuln_result = await self.scan_vulnerabilities(analysis)
             result["vulnerabilities"][eco_name] = vuln_result.to_dict()
-
-            # 許可證掃描
-            license_result = await self.scan_licenses(analysis)
             result["licenses"][eco_name] = license_result.to_dict()
 
         logger.info("完整掃描完成")
@@ -51,6 +51,7 @@ class Dependency:
         license: 許可證
         has_vulnerability: 是否存在漏洞
         vulnerability_count: 漏洞數量
+        manifest: 來源清單文件（相對於專案根目錄）
     """
     name: str
     current_version: str
@@ -61,6 +62,7 @@ class Dependency:
     license: str | None = None
     has_vulnerability: bool = False
     vulnerability_count: int = 0
+    manifest: str | None = None
 
     def is_outdated(self) -> bool:
         """檢查是否過時"""
@@ -88,6 +90,7 @@ class DependencyAnalysis:
         transitive_count: 傳遞依賴數
         outdated_count: 過時依賴數
         vulnerable_count: 有漏洞的依賴數
+        manifests: 已分析的清單文件（相對於專案根目錄）
     """
     analysis_id: str
     project: str
@@ -99,6 +102,7 @@ class DependencyAnalysis:
     transitive_count: int = 0
     outdated_count: int = 0
     vulnerable_count: int = 0
+    manifests: list[str] = field(default_factory=list)
 
     def add_dependency(self, dep: Dependency) -> None:
         """添加依賴項"""
@@ -131,6 +135,7 @@ class DependencyAnalysis:
             "project": self.project,
             "ecosystem": self.ecosystem.value,
             "timestamp": self.timestamp.isoformat(),
+            "manifests": self.manifests,
             "summary": {
                 "total_dependencies": self.total_count,
                 "direct_dependencies": self.direct_count,
@@ -145,7 +150,8 @@ class DependencyAnalysis:
                     "latest_version": d.latest_version,
                     "type": d.dep_type.value,
                     "status": d.status.value,
-                    "license": d.license
+                    "license": d.license,
+                    "manifest": d.manifest
                 }
                 for d in self.dependencies
             ]
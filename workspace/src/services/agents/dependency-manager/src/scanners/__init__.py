@@ -3,10 +3,12 @@
 漏洞和許可證掃描器
 """
 
+from .advisory_store import AdvisoryStore
 from .license_scanner import LicenseScanner
 from .vulnerability_scanner import VulnerabilityScanner
 
 __all__ = [
     "VulnerabilityScanner",
-    "LicenseScanner"
+    "LicenseScanner",
+    "AdvisoryStore"
 ]
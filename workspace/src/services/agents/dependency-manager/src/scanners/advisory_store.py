@@ -0,0 +1,686 @@
+"""
+離線漏洞通告庫 - Advisory Store
+將 OSV 格式的通告導入 SQLite，並以批次方式離線匹配依賴項
+
+- 通告按 (生態系統, 套件) 建立索引，OSV 全量導出（zip/目錄/JSON）可直接導入
+- 受影響版本範圍按套件編譯為區間樹，查詢時只解析一次依賴版本
+- 整份清單在一次批次查詢中匹配，各生態系統使用各自的版本排序規則
+"""
+
+import json
+import logging
+import math
+import re
+import sqlite3
+import zipfile
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from ..models.dependency import Ecosystem
+from ..models.vulnerability import Vulnerability, VulnerabilitySeverity, VulnerabilitySource
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# 本地生態系統 -> OSV 生態系統名稱
+OSV_ECOSYSTEMS: dict[Ecosystem, str] = {
+    Ecosystem.NPM: "npm",
+    Ecosystem.PIP: "PyPI",
+    Ecosystem.GO: "Go",
+    Ecosystem.MAVEN: "Maven",
+    Ecosystem.GRADLE: "Maven",
+    Ecosystem.CARGO: "crates.io",
+}
+
+# 版本鍵的上下界（所有版本鍵的首元素均為整數）
+MIN_KEY: tuple = ()
+MAX_KEY: tuple = (math.inf,)
+
+VersionKey = tuple
+
+
+# ============ 版本解析 ============
+
+_SEMVER_RE = re.compile(
+    r'^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$'
+)
+
+
+def semver_key(version: str) -> VersionKey:
+    """
+    SemVer 排序鍵（npm、Go、crates.io 及 SEMVER 類型範圍）
+
+    預發布版本低於正式版本，預發布標識符中數字低於字母
+    """
+    match = _SEMVER_RE.match(version.strip())
+    if not match:
+        numbers = [int(n) for n in re.findall(r'\d+', version)[:3]]
+        numbers += [0] * (3 - len(numbers))
+        return (*numbers, (0, (1, version)))
+
+    major, minor, patch, prerelease = match.groups()
+    if prerelease is None:
+        pre: tuple = (1,)
+    else:
+        pre = (0, *(
+            (0, int(part)) if part.isdigit() else (1, part)
+            for part in prerelease.split('.')
+        ))
+    return (int(major), int(minor or 0), int(patch or 0), pre)
+
+
+_PEP440_RE = re.compile(
+    r'^\s*v?(?:(\d+)!)?(\d+(?:\.\d+)*)'
+    r'(?:[-_.]?(a|b|c|rc|alpha|beta|pre|preview)[-_.]?(\d*))?'
+    r'(?:-(\d+)|[-_.]?(post|rev|r)[-_.]?(\d*))?'
+    r'(?:[-_.]?(dev)[-_.]?(\d*))?'
+    r'(?:\+[a-z0-9]+(?:[-_.][a-z0-9]+)*)?\s*$',
+    re.IGNORECASE
+)
+
+_PEP440_PRE = {'a': 0, 'alpha': 0, 'b': 1, 'beta': 1, 'c': 2, 'rc': 2, 'pre': 2, 'preview': 2}
+
+
+def pep440_key(version: str) -> VersionKey:
+    """
+    PEP 440 排序鍵（PyPI）
+
+    dev < a < b < rc < 正式版 < post；release 段忽略末尾的 0
+    """
+    match = _PEP440_RE.match(version)
+    if not match:
+        # 無法解析的舊式版本排在所有合法版本之前
+        return (-1, tuple(int(n) for n in re.findall(r'\d+', version)), (3,), (0,), (1,))
+
+    epoch, release, pre_l, pre_n, post_implicit, post_l, post_n, dev_l, dev_n = match.groups()
+    parts = [int(n) for n in release.split('.')]
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+
+    if pre_l:
+        pre: tuple = (1, _PEP440_PRE[pre_l.lower()], int(pre_n or 0))
+    elif dev_l and not (post_implicit or post_l):
+        pre = (0,)
+    else:
+        pre = (3,)
+    if post_implicit:
+        post: tuple = (1, int(post_implicit))
+    elif post_l:
+        post = (1, int(post_n or 0))
+    else:
+        post = (0,)
+    dev: tuple = (0, int(dev_n or 0)) if dev_l else (1,)
+    return (int(epoch or 0), tuple(parts), pre, post, dev)
+
+
+_MAVEN_QUALIFIERS = {
+    'alpha': 0, 'a': 0,
+    'beta': 1, 'b': 1,
+    'milestone': 2, 'm': 2,
+    'rc': 3, 'cr': 3,
+    'snapshot': 4,
+    '': 5, 'ga': 5, 'final': 5, 'release': 5,
+    'sp': 6,
+}
+_MAVEN_TOKEN_RE = re.compile(r'\d+|[a-z]+', re.IGNORECASE)
+
+
+def maven_key(version: str) -> VersionKey:
+    """
+    Maven 排序鍵（簡化的 ComparableVersion）
+
+    數字按數值比較；alpha < beta < milestone < rc < snapshot < 正式版 < sp < 其他限定詞
+    """
+    items: list[tuple] = []
+    for token in _MAVEN_TOKEN_RE.findall(version.lower()):
+        if token.isdigit():
+            items.append((2, int(token), ''))
+        else:
+            # 限定詞前的 0 無意義（1.0-alpha == 1-alpha）
+            while items and items[-1] == (2, 0, ''):
+                items.pop()
+            rank = _MAVEN_QUALIFIERS.get(token)
+            items.append((1, rank, '') if rank is not None else (1, 7, token))
+    # 去除末尾的 0 與正式版限定詞（1.0 == 1 == 1.0-ga）
+    while items and items[-1] in ((2, 0, ''), (1, 5, '')):
+        items.pop()
+    items.append((1, 5, ''))
+    return (0, tuple(items))
+
+
+VERSION_PARSERS: dict[str, Callable[[str], VersionKey]] = {
+    "npm": semver_key,
+    "Go": semver_key,
+    "crates.io": semver_key,
+    "PyPI": pep440_key,
+    "Maven": maven_key,
+}
+
+
+def version_parser(ecosystem: str, range_type: str = "ECOSYSTEM") -> Callable[[str], VersionKey]:
+    """範圍類型與生態系統對應的版本解析器"""
+    if range_type == "SEMVER":
+        return semver_key
+    return VERSION_PARSERS.get(ecosystem, maven_key)
+
+
+def normalize_package(ecosystem: str, name: str) -> str:
+    """套件名稱正規化（PyPI 依 PEP 503）"""
+    if ecosystem == "PyPI":
+        return re.sub(r'[-_.]+', '-', name).lower()
+    return name
+
+
+# ============ CVSS ============
+
+_CVSS3_WEIGHTS = {
+    'AV': {'N': 0.85, 'A': 0.62, 'L': 0.55, 'P': 0.2},
+    'AC': {'L': 0.77, 'H': 0.44},
+    'UI': {'N': 0.85, 'R': 0.62},
+    'CIA': {'H': 0.56, 'L': 0.22, 'N': 0.0},
+}
+_CVSS3_PR = {
+    'U': {'N': 0.85, 'L': 0.62, 'H': 0.27},
+    'C': {'N': 0.85, 'L': 0.68, 'H': 0.5},
+}
+
+
+def _roundup(value: float) -> float:
+    scaled = round(value * 100000)
+    if scaled % 10000 == 0:
+        return scaled / 100000.0
+    return (math.floor(scaled / 10000) + 1) / 10.0
+
+
+def cvss3_base_score(vector: str) -> float | None:
+    """
+    由 CVSS v3.x 向量計算基礎分數
+
+    Args:
+        vector: 例如 "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"
+
+    Returns:
+        基礎分數；非 v3 向量或格式錯誤時返回 None
+    """
+    if not vector.startswith("CVSS:3"):
+        return None
+    try:
+        metrics = dict(part.split(':', 1) for part in vector.split('/')[1:])
+        scope = metrics['S']
+        iss = 1 - (
+            (1 - _CVSS3_WEIGHTS['CIA'][metrics['C']])
+            * (1 - _CVSS3_WEIGHTS['CIA'][metrics['I']])
+            * (1 - _CVSS3_WEIGHTS['CIA'][metrics['A']])
+        )
+        if scope == 'U':
+            impact = 6.42 * iss
+        else:
+            impact = 7.52 * (iss - 0.029) - 3.25 * (iss - 0.02) ** 15
+        exploitability = (
+            8.22
+            * _CVSS3_WEIGHTS['AV'][metrics['AV']]
+            * _CVSS3_WEIGHTS['AC'][metrics['AC']]
+            * _CVSS3_PR[scope][metrics['PR']]
+            * _CVSS3_WEIGHTS['UI'][metrics['UI']]
+        )
+    except (KeyError, ValueError):
+        return None
+
+    if impact <= 0:
+        return 0.0
+    if scope == 'U':
+        return _roundup(min(impact + exploitability, 10))
+    return _roundup(min(1.08 * (impact + exploitability), 10))
+
+
+def _advisory_severity(advisory: dict) -> tuple[str, float | None]:
+    """通告嚴重程度：優先使用數據庫標註，其次由 CVSS 向量計算"""
+    score = None
+    for entry in advisory.get("severity") or []:
+        if entry.get("type", "").startswith("CVSS_V3"):
+            score = cvss3_base_score(entry.get("score", ""))
+            if score is not None:
+                break
+
+    labels = [(advisory.get("database_specific") or {}).get("severity")]
+    for affected in advisory.get("affected") or []:
+        labels.append((affected.get("database_specific") or {}).get("severity"))
+        labels.append((affected.get("ecosystem_specific") or {}).get("severity"))
+    for label in labels:
+        if isinstance(label, str):
+            label = label.upper()
+            if label == "MODERATE":
+                label = "MEDIUM"
+            if label in VulnerabilitySeverity.__members__:
+                return label, score
+
+    if score is not None:
+        return VulnerabilitySeverity.from_cvss(score).value, score
+    return VulnerabilitySeverity.UNKNOWN.value, None
+
+
+# ============ 區間樹 ============
+
+@dataclass(frozen=True)
+class AffectedRange:
+    """受影響版本區間 [lo, hi) 或 [lo, hi]"""
+    lo: VersionKey
+    hi: VersionKey
+    hi_inclusive: bool
+    advisory_id: str
+    description: str
+    fixed: str | None = None
+
+    def contains(self, key: VersionKey) -> bool:
+        if key < self.lo:
+            return False
+        return key < self.hi or (self.hi_inclusive and key == self.hi)
+
+
+class IntervalTree:
+    """
+    靜態區間樹
+
+    區間按下界排序存放於陣列，以中點為根隱式構成平衡二叉樹，
+    每個子樹記錄最大上界，點查詢只訪問可能包含該點的子樹。
+    """
+
+    def __init__(self, ranges: Iterable[AffectedRange]):
+        self._ranges = sorted(ranges, key=lambda r: r.lo)
+        self._max_hi: list[tuple] = [()] * len(self._ranges)
+        if self._ranges:
+            self._build(0, len(self._ranges))
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def _build(self, start: int, end: int) -> tuple:
+        mid = (start + end) // 2
+        current = self._ranges[mid]
+        best = (current.hi, current.hi_inclusive)
+        if start < mid:
+            best = max(best, self._build(start, mid))
+        if mid + 1 < end:
+            best = max(best, self._build(mid + 1, end))
+        self._max_hi[mid] = best
+        return best
+
+    def stab(self, key: VersionKey) -> list[AffectedRange]:
+        """返回包含 key 的所有區間"""
+        found = []
+        bound = (key, True)
+        stack = [(0, len(self._ranges))]
+        while stack:
+            start, end = stack.pop()
+            if start >= end:
+                continue
+            mid = (start + end) // 2
+            if self._max_hi[mid] < bound:
+                continue
+            stack.append((start, mid))
+            current = self._ranges[mid]
+            if current.lo <= key:
+                if current.contains(key):
+                    found.append(current)
+                stack.append((mid + 1, end))
+        return found
+
+
+def compile_ranges(advisory_id: str, ranges: list[dict],
+                   parser: Callable[[str], VersionKey]) -> list[AffectedRange]:
+    """
+    將 OSV events 編譯為區間
+
+    introduced 開啟區間，fixed/limit 以開區間關閉，last_affected 以閉區間關閉；
+    未關閉的區間延伸到最大版本。
+    """
+    compiled = []
+    for range_ in ranges:
+        events = []
+        for event in range_.get("events", []):
+            for kind, value in event.items():
+                if kind == "introduced" and value == "0":
+                    events.append((MIN_KEY, 0, kind, value))
+                else:
+                    events.append((parser(value), 0 if kind == "introduced" else 1, kind, value))
+        events.sort(key=lambda e: (e[0], e[1]))
+
+        start = None
+        for key, _, kind, value in events:
+            if kind == "introduced":
+                if start is None:
+                    start = (key, value)
+            elif start is not None:
+                lo, lo_text = start
+                inclusive = kind == "last_affected"
+                lower = f">={lo_text}, " if lo != MIN_KEY else ""
+                upper = f"<={value}" if inclusive else f"<{value}"
+                compiled.append(AffectedRange(
+                    lo=lo, hi=key, hi_inclusive=inclusive, advisory_id=advisory_id,
+                    description=f"{lower}{upper}", fixed=value if kind == "fixed" else None,
+                ))
+                start = None
+        if start is not None:
+            lo, lo_text = start
+            compiled.append(AffectedRange(
+                lo=lo, hi=MAX_KEY, hi_inclusive=True, advisory_id=advisory_id,
+                description=f">={lo_text}" if lo != MIN_KEY else "*",
+            ))
+    return compiled
+
+
+@dataclass
+class _PackageIndex:
+    """單一套件的已編譯索引"""
+    trees: dict[str, tuple[Callable[[str], VersionKey], IntervalTree]]
+    exact: dict[str, list[str]]
+
+
+# ============ 通告庫 ============
+
+class AdvisoryStore:
+    """
+    離線漏洞通告庫
+
+    Example:
+        store = AdvisoryStore("advisories.sqlite3")
+        store.ingest(["osv/PyPI/all.zip", "osv/npm/all.zip"])
+        matches = store.match([(Ecosystem.PIP, "django", "3.2.0")])
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        初始化通告庫
+
+        Args:
+            path: SQLite 數據庫路徑（默認為記憶體數據庫）
+        """
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+        self._indexes: dict[tuple[str, str], _PackageIndex | None] = {}
+
+    def _init_schema(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.executescript("""
+                DROP TABLE IF EXISTS advisories;
+                DROP TABLE IF EXISTS affected;
+            """)
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS advisories (
+                id       TEXT PRIMARY KEY,
+                modified TEXT,
+                severity TEXT NOT NULL,
+                cvss     REAL,
+                payload  TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS affected (
+                ecosystem   TEXT NOT NULL,
+                package     TEXT NOT NULL,
+                advisory_id TEXT NOT NULL,
+                ranges      TEXT NOT NULL,
+                versions    TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_affected_package ON affected (ecosystem, package);
+            CREATE INDEX IF NOT EXISTS idx_affected_advisory ON affected (advisory_id);
+            PRAGMA user_version = {SCHEMA_VERSION};
+        """)
+        self._conn.commit()
+
+    # ----- 導入 -----
+
+    def ingest(self, sources: Iterable[str | Path]) -> int:
+        """
+        導入 OSV 通告
+
+        Args:
+            sources: JSON 文件（單個通告或通告列表）、OSV 導出 zip 或目錄
+
+        Returns:
+            導入的通告數
+        """
+        count = 0
+        for advisory in self._iter_advisories(sources):
+            if self.add_advisory(advisory):
+                count += 1
+        self._conn.commit()
+        self._indexes.clear()
+        logger.info(f"已導入 {count} 條通告")
+        return count
+
+    def add_advisory(self, advisory: dict) -> bool:
+        """
+        寫入單條 OSV 通告（不提交事務）
+
+        Returns:
+            是否寫入（撤回或無受影響套件的通告被忽略）
+        """
+        advisory_id = advisory.get("id")
+        if not advisory_id or advisory.get("withdrawn"):
+            return False
+
+        rows = []
+        for affected in advisory.get("affected") or []:
+            package = affected.get("package") or {}
+            ecosystem = (package.get("ecosystem") or "").split(":")[0]
+            name = package.get("name")
+            if not ecosystem or not name:
+                continue
+            ranges = [r for r in affected.get("ranges") or [] if r.get("type") in ("SEMVER", "ECOSYSTEM")]
+            rows.append((
+                ecosystem, normalize_package(ecosystem, name), advisory_id,
+                json.dumps(ranges), json.dumps(affected.get("versions") or []),
+            ))
+        if not rows:
+            return False
+
+        severity, cvss = _advisory_severity(advisory)
+        payload = {
+            "summary": advisory.get("summary", ""),
+            "details": advisory.get("details", ""),
+            "aliases": advisory.get("aliases") or [],
+            "references": [ref.get("url") for ref in advisory.get("references") or [] if ref.get("url")],
+            "published": advisory.get("published"),
+        }
+        self._conn.execute("DELETE FROM affected WHERE advisory_id = ?", (advisory_id,))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO advisories (id, modified, severity, cvss, payload) VALUES (?, ?, ?, ?, ?)",
+            (advisory_id, advisory.get("modified"), severity, cvss, json.dumps(payload, ensure_ascii=False))
+        )
+        self._conn.executemany(
+            "INSERT INTO affected (ecosystem, package, advisory_id, ranges, versions) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        return True
+
+    def _iter_advisories(self, sources: Iterable[str | Path]) -> Iterator[dict]:
+        for source in sources:
+            path = Path(source)
+            if path.is_dir():
+                for child in sorted(path.rglob("*")):
+                    if child.suffix in (".json", ".zip"):
+                        yield from self._iter_advisories([child])
+            elif path.suffix == ".zip":
+                with zipfile.ZipFile(path) as archive:
+                    for name in archive.namelist():
+                        if name.endswith(".json"):
+                            yield from _as_advisories(json.loads(archive.read(name)))
+            else:
+                with open(path, encoding="utf-8") as f:
+                    yield from _as_advisories(json.load(f))
+
+    # ----- 匹配 -----
+
+    def match(
+        self,
+        packages: Iterable[tuple[Ecosystem, str, str]]
+    ) -> list[list[Vulnerability]]:
+        """
+        批次匹配依賴項
+
+        Args:
+            packages: (生態系統, 套件名稱, 版本) 列表
+
+        Returns:
+            與輸入順序對應的漏洞列表
+        """
+        packages = list(packages)
+        keys = [
+            (OSV_ECOSYSTEMS.get(ecosystem, ecosystem.value),
+             normalize_package(OSV_ECOSYSTEMS.get(ecosystem, ecosystem.value), name))
+            for ecosystem, name, _ in packages
+        ]
+        self._load_indexes(set(keys))
+
+        matched: list[list[tuple[AffectedRange | None, str]]] = []
+        advisory_ids: set[str] = set()
+        for (ecosystem, name, version), key in zip(packages, keys):
+            hits = self._match_one(self._indexes.get(key), _clean_version(version))
+            matched.append(hits)
+            advisory_ids.update(advisory_id for _, advisory_id in hits)
+
+        advisories = self._load_advisories(advisory_ids)
+        results = []
+        for (ecosystem, name, version), hits in zip(packages, matched):
+            vulnerabilities: list[Vulnerability] = []
+            seen: set[str] = set()
+            # 優先報告有嚴重程度的通告，其次按 ID 排序
+            ordered = sorted(hits, key=lambda hit: (
+                advisories[hit[1]]["severity"] == VulnerabilitySeverity.UNKNOWN.value, hit[1]
+            ))
+            for range_, advisory_id in ordered:
+                advisory = advisories[advisory_id]
+                # 同一漏洞在不同數據庫中的別名（GHSA/CVE/PYSEC）只報告一次
+                if advisory_id in seen or seen.intersection(advisory["aliases"]):
+                    continue
+                seen.add(advisory_id)
+                seen.update(advisory["aliases"])
+                vulnerabilities.append(self._to_vulnerability(advisory_id, advisory, name, range_))
+            results.append(vulnerabilities)
+        return results
+
+    def _match_one(self, index: _PackageIndex | None,
+                   version: str) -> list[tuple[AffectedRange | None, str]]:
+        if index is None:
+            return []
+        hits: list[tuple[AffectedRange | None, str]] = []
+        for parser, tree in index.trees.values():
+            hits.extend((range_, range_.advisory_id) for range_ in tree.stab(parser(version)))
+        # 同一通告優先保留區間命中（帶修復版本），其後才是明確列出的版本
+        hits.extend((None, advisory_id) for advisory_id in index.exact.get(version, []))
+        return hits
+
+    def _load_indexes(self, keys: set[tuple[str, str]]) -> None:
+        """批次讀取並編譯尚未快取的套件索引"""
+        missing = [key for key in keys if key not in self._indexes]
+        by_ecosystem: dict[str, list[str]] = {}
+        for ecosystem, package in missing:
+            by_ecosystem.setdefault(ecosystem, []).append(package)
+            self._indexes[(ecosystem, package)] = None
+
+        rows_by_key: dict[tuple[str, str], list[tuple[str, str, str]]] = {}
+        for ecosystem, names in by_ecosystem.items():
+            for offset in range(0, len(names), 500):
+                chunk = names[offset:offset + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for package, advisory_id, ranges, versions in self._conn.execute(
+                    "SELECT package, advisory_id, ranges, versions FROM affected "
+                    f"WHERE ecosystem = ? AND package IN ({placeholders})",
+                    (ecosystem, *chunk)
+                ):
+                    rows_by_key.setdefault((ecosystem, package), []).append((advisory_id, ranges, versions))
+
+        for (ecosystem, package), rows in rows_by_key.items():
+            self._indexes[(ecosystem, package)] = self._compile_package(ecosystem, rows)
+
+    def _compile_package(self, ecosystem: str, rows: list[tuple[str, str, str]]) -> _PackageIndex:
+        by_parser: dict[str, tuple[Callable[[str], VersionKey], list[AffectedRange]]] = {}
+        exact: dict[str, list[str]] = {}
+        for advisory_id, ranges_json, versions_json in rows:
+            ranges_by_type: dict[str, list[dict]] = {}
+            for range_ in json.loads(ranges_json):
+                ranges_by_type.setdefault(range_["type"], []).append(range_)
+            for range_type, ranges in ranges_by_type.items():
+                parser = version_parser(ecosystem, range_type)
+                entry = by_parser.setdefault(parser.__name__, (parser, []))
+                entry[1].extend(compile_ranges(advisory_id, ranges, parser))
+            for version in json.loads(versions_json):
+                exact.setdefault(version, []).append(advisory_id)
+        return _PackageIndex(
+            trees={name: (parser, IntervalTree(ranges)) for name, (parser, ranges) in by_parser.items()},
+            exact=exact,
+        )
+
+    def _load_advisories(self, advisory_ids: set[str]) -> dict[str, dict]:
+        advisories = {}
+        ids = sorted(advisory_ids)
+        for offset in range(0, len(ids), 500):
+            chunk = ids[offset:offset + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for advisory_id, severity, cvss, payload in self._conn.execute(
+                f"SELECT id, severity, cvss, payload FROM advisories WHERE id IN ({placeholders})", chunk
+            ):
+                advisory = json.loads(payload)
+                advisory["severity"] = severity
+                advisory["cvss"] = cvss
+                advisories[advisory_id] = advisory
+        return advisories
+
+    @staticmethod
+    def _to_vulnerability(advisory_id: str, advisory: dict, package: str,
+                          range_: AffectedRange | None) -> Vulnerability:
+        published = None
+        if advisory.get("published"):
+            try:
+                published = datetime.fromisoformat(advisory["published"].replace("Z", "+00:00"))
+            except ValueError:
+                published = None
+        return Vulnerability(
+            id=advisory_id,
+            package=package,
+            severity=VulnerabilitySeverity(advisory["severity"]),
+            title=advisory.get("summary", ""),
+            description=advisory.get("details", ""),
+            affected_versions=range_.description if range_ else "",
+            fixed_version=range_.fixed if range_ else None,
+            cvss_score=advisory.get("cvss"),
+            source=VulnerabilitySource.GHSA if advisory_id.startswith("GHSA-") else VulnerabilitySource.OSV,
+            references=advisory.get("references", []),
+            published_at=published,
+        )
+
+    # ----- 其他 -----
+
+    def stats(self) -> dict[str, int]:
+        """通告庫統計"""
+        advisories = self._conn.execute("SELECT COUNT(*) FROM advisories").fetchone()[0]
+        packages = self._conn.execute(
+            "SELECT COUNT(*) FROM (SELECT DISTINCT ecosystem, package FROM affected)"
+        ).fetchone()[0]
+        return {"advisories": advisories, "packages": packages}
+
+    def close(self) -> None:
+        """關閉數據庫"""
+        self._conn.commit()
+        self._conn.close()
+
+
+def _as_advisories(document) -> list[dict]:
+    if isinstance(document, list):
+        return [item for item in document if isinstance(item, dict)]
+    if isinstance(document, dict):
+        return [document]
+    return []
+
+
+def _clean_version(version: str) -> str:
+    """去除版本約束前綴（^1.2.3、==1.0、>=2 等）"""
+    return version.strip().lstrip("^~=<>! ")
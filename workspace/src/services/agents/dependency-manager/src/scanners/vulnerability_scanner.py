@@ -14,6 +14,7 @@ from ..models.vulnerability import (
     VulnerabilitySeverity,
     VulnerabilitySource,
 )
+from .advisory_store import AdvisoryStore
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,7 @@ class ScanConfig:
     severity_threshold: VulnerabilitySeverity = VulnerabilitySeverity.MEDIUM
     include_dev_dependencies: bool = True
     timeout_seconds: int = 30
+    advisory_db: str | None = None  # 離線通告庫路徑（設置後掃描完全離線）
 
 
 class VulnerabilityScanner:
@@ -35,14 +37,22 @@ class VulnerabilityScanner:
     - NVD (美國國家漏洞數據庫)
     - GHSA (GitHub Security Advisories)
     - OSV (Open Source Vulnerabilities)
+    
+    配置離線通告庫（AdvisoryStore）後，整份依賴清單在一次批次查詢中匹配，
+    不再逐套件逐數據源查詢。
     """
 
-    def __init__(self, config: ScanConfig | None = None):
+    def __init__(
+        self,
+        config: ScanConfig | None = None,
+        advisory_store: AdvisoryStore | None = None
+    ):
         """
         初始化漏洞掃描器
         
         Args:
             config: 掃描配置，如未提供則使用默認配置
+            advisory_store: 離線通告庫，如未提供則按 config.advisory_db 打開
         """
         self.config = config or ScanConfig(
             sources=[
@@ -51,6 +61,9 @@ class VulnerabilityScanner:
                 VulnerabilitySource.OSV
             ]
         )
+        self.advisory_store = advisory_store
+        if self.advisory_store is None and self.config.advisory_db:
+            self.advisory_store = AdvisoryStore(self.config.advisory_db)
         logger.info(f"漏洞掃描器初始化完成，數據源: {[s.value for s in self.config.sources]}")
 
     async def scan(
@@ -73,6 +86,7 @@ class VulnerabilityScanner:
 
         # 追蹤已掃描的套件避免重複
         scanned: set[str] = set()
+        unique: list[Dependency] = []
 
         for dep in dependencies:
             package_key = f"{dep.ecosystem.value}:{dep.name}@{dep.current_version}"
@@ -80,14 +94,21 @@ class VulnerabilityScanner:
             if package_key in scanned:
                 continue
             scanned.add(package_key)
+            unique.append(dep)
 
-            # 掃描每個數據源
-            vulnerabilities = await self._scan_package(
-                dep.name,
-                dep.current_version,
-                dep.ecosystem
+        if self.advisory_store is not None:
+            # 離線：整份清單一次批次匹配
+            matches = self.advisory_store.match(
+                (dep.ecosystem, dep.name, dep.current_version) for dep in unique
             )
+        else:
+            # 掃描每個數據源
+            matches = [
+                await self._scan_package(dep.name, dep.current_version, dep.ecosystem)
+                for dep in unique
+            ]
 
+        for dep, vulnerabilities in zip(unique, matches):
             for vuln in vulnerabilities:
                 # 檢查是否符合嚴重程度閾值
                 if self._meets_threshold(vuln.severity):
@@ -283,4 +304,6 @@ class VulnerabilityScanner:
         Returns:
             漏洞列表
         """
+        if self.advisory_store is not None:
+            return self.advisory_store.match([(ecosystem, package_name, version)])[0]
         return await self._scan_package(package_name, version, ecosystem)
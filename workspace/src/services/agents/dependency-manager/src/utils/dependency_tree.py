@@ -21,49 +21,176 @@ class RiskLevel(Enum):
     CRITICAL = "critical"  # 嚴重風險
 
 
-@dataclass
+_RISK_ORDER = {level: rank for rank, level in enumerate(RiskLevel)}
+
+
+@dataclass(eq=False)
 class TreeNode:
     """
     依賴樹節點
     
+    同一 (名稱, 版本) 在樹中只有一個節點，被多個父節點共享（有向無環圖）。
+    後代統計在首次查詢時自底向上一次性計算並快取，add_child 會使自身及祖先的快取失效。
+    
     Attributes:
         dependency: 依賴項
         children: 子依賴列表
-        depth: 在樹中的深度
+        depth: 距根節點的最短深度
         risk_level: 風險等級
+        parents: 父依賴列表（反向指針）
     """
     dependency: Dependency
-    children: list["TreeNode"] = field(default_factory=list)
+    children: list["TreeNode"] = field(default_factory=list, repr=False)
     depth: int = 0
     risk_level: RiskLevel = RiskLevel.NONE
+    parents: list["TreeNode"] = field(default_factory=list, repr=False)
+
+    # 自底向上彙總的結果（_roll_up 計算）
+    _descendant_count: int = field(default=0, init=False, repr=False)
+    _height: int = field(default=0, init=False, repr=False)
+    _max_risk: RiskLevel = field(default=RiskLevel.NONE, init=False, repr=False)
+    _vulnerable_below: bool = field(default=False, init=False, repr=False)
+    _dirty: bool = field(default=True, init=False, repr=False)
+
+    @property
+    def key(self) -> str:
+        """節點鍵 (name@version)"""
+        return f"{self.dependency.name}@{self.dependency.current_version}"
 
     def add_child(self, child: "TreeNode") -> None:
         """添加子依賴"""
-        child.depth = self.depth + 1
         self.children.append(child)
+        child.parents.append(self)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """使自身及所有祖先的彙總結果失效"""
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            if node._dirty and node is not self:
+                continue
+            node._dirty = True
+            pending.extend(node.parents)
+
+    def _ensure_rolled_up(self) -> None:
+        if self._dirty:
+            _roll_up([self])
 
     def get_descendants_count(self) -> int:
-        """獲取所有後代數量"""
-        count = len(self.children)
-        for child in self.children:
-            count += child.get_descendants_count()
-        return count
+        """
+        獲取所有後代數量
+        
+        按展開後的樹計數（共享子樹在每個父節點下各計一次），循環中的其他成員各計一次不展開。
+        """
+        self._ensure_rolled_up()
+        return self._descendant_count
 
     def has_vulnerable_descendants(self) -> bool:
         """檢查是否有有漏洞的後代"""
-        for child in self.children:
-            if child.dependency.has_vulnerability:
-                return True
-            if child.has_vulnerable_descendants():
-                return True
-        return False
+        self._ensure_rolled_up()
+        return self._vulnerable_below
+
+    def get_max_risk(self) -> RiskLevel:
+        """獲取自身及所有後代中的最高風險等級"""
+        self._ensure_rolled_up()
+        return self._max_risk
+
+    def get_height(self) -> int:
+        """獲取到最深後代的層數（葉節點為 0）"""
+        self._ensure_rolled_up()
+        return self._height
+
+
+def _roll_up(starts: list[TreeNode]) -> None:
+    """
+    自底向上計算後代統計
+    
+    以迭代式 Tarjan 演算法遍歷失效節點：強連通分量按逆拓撲序產生，
+    處理每個分量時其所有外部子節點均已完成，因此每個節點和每條邊只訪問一次。
+    已有有效結果的節點視為葉子直接使用其快取值。
+    """
+    index: dict[TreeNode, int] = {}
+    low: dict[TreeNode, int] = {}
+    stack: list[TreeNode] = []
+    on_stack: set[TreeNode] = set()
+
+    for start in starts:
+        if not start._dirty or start in index:
+            continue
+        index[start] = low[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        work = [(start, iter(start.children))]
+
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if not child._dirty:
+                    continue
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(child.children)))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member is node:
+                            break
+                    _roll_up_component(component)
+
+
+def _roll_up_component(members: list[TreeNode]) -> None:
+    """
+    彙總一個強連通分量（單節點或循環）
+
+    分量內節點互相可達，所有成員共享同一組統計：後代為分量內其他成員加上
+    所有成員的外部子樹（每條外部邊各計一次），高度按穿過分量內其他成員再進入
+    最深外部子樹計算。
+    """
+    inside = set(members)
+    cyclic = len(members) > 1 or members[0] in members[0].children
+
+    max_risk = max((m.risk_level for m in members), key=_RISK_ORDER.__getitem__)
+    vulnerable_below = cyclic and any(m.dependency.has_vulnerability for m in members)
+    external_count = external_height = 0
+    for member in members:
+        for child in member.children:
+            if child in inside:
+                continue
+            external_count += 1 + child._descendant_count
+            external_height = max(external_height, child._height + 1)
+            if _RISK_ORDER[child._max_risk] > _RISK_ORDER[max_risk]:
+                max_risk = child._max_risk
+            vulnerable_below = vulnerable_below or child.dependency.has_vulnerability or child._vulnerable_below
+
+    span = len(members) - 1
+    for member in members:
+        member._descendant_count = span + external_count
+        member._height = span + external_height
+        member._max_risk = max_risk
+        member._vulnerable_below = vulnerable_below
+        member._dirty = False
 
 
 class DependencyTree:
     """
     依賴樹
     
-    用於視覺化依賴關係和風險傳播
+    用於視覺化依賴關係和風險傳播。每個 (名稱, 版本) 只建立一個節點，
+    節點數與邊數線性於唯一套件數，而不是展開後的樹大小。
     """
 
     def __init__(self, project_name: str):
@@ -76,6 +203,8 @@ class DependencyTree:
         self.project_name = project_name
         self.root_nodes: list[TreeNode] = []
         self._all_nodes: dict[str, TreeNode] = {}
+        self._by_name: dict[str, TreeNode] = {}
+        self._reachable: set[TreeNode] = set()
 
         logger.info(f"初始化依賴樹: {project_name}")
 
@@ -88,39 +217,60 @@ class DependencyTree:
         建構依賴樹
         
         Args:
-            dependencies: 依賴項列表
-            parent_map: 父子關係映射 {parent_name: [child_names]}
+            dependencies: 依賴項列表（相同名稱與版本只建立一個節點）
+            parent_map: 父子關係映射 {parent: [children]}，鍵和值可以是
+                套件名稱或 "name@version"；僅給出名稱時對應最後加入的同名節點
         """
-        # 創建所有節點
+        # 創建所有節點（按 (名稱, 版本) 去重）
         for dep in dependencies:
-            node = TreeNode(dependency=dep)
-            self._all_nodes[dep.name] = node
-
-            # 計算風險等級
-            node.risk_level = self._calculate_risk(dep)
+            key = f"{dep.name}@{dep.current_version}"
+            node = self._all_nodes.get(key)
+            if node is None:
+                node = TreeNode(dependency=dep, risk_level=self._calculate_risk(dep))
+                self._all_nodes[key] = node
+            self._by_name[dep.name] = node
 
         # 建立關係
         if parent_map:
-            for parent_name, children in parent_map.items():
-                if parent_name in self._all_nodes:
-                    parent_node = self._all_nodes[parent_name]
-                    for child_name in children:
-                        if child_name in self._all_nodes:
-                            child_node = self._all_nodes[child_name]
-                            parent_node.add_child(child_node)
+            for parent_ref, children in parent_map.items():
+                parent_node = self._resolve(parent_ref)
+                if parent_node is None:
+                    continue
+                existing = set(parent_node.children)
+                for child_ref in children:
+                    child_node = self._resolve(child_ref)
+                    if child_node is not None and child_node not in existing:
+                        existing.add(child_node)
+                        parent_node.add_child(child_node)
 
         # 找出根節點（沒有父節點的依賴）
-        children_set: set[str] = set()
-        if parent_map:
-            for children in parent_map.values():
-                children_set.update(children)
-
-        for name, node in self._all_nodes.items():
-            if name not in children_set:
-                self.root_nodes.append(node)
+        self.root_nodes = [node for node in self._all_nodes.values() if not node.parents]
+        self._assign_depths()
+        _roll_up(list(self._all_nodes.values()))
 
         logger.info(f"依賴樹建構完成: {len(self.root_nodes)} 個根節點, {len(self._all_nodes)} 個總節點")
 
+    def _resolve(self, ref: str) -> TreeNode | None:
+        """按 "name@version" 或名稱查找節點"""
+        return self._all_nodes.get(ref) or self._by_name.get(ref)
+
+    def _assign_depths(self) -> None:
+        """從根節點廣度優先計算最短深度"""
+        seen = set(self.root_nodes)
+        level = list(self.root_nodes)
+        depth = 0
+        while level:
+            next_level = []
+            for node in level:
+                node.depth = depth
+                for child in node.children:
+                    if child not in seen:
+                        seen.add(child)
+                        next_level.append(child)
+            level = next_level
+            depth += 1
+        self._reachable = seen
+
     def _calculate_risk(self, dep: Dependency) -> RiskLevel:
         """
         計算依賴項的風險等級
@@ -153,10 +303,11 @@ class DependencyTree:
             文字格式的樹狀圖
         """
         lines = [f"📦 {self.project_name}"]
+        rendered: set[TreeNode] = set()
 
         for i, node in enumerate(self.root_nodes):
             is_last = (i == len(self.root_nodes) - 1)
-            lines.extend(self._render_node(node, "", is_last, show_risk))
+            lines.extend(self._render_node(node, "", is_last, show_risk, rendered))
 
         return "\n".join(lines)
 
@@ -165,16 +316,20 @@ class DependencyTree:
         node: TreeNode,
         prefix: str,
         is_last: bool,
-        show_risk: bool
+        show_risk: bool,
+        rendered: set[TreeNode]
     ) -> list[str]:
         """
         渲染單個節點
         
+        共享子樹只在首次出現時展開，之後標記為 (deduped)。
+        
         Args:
             node: 樹節點
             prefix: 前綴字符串
             is_last: 是否是最後一個兄弟節點
             show_risk: 是否顯示風險
+            rendered: 已展開的節點
             
         Returns:
             渲染的行列表
@@ -206,13 +361,18 @@ class DependencyTree:
         elif dep.is_outdated():
             status_mark = " ⬆️"
 
-        lines.append(f"{prefix}{connector}{name_version}{status_mark}{risk_indicator}")
+        deduped = node in rendered and bool(node.children)
+        dedupe_mark = " (deduped)" if deduped else ""
+        lines.append(f"{prefix}{connector}{name_version}{status_mark}{risk_indicator}{dedupe_mark}")
+        if deduped:
+            return lines
+        rendered.add(node)
 
         # 遞歸渲染子節點
         child_prefix = prefix + ("    " if is_last else "│   ")
         for i, child in enumerate(node.children):
             child_is_last = (i == len(node.children) - 1)
-            lines.extend(self._render_node(child, child_prefix, child_is_last, show_risk))
+            lines.extend(self._render_node(child, child_prefix, child_is_last, show_risk, rendered))
 
         return lines
 
@@ -220,19 +380,29 @@ class DependencyTree:
         """
         渲染 JSON 格式的依賴樹
         
+        共享子樹只在首次出現時展開，之後以 "deduped": true 標記且不含子節點。
+        
         Returns:
             JSON 結構
         """
+        rendered: set[TreeNode] = set()
+
         def node_to_dict(node: TreeNode) -> dict:
-            return {
+            result = {
                 "name": node.dependency.name,
                 "version": node.dependency.current_version,
                 "latest_version": node.dependency.latest_version,
                 "risk_level": node.risk_level.value,
                 "has_vulnerability": node.dependency.has_vulnerability,
                 "is_outdated": node.dependency.is_outdated(),
-                "children": [node_to_dict(child) for child in node.children]
+                "children": []
             }
+            if node in rendered and node.children:
+                result["deduped"] = True
+                return result
+            rendered.add(node)
+            result["children"] = [node_to_dict(child) for child in node.children]
+            return result
 
         return {
             "project": self.project_name,
@@ -245,13 +415,15 @@ class DependencyTree:
         """
         獲取依賴樹統計資訊
         
+        風險、漏洞與過時計數按唯一套件統計；max_depth 為最長依賴鏈的深度。
+        
         Returns:
             統計資訊字典
         """
         stats = {
             "total_dependencies": len(self._all_nodes),
             "direct_dependencies": len(self.root_nodes),
-            "max_depth": 0,
+            "max_depth": max((root.get_height() for root in self.root_nodes), default=0),
             "risk_summary": {
                 RiskLevel.CRITICAL.value: 0,
                 RiskLevel.HIGH.value: 0,
@@ -263,8 +435,7 @@ class DependencyTree:
             "outdated_count": 0
         }
 
-        def process_node(node: TreeNode, depth: int = 0):
-            stats["max_depth"] = max(stats["max_depth"], depth)
+        for node in self._reachable:
             stats["risk_summary"][node.risk_level.value] += 1
 
             if node.dependency.has_vulnerability:
@@ -272,33 +443,39 @@ class DependencyTree:
             if node.dependency.is_outdated():
                 stats["outdated_count"] += 1
 
-            for child in node.children:
-                process_node(child, depth + 1)
-
-        for root in self.root_nodes:
-            process_node(root)
-
         return stats
 
-    def find_path_to_vulnerable(self) -> list[list[str]]:
+    def find_path_to_vulnerable(self, max_paths: int = 1000) -> list[list[str]]:
         """
         找出到有漏洞依賴的路徑
         
+        從每個有漏洞的節點沿父節點反向指針回溯到根節點，路徑總數以 max_paths 為上限，
+        因此在共享子樹眾多的依賴圖上不會隨展開後的樹大小爆炸。
+        
+        Args:
+            max_paths: 返回路徑數上限
+            
         Returns:
-            路徑列表，每個路徑是依賴名稱列表
+            路徑列表，每個路徑是從根節點到有漏洞依賴的名稱列表
         """
-        paths = []
-
-        def find_paths(node: TreeNode, current_path: list[str]):
-            current_path = current_path + [node.dependency.name]
-
-            if node.dependency.has_vulnerability:
-                paths.append(current_path)
-
-            for child in node.children:
-                find_paths(child, current_path)
-
-        for root in self.root_nodes:
-            find_paths(root, [])
+        paths: list[list[str]] = []
+        roots = set(self.root_nodes)
+
+        for target in self._all_nodes.values():
+            if not target.dependency.has_vulnerability or target not in self._reachable:
+                continue
+
+            # 棧中保存從 target 向上的部分路徑；跳過已在路徑上的節點以避開循環
+            stack: list[tuple[TreeNode, ...]] = [(target,)]
+            while stack:
+                chain = stack.pop()
+                head = chain[-1]
+                if head in roots:
+                    paths.append([node.dependency.name for node in reversed(chain)])
+                    if len(paths) >= max_paths:
+                        return paths
+                for parent in reversed(head.parents):
+                    if parent in self._reachable and parent not in chain:
+                        stack.append(chain + (parent,))
 
         return paths
@@ -0,0 +1,148 @@
+"""
+離線通告庫基準測試
+Benchmark for AdvisoryStore
+
+生成合成 OSV 通告（預設 20,000 個套件、約 60,000 條通告）並導入 SQLite，
+然後以 2,000 個依賴項的清單比較：
+- 逐套件逐數據源查詢（現有 VulnerabilityScanner.scan 的循環方式，
+  每次查詢都讀取該套件的通告並重新解析版本範圍）
+- AdvisoryStore 批次匹配（冷啟動與已編譯索引兩種情況）
+並按 --latency-ms 估算現有在線查詢方式的耗時。
+
+用法:
+    python tests/benchmark_advisory_store.py --packages 20000 --deps 2000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.dependency import Dependency, Ecosystem
+from src.scanners.advisory_store import (
+    OSV_ECOSYSTEMS,
+    AdvisoryStore,
+    compile_ranges,
+    normalize_package,
+    version_parser,
+)
+from src.scanners.vulnerability_scanner import ScanConfig, VulnerabilityScanner
+
+ECOSYSTEMS = [Ecosystem.NPM, Ecosystem.PIP, Ecosystem.GO, Ecosystem.MAVEN, Ecosystem.CARGO]
+SOURCES = 3
+
+
+def _version(rng: random.Random) -> str:
+    return f"{rng.randint(0, 5)}.{rng.randint(0, 20)}.{rng.randint(0, 30)}"
+
+
+def generate_advisories(packages: int, seed: int = 0) -> list[dict]:
+    """生成合成 OSV 通告"""
+    rng = random.Random(seed)
+    advisories = []
+    for p in range(packages):
+        ecosystem = OSV_ECOSYSTEMS[ECOSYSTEMS[p % len(ECOSYSTEMS)]]
+        name = f"pkg-{p}"
+        for a in range(rng.randint(1, 5)):
+            low, high = sorted([_version(rng), _version(rng)], key=version_parser(ecosystem))
+            events = [{"introduced": rng.choice(["0", low])}, {"fixed": high}]
+            if rng.random() < 0.3:
+                events += [{"introduced": high.replace(".", ".1", 1)}]
+            advisories.append({
+                "id": f"OSV-{p}-{a}",
+                "summary": f"Synthetic advisory {a} for {name}",
+                "database_specific": {"severity": rng.choice(["LOW", "MODERATE", "HIGH", "CRITICAL"])},
+                "affected": [{
+                    "package": {"ecosystem": ecosystem, "name": name},
+                    "ranges": [{"type": "ECOSYSTEM", "events": events}],
+                }],
+            })
+    return advisories
+
+
+def per_package_lookup(store: AdvisoryStore, deps: list[Dependency]) -> int:
+    """逐套件逐數據源查詢：每次讀取並重新解析該套件的通告"""
+    found = 0
+    seen = set()
+    for dep in deps:
+        key = f"{dep.ecosystem.value}:{dep.name}@{dep.current_version}"
+        if key in seen:
+            continue
+        seen.add(key)
+        ecosystem = OSV_ECOSYSTEMS[dep.ecosystem]
+        parser = version_parser(ecosystem)
+        ids = set()
+        for _ in range(SOURCES):
+            rows = store._conn.execute(
+                "SELECT advisory_id, ranges FROM affected WHERE ecosystem = ? AND package = ?",
+                (ecosystem, normalize_package(ecosystem, dep.name))
+            ).fetchall()
+            version = parser(dep.current_version)
+            for advisory_id, ranges in rows:
+                if any(r.contains(version) for r in compile_ranges(advisory_id, json.loads(ranges), parser)):
+                    ids.add(advisory_id)
+        found += len(ids)
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="AdvisoryStore benchmark")
+    parser.add_argument("--packages", type=int, default=20000, help="合成通告覆蓋的套件數")
+    parser.add_argument("--deps", type=int, default=2000, help="清單中的依賴項數")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="在線查詢每次請求的估算延遲")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory(prefix="advisory-bench-") as tmp:
+        dump = Path(tmp) / "advisories.json"
+        advisories = generate_advisories(args.packages)
+        dump.write_text(json.dumps(advisories))
+
+        store = AdvisoryStore(str(Path(tmp) / "advisories.sqlite3"))
+        start = time.perf_counter()
+        store.ingest([dump])
+        print(f"ingest          {len(advisories):>8} advisories {time.perf_counter() - start:>8.2f} s")
+
+        deps = []
+        for _ in range(args.deps):
+            p = rng.randrange(args.packages * 2)  # 約一半套件沒有通告
+            deps.append(Dependency(
+                name=f"pkg-{p}",
+                current_version=_version(rng),
+                ecosystem=ECOSYSTEMS[p % len(ECOSYSTEMS)],
+            ))
+
+        start = time.perf_counter()
+        legacy = per_package_lookup(store, deps)
+        legacy_seconds = time.perf_counter() - start
+        print(f"per-package     {args.deps:>8} deps {legacy_seconds * 1000:>12.1f} ms {legacy:>6} findings")
+
+        scanner = VulnerabilityScanner(ScanConfig(sources=[]), advisory_store=store)
+        for label in ("batched (cold)", "batched (warm)"):
+            start = time.perf_counter()
+            batched = sum(len(found) for found in store.match(
+                (dep.ecosystem, dep.name, dep.current_version) for dep in deps
+            ))
+            print(f"{label:<15} {args.deps:>8} deps {(time.perf_counter() - start) * 1000:>12.1f} ms "
+                  f"{batched:>6} findings")
+
+        start = time.perf_counter()
+        result = asyncio.run(scanner.scan(deps))
+        print(f"scanner.scan    {args.deps:>8} deps {(time.perf_counter() - start) * 1000:>12.1f} ms "
+              f"{result.total_count:>6} findings (>= MEDIUM)")
+
+        online = len(deps) * SOURCES * args.latency_ms / 1000
+        print(f"online estimate {args.deps:>8} deps {online * 1000:>12.1f} ms "
+              f"({SOURCES} sources x {args.latency_ms:.0f} ms per request, sequential)")
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
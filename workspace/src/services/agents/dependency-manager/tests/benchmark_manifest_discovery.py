@@ -0,0 +1,125 @@
+"""
+monorepo 清單掃描基準測試
+Benchmark for manifest discovery, parallel parsing and ManifestCache
+
+生成合成 monorepo（預設 600 個子專案，npm/pip/go 輪流，每個 80 個依賴項，
+並在每個 npm 專案下放置需要剪枝的 node_modules），比較：
+- 舊方式：逐個子專案逐生態系統調用 BaseAnalyzer.analyze
+- 首次掃描：單次遍歷發現 + 進程池解析
+- 重新掃描：快取命中，只重新解析內容改變的清單
+
+用法:
+    python tests/benchmark_manifest_discovery.py --projects 600 --deps 80
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analyzers import ManifestCache, discover_manifests, parse_manifests
+from src.engine import DependencyManager
+
+
+def generate_monorepo(root: Path, projects: int, deps: int) -> list[Path]:
+    """生成合成 monorepo，返回所有子專案目錄"""
+    directories = []
+    for p in range(projects):
+        directory = root / "packages" / f"project-{p}"
+        (directory / "src").mkdir(parents=True)
+        (directory / "src" / "main.txt").write_text("placeholder\n")
+        kind = p % 3
+        if kind == 0:
+            (directory / "package.json").write_text(json.dumps({
+                "name": f"project-{p}",
+                "dependencies": {f"lib-{i}": f"^{i % 7}.{i % 11}.0" for i in range(deps)},
+            }))
+            modules = directory / "node_modules" / "lib-0"
+            modules.mkdir(parents=True)
+            (modules / "package.json").write_text(json.dumps({"dependencies": {"x": "1.0.0"}}))
+        elif kind == 1:
+            (directory / "requirements.txt").write_text(
+                "".join(f"lib-{i}[extra]>={i % 7}.{i % 11}.0 ; python_version >= '3.8'\n" for i in range(deps))
+            )
+        else:
+            (directory / "go.mod").write_text(
+                f"module example.com/project-{p}\n\ngo 1.21\n\nrequire (\n"
+                + "".join(f"\tgithub.com/org/lib-{i} v{i % 7}.{i % 11}.0\n" for i in range(deps))
+                + ")\n"
+            )
+        directories.append(directory)
+    return directories
+
+
+async def per_project(manager: DependencyManager, directories: list[Path]) -> int:
+    """舊方式：每個子專案、每個生態系統分別查找並解析清單"""
+    total = 0
+    for directory in directories:
+        for analyzer in manager._analyzers.values():
+            analysis = await analyzer.analyze(directory, "bench")
+            if analysis:
+                total += analysis.total_count
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Manifest discovery benchmark")
+    parser.add_argument("--projects", type=int, default=600, help="子專案數")
+    parser.add_argument("--deps", type=int, default=80, help="每個清單的依賴項數")
+    parser.add_argument("--workers", type=int, default=8, help="進程池大小")
+    parser.add_argument("--changed", type=int, default=10, help="重新掃描前修改的清單數")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory(prefix="manifest-bench-") as tmp:
+        root = Path(tmp)
+        directories = generate_monorepo(root, args.projects, args.deps)
+        manager = DependencyManager()
+        analyzers = manager._analyzers
+
+        start = time.perf_counter()
+        total = asyncio.run(per_project(manager, directories))
+        print(f"per-project      {args.projects:>6} projects {(time.perf_counter() - start) * 1000:>10.1f} ms "
+              f"{total:>8} deps")
+
+        start = time.perf_counter()
+        manifests = discover_manifests(root, analyzers)
+        discovered = sum(len(paths) for paths in manifests.values())
+        print(f"discovery        {discovered:>6} manifests {(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+        for label, parallel in (("parse (serial)", False), ("parse (pool)", True)):
+            start = time.perf_counter()
+            parsed = asyncio.run(parse_manifests(manifests, analyzers, max_workers=args.workers,
+                                                 parallel=parallel))
+            deps = sum(len(d) for per_file in parsed.values() for d in per_file.values())
+            print(f"{label:<16} {discovered:>6} manifests {(time.perf_counter() - start) * 1000:>9.1f} ms "
+                  f"{deps:>8} deps")
+
+        cache = ManifestCache(str(root / ".cache" / "manifests.sqlite3"))
+        start = time.perf_counter()
+        asyncio.run(parse_manifests(manifests, analyzers, cache=cache, max_workers=args.workers))
+        print(f"cold (cache)     {discovered:>6} manifests {(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+        for directory in directories[:args.changed]:
+            for path in directory.iterdir():
+                if path.is_file():
+                    path.write_text(path.read_text() + "\n")
+
+        start = time.perf_counter()
+        manifests = discover_manifests(root, analyzers)
+        asyncio.run(parse_manifests(manifests, analyzers, cache=cache, max_workers=args.workers))
+        print(f"rescan           {discovered:>6} manifests {(time.perf_counter() - start) * 1000:>9.1f} ms "
+              f"({cache.misses - discovered} re-parsed)")
+        cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+離線漏洞通告庫測試
+Tests for AdvisoryStore
+"""
+
+import asyncio
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# 添加專案目錄到路徑（掃描器使用包內相對導入）
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.dependency import Dependency, Ecosystem
+from src.models.vulnerability import VulnerabilitySeverity
+from src.scanners.advisory_store import (
+    AdvisoryStore,
+    cvss3_base_score,
+    maven_key,
+    pep440_key,
+    semver_key,
+)
+from src.scanners.vulnerability_scanner import ScanConfig, VulnerabilityScanner
+
+ADVISORIES = [
+    {
+        "id": "GHSA-aaaa-bbbb-cccc",
+        "aliases": ["CVE-2021-23337"],
+        "summary": "Command injection in lodash",
+        "modified": "2021-02-15T00:00:00Z",
+        "published": "2021-02-15T00:00:00Z",
+        "database_specific": {"severity": "HIGH"},
+        "affected": [{
+            "package": {"ecosystem": "npm", "name": "lodash"},
+            "ranges": [{"type": "SEMVER", "events": [{"introduced": "0"}, {"fixed": "4.17.21"}]}],
+        }],
+    },
+    {
+        "id": "CVE-2021-23337",
+        "aliases": ["GHSA-aaaa-bbbb-cccc"],
+        "summary": "Duplicate record of the lodash advisory",
+        "affected": [{
+            "package": {"ecosystem": "npm", "name": "lodash"},
+            "ranges": [{"type": "SEMVER", "events": [{"introduced": "0"}, {"fixed": "4.17.21"}]}],
+        }],
+    },
+    {
+        "id": "PYSEC-2021-1",
+        "summary": "SQL injection in Django",
+        "severity": [{"type": "CVSS_V3", "score": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"}],
+        "affected": [{
+            "package": {"ecosystem": "PyPI", "name": "Django"},
+            "ranges": [{"type": "ECOSYSTEM", "events": [
+                {"introduced": "2.2"}, {"fixed": "2.2.24"},
+                {"introduced": "3.0"}, {"last_affected": "3.1.12"},
+            ]}],
+            "versions": ["1.11.29"],
+        }],
+    },
+    {
+        "id": "GHSA-withdrawn",
+        "withdrawn": "2022-01-01T00:00:00Z",
+        "affected": [{
+            "package": {"ecosystem": "npm", "name": "lodash"},
+            "ranges": [{"type": "SEMVER", "events": [{"introduced": "0"}]}],
+        }],
+    },
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """已導入測試通告的通告庫"""
+    dump = tmp_path / "all.zip"
+    with zipfile.ZipFile(dump, "w") as archive:
+        for advisory in ADVISORIES:
+            archive.writestr(f"{advisory['id']}.json", json.dumps(advisory))
+    advisory_store = AdvisoryStore(str(tmp_path / "advisories.sqlite3"))
+    assert advisory_store.ingest([dump]) == 3
+    yield advisory_store
+    advisory_store.close()
+
+
+class TestVersionKeys:
+    """版本排序測試"""
+
+    def test_semver_order(self):
+        """測試 SemVer 排序"""
+        versions = ["1.0.0-alpha", "1.0.0-alpha.1", "1.0.0-beta.2", "1.0.0-beta.11", "1.0.0-rc.1", "1.0.0", "1.0.1", "v1.10.0"]
+        assert sorted(versions, key=semver_key) == versions
+
+    def test_pep440_order(self):
+        """測試 PEP 440 排序"""
+        versions = ["1.0.dev1", "1.0a1", "1.0b2", "1.0rc1", "1.0", "1.0.post1", "1.0.1", "1!0.1"]
+        assert sorted(versions, key=pep440_key) == versions
+        assert pep440_key("2.2") == pep440_key("2.2.0")
+
+    def test_maven_order(self):
+        """測試 Maven 排序"""
+        versions = ["1.0-alpha-1", "1.0-beta", "1.0-rc1", "1.0-SNAPSHOT", "1.0", "1.0-sp1", "1.0.1", "1.2"]
+        assert sorted(versions, key=maven_key) == versions
+        assert maven_key("1.0") == maven_key("1.0.0.GA")
+
+    def test_cvss3_base_score(self):
+        """測試 CVSS v3 基礎分數"""
+        assert cvss3_base_score("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H") == 9.8
+        assert cvss3_base_score("CVSS:3.1/AV:N/AC:L/PR:N/UI:R/S:C/C:L/I:L/A:N") == 6.1
+        assert cvss3_base_score("CVSS:4.0/AV:N") is None
+
+
+class TestAdvisoryStore:
+    """通告庫匹配測試"""
+
+    def test_batched_match(self, store):
+        """測試批次匹配與區間邊界"""
+        results = store.match([
+            (Ecosystem.NPM, "lodash", "4.17.20"),
+            (Ecosystem.NPM, "lodash", "4.17.21"),
+            (Ecosystem.PIP, "django", "2.2.23"),
+            (Ecosystem.PIP, "django", "2.2.24"),
+            (Ecosystem.PIP, "Django", "3.1.12"),
+            (Ecosystem.PIP, "django", "3.1.13"),
+            (Ecosystem.PIP, "django", "1.11.29"),
+            (Ecosystem.GO, "unknown", "1.0.0"),
+        ])
+
+        assert [[v.id for v in found] for found in results] == [
+            ["GHSA-aaaa-bbbb-cccc"], [], ["PYSEC-2021-1"], [], ["PYSEC-2021-1"], [], ["PYSEC-2021-1"], [],
+        ]
+        lodash = results[0][0]
+        assert lodash.fixed_version == "4.17.21"
+        assert lodash.affected_versions == "<4.17.21"
+        assert results[2][0].severity == VulnerabilitySeverity.CRITICAL
+        assert results[2][0].cvss_score == 9.8
+        assert results[4][0].affected_versions == ">=3.0, <=3.1.12"
+
+    def test_scanner_uses_store(self, store):
+        """測試漏洞掃描器離線模式"""
+        scanner = VulnerabilityScanner(ScanConfig(sources=[]), advisory_store=store)
+        deps = [
+            Dependency(name="lodash", current_version="^4.17.15", ecosystem=Ecosystem.NPM),
+            Dependency(name="django", current_version="==3.0.5", ecosystem=Ecosystem.PIP),
+            Dependency(name="requests", current_version="2.31.0", ecosystem=Ecosystem.PIP),
+        ]
+
+        result = asyncio.run(scanner.scan(deps))
+
+        assert result.total_count == 2
+        assert result.critical_count == 1
+        assert result.high_count == 1
+        assert [d.has_vulnerability for d in deps] == [True, True, False]
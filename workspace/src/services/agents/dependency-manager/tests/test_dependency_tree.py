@@ -0,0 +1,125 @@
+"""
+共享子樹依賴樹測試
+Tests for the DAG-based DependencyTree
+"""
+
+import sys
+from pathlib import Path
+
+# 添加專案目錄到路徑（工具模組使用包內相對導入）
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.dependency import Dependency, Ecosystem
+from src.utils.dependency_tree import DependencyTree, RiskLevel, TreeNode
+
+
+def _dep(name: str, version: str = "1.0.0", **kwargs) -> Dependency:
+    return Dependency(name=name, current_version=version, ecosystem=Ecosystem.NPM, **kwargs)
+
+
+def _diamond_chain(levels: int) -> DependencyTree:
+    """每層兩個節點都依賴下一層兩個節點：展開後的樹大小為 2^levels"""
+    deps = [_dep("app")]
+    parent_map = {"app": ["l0-a", "l0-b"]}
+    for level in range(levels):
+        deps += [_dep(f"l{level}-a"), _dep(f"l{level}-b")]
+        children = [f"l{level + 1}-a", f"l{level + 1}-b"] if level + 1 < levels else ["leaf"]
+        parent_map[f"l{level}-a"] = children
+        parent_map[f"l{level}-b"] = children
+    deps.append(_dep("leaf", has_vulnerability=True, vulnerability_count=3))
+
+    tree = DependencyTree("diamond")
+    tree.build_tree(deps, parent_map)
+    return tree
+
+
+class TestSharedSubtrees:
+    """共享子樹測試"""
+
+    def test_nodes_interned_by_name_and_version(self):
+        """測試相同 (名稱, 版本) 只建立一個節點"""
+        tree = DependencyTree("test-project")
+        tree.build_tree(
+            [_dep("a"), _dep("b"), _dep("c"), _dep("shared"), _dep("shared"), _dep("shared", "2.0.0")],
+            {"a": ["b", "c"], "b": ["shared@1.0.0"], "c": ["shared@1.0.0", "shared@2.0.0"]}
+        )
+
+        assert len(tree._all_nodes) == 5
+        shared = tree._all_nodes["shared@1.0.0"]
+        assert [p.dependency.name for p in shared.parents] == ["b", "c"]
+        assert shared.depth == 2
+        assert [n.dependency.name for n in tree.root_nodes] == ["a"]
+        assert tree.root_nodes[0].get_descendants_count() == 5
+
+    def test_rollups_on_deep_diamonds(self):
+        """測試深層菱形依賴的彙總為線性時間"""
+        tree = _diamond_chain(60)
+        app = tree.root_nodes[0]
+
+        assert app.get_descendants_count() == sum(2 ** k for k in range(1, 61)) + 2 ** 60
+        assert app.has_vulnerable_descendants()
+        assert app.get_max_risk() == RiskLevel.CRITICAL
+        assert tree.get_statistics()["max_depth"] == 61
+
+        paths = tree.find_path_to_vulnerable(max_paths=5)
+        assert len(paths) == 5
+        assert all(path[0] == "app" and path[-1] == "leaf" and len(path) == 62 for path in paths)
+
+    def test_render_dedupes_shared_subtrees(self):
+        """測試渲染時共享子樹只展開一次"""
+        tree = _diamond_chain(30)
+
+        text = tree.render_text()
+        # 每層節點只展開一次，其餘出現均為 deduped：輸出行數線性於唯一套件數
+        assert text.count("(deduped)") == 2 * 29
+        assert len(text.splitlines()) == 2 + 2 * 30 + 2 * 29 + 2
+
+        tree_json = tree.render_json()["tree"][0]
+        deduped = tree_json["children"][1]["children"][0]
+        assert deduped["deduped"] is True and deduped["children"] == []
+
+    def test_cycles(self):
+        """測試循環依賴不會無限遞歸"""
+        tree = DependencyTree("cyclic")
+        tree.build_tree(
+            [_dep("app"), _dep("a"), _dep("b", has_vulnerability=True)],
+            {"app": ["a"], "a": ["b"], "b": ["a"]}
+        )
+        app, a, b = (tree._all_nodes[f"{name}@1.0.0"] for name in ("app", "a", "b"))
+
+        assert app.has_vulnerable_descendants()
+        assert b.has_vulnerable_descendants()
+        assert app.get_max_risk() == RiskLevel.HIGH
+        assert (app.get_descendants_count(), a.get_descendants_count()) == (2, 1)
+        assert tree.find_path_to_vulnerable() == [["app", "a", "b"]]
+        assert "(deduped)" in tree.render_text()
+
+    def test_cycle_members_share_external_subtrees(self):
+        """測試循環成員共享經由其他成員可達的外部子樹"""
+        tree = DependencyTree("cyclic")
+        tree.build_tree(
+            [_dep("root"), _dep("a"), _dep("b"), _dep("c"), _dep("e", has_vulnerability=True)],
+            {"root": ["a"], "a": ["b"], "b": ["a", "c"], "c": ["e"]}
+        )
+        root, a, b = (tree._all_nodes[f"{name}@1.0.0"] for name in ("root", "a", "b"))
+
+        assert (root.get_descendants_count(), root.get_height()) == (4, 4)
+        assert (a.get_descendants_count(), a.get_height()) == (3, 3)
+        assert (b.get_descendants_count(), b.get_height()) == (3, 3)
+        assert a.has_vulnerable_descendants()
+        assert a.get_max_risk() == RiskLevel.HIGH
+        assert tree.get_statistics()["max_depth"] == 4
+
+    def test_add_child_invalidates_ancestors(self):
+        """測試新增子節點後祖先的彙總重新計算"""
+        root = TreeNode(dependency=_dep("root"))
+        middle = TreeNode(dependency=_dep("middle"))
+        root.add_child(middle)
+        assert not root.has_vulnerable_descendants()
+        assert root.get_descendants_count() == 1
+
+        middle.add_child(TreeNode(dependency=_dep("bad", has_vulnerability=True), risk_level=RiskLevel.HIGH))
+
+        assert root.has_vulnerable_descendants()
+        assert root.get_descendants_count() == 2
+        assert root.get_max_risk() == RiskLevel.HIGH
@@ -0,0 +1,140 @@
+"""
+清單發現與解析快取測試
+Tests for manifest discovery and ManifestCache
+"""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加專案目錄到路徑（分析器使用包內相對導入）
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analyzers import (
+    GoAnalyzer,
+    ManifestCache,
+    NpmAnalyzer,
+    PipAnalyzer,
+    discover_manifests,
+    parse_manifests,
+)
+from src.engine import DependencyManager
+from src.models.dependency import Ecosystem
+
+ANALYZERS = {
+    Ecosystem.NPM: NpmAnalyzer(),
+    Ecosystem.PIP: PipAnalyzer(),
+    Ecosystem.GO: GoAnalyzer(),
+}
+
+
+@pytest.fixture
+def monorepo(tmp_path):
+    """包含多個子專案的倉庫"""
+    files = {
+        "package.json": {"dependencies": {"lodash": "^4.17.21"}},
+        "apps/web/package.json": {"dependencies": {"react": "18.2.0"}, "devDependencies": {"jest": "~29.0.0"}},
+        "apps/web/node_modules/react/package.json": {"dependencies": {"loose-envify": "1.4.0"}},
+        "apps/api/package.json": {"dependencies": {"express": "4.18.0"}},
+        "services/ml/requirements.txt": "numpy==1.26.0\nrequests>=2.31.0\n",
+        "services/ml/pyproject.toml": "[project]\ndependencies = [\"ignored==1.0\"]\n",
+        "services/ml/.venv/lib/requirements.txt": "ignored==1.0\n",
+        "services/gateway/go.mod": "module example.com/gateway\n\ngo 1.21\n\nrequire github.com/gin-gonic/gin v1.9.1\n",
+    }
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content if isinstance(content, str) else json.dumps(content))
+    return tmp_path
+
+
+class TestManifestDiscovery:
+    """清單發現測試"""
+
+    def test_discovers_every_project(self, monorepo):
+        """測試單次遍歷發現所有子專案的清單並跳過依賴目錄"""
+        found = discover_manifests(monorepo, ANALYZERS)
+
+        relative = {
+            ecosystem: [p.relative_to(monorepo).as_posix() for p in paths]
+            for ecosystem, paths in found.items()
+        }
+        assert relative == {
+            Ecosystem.NPM: ["package.json", "apps/api/package.json", "apps/web/package.json"],
+            Ecosystem.PIP: ["services/ml/requirements.txt"],
+            Ecosystem.GO: ["services/gateway/go.mod"],
+        }
+
+    def test_parallel_parse_matches_sequential(self, monorepo):
+        """測試進程池解析結果與逐個解析一致"""
+        found = discover_manifests(monorepo, ANALYZERS)
+
+        sequential = asyncio.run(parse_manifests(found, ANALYZERS, parallel=False))
+        pooled = asyncio.run(parse_manifests(found, ANALYZERS, max_workers=2, parallel_threshold=1))
+
+        assert sequential == pooled
+        assert [d.name for d in pooled[Ecosystem.PIP][monorepo / "services/ml/requirements.txt"]] == [
+            "numpy", "requests"
+        ]
+
+
+class TestManifestCache:
+    """解析快取測試"""
+
+    def test_only_changed_manifests_are_reparsed(self, monorepo, tmp_path):
+        """測試重新掃描只解析內容改變的清單"""
+        cache = ManifestCache(str(tmp_path / "cache" / "manifests.sqlite3"))
+        found = discover_manifests(monorepo, ANALYZERS)
+
+        asyncio.run(parse_manifests(found, ANALYZERS, cache=cache, parallel=False))
+        assert cache.stats() == {"entries": 5, "hits": 0, "misses": 5}
+
+        # 僅更新時間改變：內容雜湊相同，仍命中
+        web = monorepo / "apps/web/package.json"
+        os.utime(web, ns=(0, 0))
+        # 內容改變
+        api = monorepo / "apps/api/package.json"
+        api.write_text(json.dumps({"dependencies": {"express": "4.19.2", "cors": "2.8.5"}}))
+
+        parsed = asyncio.run(parse_manifests(found, ANALYZERS, cache=cache, parallel=False))
+
+        assert cache.hits == 4 and cache.misses == 6
+        assert [(d.name, d.current_version) for d in parsed[Ecosystem.NPM][api]] == [
+            ("express", "4.19.2"), ("cors", "2.8.5")
+        ]
+        assert [d.dep_type.value for d in parsed[Ecosystem.NPM][web]] == ["direct", "dev"]
+
+        # 刪除的清單從快取中移除
+        api.unlink()
+        remaining = discover_manifests(monorepo, ANALYZERS)
+        assert cache.prune(monorepo, [p for paths in remaining.values() for p in paths]) == 1
+        assert cache.stats()["entries"] == 4
+        cache.close()
+
+
+class TestDependencyManagerMonorepo:
+    """依賴管理器 monorepo 掃描測試"""
+
+    def test_analyze_project_covers_all_manifests(self, monorepo):
+        """測試 analyze_project 合併所有子專案的依賴"""
+        manager = DependencyManager()
+
+        analyses = asyncio.run(manager.analyze_project(str(monorepo)))
+
+        npm = analyses[Ecosystem.NPM]
+        assert npm.manifests == ["package.json", "apps/api/package.json", "apps/web/package.json"]
+        assert [(d.name, d.manifest) for d in npm.dependencies] == [
+            ("lodash", "package.json"),
+            ("express", "apps/api/package.json"),
+            ("react", "apps/web/package.json"),
+            ("jest", "apps/web/package.json"),
+        ]
+        assert analyses[Ecosystem.GO].total_count == 1
+
+        result = asyncio.run(manager.full_scan(str(monorepo)))
+        assert manager.get_summary(result)["total_dependencies"] == 7
+        assert manager._manifest_cache.hits == 5
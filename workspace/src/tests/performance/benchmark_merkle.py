@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: incremental RFC 6962 Merkle tree
+
+Appends leaves to merkle.MerkleTree in batches and reports:
+- append throughput (leaves/s) with node retention and frontier-only
+- memory held by the level arrays
+- root, inclusion proof and consistency proof latency at full size
+- the previous rebuild-on-build() cost, estimated on a small prefix
+
+Usage:
+    python benchmark_merkle.py --leaves 10000000 --batch 65536
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from merkle.merkle_foundation import MerkleTree
+
+
+def append_all(tree: MerkleTree, leaves: int, batch: int) -> float:
+    """Append leaves in batches, returning seconds"""
+    start = time.perf_counter()
+    for offset in range(0, leaves, batch):
+        count = min(batch, leaves - offset)
+        tree.add_raw_leaves([i.to_bytes(8, 'big') for i in range(offset, offset + count)])
+    return time.perf_counter() - start
+
+
+def legacy_build(leaves: List[bytes]) -> str:
+    """Previous implementation: rebuild every level from the leaves on build()"""
+    level = [hashlib.sha256(leaf).hexdigest() for leaf in leaves]
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha256((level[i] + level[i + 1]).encode()).hexdigest()
+                 for i in range(0, len(level), 2)]
+    return level[0]
+
+
+def timed(fn, repeat: int = 1000) -> float:
+    """Mean microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Merkle tree benchmark')
+    parser.add_argument('--leaves', type=int, default=10_000_000, help='Number of leaves')
+    parser.add_argument('--batch', type=int, default=65536, help='Leaves per add_raw_leaves call')
+    parser.add_argument('--legacy-leaves', type=int, default=100_000,
+                        help='Prefix size for the legacy rebuild estimate (0 skips)')
+    args = parser.parse_args()
+
+    frontier = MerkleTree(retain_nodes=False)
+    seconds = append_all(frontier, args.leaves, args.batch)
+    print(f'append frontier-only        {args.leaves:>11,} leaves {seconds:>8.2f} s '
+          f'{args.leaves / seconds:>12,.0f} leaves/s')
+
+    tree = MerkleTree()
+    seconds = append_all(tree, args.leaves, args.batch)
+    stored = sum(len(level) for level in tree._levels)
+    print(f'append retaining nodes      {args.leaves:>11,} leaves {seconds:>8.2f} s '
+          f'{args.leaves / seconds:>12,.0f} leaves/s   levels {stored / (1024 * 1024):,.0f} MB')
+    assert tree.root() == frontier.root()
+
+    n = len(tree)
+    old = n // 3 + 1
+    index = n // 2 + 7
+    print(f'root()                      {timed(tree.root):>10.1f} us')
+    print(f'inclusion_proof(n/2)        {timed(lambda: tree.inclusion_proof(index)):>10.1f} us '
+          f'({len(tree.inclusion_proof(index))} hashes)')
+    print(f'consistency_proof(n/3, n)   {timed(lambda: tree.consistency_proof(old)):>10.1f} us '
+          f'({len(tree.consistency_proof(old))} hashes)')
+    proof = tree.inclusion_proof(index)
+    leaf = bytes.fromhex(tree.leaf_hash(index))
+    root = tree.root()
+    print(f'verify_inclusion            '
+          f'{timed(lambda: MerkleTree.verify_inclusion(leaf, index, n, proof, root)):>10.1f} us')
+
+    if args.legacy_leaves:
+        leaves = [i.to_bytes(8, 'big') for i in range(min(args.legacy_leaves, n))]
+        start = time.perf_counter()
+        legacy_build(leaves)
+        seconds = time.perf_counter() - start
+        print(f'legacy build() per call     {len(leaves):>11,} leaves {seconds:>8.2f} s '
+              f'(~{seconds * n / len(leaves):,.1f} s per build() at {n:,} leaves)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -20,7 +20,9 @@ from slsa_provenance import (
     AttestationManager,
     AttestationType,
     ArtifactVerifier,
-    VerificationResult
+    VerificationResult,
+    DigestCache,
+    hash_file
 )
 from slsa_provenance.provenance_generator import SLSALevel, Subject
 
@@ -303,5 +305,66 @@ class TestArtifactVerifier:
         assert summary['total_artifacts'] == 2
 
 
+class TestDigestCache:
+    """Tests for streaming hashing and the stat-keyed digest cache"""
+    
+    def test_hash_file_multi_digest(self, tmp_path):
+        """Test one streaming pass matches hashlib for every algorithm"""
+        import hashlib
+        
+        content = os.urandom(300_000)
+        path = tmp_path / 'layer.tar'
+        path.write_bytes(content)
+        
+        digests = hash_file(str(path), ['sha256', 'sha512'], chunk_size=4096)
+        
+        assert digests == {
+            'sha256': hashlib.sha256(content).hexdigest(),
+            'sha512': hashlib.sha512(content).hexdigest()
+        }
+        
+    def test_cache_hit_and_invalidation(self, tmp_path):
+        """Test unchanged files are not rehashed and rewritten files are"""
+        path = tmp_path / 'app.tar.gz'
+        path.write_bytes(b'v1')
+        cache = DigestCache(str(tmp_path / 'digests.db'))
+        
+        first = cache.get_digests(str(path))
+        assert cache.get_digests(str(path)) == first
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+        
+        cache.get_digests(str(path), ['sha256', 'sha512'])
+        assert cache.stats.bytes_hashed == 4
+        
+        path.write_bytes(b'v2-changed')
+        assert cache.get_digests(str(path)) != first
+        assert cache.stats.misses == 3
+        cache.close()
+        
+        reopened = DigestCache(str(tmp_path / 'digests.db'))
+        reopened.get_digests(str(path))
+        assert (reopened.stats.hits, reopened.stats.misses) == (1, 0)
+        
+    def test_verify_artifact_batch_parallel(self, tmp_path):
+        """Test batch verification keeps input order across threads"""
+        import hashlib
+        
+        verifier = ArtifactVerifier(max_workers=4)
+        artifacts = []
+        for i in range(8):
+            path = tmp_path / f'artifact-{i}.bin'
+            path.write_bytes(f'artifact {i}'.encode() * 1000)
+            artifacts.append({
+                'path': str(path),
+                'digest': {'sha256': hashlib.sha256(path.read_bytes()).hexdigest()}
+            })
+            
+        results = verifier.verify_artifact_batch(artifacts)
+        
+        assert [r.artifact.name for r in results] == [f'artifact-{i}.bin' for i in range(8)]
+        assert all(r.integrity_status.value == 'verified' for r in results)
+        assert verifier.digest_cache.stats.misses == 8
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,98 @@
+"""
+Unit Tests for Anomaly Detector
+異常檢測器單元測試
+
+Tests for the ring-buffer MetricWindow and the batch ingestion path in
+core/safety/anomaly_detector.py
+"""
+
+from __future__ import annotations
+
+import random
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.safety.anomaly_detector import AnomalyDetector, AnomalyType, MetricWindow
+
+
+def test_window_moments_match_statistics() -> None:
+    """Incremental moments agree with a full recomputation after wraparound."""
+    rng = random.Random(7)
+    window = MetricWindow(max_size=50)
+    values = [rng.gauss(10, 3) for _ in range(537)]
+    for value in values:
+        window.add(value)
+
+    assert len(window) == 50
+    assert window.values.tolist() == values[-50:]
+    assert window.mean == pytest.approx(statistics.mean(values[-50:]))
+    assert window.std_dev == pytest.approx(statistics.stdev(values[-50:]))
+
+
+def test_window_extend_and_recent() -> None:
+    """Bulk extend keeps order and time queries use the timestamps."""
+    now = datetime.now()
+    window = MetricWindow(max_size=10)
+    window.extend(
+        list(range(15)),
+        [now - timedelta(seconds=15 - i) for i in range(15)],
+    )
+
+    assert window.values.tolist() == list(range(5, 15))
+    assert window.get_recent(3.5, now=now) == [12.0, 13.0, 14.0]
+    # Evicted samples are still counted through the time buckets
+    assert window.count_recent(60, now=now) >= 15
+
+
+@pytest.mark.asyncio
+async def test_record_many_matches_sequential_record() -> None:
+    """The vectorized path raises the same alerts as per-value recording."""
+    rng = random.Random(11)
+    values = [rng.gauss(10, 3) for _ in range(500)]
+
+    sequential = AnomalyDetector()
+    batched = AnomalyDetector()
+    for detector in (sequential, batched):
+        detector.add_metric("latency", threshold=18, min_threshold=1, window_size=100)
+
+    expected = [await sequential.record("latency", v) for v in values]
+    expected = [a for a in expected if a is not None]
+    alerts = await batched.record_many("latency", values)
+
+    assert [a.description for a in alerts] == [a.description for a in expected]
+    assert batched.get_metrics_summary()["latency"]["mean"] == pytest.approx(
+        sequential.get_metrics_summary()["latency"]["mean"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_record_many_rate_limit() -> None:
+    """Rate limits are evaluated per sample within a batch."""
+    detector = AnomalyDetector()
+    detector.add_metric("requests", rate_limit=(5, 60))
+    now = datetime.now()
+
+    alerts = await detector.record_many(
+        "requests", [1.0] * 8, [now + timedelta(milliseconds=i) for i in range(8)]
+    )
+
+    assert len(alerts) == 3
+    assert all(a.type == AnomalyType.RATE_ANOMALY for a in alerts)
+    assert alerts[0].details["rate_count"] == 6
+
+
+@pytest.mark.asyncio
+async def test_record_many_sorts_out_of_order_timestamps() -> None:
+    """Out-of-order samples are evaluated and alerted in timestamp order."""
+    detector = AnomalyDetector()
+    detector.add_metric("latency", threshold=10)
+    now = datetime.now()
+
+    alerts = await detector.record_many(
+        "latency", [20.0, 1.0, 30.0], [now + timedelta(seconds=s) for s in (2, 0, 1)]
+    )
+
+    assert [a.details["value"] for a in alerts] == [30.0, 20.0]
+    assert detector._metrics["latency"].values.tolist() == [1.0, 30.0, 20.0]
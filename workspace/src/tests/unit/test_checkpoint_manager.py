@@ -0,0 +1,98 @@
+"""
+Unit Tests for Checkpoint Manager
+檢查點管理器單元測試
+
+Tests for the content-addressed, delta-chained CheckpointManager in
+core/safety/checkpoint_manager.py
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+import pytest
+
+from core.safety.checkpoint_manager import CheckpointManager
+
+
+@pytest.fixture
+def manager() -> CheckpointManager:
+    mgr = CheckpointManager(retention_count=20, snapshot_interval=4)
+    yield mgr
+    mgr.close()
+
+
+def _state() -> dict[str, Any]:
+    return {
+        "phase": 0,
+        "config": {"retries": 3, "targets": ["a", "b"]},
+        "results": {f"task{i}": {"output": list(range(20))} for i in range(50)},
+    }
+
+
+def test_restore_every_checkpoint_in_chain(manager: CheckpointManager) -> None:
+    state = _state()
+    snapshots = []
+    for phase in range(10):
+        state["phase"] = phase
+        state["results"][f"task{phase}"]["output"] = [phase]
+        if phase == 5:
+            del state["config"]["targets"]
+        cid = manager.create_checkpoint("exec", f"phase{phase}", state)
+        snapshots.append((cid, copy.deepcopy(state)))
+
+    manager.wait_for_compression()
+    for cid, expected in snapshots:
+        assert manager.restore_checkpoint(cid) == expected
+
+    chain = [cp.chain_length for cp in manager._checkpoints["exec"]]
+    assert max(chain) < manager.snapshot_interval
+
+
+def test_unchanged_chunks_are_shared(manager: CheckpointManager) -> None:
+    state = _state()
+    manager.create_checkpoint("exec", "phase0", state)
+    chunks_after_first = len(manager._store)
+
+    state["phase"] = 1
+    cid = manager.create_checkpoint("exec", "phase1", state)
+
+    assert len(manager._store) == chunks_after_first + 1
+    assert len(manager._index[cid].delta) == 1
+
+
+def test_retention_rebases_dependents() -> None:
+    manager = CheckpointManager(retention_count=2, snapshot_interval=10)
+    state = _state()
+    ids = []
+    for phase in range(5):
+        state["phase"] = phase
+        ids.append(manager.create_checkpoint("exec", f"phase{phase}", state))
+    manager.close()
+
+    remaining = manager._checkpoints["exec"]
+    assert len(remaining) == 2
+    assert remaining[0].is_snapshot
+    assert manager.restore_checkpoint(ids[-1])["phase"] == 4
+    assert manager.restore_checkpoint(ids[-2])["phase"] == 3
+
+
+def test_open_checkpoint_is_lazy(manager: CheckpointManager) -> None:
+    cid = manager.create_checkpoint("exec", "phase0", _state())
+
+    lazy_state = manager.open_checkpoint(cid)
+
+    assert lazy_state["config"]["retries"] == 3
+    assert list(lazy_state._cache) == ["config"]
+
+
+def test_corrupted_chunk_fails_verification(manager: CheckpointManager) -> None:
+    cid = manager.create_checkpoint("exec", "phase0", _state())
+    manager.wait_for_compression()
+    digest = next(iter(manager._index[cid].delta.values()))
+    manager._store._chunks[digest].data = b"tampered"
+    manager._store._chunks[digest].compressed = False
+
+    with pytest.raises(ValueError, match="Checksum verification failed"):
+        manager.restore_checkpoint(cid)
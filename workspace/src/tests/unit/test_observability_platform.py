@@ -0,0 +1,132 @@
+"""
+Unit Tests for Observability Platform
+可觀測性平台單元測試
+
+Tests for the time- and trace-indexed telemetry store in
+core/monitoring/observability_platform.py
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from core.monitoring import ObservabilityPlatform
+from core.monitoring.observability_platform import (
+    CorrelationEngine,
+    LogEntry,
+    LogLevel,
+    TelemetryIndex,
+    TimeIndex,
+    TraceSpan,
+    TraceStatus,
+)
+
+START = datetime(2026, 1, 1)
+
+
+def test_time_index_range_handles_out_of_order_and_eviction() -> None:
+    index: TimeIndex[int] = TimeIndex(lambda m: START + timedelta(minutes=m), max_size=5)
+    evicted = []
+    for minute in [0, 1, 2, 4, 3, 5, 6]:
+        evicted.extend(index.add(minute))
+
+    assert evicted == [0, 1]
+    assert list(index) == [2, 3, 4, 5, 6]
+    assert index.range(START + timedelta(minutes=3), START + timedelta(minutes=5)) == [3, 4, 5]
+    assert index.since(START + timedelta(minutes=6)) == [6]
+
+
+def test_indexed_correlation_matches_scan() -> None:
+    platform = ObservabilityPlatform()
+    logs, spans = [], []
+    for i in range(200):
+        ts = START + timedelta(seconds=30 * i)
+        log = LogEntry(message=f"m{i}", service=f"svc{i % 3}", timestamp=ts, trace_id=f"t{i % 7}")
+        span = TraceSpan(trace_id=f"t{i % 7}", service=f"svc{i % 4}", start_time=ts)
+        platform.telemetry_index.add_log(log)
+        platform.telemetry_index.add_span(span)
+        logs.append(log)
+        spans.append(span)
+
+    reference = START + timedelta(minutes=50)
+    indexed = platform.correlate_by_time(reference, ['cpu'])
+    scanned = CorrelationEngine().correlate_by_time(logs, spans, ['cpu'], reference)
+    assert indexed.related_logs == scanned.related_logs
+    assert indexed.related_traces == scanned.related_traces
+    assert sorted(indexed.related_services) == sorted(scanned.related_services)
+
+    by_trace = platform.correlate_by_trace('t3')
+    scanned = CorrelationEngine().correlate_by_trace(logs, spans, 't3')
+    assert by_trace.related_logs == scanned.related_logs
+    assert by_trace.related_traces == scanned.related_traces
+
+
+def test_service_health_rollups_follow_span_status_and_eviction() -> None:
+    platform = ObservabilityPlatform(max_retention=4)
+    for i in range(4):
+        root = platform.start_trace(f"req{i}", service="api")
+        platform.end_span(root, TraceStatus.ERROR if i == 0 else TraceStatus.OK)
+
+    health = platform.get_service_health("api")
+    assert health['total_traces'] == 4
+    assert health['error_traces'] == 1
+
+    # The errored trace is the oldest span and is evicted by the next one
+    root = platform.start_trace("req4", service="api")
+    platform.end_span(root)
+    health = platform.get_service_health("api")
+    assert health['total_traces'] == 4
+    assert health['error_traces'] == 0
+    assert health['status'] == "HEALTHY"
+
+    for _ in range(6):
+        platform.log_error("boom", service="db")
+    assert platform.get_service_health("db")['error_logs'] == 4
+    summary = platform.get_platform_summary()
+    assert summary['total_logs'] == 4
+    assert summary['total_traces'] == 4
+    assert sorted(summary['services']) == ['api', 'db']
+
+
+def test_slow_traces_use_root_duration_index() -> None:
+    platform = ObservabilityPlatform()
+    durations = {}
+    for i, ms in enumerate([50, 1500, 300, 2500]):
+        root = platform.start_trace(f"op{i}", service="api")
+        child = platform.start_span(root.trace_id, root.span_id, "child", service="db")
+        platform.end_span(child)
+        platform.end_span(root)
+        root.end_time = root.start_time + timedelta(milliseconds=ms)
+        # Re-index with the adjusted duration
+        platform.telemetry_index.span_ended(root, TraceStatus.OK)
+        durations[root.trace_id] = ms
+
+    slow = platform.get_slow_traces(threshold_ms=1000)
+    assert [durations[s.trace_id] for s in slow] == [2500, 1500]
+    assert all(s.parent_span_id is None for s in slow)
+    assert len(platform.get_trace(slow[0].trace_id)) == 2
+    assert platform.get_logs(level=LogLevel.ERROR) == []
+
+
+def test_duration_index_handles_ties_reindexing_and_eviction() -> None:
+    index = TelemetryIndex(max_spans=4)
+    roots = []
+    for i, ms in enumerate([500, 500, 2000, 500]):
+        root = TraceSpan(trace_id=f"t{i}", span_id=f"s{i}", service="api",
+                         start_time=START + timedelta(seconds=i))
+        index.add_span(root)
+        root.end_time = root.start_time + timedelta(milliseconds=ms)
+        index.span_ended(root, TraceStatus.UNSET)
+        roots.append(root)
+
+    assert [s.span_id for s in index.slow_roots(100)] == ["s2", "s3", "s1", "s0"]
+
+    # Re-ending a root moves it instead of duplicating it
+    roots[1].end_time = roots[1].start_time + timedelta(milliseconds=3000)
+    index.span_ended(roots[1], TraceStatus.OK)
+    assert [s.span_id for s in index.slow_roots(100)] == ["s1", "s2", "s3", "s0"]
+
+    # Evicting the oldest span drops its entry
+    index.add_span(TraceSpan(trace_id="t4", span_id="s4", start_time=START + timedelta(seconds=4)))
+    assert [s.span_id for s in index.slow_roots(100)] == ["s1", "s2", "s3"]
+    assert [s.span_id for s in index.slow_roots(1000)] == ["s1", "s2"]
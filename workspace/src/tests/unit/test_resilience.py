@@ -0,0 +1,190 @@
+"""
+Unit Tests for Resilience Guards
+韌性防護單元測試
+
+Tests for the sliding-window circuit breaker, adaptive concurrency limiter
+and retry budget in core/safety, and their integration with ToolCallRouter
+and ConnectorManager
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from core.engine.connector_manager import ConnectionStatus, ConnectorManager, ConnectorType
+from core.engine.function_calling import ToolCallRouter
+from core.safety import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerOpenError,
+    ConcurrencyLimiterConfig,
+    LimitAlgorithm,
+    ResilienceConfig,
+    ResilienceRegistry,
+    RetryBudget,
+    SlidingWindow,
+    SlidingWindowType,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_sliding_windows_track_rates() -> None:
+    window = SlidingWindow(size=4)
+    for failed in [True, True, False, False, False, False]:
+        window.record(failed=failed, slow=False)
+    assert window.snapshot().total_calls == 4
+    assert window.snapshot().failure_rate == 0.0
+
+    clock = FakeClock()
+    timed = SlidingWindow(size=10, window_type=SlidingWindowType.TIME_BASED, clock=clock)
+    timed.record(failed=True, slow=True)
+    clock.now += 5
+    timed.record(failed=False, slow=False)
+    assert timed.snapshot().failure_rate == 0.5
+    clock.now += 6
+    snapshot = timed.snapshot()
+    assert snapshot.total_calls == 1
+    assert snapshot.failed_calls == 0
+    assert snapshot.slow_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_breaker_ignores_isolated_failures_but_trips_on_rate() -> None:
+    breaker = CircuitBreaker(CircuitBreakerConfig(
+        failure_threshold=2,
+        failure_rate_threshold=0.5,
+        sliding_window_size=20,
+        minimum_number_of_calls=10,
+    ))
+
+    def fail() -> None:
+        raise RuntimeError("boom")
+
+    # 1 failure in 5 calls stays well below the rate, however long it runs
+    for i in range(40):
+        if i % 5 == 0:
+            with pytest.raises(RuntimeError):
+                await breaker.execute(fail)
+        else:
+            await breaker.execute(lambda: "ok")
+    assert breaker.is_closed
+
+    for _ in range(10):
+        with pytest.raises(RuntimeError):
+            await breaker.execute(fail)
+        if breaker.is_open:
+            break
+    assert breaker.is_open
+    with pytest.raises(CircuitBreakerOpenError):
+        await breaker.execute(lambda: "ok")
+
+
+@pytest.mark.asyncio
+async def test_breaker_does_not_serialize_calls() -> None:
+    breaker = CircuitBreaker(CircuitBreakerConfig())
+    running = 0
+    peak = 0
+
+    async def op() -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await asyncio.gather(*(breaker.execute(op) for _ in range(10)))
+    assert peak == 10
+
+
+def _saturate(limiter: AdaptiveConcurrencyLimiter, latency: float, rounds: int) -> None:
+    for _ in range(rounds):
+        admitted = 0
+        while limiter.try_acquire():
+            admitted += 1
+        for _ in range(admitted):
+            limiter.release(latency)
+
+
+def test_concurrency_limit_shrinks_as_latency_rises() -> None:
+    for algorithm in LimitAlgorithm:
+        limiter = AdaptiveConcurrencyLimiter(ConcurrencyLimiterConfig(
+            algorithm=algorithm, initial_limit=20, latency_threshold=0.1
+        ))
+
+        _saturate(limiter, 0.01, 20)
+        healthy = limiter.limit
+        _saturate(limiter, 0.5, 3)
+        assert limiter.limit < healthy, algorithm
+        assert limiter.limit >= limiter.config.min_limit
+
+
+def test_retry_budget_caps_retries_to_ratio() -> None:
+    clock = FakeClock()
+    budget = RetryBudget(retry_ratio=0.1, min_retries_per_second=0, ttl_seconds=10, clock=clock)
+    for _ in range(100):
+        budget.record_request()
+    granted = sum(budget.try_acquire_retry() for _ in range(100))
+    assert granted == 10
+
+    clock.now += 11
+    assert budget.try_acquire_retry() is False
+    assert budget.get_stats()['rejected_retries'] == 91
+
+
+@pytest.mark.asyncio
+async def test_router_and_connector_export_per_target_metrics() -> None:
+    registry = ResilienceRegistry(ResilienceConfig(max_retries=1, retry_delay=0))
+    router = ToolCallRouter(resilience=registry)
+    attempts = []
+
+    async def flaky(tool_name, _params):
+        attempts.append(tool_name)
+        if len(attempts) == 1:
+            raise ConnectionError("transient")
+        return "done"
+
+    router.register_executor("api", flaky)
+    router.set_default_executor("api")
+    assert await router.execute("fetch", {}) == "done"
+    assert len(attempts) == 2
+    assert router.get_executor_metrics()['api']['calls_failed'] == 1
+
+    manager = ConnectorManager(resilience=registry)
+    connector = await manager.create("db", ConnectorType.CUSTOM)
+    connector.status = ConnectionStatus.CONNECTED
+    registry.get("db").breaker.trip()
+    result = await manager.execute("db", "query", {})
+    assert result['rejected'] == "circuit_open"
+
+    exposition = registry.render_prometheus()
+    assert 'resilience_circuit_state{target="db"} 2' in exposition
+    assert 'resilience_concurrency_limit{target="api"}' in exposition
+
+
+@pytest.mark.asyncio
+async def test_only_transient_errors_are_retried_by_default() -> None:
+    attempts = []
+
+    def broken() -> None:
+        attempts.append(1)
+        raise ValueError("bad request")
+
+    registry = ResilienceRegistry(ResilienceConfig(max_retries=2, retry_delay=0))
+    with pytest.raises(ValueError):
+        await registry.call("api", broken)
+    assert len(attempts) == 1
+
+    registry.configure("api", ResilienceConfig(max_retries=2, retry_delay=0, retry_on=(Exception,)))
+    with pytest.raises(ValueError):
+        await registry.call("api", broken)
+    assert len(attempts) == 4
@@ -0,0 +1,136 @@
+"""
+Unit Tests for Smart Anomaly Detector
+智能異常檢測器單元測試
+
+Tests for the streaming, seasonality-aware baselines in
+core/monitoring/smart_anomaly_detector.py and streaming_baselines.py
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.monitoring import AnomalyDetectionStrategy, SmartAnomalyDetector
+from core.monitoring.streaming_baselines import CusumDetector, P2Quantile
+
+START = datetime(2026, 1, 1)
+
+
+def _daily_cycle(minute: int, rng: random.Random) -> float:
+    return 100 + 50 * math.sin(2 * math.pi * (minute % 1440) / 1440) + rng.gauss(0, 3)
+
+
+def _false_positives(detector: SmartAnomalyDetector, days: int = 5) -> int:
+    rng = random.Random(3)
+    flagged = 0
+    for minute in range(1440 * days):
+        result = detector.detect(
+            'traffic', _daily_cycle(minute, rng), timestamp=START + timedelta(minutes=minute)
+        )
+        if minute > 1440 * 2 and result is not None:
+            flagged += 1
+    return flagged
+
+
+def test_p2_quantile_tracks_median() -> None:
+    rng = random.Random(1)
+    sketch = P2Quantile(0.5)
+    for _ in range(5000):
+        sketch.update(rng.gauss(10, 2))
+    assert sketch.value == pytest.approx(10, abs=0.2)
+
+
+def test_cusum_flags_level_shift() -> None:
+    cusum = CusumDetector(drift=0.5, threshold=5.0)
+    assert all(cusum.update(0.1) is None for _ in range(50))
+    shifts = [cusum.update(2.0) for _ in range(10)]
+    assert "up" in shifts
+
+
+def test_seasonal_baseline_follows_daily_cycle() -> None:
+    """Peaks of a daily cycle are expected, not anomalous."""
+    detector = SmartAnomalyDetector(sensitivity=3.0, min_samples=50)
+
+    assert _false_positives(detector) < 1440 * 3 * 0.01
+
+    # The same peak value is far outside the flat window baseline
+    flat = detector.get_baseline('traffic')
+    assert (150 - flat['mean']) / flat['stdev'] > 1.2
+
+
+def test_state_round_trip_without_replay() -> None:
+    detector = SmartAnomalyDetector(sensitivity=3.0, min_samples=50)
+    _false_positives(detector, days=3)
+
+    restored = SmartAnomalyDetector(sensitivity=3.0, min_samples=50)
+    restored.import_state(json.loads(json.dumps(detector.export_state())))
+
+    peak = START + timedelta(days=3, hours=6)
+    assert restored.detect_statistical('traffic', 148.0, peak) is None
+    assert restored.detect_statistical('traffic', 100.0, peak) is not None
+
+
+def test_detect_batch_scores_array() -> None:
+    detector = SmartAnomalyDetector(min_samples=10)
+    detector.learn_baseline('latency', [100, 105, 98, 102, 101, 99, 103, 100, 97, 104])
+
+    values = [101.0, 99.0, 500.0, 102.0]
+    anomalies = detector.detect_batch(
+        'latency', values, strategy=AnomalyDetectionStrategy.STATISTICAL
+    )
+
+    assert [a.context['index'] for a in anomalies] == [2]
+    assert len(detector._history['latency']) == 14
+
+
+def test_detect_batch_scores_against_pre_batch_baseline() -> None:
+    detector = SmartAnomalyDetector(sensitivity=3.0, min_samples=50)
+    _false_positives(detector, days=3)
+    frozen = copy.deepcopy(detector)
+
+    rng = random.Random(7)
+    timestamps = [START + timedelta(days=3, minutes=m) for m in range(0, 600, 10)]
+    values = [_daily_cycle(m, rng) for m in range(0, 600, 10)]
+    values[5] += 40
+    values[30] -= 40
+    anomalies = detector.detect_batch(
+        'traffic', values, timestamps, strategy=AnomalyDetectionStrategy.STATISTICAL
+    )
+
+    expected = [
+        i for i, (value, ts) in enumerate(zip(values, timestamps, strict=True))
+        if frozen.detect_statistical('traffic', value, ts) is not None
+    ]
+    assert [a.context['index'] for a in anomalies] == expected
+    assert 5 in expected and 30 in expected
+
+
+def test_detect_batch_hybrid_reports_change_points_like_detect() -> None:
+    rng = random.Random(5)
+    # Extremes widen the threshold baseline; high sensitivity mutes z-scores,
+    # leaving CUSUM change points as the only hybrid signal
+    detector = SmartAnomalyDetector(sensitivity=50.0, min_samples=20)
+    training = [-1000.0, 1000.0] + [100 + rng.gauss(0, 1) for _ in range(200)]
+    for minute, value in enumerate(training):
+        detector.add_sample('level', value, START + timedelta(minutes=minute))
+    looped = copy.deepcopy(detector)
+
+    values = [100 + rng.gauss(0, 1) for _ in range(15)] + [110 + rng.gauss(0, 1) for _ in range(15)]
+    timestamps = [START + timedelta(minutes=len(training) + i) for i in range(len(values))]
+    single = [
+        looped.detect('level', value, AnomalyDetectionStrategy.HYBRID, ts)
+        for value, ts in zip(values, timestamps, strict=True)
+    ]
+    batch = detector.detect_batch(
+        'level', values, timestamps, strategy=AnomalyDetectionStrategy.HYBRID
+    )
+
+    assert [a.context['index'] for a in batch] == [i for i, a in enumerate(single) if a]
+    assert any(a.context['index'] >= 15 for a in batch)
+    assert all(a.description == 'Change point: level level shifted up' for a in batch)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the SQLite EventStore write path.
+
+Appends events from concurrent producers and compares:
+- legacy: one synchronous INSERT + commit per event inside the event loop
+  (rollback journal, synchronous=FULL), as the store used to do
+- group commit: EventStore writer thread, WAL + synchronous=NORMAL,
+  executemany batches resolved through futures
+
+Also reports the worst event-loop stall seen by a 1 ms ticker task.
+
+Usage:
+    python benchmark_event_store.py --events 20000 --producers 50
+"""
+
+import argparse
+import asyncio
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from services.event_store import EventStore, StoredEvent, _INSERT_EVENT, _event_row
+
+
+class LegacyStore:
+    """Per-event INSERT + commit on the event loop thread."""
+
+    def __init__(self, db_path: Path):
+        self._connection = sqlite3.connect(str(db_path))
+        self._connection.execute("""
+            CREATE TABLE events (
+                event_id TEXT PRIMARY KEY,
+                event_type TEXT NOT NULL,
+                aggregate_type TEXT NOT NULL,
+                aggregate_id TEXT NOT NULL,
+                sequence_number INTEGER NOT NULL,
+                timestamp TEXT NOT NULL,
+                trace_id TEXT,
+                data TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                UNIQUE(aggregate_id, sequence_number)
+            )
+        """)
+        self._lock = asyncio.Lock()
+        self._sequence_numbers = {}
+
+    async def append(self, event_type, aggregate_type, aggregate_id, data, trace_id=None, metadata=None):
+        async with self._lock:
+            key = f"{aggregate_type}:{aggregate_id}"
+            sequence = self._sequence_numbers.get(key, 0) + 1
+            self._sequence_numbers[key] = sequence
+            event = StoredEvent(
+                event_type=event_type,
+                aggregate_type=aggregate_type,
+                aggregate_id=aggregate_id,
+                sequence_number=sequence,
+                trace_id=trace_id,
+                data=data,
+                metadata=metadata or {},
+            )
+            self._connection.execute(_INSERT_EVENT, _event_row(event))
+            self._connection.commit()
+        return event
+
+    async def close(self):
+        self._connection.close()
+
+
+async def measure_stalls(stop: asyncio.Event, stalls: list):
+    """Track the longest gap between 1 ms ticks."""
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        stalls.append(now - last - 0.001)
+        last = now
+
+
+async def run(store, events: int, producers: int) -> None:
+    per_producer = events // producers
+
+    async def producer(index: int):
+        for i in range(per_producer):
+            await store.append(
+                event_type="IncidentUpdated",
+                aggregate_type="incident",
+                aggregate_id=f"inc-{index}",
+                data={"step": i, "payload": "x" * 200},
+                trace_id=f"trace-{index}",
+            )
+
+    stop = asyncio.Event()
+    stalls: list = []
+    ticker = asyncio.create_task(measure_stalls(stop, stalls))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(producer(p) for p in range(producers)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+    written = per_producer * producers
+    print(f"  {written} events in {elapsed * 1000:.1f} ms ({written / elapsed:.0f} events/s), "
+          f"max loop stall {max(stalls, default=0) * 1000:.1f} ms")
+
+
+async def main_async(args) -> int:
+    with tempfile.TemporaryDirectory(prefix="event-store-bench-", dir=args.dir) as tmp:
+        print("legacy (commit per event):")
+        legacy = LegacyStore(Path(tmp) / "legacy.db")
+        await run(legacy, args.events, args.producers)
+        await legacy.close()
+
+        print("group commit:")
+        store = EventStore(
+            store_type="sqlite",
+            db_path=str(Path(tmp) / "group.db"),
+            batch_size=args.batch_size,
+            flush_interval_ms=args.flush_interval_ms,
+        )
+        await store.initialize()
+        await run(store, args.events, args.producers)
+        stats = await store.get_statistics()
+        print(f"  {stats['total_events']} events committed in {stats['write_batches']} batches")
+        await store.close()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="EventStore SQLite write benchmark")
+    parser.add_argument("--events", type=int, default=20000, help="Total events to append")
+    parser.add_argument("--producers", type=int, default=50, help="Concurrent producer tasks")
+    parser.add_argument("--batch-size", type=int, default=500, help="Group commit batch size")
+    parser.add_argument("--flush-interval-ms", type=float, default=0.0, help="Group commit linger")
+    parser.add_argument("--dir", default=None, help="Directory for the database files")
+    args = parser.parse_args()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
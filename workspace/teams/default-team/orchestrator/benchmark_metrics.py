@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the per-request metrics overhead.
+
+Compares the previous metric primitives (asyncio.Lock per observation,
+linear bucket walk, exposition rebuilt on every scrape) with utils.metrics:
+- record_request: counter increment + histogram observation per request
+- scrape: /metrics/prometheus with many series after a few updates
+
+Usage:
+    python benchmark_metrics.py --requests 200000 --series 5000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.metrics import Histogram, MetricsCollector
+
+
+class LegacyCounter:
+    """Previous Counter: lock per increment, exposition rebuilt per scrape."""
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self._values = defaultdict(float)
+        self._lock = asyncio.Lock()
+
+    async def inc(self, value=1.0, **label_values):
+        key = tuple(label_values.get(l, "") for l in self.labels)
+        async with self._lock:
+            self._values[key] += value
+
+    def prometheus_format(self):
+        lines = [f"# HELP {self.name} x", f"# TYPE {self.name} counter"]
+        for key, value in self._values.items():
+            label_str = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, key))
+            lines.append(f"{self.name}{{{label_str}}} {value}")
+        return "\n".join(lines)
+
+
+class LegacyHistogram:
+    """Previous Histogram: lock per observation, linear bucket walk."""
+
+    def __init__(self, name, labels, buckets=Histogram.DEFAULT_BUCKETS):
+        self.name = name
+        self.labels = labels
+        self.buckets = buckets
+        self._buckets = defaultdict(lambda: {b: 0 for b in self.buckets})
+        self._sums = defaultdict(float)
+        self._counts = defaultdict(int)
+        self._lock = asyncio.Lock()
+
+    async def observe(self, value, **label_values):
+        key = tuple(label_values.get(l, "") for l in self.labels)
+        async with self._lock:
+            self._sums[key] += value
+            self._counts[key] += 1
+            for bucket in self.buckets:
+                if value <= bucket:
+                    self._buckets[key][bucket] += 1
+
+    def prometheus_format(self):
+        lines = [f"# HELP {self.name} x", f"# TYPE {self.name} histogram"]
+        for key in set(list(self._sums.keys()) + list(self._counts.keys())):
+            label_str = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, key))
+            cumulative = 0
+            for bucket in sorted(self.buckets):
+                cumulative += self._buckets[key].get(bucket, 0)
+                lines.append(f'{self.name}_bucket{{{label_str},le="{bucket}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label_str},le="+Inf"}} {self._counts[key]}')
+            lines.append(f"{self.name}_sum{{{label_str}}} {self._sums[key]}")
+            lines.append(f"{self.name}_count{{{label_str}}} {self._counts[key]}")
+        return "\n".join(lines)
+
+
+class LegacyCollector:
+    def __init__(self):
+        self.requests_total = LegacyCounter("superagent_requests_total", ["method", "endpoint", "status"])
+        self.request_duration = LegacyHistogram("superagent_request_duration_seconds", ["method", "endpoint"])
+
+    async def record_request(self, method, endpoint, status, duration):
+        await self.requests_total.inc(method=method, endpoint=endpoint, status=status)
+        await self.request_duration.observe(duration, method=method, endpoint=endpoint)
+
+    def prometheus_format(self):
+        return "\n\n".join([self.requests_total.prometheus_format(),
+                            self.request_duration.prometheus_format()]) + "\n"
+
+
+async def per_request(collector, requests, endpoints, seed):
+    rng = random.Random(seed)
+    calls = [(f"/api/v1/items/{rng.randrange(endpoints)}", rng.expovariate(20)) for _ in range(requests)]
+    start = time.perf_counter()
+    for endpoint, duration in calls:
+        await collector.record_request("GET", endpoint, "200", duration)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def scrape(collector, series, scrapes, updates):
+    for i in range(series):
+        await collector.record_request("GET", f"/api/v1/items/{i}", "200", 0.01)
+    collector.prometheus_format()
+    start = time.perf_counter()
+    for n in range(scrapes):
+        for i in range(updates):
+            await collector.record_request("GET", f"/api/v1/items/{(n * updates + i) % series}", "200", 0.02)
+        collector.prometheus_format()
+    return (time.perf_counter() - start) / scrapes * 1000
+
+
+async def main_async(args) -> int:
+    for label, factory in (("legacy", LegacyCollector), ("lock-free", MetricsCollector)):
+        overhead = await per_request(factory(), args.requests, args.endpoints, args.seed)
+        scrape_ms = await scrape(factory(), args.series, args.scrapes, args.updates)
+        print(f"{label:<10} record_request {overhead:>6.2f} us/request   "
+              f"scrape ({args.series} series, {args.updates} updated) {scrape_ms:>8.2f} ms")
+
+    legacy, current = LegacyCollector(), MetricsCollector()
+    for collector in (legacy, current):
+        await collector.record_request("GET", "/api", "200", 0.3)
+    expected = legacy.prometheus_format()
+    assert all(line in current.prometheus_format() for line in expected.splitlines()
+               if "_bucket" not in line and not line.startswith("#")), "exposition differs"
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Metrics per-request overhead benchmark")
+    parser.add_argument("--requests", type=int, default=200000, help="Requests to record")
+    parser.add_argument("--endpoints", type=int, default=50, help="Distinct endpoints for record_request")
+    parser.add_argument("--series", type=int, default=5000, help="Endpoints populated before scraping")
+    parser.add_argument("--scrapes", type=int, default=50, help="Scrapes to time")
+    parser.add_argument("--updates", type=int, default=10, help="Requests recorded between scrapes")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -71,6 +71,9 @@ class Settings(BaseSettings):
     event_store_type: str = Field(default="memory", env="EVENT_STORE_TYPE")  # memory, sqlite, postgres
     event_store_path: str = Field(default="/var/lib/super-agent/events.db", env="EVENT_STORE_PATH")
     event_store_max_events: int = Field(default=100000, env="EVENT_STORE_MAX_EVENTS")
+    event_store_batch_size: int = Field(default=500, env="EVENT_STORE_BATCH_SIZE")
+    event_store_flush_interval_ms: float = Field(default=0.0, env="EVENT_STORE_FLUSH_INTERVAL_MS")
+    event_store_write_queue_size: int = Field(default=10000, env="EVENT_STORE_WRITE_QUEUE_SIZE")
 
     # Audit Trail
     audit_enabled: bool = Field(default=True, env="AUDIT_ENABLED")
@@ -83,7 +83,14 @@ class SuperAgentCore:
         self.metrics = MetricsCollector()
         self.circuit_breakers = CircuitBreakerRegistry()
         self.backpressure = BackpressureController()
-        self.event_store = EventStore()
+        self.event_store = EventStore(
+            store_type=settings.event_store_type,
+            db_path=settings.event_store_path,
+            max_events=settings.event_store_max_events,
+            batch_size=settings.event_store_batch_size,
+            flush_interval_ms=settings.event_store_flush_interval_ms,
+            write_queue_size=settings.event_store_write_queue_size,
+        )
         self.audit_trail = AuditTrail()
         self.agent_registry = AgentRegistry()
         self.agent_client = AgentClient(registry=self.agent_registry)
@@ -116,6 +123,7 @@ class SuperAgentCore:
         logger.info("Shutting down SuperAgent services...")
         await self.agent_client.close()
         await self.circuit_breakers.reset_all()
+        await self.event_store.close()
         logger.info("SuperAgent services shut down")
         
     def generate_trace_id(self) -> str:
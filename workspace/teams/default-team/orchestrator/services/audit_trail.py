@@ -17,7 +17,8 @@ from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 import uuid
 import asyncio
-from collections import deque
+
+from .indexed_log import IndexedLog
 
 
 class AuditAction(str, Enum):
@@ -134,7 +135,17 @@ class AuditTrail:
     """
 
     def __init__(self, max_entries: int = 100000, persistence_path: Optional[str] = None):
-        self._entries: deque[AuditEntry] = deque(maxlen=max_entries)
+        # Actions are keyed by value: str-Enum members do not hash like their value
+        self._entries: IndexedLog[AuditEntry] = IndexedLog(
+            {
+                "action": lambda e: e.action.value,
+                "actor": lambda e: e.actor,
+                "trace_id": lambda e: e.trace_id,
+                "incident_id": lambda e: e.incident_id,
+            },
+            timestamp=lambda e: e.timestamp,
+            max_entries=max_entries,
+        )
         self._lock = asyncio.Lock()
         self._persistence_path = persistence_path
         self._entry_count = 0
@@ -263,27 +274,26 @@ class AuditTrail:
         success_only: Optional[bool] = None,
     ) -> List[AuditEntry]:
         """Query audit entries with filters."""
-        async with self._lock:
-            filtered = list(self._entries)
-
-        # Apply filters
-        if action is not None:
-            filtered = [e for e in filtered if e.action == action]
-        if actor is not None:
-            filtered = [e for e in filtered if e.actor == actor]
-        if trace_id is not None:
-            filtered = [e for e in filtered if e.trace_id == trace_id]
-        if incident_id is not None:
-            filtered = [e for e in filtered if e.incident_id == incident_id]
-        if start_time is not None:
-            filtered = [e for e in filtered if e.timestamp >= start_time]
-        if end_time is not None:
-            filtered = [e for e in filtered if e.timestamp <= end_time]
+        # The index lookup never awaits, so it reads a consistent snapshot
+        # without taking the lock
+        predicate = None
         if success_only is not None:
-            filtered = [e for e in filtered if e.success == success_only]
-
-        # Apply pagination
-        return filtered[offset:offset + limit]
+            def predicate(e: AuditEntry) -> bool:
+                return e.success == success_only
+
+        return self._entries.query(
+            equals={
+                "action": getattr(action, "value", action),
+                "actor": actor,
+                "trace_id": trace_id,
+                "incident_id": incident_id,
+            },
+            start_time=start_time,
+            end_time=end_time,
+            predicate=predicate,
+            offset=offset,
+            limit=limit,
+        )
 
     async def get_incident_audit(self, incident_id: str) -> List[AuditEntry]:
         """Get all audit entries for an incident."""
@@ -295,8 +305,7 @@ class AuditTrail:
 
     async def verify_integrity(self) -> Dict[str, Any]:
         """Verify integrity of all entries."""
-        async with self._lock:
-            entries = list(self._entries)
+        entries = self._entries.snapshot()
 
         valid_count = 0
         invalid_count = 0
@@ -320,22 +329,14 @@ class AuditTrail:
 
     async def get_statistics(self) -> Dict[str, Any]:
         """Get audit trail statistics."""
-        async with self._lock:
-            entries = list(self._entries)
+        entries = self._entries.snapshot()
 
         if not entries:
             return {"total_entries": 0, "actions": {}}
 
-        action_counts: Dict[str, int] = {}
-        success_count = 0
-        failure_count = 0
-
-        for entry in entries:
-            action_counts[entry.action.value] = action_counts.get(entry.action.value, 0) + 1
-            if entry.success:
-                success_count += 1
-            else:
-                failure_count += 1
+        action_counts = self._entries.counts("action")
+        success_count = sum(1 for entry in entries if entry.success)
+        failure_count = len(entries) - success_count
 
         return {
             "total_entries": len(entries),
@@ -350,8 +351,7 @@ class AuditTrail:
     async def export_json(self, entries: Optional[List[AuditEntry]] = None) -> str:
         """Export entries to JSON."""
         if entries is None:
-            async with self._lock:
-                entries = list(self._entries)
+            entries = self._entries.snapshot()
 
         return json.dumps([e.to_dict() for e in entries], indent=2)
 
@@ -7,17 +7,24 @@ Provides persistent storage for events with:
 - Event sourcing support
 - Snapshot capabilities
 - Query and replay
+- Group-commit writes for the SQLite backend (WAL, batched transactions)
 """
 
+import contextlib
 import json
+import queue
 import sqlite3
 import asyncio
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from pydantic import BaseModel, Field
 import uuid
 from pathlib import Path
 
+from .indexed_log import IndexedLog
+
 
 class StoredEvent(BaseModel):
     """Event stored in the event store."""
@@ -53,6 +60,151 @@ class StoredEvent(BaseModel):
         }
 
 
+_INSERT_EVENT = """
+    INSERT INTO events (
+        event_id, event_type, aggregate_type, aggregate_id,
+        sequence_number, timestamp, trace_id, data, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _event_row(event: StoredEvent) -> Tuple[Any, ...]:
+    """Column values of an event for _INSERT_EVENT."""
+    return (
+        event.event_id,
+        event.event_type,
+        event.aggregate_type,
+        event.aggregate_id,
+        event.sequence_number,
+        event.timestamp,
+        event.trace_id,
+        json.dumps(event.data),
+        json.dumps(event.metadata),
+    )
+
+
+class _GroupCommitWriter:
+    """
+    Dedicated writer thread for the SQLite backend.
+
+    Appends are serialized on the caller's side, so events that cannot be
+    encoded fail there, and queued together with a future. The thread drains the queue
+    in batches of up to batch_size events, inserts each batch with
+    executemany in a single transaction and resolves the futures once the
+    transaction is committed. Events queued while a commit is in progress
+    form the next batch; flush_interval_ms > 0 additionally waits up to that
+    long for a batch to fill.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        batch_size: int,
+        flush_interval_ms: float,
+        queue_size: int,
+    ):
+        self._connection = connection
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_ms / 1000
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.batches = 0
+        self.events_written = 0
+
+        self._thread = threading.Thread(target=self._run, name="event-store-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Number of queued events not yet picked up by the writer."""
+        return self._queue.qsize()
+
+    async def submit(self, event: StoredEvent) -> asyncio.Future:
+        """
+        Queue an event; the returned future resolves once it is committed.
+
+        A failed write sets the future's exception, so the caller must await
+        the future or consume the exception in a done-callback.
+        """
+        row = _event_row(event)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        item = (row, event, future, loop)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # Backpressure: wait for room without blocking the event loop
+            await loop.run_in_executor(None, self._queue.put, item)
+        return future
+
+    def close(self) -> None:
+        """Flush queued events, stop the thread and close the connection (blocking)."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._connection.close()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size:
+                try:
+                    timeout = deadline - time.monotonic()
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(
+        self,
+        batch: List[Tuple[Tuple[Any, ...], StoredEvent, asyncio.Future, asyncio.AbstractEventLoop]],
+    ) -> None:
+        rows = [row for row, _, _, _ in batch]
+        errors: List[Optional[Exception]] = [None] * len(batch)
+        try:
+            with self._connection:
+                self._connection.executemany(_INSERT_EVENT, rows)
+        except Exception:
+            # Retry one by one so a single bad event does not fail its batch;
+            # any error only fails that event's future, never the thread
+            for i, row in enumerate(rows):
+                try:
+                    with self._connection:
+                        self._connection.execute(_INSERT_EVENT, row)
+                except Exception as e:
+                    errors[i] = e
+
+        self.batches += 1
+        self.events_written += errors.count(None)
+
+        by_loop: Dict[asyncio.AbstractEventLoop, List[Tuple[asyncio.Future, Any, Optional[Exception]]]] = {}
+        for (_, event, future, loop), error in zip(batch, errors, strict=True):
+            by_loop.setdefault(loop, []).append((future, event, error))
+        for loop, results in by_loop.items():
+            # RuntimeError: event loop already closed
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(self._settle, results)
+
+    @staticmethod
+    def _settle(results: List[Tuple[asyncio.Future, Any, Optional[Exception]]]) -> None:
+        for future, event, error in results:
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(event)
+            else:
+                future.set_exception(error)
+
+
 class EventStore:
     """
     Event store with support for memory and SQLite backends.
@@ -62,6 +214,9 @@ class EventStore:
     - Query by aggregate
     - Event replay
     - Snapshot creation
+
+    With the SQLite backend, writes go through a group-commit writer thread
+    and reads through a separate read-only connection.
     """
 
     def __init__(
@@ -69,18 +224,34 @@ class EventStore:
         store_type: str = "memory",
         db_path: Optional[str] = None,
         max_events: int = 100000,
+        batch_size: int = 500,
+        flush_interval_ms: float = 0.0,
+        write_queue_size: int = 10000,
     ):
         self._store_type = store_type
         self._db_path = db_path
         self._max_events = max_events
+        self._batch_size = batch_size
+        self._flush_interval_ms = flush_interval_ms
+        self._write_queue_size = write_queue_size
         self._lock = asyncio.Lock()
 
-        # In-memory storage
-        self._events: List[StoredEvent] = []
+        # In-memory storage, indexed by the fields get_events filters on
+        self._events: IndexedLog[StoredEvent] = IndexedLog(
+            {
+                "aggregate_type": lambda e: e.aggregate_type,
+                "aggregate_id": lambda e: e.aggregate_id,
+                "event_type": lambda e: e.event_type,
+                "trace_id": lambda e: e.trace_id,
+            },
+            timestamp=lambda e: e.timestamp,
+            max_entries=max_events,
+        )
         self._sequence_numbers: Dict[str, int] = {}  # aggregate_id -> last sequence
 
-        # SQLite connection (lazy init)
+        # SQLite read-only connection and group-commit writer (lazy init)
         self._connection: Optional[sqlite3.Connection] = None
+        self._writer: Optional[_GroupCommitWriter] = None
 
         # Event handlers
         self._handlers: Dict[str, List[Callable]] = {}
@@ -95,8 +266,11 @@ class EventStore:
         path = Path(self._db_path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        self._connection = sqlite3.connect(str(path), check_same_thread=False)
-        cursor = self._connection.cursor()
+        # The write connection is handed over to the writer thread
+        connection = sqlite3.connect(str(path), check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        cursor = connection.cursor()
 
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS events (
@@ -113,22 +287,47 @@ class EventStore:
             )
         """)
 
+        # Composite indexes matching the get_events query shapes; each
+        # equality prefix is followed by the ORDER BY / range column
+        cursor.execute("DROP INDEX IF EXISTS idx_aggregate")
+        cursor.execute("DROP INDEX IF EXISTS idx_trace")
+
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_aggregate
-            ON events(aggregate_type, aggregate_id)
+            CREATE INDEX IF NOT EXISTS idx_aggregate_timestamp
+            ON events(aggregate_type, aggregate_id, timestamp)
         """)
 
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_timestamp
-            ON events(timestamp)
+            CREATE INDEX IF NOT EXISTS idx_aggregate_sequence
+            ON events(aggregate_type, aggregate_id, sequence_number)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trace_timestamp
+            ON events(trace_id, timestamp)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_event_type_timestamp
+            ON events(event_type, timestamp)
         """)
 
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trace
-            ON events(trace_id)
+            CREATE INDEX IF NOT EXISTS idx_timestamp
+            ON events(timestamp)
         """)
 
-        self._connection.commit()
+        connection.commit()
+
+        self._writer = _GroupCommitWriter(
+            connection,
+            batch_size=self._batch_size,
+            flush_interval_ms=self._flush_interval_ms,
+            queue_size=self._write_queue_size,
+        )
+        self._connection = sqlite3.connect(
+            f"{path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
 
     async def append(
         self,
@@ -139,7 +338,39 @@ class EventStore:
         trace_id: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> StoredEvent:
-        """Append an event to the store."""
+        """
+        Append an event to the store.
+
+        With the SQLite backend this returns once the event's batch has been
+        committed; use submit() to queue several events before waiting.
+        """
+        future = await self.submit(
+            event_type=event_type,
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            data=data,
+            trace_id=trace_id,
+            metadata=metadata,
+        )
+        return await future
+
+    async def submit(
+        self,
+        event_type: str,
+        aggregate_type: str,
+        aggregate_id: str,
+        data: Dict[str, Any],
+        trace_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> "asyncio.Future[StoredEvent]":
+        """
+        Queue an event and return a future for it.
+
+        The future resolves to the stored event once it is durable and its
+        handlers have run, or raises if the write failed. Await it, or attach
+        a done-callback that calls future.exception(); otherwise a failed
+        write is only reported by asyncio as "exception was never retrieved".
+        """
         async with self._lock:
             # Get next sequence number
             key = f"{aggregate_type}:{aggregate_id}"
@@ -156,46 +387,23 @@ class EventStore:
                 metadata=metadata or {},
             )
 
-            if self._store_type == "sqlite" and self._connection:
-                await self._append_sqlite(event)
+            if self._store_type == "sqlite" and self._writer:
+                # Queued under the lock so sequence numbers commit in order
+                durable = await self._writer.submit(event)
             else:
+                # Bounded by max_events; the oldest events are evicted
                 self._events.append(event)
-                # Enforce max events for memory store
-                if len(self._events) > self._max_events:
-                    self._events = self._events[-self._max_events:]
+                durable = None
 
-        # Trigger handlers
-        await self._trigger_handlers(event)
+        return asyncio.ensure_future(self._complete(event, durable))
 
+    async def _complete(self, event: StoredEvent, durable: Optional[asyncio.Future]) -> StoredEvent:
+        """Wait for durability, then trigger handlers."""
+        if durable is not None:
+            await durable
+        await self._trigger_handlers(event)
         return event
 
-    async def _append_sqlite(self, event: StoredEvent) -> None:
-        """Append event to SQLite."""
-        if not self._connection:
-            return
-
-        cursor = self._connection.cursor()
-        cursor.execute(
-            """
-            INSERT INTO events (
-                event_id, event_type, aggregate_type, aggregate_id,
-                sequence_number, timestamp, trace_id, data, metadata
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                event.event_id,
-                event.event_type,
-                event.aggregate_type,
-                event.aggregate_id,
-                event.sequence_number,
-                event.timestamp,
-                event.trace_id,
-                json.dumps(event.data),
-                json.dumps(event.metadata),
-            ),
-        )
-        self._connection.commit()
-
     async def get_events(
         self,
         aggregate_type: Optional[str] = None,
@@ -215,28 +423,26 @@ class EventStore:
                 from_sequence, to_sequence, from_timestamp, to_timestamp, limit
             )
 
-        # In-memory query
-        async with self._lock:
-            result = list(self._events)
-
-        if aggregate_type:
-            result = [e for e in result if e.aggregate_type == aggregate_type]
-        if aggregate_id:
-            result = [e for e in result if e.aggregate_id == aggregate_id]
-        if event_type:
-            result = [e for e in result if e.event_type == event_type]
-        if trace_id:
-            result = [e for e in result if e.trace_id == trace_id]
-        if from_sequence:
-            result = [e for e in result if e.sequence_number >= from_sequence]
-        if to_sequence:
-            result = [e for e in result if e.sequence_number <= to_sequence]
-        if from_timestamp:
-            result = [e for e in result if e.timestamp >= from_timestamp]
-        if to_timestamp:
-            result = [e for e in result if e.timestamp <= to_timestamp]
-
-        return result[:limit]
+        # In-memory query: the index lookup never awaits, so it reads a
+        # consistent snapshot without taking the lock
+        predicate = None
+        if from_sequence or to_sequence:
+            def predicate(e: StoredEvent) -> bool:
+                return ((not from_sequence or e.sequence_number >= from_sequence)
+                        and (not to_sequence or e.sequence_number <= to_sequence))
+
+        return self._events.query(
+            equals={
+                "aggregate_type": aggregate_type or None,
+                "aggregate_id": aggregate_id or None,
+                "event_type": event_type or None,
+                "trace_id": trace_id or None,
+            },
+            start_time=from_timestamp or None,
+            end_time=to_timestamp or None,
+            predicate=predicate,
+            limit=limit,
+        )
 
     async def _query_sqlite(
         self,
@@ -365,24 +571,27 @@ class EventStore:
             )
             by_aggregate = dict(cursor.fetchall())
         else:
-            async with self._lock:
-                total = len(self._events)
-                by_type: Dict[str, int] = {}
-                by_aggregate: Dict[str, int] = {}
-                for e in self._events:
-                    by_type[e.event_type] = by_type.get(e.event_type, 0) + 1
-                    by_aggregate[e.aggregate_type] = by_aggregate.get(e.aggregate_type, 0) + 1
+            total = len(self._events)
+            by_type = self._events.counts("event_type")
+            by_aggregate = self._events.counts("aggregate_type")
 
-        return {
+        stats = {
             "total_events": total,
             "store_type": self._store_type,
             "events_by_type": by_type,
             "events_by_aggregate": by_aggregate,
             "aggregates_tracked": len(self._sequence_numbers),
         }
+        if self._writer:
+            stats["write_batches"] = self._writer.batches
+            stats["pending_writes"] = self._writer.pending
+        return stats
 
     async def close(self) -> None:
-        """Close the event store."""
+        """Flush pending writes and close the event store."""
+        if self._writer:
+            writer, self._writer = self._writer, None
+            await asyncio.get_running_loop().run_in_executor(None, writer.close)
         if self._connection:
             self._connection.close()
             self._connection = None
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Indexed append-only log for in-memory stores.
+
+Backs the in-memory EventStore and AuditTrail with:
+- Secondary hash indexes (field value -> ascending position list)
+- Timestamp-ordered lookups via bisect for range queries
+- Bounded retention with amortized O(1) eviction
+- Lazy, ordered query results (offset/limit cost O(offset + limit))
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+class IndexedLog(Generic[T]):
+    """
+    Append-only log with secondary indexes.
+
+    Every entry gets a monotonically increasing position. Indexes map a key
+    to the ascending list of positions holding it; evicted positions are
+    skipped by bisecting at the current base and trimmed in bulk once enough
+    entries have been evicted.
+
+    Queries never await, so within an asyncio event loop they observe a
+    consistent snapshot without taking the store's lock.
+    """
+
+    def __init__(
+        self,
+        indexes: Dict[str, Callable[[T], Optional[Hashable]]],
+        timestamp: Callable[[T], str],
+        max_entries: Optional[int] = None,
+    ):
+        self._key_funcs = indexes
+        self._timestamp = timestamp
+        self._max_entries = max_entries
+
+        # Live entries are _entries[_offset:]; entry i has position _base + i - _offset
+        self._entries: List[T] = []
+        self._timestamps: List[str] = []
+        self._offset = 0
+        self._base = 0
+        self._indexes: Dict[str, Dict[Hashable, List[int]]] = {name: {} for name in indexes}
+
+        # Timestamps are appended in order unless callers supply their own
+        self._time_ordered = True
+
+    def append(self, entry: T) -> None:
+        """Append an entry, evicting the oldest one beyond max_entries."""
+        position = self._base + len(self._entries) - self._offset
+        timestamp = self._timestamp(entry)
+        if self._timestamps and timestamp < self._timestamps[-1]:
+            self._time_ordered = False
+
+        self._entries.append(entry)
+        self._timestamps.append(timestamp)
+        for name, key_func in self._key_funcs.items():
+            key = key_func(entry)
+            if key is not None:
+                self._indexes[name].setdefault(key, []).append(position)
+
+        if self._max_entries is not None and len(self) > self._max_entries:
+            self._evict(len(self) - self._max_entries)
+
+    def _evict(self, count: int) -> None:
+        self._offset += count
+        self._base += count
+        # Compact once the dead prefix is as large as the live log
+        if self._offset >= max(len(self._entries) - self._offset, 1024):
+            del self._entries[:self._offset]
+            del self._timestamps[:self._offset]
+            self._offset = 0
+            self._compact_indexes()
+
+    def _compact_indexes(self) -> None:
+        base = self._base
+        for index in self._indexes.values():
+            for key in list(index):
+                positions = index[key]
+                start = bisect_left(positions, base)
+                if start == len(positions):
+                    del index[key]
+                elif start:
+                    del positions[:start]
+
+    def __len__(self) -> int:
+        return len(self._entries) - self._offset
+
+    def __iter__(self) -> Iterator[T]:
+        return islice(self._entries, self._offset, None)
+
+    def snapshot(self) -> List[T]:
+        """Copy of all live entries in insertion order."""
+        return self._entries[self._offset:]
+
+    def _live(self, positions: List[int]) -> range:
+        """Index range of live positions within a position list."""
+        return range(bisect_left(positions, self._base), len(positions))
+
+    def counts(self, name: str) -> Dict[Hashable, int]:
+        """Live entry count per key of an index."""
+        counts = {}
+        for key, positions in self._indexes[name].items():
+            live = len(self._live(positions))
+            if live:
+                counts[key] = live
+        return counts
+
+    def query(
+        self,
+        equals: Optional[Dict[str, Hashable]] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        predicate: Optional[Callable[[T], bool]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[T]:
+        """
+        Query entries in insertion order.
+
+        Args:
+            equals: index name -> required key (None values are ignored)
+            start_time: inclusive lower timestamp bound
+            end_time: inclusive upper timestamp bound
+            predicate: extra filter applied to candidate entries
+            offset: number of matching entries to skip
+            limit: maximum number of entries to return
+        """
+        stop = None if limit is None else offset + limit
+        return list(islice(self._matches(equals or {}, start_time, end_time, predicate), offset, stop))
+
+    def _matches(
+        self,
+        equals: Dict[str, Hashable],
+        start_time: Optional[str],
+        end_time: Optional[str],
+        predicate: Optional[Callable[[T], bool]],
+    ) -> Iterator[T]:
+        base = self._base
+        first = self._offset - base  # list index = position + first
+
+        # Live list-index bounds from the timestamp range
+        lo, hi = self._offset, len(self._entries)
+        time_checked = start_time is None and end_time is None
+        if not time_checked and self._time_ordered:
+            if start_time is not None:
+                lo = bisect_left(self._timestamps, start_time, lo, hi)
+            if end_time is not None:
+                hi = bisect_right(self._timestamps, end_time, lo, hi)
+            time_checked = True
+
+        # Drive iteration from the smallest candidate set
+        candidate_sets = []
+        for name, key in equals.items():
+            if key is None:
+                continue
+            positions = self._indexes[name].get(key)
+            if not positions:
+                return
+            live = range(
+                bisect_left(positions, lo - first),
+                bisect_left(positions, hi - first),
+            )
+            candidate_sets.append((len(live), name, key, positions, live))
+        candidate_sets.sort(key=lambda candidate: candidate[0])
+
+        checks: List[Callable[[T], bool]] = [
+            self._equals_check(name, key) for _, name, key, _, _ in candidate_sets[1:]
+        ]
+        if not time_checked:
+            checks.append(self._time_check(start_time, end_time))
+        if predicate is not None:
+            checks.append(predicate)
+
+        if not candidate_sets:
+            candidates: Iterable[T] = islice(self._entries, lo, hi)
+        else:
+            _, _, _, positions, live = candidate_sets[0]
+            entries = self._entries
+            candidates = (entries[positions[i] + first] for i in live)
+
+        for entry in candidates:
+            if all(check(entry) for check in checks):
+                yield entry
+
+    def _equals_check(self, name: str, key: Hashable) -> Callable[[T], bool]:
+        key_func = self._key_funcs[name]
+        return lambda entry: key_func(entry) == key
+
+    def _time_check(self, start_time: Optional[str], end_time: Optional[str]) -> Callable[[T], bool]:
+        timestamp = self._timestamp
+
+        def check(entry: T) -> bool:
+            value = timestamp(entry)
+            return (start_time is None or value >= start_time) and (end_time is None or value <= end_time)
+
+        return check
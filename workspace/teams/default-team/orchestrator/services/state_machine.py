@@ -51,6 +51,7 @@ class IncidentStateMachine:
         self._event_store = event_store
         self._audit_trail = audit_trail
         self._incidents: Dict[str, Incident] = {}
+        self._by_trace: Dict[str, str] = {}  # trace_id -> first incident_id
         self._lock = asyncio.Lock()
 
         # Transition hooks
@@ -85,6 +86,7 @@ class IncidentStateMachine:
 
         async with self._lock:
             self._incidents[incident.incident_id] = incident
+            self._by_trace.setdefault(trace_id, incident.incident_id)
 
         # Store event
         if self._event_store:
@@ -198,11 +200,8 @@ class IncidentStateMachine:
 
     async def find_by_trace_id(self, trace_id: str) -> Optional[Incident]:
         """Find incident by trace ID."""
-        async with self._lock:
-            for incident in self._incidents.values():
-                if incident.trace_id == trace_id:
-                    return incident
-            return None
+        incident_id = self._by_trace.get(trace_id)
+        return self._incidents.get(incident_id) if incident_id else None
 
     async def list_incidents(
         self,
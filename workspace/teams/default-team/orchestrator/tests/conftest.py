@@ -15,8 +15,6 @@ from httpx import AsyncClient
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from main import app, superagent_core
-
 
 @pytest.fixture(scope="session")
 def event_loop() -> Generator:
@@ -29,6 +27,9 @@ def event_loop() -> Generator:
 @pytest_asyncio.fixture
 async def async_client() -> AsyncGenerator[AsyncClient, None]:
     """Create an async HTTP client for testing the API."""
+    # Imported here so suites that do not use the app collect without it
+    from main import app
+
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
 
@@ -37,6 +38,9 @@ async def async_client() -> AsyncGenerator[AsyncClient, None]:
 async def initialized_core():
     """Get the SuperAgent core after initialization."""
     # Core is initialized via lifespan, but we need to ensure it's ready
+    import main
+
+    superagent_core = getattr(main, "superagent_core", None)
     if superagent_core is None:
         pytest.skip("SuperAgent core not initialized")
     return superagent_core
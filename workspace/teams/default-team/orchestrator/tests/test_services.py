@@ -12,21 +12,24 @@ Tests cover:
 
 import asyncio
 import os
+import sqlite3
 import sys
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Services use package-relative imports (..models, ..config), so import them
+# through the orchestrator package rather than as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from services.audit_trail import AuditTrail, AuditEntry, AuditAction
-from services.event_store import EventStore, StoredEvent
-from services.state_machine import IncidentStateMachine
-from services.consensus import ConsensusManager
-from services.agent_client import AgentClient, AgentRegistry
-from models.incidents import Incident, IncidentState
-from models.consensus import VoteType, ConsensusState
+from orchestrator.services.audit_trail import AuditTrail, AuditEntry, AuditAction
+from orchestrator.services.event_store import EventStore, StoredEvent
+from orchestrator.services.state_machine import IncidentStateMachine
+from orchestrator.services.consensus import ConsensusManager
+from orchestrator.services.agent_client import AgentClient, AgentRegistry
+from orchestrator.models.incidents import Incident, IncidentState
+from orchestrator.models.consensus import VoteType, ConsensusState
 
 
 class TestAuditTrail:
@@ -136,6 +139,47 @@ class TestAuditTrail:
         all_entries = await audit_trail.query()
         assert len(all_entries) <= 100
 
+    @pytest.mark.asyncio
+    async def test_get_entries_intersects_indexes(self, audit_trail):
+        """Test combined indexed filters, time range and pagination."""
+        for i in range(20):
+            await audit_trail.log(
+                action=AuditAction.INCIDENT_TRANSITIONED if i % 2 else AuditAction.MESSAGE_SENT,
+                actor=f"agent-{i % 3}",
+                incident_id=f"inc-{i % 4}",
+                success=i % 5 != 0,
+            )
+        entries = await audit_trail.get_entries(limit=1000)
+
+        results = await audit_trail.get_entries(
+            action=AuditAction.INCIDENT_TRANSITIONED,
+            incident_id="inc-1",
+            start_time=entries[3].timestamp,
+            success_only=True,
+            offset=1,
+            limit=2,
+        )
+        expected = [
+            e for e in entries[3:]
+            if e.action == AuditAction.INCIDENT_TRANSITIONED and e.incident_id == "inc-1" and e.success
+        ][1:3]
+        assert [e.audit_id for e in results] == [e.audit_id for e in expected]
+
+    @pytest.mark.asyncio
+    async def test_evicted_entries_leave_indexes(self, audit_trail):
+        """Test that entries beyond max_entries are no longer returned."""
+        for i in range(150):
+            await audit_trail.log(
+                action=AuditAction.MESSAGE_SENT,
+                actor=f"agent-{i}",
+                trace_id="trace-001",
+            )
+
+        assert await audit_trail.get_entries(actor="agent-0") == []
+        assert len(await audit_trail.get_trace_audit("trace-001")) == 100
+        stats = await audit_trail.get_statistics()
+        assert stats["actions"] == {AuditAction.MESSAGE_SENT.value: 100}
+
 
 class TestEventStore:
     """Tests for EventStore service."""
@@ -208,6 +252,105 @@ class TestEventStore:
         assert len(received_events) == 1
         assert received_events[0].event_type == "IncidentCreated"
 
+    @pytest.mark.asyncio
+    async def test_get_events_indexed_filters(self):
+        """Test indexed filters with sequence bounds and retention."""
+        event_store = EventStore(max_events=50)
+        for i in range(60):
+            await event_store.append(
+                event_type="Updated" if i % 2 else "Created",
+                aggregate_type="incident",
+                aggregate_id=f"inc-{i % 3}",
+                data={"i": i},
+                trace_id=f"trace-{i % 5}",
+            )
+
+        events = await event_store.get_events(
+            aggregate_type="incident",
+            aggregate_id="inc-1",
+            event_type="Updated",
+            from_sequence=8,
+        )
+        retained = await event_store.get_events()
+        assert [e.event_id for e in events] == [
+            e.event_id for e in retained
+            if e.aggregate_id == "inc-1" and e.event_type == "Updated" and e.sequence_number >= 8
+        ]
+        assert retained[0].data["i"] == 10
+
+        traced = await event_store.get_events(trace_id="trace-0")
+        assert await event_store.get_events(trace_id="trace-0", limit=3) == traced[:3]
+        stats = await event_store.get_statistics()
+        assert stats["total_events"] == 50
+        assert stats["events_by_type"] == {"Created": 25, "Updated": 25}
+
+    @pytest.mark.asyncio
+    async def test_sqlite_composite_indexes(self, tmp_path):
+        """Test that per-aggregate and per-trace queries use composite indexes."""
+        event_store = EventStore(store_type="sqlite", db_path=str(tmp_path / "events.db"))
+        await event_store.initialize()
+        await event_store.append("Created", "incident", "inc-001", {}, trace_id="trace-001")
+
+        cursor = event_store._connection.cursor()
+        cursor.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM events WHERE aggregate_type = ? AND aggregate_id = ? "
+            "ORDER BY timestamp ASC LIMIT ?",
+            ("incident", "inc-001", 10),
+        )
+        plan = " ".join(row[-1] for row in cursor.fetchall())
+        assert "idx_aggregate_timestamp" in plan
+        assert "TEMP B-TREE" not in plan
+
+        events = await event_store.get_events(trace_id="trace-001")
+        assert [e.aggregate_id for e in events] == ["inc-001"]
+        await event_store.close()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_group_commit(self, tmp_path):
+        """Test batched writes resolve futures on commit and isolate failures."""
+        db_path = str(tmp_path / "events.db")
+        event_store = EventStore(store_type="sqlite", db_path=db_path)
+        await event_store.initialize()
+
+        futures = [
+            await event_store.submit("Updated", "incident", f"inc-{i % 4}", {"i": i})
+            for i in range(100)
+        ]
+        events = await asyncio.gather(*futures)
+        assert [e.sequence_number for e in events[:8]] == [1, 1, 1, 1, 2, 2, 2, 2]
+        assert len(await event_store.get_events(limit=1000)) == 100
+        assert (await event_store.get_statistics())["write_batches"] <= 100
+        await event_store.close()
+
+        # A fresh store restarts sequence numbers, so this append conflicts
+        reopened = EventStore(store_type="sqlite", db_path=db_path)
+        await reopened.initialize()
+        conflicting = await reopened.submit("Updated", "incident", "inc-0", {})
+        accepted = await reopened.submit("Created", "incident", "inc-new", {})
+        with pytest.raises(sqlite3.IntegrityError):
+            await conflicting
+        assert (await accepted).aggregate_id == "inc-new"
+        assert len(reopened) == 101
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_unserializable_event(self, tmp_path):
+        """Test that unserializable data fails the append and not the writer."""
+        event_store = EventStore(store_type="sqlite", db_path=str(tmp_path / "events.db"))
+        await event_store.initialize()
+
+        with pytest.raises(TypeError):
+            await asyncio.wait_for(
+                event_store.append("Created", "incident", "inc-001", {"when": datetime.now()}),
+                timeout=2,
+            )
+        event = await asyncio.wait_for(
+            event_store.append("Created", "incident", "inc-002", {"ok": True}), timeout=2
+        )
+        assert event.aggregate_id == "inc-002"
+        assert len(await event_store.get_events()) == 1
+        await event_store.close()
+
 
 class TestIncidentStateMachine:
     """Tests for IncidentStateMachine service."""
@@ -157,6 +157,19 @@ class TestHistogram:
         assert buckets[1.0] == 0
         assert buckets[5.0] == 1
 
+    def test_prometheus_format_cumulative(self, histogram):
+        """Test buckets are cumulated in the exposition."""
+        series = histogram.labels_for("/api")
+        for value in (0.05, 0.3, 2.0, 7.0):
+            series.observe(value)
+
+        output = histogram.prometheus_format()
+        assert 'test_request_duration_seconds_bucket{endpoint="/api",le="0.1"} 1' in output
+        assert 'test_request_duration_seconds_bucket{endpoint="/api",le="1.0"} 2' in output
+        assert 'test_request_duration_seconds_bucket{endpoint="/api",le="5.0"} 3' in output
+        assert 'test_request_duration_seconds_bucket{endpoint="/api",le="+Inf"} 4' in output
+        assert 'test_request_duration_seconds_count{endpoint="/api"} 4' in output
+
 
 class TestMetricsCollector:
     """Tests for MetricsCollector."""
@@ -196,6 +209,23 @@ class TestMetricsCollector:
         assert "# HELP" in output
         assert "# TYPE" in output
 
+    @pytest.mark.asyncio
+    async def test_prometheus_format_cached(self, collector):
+        """Test the exposition is reused until a series changes."""
+        await collector.record_request("GET", "/api/health", "200", 0.05)
+        output = collector.prometheus_format()
+        assert collector.prometheus_format() is output
+
+        await collector.record_request("GET", "/api/health", "200", 0.05)
+        output = collector.prometheus_format()
+        assert 'superagent_requests_total{method="GET",endpoint="/api/health",status="200"} 2.0' in output
+        assert 'superagent_request_duration_seconds_count{method="GET",endpoint="/api/health"} 2' in output
+
+    def test_label_values_escaped(self, collector):
+        """Test label values are escaped in the exposition."""
+        collector.requests_total.labels_for("GET", '/a"b\\c', "200").inc()
+        assert 'endpoint="/a\\"b\\\\c"' in collector.prometheus_format()
+
 
 class TestCircuitBreaker:
     """Tests for CircuitBreaker."""
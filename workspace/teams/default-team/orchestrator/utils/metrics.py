@@ -6,117 +6,172 @@ Provides metrics collection and exposition compatible with Prometheus.
 """
 
 import time
+from bisect import bisect_left
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-from collections import defaultdict
-import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 
-class Counter:
-    """Prometheus-style counter metric."""
+def _escape_label_value(value: Any) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Series:
+    """Value of one label set; updates mark it for re-rendering."""
+
+    __slots__ = ("metric", "key", "label_str", "value", "text")
+
+    def __init__(self, metric: "_Metric", key: tuple, label_str: str):
+        self.metric = metric
+        self.key = key
+        self.label_str = label_str
+        self.value = 0.0
+        self.text = ""
+
+    def inc(self, value: float = 1.0) -> None:
+        """Increment the value."""
+        self.value += value
+        self.metric._dirty.add(self)
+
+    def dec(self, value: float = 1.0) -> None:
+        """Decrement the value."""
+        self.value -= value
+        self.metric._dirty.add(self)
+
+    def set(self, value: float) -> None:
+        """Set the value."""
+        self.value = value
+        self.metric._dirty.add(self)
+
+
+class _HistogramSeries:
+    """Per-bucket counts of one label set; cumulated at scrape time."""
+
+    __slots__ = ("metric", "key", "label_str", "counts", "sum", "count", "text")
+
+    def __init__(self, metric: "Histogram", key: tuple, label_str: str):
+        self.metric = metric
+        self.key = key
+        self.label_str = label_str
+        self.counts = [0] * (len(metric._bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.text = ""
+
+    def observe(self, value: float) -> None:
+        """Observe a value."""
+        self.counts[bisect_left(self.metric._bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.metric._dirty.add(self)
+
+
+class _Metric:
+    """
+    Base for label-keyed metrics.
+
+    Updates are plain attribute writes: the service runs on a single event
+    loop and no update awaits, so no lock is needed. Each label set is
+    interned once into a series object holding its pre-rendered label
+    string. The Prometheus exposition is cached and only the series updated
+    since the last scrape are re-rendered.
+    """
+
+    TYPE = "untyped"
 
     def __init__(self, name: str, description: str, labels: Optional[List[str]] = None):
         self.name = name
         self.description = description
         self.labels = labels or []
-        self._values: Dict[tuple, float] = defaultdict(float)
-        self._lock = asyncio.Lock()
-
-    async def inc(self, value: float = 1.0, **label_values) -> None:
-        """Increment the counter."""
-        key = self._make_key(label_values)
-        async with self._lock:
-            self._values[key] += value
+        self._blank = ("",) * len(self.labels)
+        self._series: Dict[tuple, Any] = {}
+        self._dirty: Set[Any] = set()
+        self._header = f"# HELP {name} {description}\n# TYPE {name} {self.TYPE}"
+        self._text: Optional[str] = None
+
+    def labels_for(self, *values: str, **label_values: str) -> Any:
+        """
+        Series for a label set, given positionally or by name.
+
+        Callers on hot paths can keep the returned series and update it
+        directly.
+        """
+        key = values if values else self._make_key(label_values)
+        series = self._series.get(key)
+        if series is None:
+            label_str = ",".join(
+                f'{label}="{_escape_label_value(value)}"' for label, value in zip(self.labels, key)
+            )
+            series = self._series[key] = self._new_series(key, label_str)
+            self._dirty.add(series)
+        return series
 
     def _make_key(self, label_values: Dict[str, str]) -> tuple:
         """Create a key from label values."""
-        return tuple(label_values.get(l, "") for l in self.labels)
+        return tuple(map(label_values.get, self.labels, self._blank))
+
+    def _new_series(self, key: tuple, label_str: str) -> Any:
+        return _Series(self, key, label_str)
+
+    def _render(self, series: Any) -> str:
+        if series.label_str:
+            return f"{self.name}{{{series.label_str}}} {series.value}"
+        return f"{self.name} {series.value}"
 
     def collect(self) -> List[Dict[str, Any]]:
         """Collect all metric values."""
-        result = []
-        for key, value in self._values.items():
-            labels = dict(zip(self.labels, key))
-            result.append({
+        return [
+            {
                 "name": self.name,
-                "type": "counter",
-                "value": value,
-                "labels": labels,
-            })
-        return result
+                "type": self.TYPE,
+                "value": series.value,
+                "labels": dict(zip(self.labels, key)),
+            }
+            for key, series in self._series.items()
+        ]
 
     def prometheus_format(self) -> str:
         """Format metrics in Prometheus exposition format."""
-        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
-        for key, value in self._values.items():
-            labels = dict(zip(self.labels, key))
-            label_str = ",".join(f'{k}="{v}"' for k, v in labels.items()) if labels else ""
-            if label_str:
-                lines.append(f"{self.name}{{{label_str}}} {value}")
-            else:
-                lines.append(f"{self.name} {value}")
-        return "\n".join(lines)
+        if self._dirty or self._text is None:
+            for series in self._dirty:
+                series.text = self._render(series)
+            self._dirty.clear()
+            self._text = "\n".join([self._header, *(series.text for series in self._series.values())])
+        return self._text
+
 
+class Counter(_Metric):
+    """Prometheus-style counter metric."""
 
-class Gauge:
+    TYPE = "counter"
+
+    async def inc(self, value: float = 1.0, **label_values) -> None:
+        """Increment the counter."""
+        self.labels_for(**label_values).inc(value)
+
+
+class Gauge(_Metric):
     """Prometheus-style gauge metric."""
 
-    def __init__(self, name: str, description: str, labels: Optional[List[str]] = None):
-        self.name = name
-        self.description = description
-        self.labels = labels or []
-        self._values: Dict[tuple, float] = {}
-        self._lock = asyncio.Lock()
+    TYPE = "gauge"
 
     async def set(self, value: float, **label_values) -> None:
         """Set the gauge value."""
-        key = self._make_key(label_values)
-        async with self._lock:
-            self._values[key] = value
+        self.labels_for(**label_values).set(value)
 
     async def inc(self, value: float = 1.0, **label_values) -> None:
         """Increment the gauge."""
-        key = self._make_key(label_values)
-        async with self._lock:
-            self._values[key] = self._values.get(key, 0) + value
+        self.labels_for(**label_values).inc(value)
 
     async def dec(self, value: float = 1.0, **label_values) -> None:
         """Decrement the gauge."""
-        await self.inc(-value, **label_values)
-
-    def _make_key(self, label_values: Dict[str, str]) -> tuple:
-        """Create a key from label values."""
-        return tuple(label_values.get(l, "") for l in self.labels)
-
-    def collect(self) -> List[Dict[str, Any]]:
-        """Collect all metric values."""
-        result = []
-        for key, value in self._values.items():
-            labels = dict(zip(self.labels, key))
-            result.append({
-                "name": self.name,
-                "type": "gauge",
-                "value": value,
-                "labels": labels,
-            })
-        return result
-
-    def prometheus_format(self) -> str:
-        """Format metrics in Prometheus exposition format."""
-        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} gauge"]
-        for key, value in self._values.items():
-            labels = dict(zip(self.labels, key))
-            label_str = ",".join(f'{k}="{v}"' for k, v in labels.items()) if labels else ""
-            if label_str:
-                lines.append(f"{self.name}{{{label_str}}} {value}")
-            else:
-                lines.append(f"{self.name} {value}")
-        return "\n".join(lines)
+        self.labels_for(**label_values).dec(value)
 
 
-class Histogram:
+class Histogram(_Metric):
     """Prometheus-style histogram metric."""
 
+    TYPE = "histogram"
     DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
 
     def __init__(
@@ -126,72 +181,50 @@ class Histogram:
         labels: Optional[List[str]] = None,
         buckets: Optional[tuple] = None,
     ):
-        self.name = name
-        self.description = description
-        self.labels = labels or []
+        super().__init__(name, description, labels)
         self.buckets = buckets or self.DEFAULT_BUCKETS
-        self._buckets: Dict[tuple, Dict[float, int]] = defaultdict(lambda: {b: 0 for b in self.buckets})
-        self._sums: Dict[tuple, float] = defaultdict(float)
-        self._counts: Dict[tuple, int] = defaultdict(int)
-        self._lock = asyncio.Lock()
+        self._bounds: Tuple[float, ...] = tuple(sorted(self.buckets))
 
     async def observe(self, value: float, **label_values) -> None:
         """Observe a value."""
-        key = self._make_key(label_values)
-        async with self._lock:
-            self._sums[key] += value
-            self._counts[key] += 1
-            for bucket in self.buckets:
-                if value <= bucket:
-                    self._buckets[key][bucket] += 1
+        self.labels_for(**label_values).observe(value)
 
-    def _make_key(self, label_values: Dict[str, str]) -> tuple:
-        """Create a key from label values."""
-        return tuple(label_values.get(l, "") for l in self.labels)
+    def _new_series(self, key: tuple, label_str: str) -> _HistogramSeries:
+        return _HistogramSeries(self, key, label_str)
+
+    def _render(self, series: _HistogramSeries) -> str:
+        prefix = f"{series.label_str}," if series.label_str else ""
+        suffix = f"{{{series.label_str}}}" if series.label_str else ""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self._bounds, series.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series.count}')
+        lines.append(f"{self.name}_sum{suffix} {series.sum}")
+        lines.append(f"{self.name}_count{suffix} {series.count}")
+        return "\n".join(lines)
 
     def collect(self) -> List[Dict[str, Any]]:
-        """Collect all metric values."""
-        result = []
-        for key in set(list(self._sums.keys()) + list(self._counts.keys())):
-            labels = dict(zip(self.labels, key))
-            result.append({
+        """
+        Collect all metric values.
+
+        ``buckets`` maps every bound to the observations that fell into that
+        bucket alone, not the cumulative ``le`` counts of prometheus_format;
+        values above the largest bound only appear in ``count``. Earlier
+        versions returned cumulative counts for the bounds reached so far.
+        """
+        return [
+            {
                 "name": self.name,
-                "type": "histogram",
-                "sum": self._sums[key],
-                "count": self._counts[key],
-                "buckets": dict(self._buckets[key]),
-                "labels": labels,
-            })
-        return result
-
-    def prometheus_format(self) -> str:
-        """Format metrics in Prometheus exposition format."""
-        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
-
-        for key in set(list(self._sums.keys()) + list(self._counts.keys())):
-            labels = dict(zip(self.labels, key))
-            label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
-
-            # Buckets
-            cumulative = 0
-            for bucket in sorted(self.buckets):
-                cumulative += self._buckets[key].get(bucket, 0)
-                if label_str:
-                    lines.append(f'{self.name}_bucket{{{label_str},le="{bucket}"}} {cumulative}')
-                else:
-                    lines.append(f'{self.name}_bucket{{le="{bucket}"}} {cumulative}')
-
-            # +Inf bucket
-            if label_str:
-                lines.append(f'{self.name}_bucket{{{label_str},le="+Inf"}} {self._counts[key]}')
-                lines.append(f"{self.name}_sum{{{label_str}}} {self._sums[key]}")
-                lines.append(f"{self.name}_count{{{label_str}}} {self._counts[key]}")
-            else:
-                lines.append(f'{self.name}_bucket{{le="+Inf"}} {self._counts[key]}')
-                lines.append(f"{self.name}_sum {self._sums[key]}")
-                lines.append(f"{self.name}_count {self._counts[key]}")
-
-        return "\n".join(lines)
+                "type": self.TYPE,
+                "sum": series.sum,
+                "count": series.count,
+                "buckets": dict(zip(self._bounds, series.counts)),
+                "labels": dict(zip(self.labels, key)),
+            }
+            for key, series in self._series.items()
+        ]
 
 
 class MetricsCollector:
@@ -301,6 +334,10 @@ class MetricsCollector:
             self.uptime,
         ]
 
+        # Last exposition and the per-metric texts it was joined from
+        self._prometheus_parts: List[str] = []
+        self._prometheus_text = ""
+
     async def record_request(
         self,
         method: str,
@@ -309,8 +346,8 @@ class MetricsCollector:
         duration: float,
     ) -> None:
         """Record an HTTP request."""
-        await self.requests_total.inc(method=method, endpoint=endpoint, status=status)
-        await self.request_duration.observe(duration, method=method, endpoint=endpoint)
+        self.requests_total.labels_for(method, endpoint, status).inc()
+        self.request_duration.labels_for(method, endpoint).observe(duration)
 
     async def record_message(
         self,
@@ -320,9 +357,9 @@ class MetricsCollector:
         duration: float,
     ) -> None:
         """Record a message processing."""
-        await self.messages_received.inc(message_type=message_type, source_agent=source_agent)
-        await self.messages_processed.inc(message_type=message_type, status=status)
-        await self.message_processing_duration.observe(duration, message_type=message_type)
+        self.messages_received.labels_for(message_type, source_agent).inc()
+        self.messages_processed.labels_for(message_type, status).inc()
+        self.message_processing_duration.labels_for(message_type).observe(duration)
 
     async def record_incident_created(
         self,
@@ -330,7 +367,7 @@ class MetricsCollector:
         incident_type: str,
     ) -> None:
         """Record an incident creation."""
-        await self.incidents_created.inc(severity=severity, incident_type=incident_type)
+        self.incidents_created.labels_for(severity, incident_type).inc()
 
     async def record_transition(
         self,
@@ -338,16 +375,16 @@ class MetricsCollector:
         to_state: str,
     ) -> None:
         """Record a state transition."""
-        await self.incident_transitions.inc(from_state=from_state, to_state=to_state)
+        self.incident_transitions.labels_for(from_state, to_state).inc()
 
     async def update_incidents_by_state(self, states: Dict[str, int]) -> None:
         """Update incident counts by state."""
         for state, count in states.items():
-            await self.incidents_total.set(count, state=state)
+            self.incidents_total.labels_for(state).set(count)
 
     async def update_uptime(self) -> None:
         """Update uptime metric."""
-        await self.uptime.set(time.time() - self._start_time)
+        self.uptime.labels_for().set(time.time() - self._start_time)
 
     def get_uptime(self) -> float:
         """Get current uptime."""
@@ -362,10 +399,14 @@ class MetricsCollector:
 
     def prometheus_format(self) -> str:
         """Get all metrics in Prometheus exposition format."""
-        lines = []
-        for metric in self._metrics:
-            lines.append(metric.prometheus_format())
-        return "\n\n".join(lines) + "\n"
+        parts = [metric.prometheus_format() for metric in self._metrics]
+        # Metrics return their cached text when unchanged; rejoin only on change
+        if len(parts) != len(self._prometheus_parts) or any(
+            part is not last for part, last in zip(parts, self._prometheus_parts)
+        ):
+            self._prometheus_parts = parts
+            self._prometheus_text = "\n\n".join(parts) + "\n"
+        return self._prometheus_text
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON response."""
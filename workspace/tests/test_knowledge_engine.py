@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests for the KnowledgeEngine: matrix-backed VectorStore, index persistence,
+adjacency-indexed RepoGraph and incremental tree indexing
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pytest
+
+from core.island_ai_runtime.knowledge_engine import (
+    EdgeType,
+    GraphEdge,
+    GraphNode,
+    KnowledgeEngine,
+    NodeType,
+    RepoGraph,
+    VectorStore,
+)
+
+
+def brute_force(vectors, query, top_k):
+    """Reference cosine top-k"""
+    scores = []
+    for id, vector in vectors.items():
+        denom = np.linalg.norm(vector) * np.linalg.norm(query)
+        scores.append((id, float(np.dot(vector, query) / denom) if denom else 0.0))
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores[:top_k]
+
+
+class TestVectorStore:
+    """Test exact, batched and IVF search"""
+
+    def setup_method(self):
+        rng = np.random.default_rng(0)
+        self.vectors = {f"v{i}": rng.normal(size=16).tolist() for i in range(300)}
+        self.store = VectorStore(initial_capacity=8)
+        for id, vector in self.vectors.items():
+            self.store.upsert(id, vector, {"n": id})
+
+    def test_search_matches_brute_force(self):
+        query = self.vectors["v7"]
+        results = self.store.search(query, top_k=5)
+        expected = brute_force(self.vectors, query, 5)
+        assert [r[0] for r in results] == [e[0] for e in expected]
+        assert [r[1] for r in results] == pytest.approx([e[1] for e in expected], abs=1e-5)
+
+    def test_delete_reuses_rows_and_search_many(self):
+        for i in range(0, 300, 2):
+            self.store.delete(f"v{i}")
+            del self.vectors[f"v{i}"]
+        self.store.upsert("new", self.vectors["v1"])
+        self.vectors["new"] = self.vectors["v1"]
+        assert len(self.store) == 151
+
+        queries = [self.vectors["v1"], self.vectors["v3"]]
+        batched = self.store.search_many(queries, top_k=3)
+        for query, results in zip(queries, batched):
+            assert {r[0] for r in results} == {e[0] for e in brute_force(self.vectors, query, 3)}
+        assert self.store.get_vector("new") == pytest.approx(self.vectors["v1"], abs=1e-5)
+
+    def test_ivf_search_finds_exact_match(self):
+        self.store.build_ivf(n_lists=10)
+        for id in ["v3", "v150", "v299"]:
+            results = self.store.search(self.vectors[id], top_k=1, n_probe=2)
+            assert results[0][0] == id
+
+    def test_save_and_mmap_load(self, tmp_path):
+        self.store.delete("v0")
+        self.store.save(tmp_path)
+        loaded = VectorStore.load(tmp_path)
+        assert len(loaded) == 299
+        assert loaded.metadata["v5"] == {"n": "v5"}
+        assert loaded.search(self.vectors["v9"], top_k=1)[0][0] == "v9"
+
+        # Loaded matrix stays writable (copy-on-write) and can grow
+        loaded.upsert("v9", self.vectors["v10"])
+        loaded.upsert("extra", self.vectors["v11"])
+        assert loaded.search(self.vectors["v10"], top_k=2)[0][0] in {"v9", "v10"}
+        assert VectorStore.load(tmp_path).get_vector("v9") == pytest.approx(self.vectors["v9"], abs=1e-5)
+
+
+class TestKnowledgeEngineIndex:
+    """Test warm starts skip re-embedding"""
+
+    @pytest.mark.asyncio
+    async def test_warm_start_reuses_embeddings(self, tmp_path):
+        engine = KnowledgeEngine()
+        await engine.index_file("src/a.py", "def a(): pass")
+        await engine.index_file("src/b.py", "def b(): pass")
+        engine.save_index(tmp_path)
+
+        warm = KnowledgeEngine()
+        warm.load_index(tmp_path)
+        calls = []
+
+        async def counting_embed(text):
+            calls.append(text)
+            return warm.embedding_provider._mock_embedding(text)
+
+        warm.embedding_provider.embed = counting_embed
+        await warm.index_file("src/a.py", "def a(): pass")
+        await warm.index_file("src/b.py", "def b(): changed")
+        assert calls == ["def b(): changed"]
+
+        results = await warm.search("def a(): pass", top_k=1)
+        assert results[0].node.path == "src/a.py"
+
+
+class TestRepoGraph:
+    """Test adjacency maps and k-hop traversal"""
+
+    def test_neighbors_k_hop_and_removal(self):
+        graph = RepoGraph()
+        for name in "abcde":
+            graph.add_node(GraphNode(id=name, name=name, node_type=NodeType.FILE, path=name))
+        graph.add_edge(GraphEdge("a", "b", EdgeType.IMPORTS))
+        graph.add_edge(GraphEdge("b", "c", EdgeType.IMPORTS))
+        graph.add_edge(GraphEdge("c", "a", EdgeType.IMPORTS))
+        graph.add_edge(GraphEdge("c", "d", EdgeType.CALLS))
+        graph.add_edge(GraphEdge("e", "a", EdgeType.REFERENCES))
+
+        assert [n.id for n in graph.get_neighbors("c", EdgeType.CALLS)] == ["d"]
+        assert {n.id for n in graph.get_neighbors("a", reverse=True)} == {"c", "e"}
+        assert graph.k_hop("a", 2) == {"b": 1, "c": 2}
+        assert graph.k_hop("a", 5, edge_types={EdgeType.IMPORTS}) == {"b": 1, "c": 2}
+        assert graph.k_hop("a", 1, direction="both") == {"b": 1, "c": 1, "e": 1}
+
+        graph.remove_node("c")
+        assert graph.edge_count == 2
+        assert graph.k_hop("a", 3) == {"b": 1}
+        assert len(graph.edges) == 2
+
+
+class TestIndexTree:
+    """Test incremental tree indexing"""
+
+    @pytest.mark.asyncio
+    async def test_only_changed_files_are_reembedded_and_relinked(self, tmp_path):
+        pkg = tmp_path / "pkg"
+        pkg.mkdir()
+        (pkg / "__init__.py").write_text("")
+        (pkg / "util.py").write_text("def helper(): pass\n")
+        (pkg / "app.py").write_text("from pkg.util import helper\n")
+        (tmp_path / "main.py").write_text("import pkg.app\n")
+
+        engine = KnowledgeEngine()
+        batches = []
+        original = engine.embedding_provider.embed_batch
+
+        async def counting_batch(texts):
+            batches.append(len(texts))
+            return await original(texts)
+
+        engine.embedding_provider.embed_batch = counting_batch
+        stats = await engine.index_tree(tmp_path, batch_size=2)
+        assert stats["embedded"] == 4
+        assert batches == [2, 2]
+
+        graph = engine.repo_graph
+        app_id = engine._generate_id("pkg/app.py")
+        util_id = engine._generate_id("pkg/util.py")
+        main_id = engine._generate_id("main.py")
+        assert [n.id for n in graph.get_neighbors(app_id, EdgeType.IMPORTS)] == [util_id]
+        assert graph.k_hop(main_id, 2, edge_types={EdgeType.IMPORTS}) == {app_id: 1, util_id: 2}
+
+        context = await engine.get_context("main.py", depth=2)
+        assert util_id in {r["id"] for r in context["related"]}
+
+        # Nothing changed: no embedding, no relinking
+        batches.clear()
+        stats = await engine.index_tree(tmp_path)
+        assert stats["unchanged"] == 4 and batches == []
+
+        # Edit one file, delete another
+        (pkg / "app.py").write_text("import os\n")
+        (pkg / "util.py").unlink()
+        stats = await engine.index_tree(tmp_path)
+        assert stats["embedded"] == 1 and stats["removed"] == 1
+        assert graph.get_neighbors(app_id, EdgeType.IMPORTS) == []
+        assert util_id not in graph.nodes
+
+        # Re-creating the module links pending importers again
+        await engine.index_file("pkg/util.py", "def helper(): pass\n")
+        (pkg / "app.py").write_text("from pkg import util\n")
+        await engine.index_tree(tmp_path)
+        assert [n.id for n in graph.get_neighbors(app_id, EdgeType.IMPORTS)] == [util_id]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental RFC 6962 Merkle tree: roots against a reference
+recursive MTH, inclusion and consistency proofs, and frontier-only mode
+"""
+
+import hashlib
+import sys
+import unittest
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.merkle.merkle_foundation import MerkleTree, StateVerifier
+
+
+def reference_mth(leaves):
+    """RFC 6962 section 2.1 Merkle Tree Hash, computed recursively"""
+    if len(leaves) == 1:
+        return hashlib.sha256(b"\x00" + leaves[0]).digest()
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    return hashlib.sha256(b"\x01" + reference_mth(leaves[:k]) + reference_mth(leaves[k:])).digest()
+
+
+class TestMerkleTree(unittest.TestCase):
+    """Test MerkleTree roots and proofs"""
+
+    def setUp(self):
+        self.leaves = [f"leaf-{i}".encode() for i in range(33)]
+
+    def test_root_matches_reference(self):
+        """Test incremental roots equal the recursive MTH at every size"""
+        tree = MerkleTree()
+        self.assertIsNone(tree.get_root_hash())
+        for n, leaf in enumerate(self.leaves, start=1):
+            tree.add_raw_leaves([leaf])
+            self.assertEqual(tree.root(), reference_mth(self.leaves[:n]))
+
+    def test_batched_appends_and_historical_roots(self):
+        """Test batched appends build the same tree and keep old roots"""
+        tree = MerkleTree()
+        tree.add_raw_leaves(self.leaves[:5])
+        tree.add_raw_leaves(self.leaves[5:20])
+        tree.add_raw_leaves(self.leaves[20:])
+        self.assertEqual(len(tree), 33)
+        for n in range(1, 34):
+            self.assertEqual(tree.root(n), reference_mth(self.leaves[:n]))
+
+    def test_frontier_only_mode(self):
+        """Test retain_nodes=False tracks the same root without proofs"""
+        tree = MerkleTree(retain_nodes=False)
+        tree.add_raw_leaves(self.leaves)
+        self.assertEqual(tree.root(), reference_mth(self.leaves))
+        with self.assertRaises(ValueError):
+            tree.inclusion_proof(0)
+
+    def test_inclusion_proofs(self):
+        """Test inclusion proofs verify for every leaf and tree size"""
+        tree = MerkleTree()
+        tree.add_raw_leaves(self.leaves)
+        for size in range(1, 34):
+            root = tree.root(size)
+            for index in range(size):
+                proof = tree.inclusion_proof(index, size)
+                leaf = bytes.fromhex(tree.leaf_hash(index))
+                self.assertTrue(MerkleTree.verify_inclusion(leaf, index, size, proof, root))
+        proof = tree.inclusion_proof(3)
+        self.assertFalse(MerkleTree.verify_inclusion(
+            bytes.fromhex(tree.leaf_hash(4)), 3, 33, proof, tree.root()))
+
+    def test_consistency_proofs(self):
+        """Test consistency proofs verify between every pair of sizes"""
+        tree = MerkleTree()
+        tree.add_raw_leaves(self.leaves)
+        for new_size in range(1, 34):
+            for old_size in range(1, new_size + 1):
+                proof = tree.consistency_proof(old_size, new_size)
+                self.assertTrue(MerkleTree.verify_consistency(
+                    old_size, new_size, tree.root(old_size), tree.root(new_size), proof))
+        proof = tree.consistency_proof(7, 33)
+        self.assertFalse(MerkleTree.verify_consistency(
+            7, 33, tree.root(6), tree.root(33), proof))
+
+    def test_legacy_proof_api(self):
+        """Test get_proof/verify_proof round trip on structured leaves"""
+        tree = MerkleTree()
+        hashes = tree.add_leaves([{"n": i} for i in range(7)])
+        root = tree.build()
+        for index, leaf_hash in enumerate(hashes):
+            self.assertTrue(tree.verify_proof(leaf_hash, tree.get_proof(index), root))
+        self.assertFalse(tree.verify_proof(hashes[0], tree.get_proof(1), root))
+
+
+class TestStateVerifier(unittest.TestCase):
+    """Test StateVerifier proofs"""
+
+    def test_prove_state_and_append_only(self):
+        """Test state and append-only proofs verify"""
+        verifier = StateVerifier()
+        for i in range(5):
+            verifier.record_state("component", {"step": i})
+        old_root = verifier.finalize()
+        for i in range(5, 9):
+            verifier.record_state("component", {"step": i})
+
+        state = verifier.prove_state(2)
+        self.assertTrue(MerkleTree.verify_inclusion(
+            bytes.fromhex(state["leaf_hash"]), 2, state["tree_size"],
+            [bytes.fromhex(node) for node in state["proof"]], bytes.fromhex(state["root_hash"])))
+
+        growth = verifier.prove_append_only(5)
+        self.assertEqual(growth["old_root"], old_root)
+        self.assertTrue(MerkleTree.verify_consistency(
+            5, 9, bytes.fromhex(old_root), bytes.fromhex(growth["new_root"]),
+            [bytes.fromhex(node) for node in growth["proof"]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for the ModelGateway middleware: response cache, single-flight
+coalescing, micro-batching and per-model limits
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from core.island_ai_runtime.gateway_middleware import ResponseCache, TokenBucket, request_cache_key
+from core.island_ai_runtime.model_gateway import (
+    CompletionRequest,
+    CompletionResponse,
+    FakeModelClient,
+    ModelConfig,
+    ModelGateway,
+    ModelProvider,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_gateway(client, middleware=None):
+    gateway = ModelGateway({"providers": {"openai": {"enabled": False}}, "middleware": middleware or {}})
+    gateway.register_client(ModelProvider.LOCAL, client)
+    gateway.register_model(ModelConfig(id="fake-1", provider=ModelProvider.LOCAL, type="chat", max_tokens=512))
+    return gateway
+
+
+def messages(text):
+    return [{"role": "system", "content": "You are a planner."}, {"role": "user", "content": text}]
+
+
+class TestResponseCache:
+    """Test key normalization, TTL, LRU and the disk tier"""
+
+    def test_key_normalizes_whitespace_and_key_order(self):
+        a = CompletionRequest(messages=[{"role": "user", "content": " plan "}])
+        b = CompletionRequest(messages=[{"content": "plan", "role": "user"}])
+        c = CompletionRequest(messages=[{"role": "user", "content": "plan"}], temperature=0.0)
+        assert request_cache_key(a, "m") == request_cache_key(b, "m")
+        assert request_cache_key(a, "m") != request_cache_key(c, "m")
+        assert request_cache_key(a, "m") != request_cache_key(a, "other")
+
+    def test_ttl_lru_and_disk_tier(self, tmp_path):
+        clock = FakeClock()
+        cache = ResponseCache(max_entries=2, ttl_seconds=10, disk_dir=tmp_path, clock=clock)
+        for key in ["a", "b", "c"]:
+            cache.put(key, CompletionResponse(content=key, model="m", usage={"n": 1}, finish_reason="stop"))
+        assert len(cache) == 2 and cache.stats.evictions == 1
+
+        # Evicted from memory but still on disk, promoted back on read
+        assert cache.get("a").content == "a"
+        assert cache.stats.disk_hits == 1
+
+        # Cached responses are copies
+        cache.get("b").usage["n"] = 99
+        assert cache.get("b").usage == {"n": 1}
+
+        restarted = ResponseCache(disk_dir=tmp_path, clock=clock)
+        assert restarted.get("c").content == "c"
+
+        clock.now += 11
+        assert cache.get("b") is None
+        assert restarted.get("c") is None
+
+
+class TestGatewayMiddleware:
+    """Test the complete() pipeline"""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_provider(self):
+        client = FakeModelClient()
+        gateway = make_gateway(client, {"batching": {"enabled": False}})
+        first = await gateway.complete(messages("plan"), model="fake-1", temperature=0.0)
+        second = await gateway.complete(messages("plan "), model="fake-1", temperature=0.0)
+        assert first == second
+        assert client.calls == 1
+        assert gateway.get_middleware_stats()["cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sampled_requests_bypass_cache_and_coalescing(self):
+        client = FakeModelClient(latency=0.01)
+        gateway = make_gateway(client, {"batching": {"enabled": False}})
+        await gateway.complete(messages("plan"), model="fake-1", temperature=0.7)
+        await gateway.complete(messages("plan"), model="fake-1", temperature=0.7)
+        await asyncio.gather(*(gateway.complete(messages("same"), model="fake-1") for _ in range(3)))
+        assert client.calls == 5
+        assert len(gateway.response_cache) == 0
+        assert gateway.get_middleware_stats()["coalesced_requests"] == 0
+
+        shared = make_gateway(FakeModelClient(), {"batching": {"enabled": False}, "share_sampled": True})
+        await shared.complete(messages("plan"), model="fake-1")
+        await shared.complete(messages("plan"), model="fake-1")
+        assert shared.get_middleware_stats()["cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_identical_in_flight_requests_are_coalesced(self):
+        client = FakeModelClient(latency=0.02)
+        gateway = make_gateway(client, {"cache": {"enabled": False}, "batching": {"enabled": False}})
+        results = await asyncio.gather(
+            *(gateway.complete(messages("same"), model="fake-1", temperature=0.0) for _ in range(10))
+        )
+        assert len({r.content for r in results}) == 1
+        assert client.calls == 1
+        assert gateway.get_middleware_stats()["coalesced_requests"] == 9
+
+    @pytest.mark.asyncio
+    async def test_failures_are_shared_and_not_cached(self):
+        client = FakeModelClient(latency=0.01)
+        gateway = make_gateway(client, {"batching": {"enabled": False}})
+
+        async def failing(request):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider down")
+
+        client.complete = failing
+        results = await asyncio.gather(
+            *(gateway.complete(messages("x"), model="fake-1", temperature=0.0) for _ in range(3)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert len(gateway.response_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_distinct_requests_are_micro_batched(self):
+        client = FakeModelClient()
+        gateway = make_gateway(client, {"batching": {"max_batch_size": 4, "window_ms": 20}})
+        results = await asyncio.gather(*(gateway.complete(messages(f"q{i}"), model="fake-1") for i in range(10)))
+        assert len({r.content for r in results}) == 10
+        assert client.batch_sizes == [4, 4, 2]
+
+        # Results are routed back to the caller that sent the request
+        direct = await FakeModelClient().complete(CompletionRequest(messages=messages("q3"), model="fake-1"))
+        assert results[3].content == direct.content
+
+    @pytest.mark.asyncio
+    async def test_per_model_concurrency_limit(self):
+        client = FakeModelClient(latency=0.01)
+        running = 0
+        peak = 0
+        original = client.complete
+
+        async def tracking(request):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            try:
+                return await original(request)
+            finally:
+                running -= 1
+
+        client.complete = tracking
+        client.supports_batch = False
+        gateway = make_gateway(client, {"cache": {"enabled": False}, "concurrency": {"fake-1": 2}})
+        await asyncio.gather(*(gateway.complete(messages(f"q{i}"), model="fake-1") for i in range(8)))
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_rate_limit(self):
+        bucket = TokenBucket(rate=100, capacity=2)
+        assert bucket.try_acquire() and bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+        client = FakeModelClient()
+        gateway = make_gateway(client, {
+            "cache": {"enabled": False},
+            "batching": {"enabled": False},
+            "rate_limits": {"fake-1": {"requests_per_second": 50, "burst": 1}},
+        })
+        start = time.monotonic()
+        await asyncio.gather(*(gateway.complete(messages(f"q{i}"), model="fake-1") for i in range(6)))
+        # One request from the burst, five more at 50/s
+        assert time.monotonic() - start >= 0.09
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for SessionMemory: cached token counts, token-budgeted context window,
+rolling summary and indexed search
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.island_ai_runtime.session_memory import (
+    Message,
+    MessageRole,
+    RollingSummary,
+    SessionMemory,
+    ShortTermMemory,
+)
+
+
+def word_count(text):
+    return len(text.split())
+
+
+class TestShortTermMemory:
+    """Test the trigram index matches a linear substring scan"""
+
+    def test_search_matches_scan_after_eviction(self):
+        memory = ShortTermMemory(max_messages=20)
+        texts = [f"Step {i}: deploy service-{i % 7} to Cluster {i % 3}" for i in range(50)]
+        for text in texts:
+            memory.add(Message(role=MessageRole.USER, content=text))
+
+        for query in ["CLUSTER 2", "service-3", "p 4", "ep", "", "missing", "Step 45:"]:
+            expected = [m for m in memory.messages if query.lower() in m.content.lower()]
+            assert memory.search(query) == expected, query
+        assert memory.search("Step 5:") == []
+        assert [m.content for m in memory.get_recent(2)] == texts[-2:]
+
+        memory.clear()
+        assert memory.search("step") == []
+
+
+class TestContextWindow:
+    """Test token budgeting and the rolling summary"""
+
+    def test_budget_evicts_into_summary(self):
+        memory = SessionMemory({"max_tokens": 40, "summary_tokens": 10}, tokenizer=word_count)
+        for i in range(10):
+            memory.add_message("user", f"please refactor module alpha part {i}")
+
+        window = memory.context_window
+        assert window.current_tokens <= 30
+        assert len(window.messages) == 5
+        assert window.summary.message_count == 5
+        assert all(m.token_count == 6 for m in window.messages)
+
+        context = memory.get_context()
+        assert context[0]["role"] == "system"
+        assert "5 earlier messages" in context[0]["content"]
+        assert "refactor" in context[0]["content"]
+        assert [c["content"] for c in context[1:]] == [
+            f"please refactor module alpha part {i}" for i in range(5, 10)
+        ]
+
+        trimmed = memory.get_context(max_tokens=12)
+        assert [c["content"] for c in trimmed[1:]] == [
+            "please refactor module alpha part 8",
+            "please refactor module alpha part 9",
+        ]
+        assert memory.summarize()["context_window"]["summarized_messages"] == 5
+
+    def test_context_unchanged_until_budget_is_reached(self):
+        memory = SessionMemory()
+        memory.add_message("user", "hello")
+        memory.add_message("assistant", "hi there")
+        assert memory.get_context() == [
+            {"role": "user", "content": "hello"},
+            {"role": "assistant", "content": "hi there"},
+        ]
+        assert memory.get_context(max_messages=1) == [{"role": "assistant", "content": "hi there"}]
+
+        memory.clear()
+        assert memory.get_context() == []
+
+    def test_summary_keeps_bounded_points(self):
+        summary = RollingSummary(max_points=3)
+        for i in range(10):
+            summary.fold(Message(role=MessageRole.TOOL, content=f"result {i} ok", token_count=3))
+        text = summary.render()
+        assert summary.token_count == 30
+        assert len(summary.points) == 3
+        assert "tool: result 9 ok" in text and "result 6 ok" not in text
+        assert summary.render() is text
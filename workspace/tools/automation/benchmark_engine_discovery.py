@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+引擎發現啟動基準測試
+Benchmark for engine discovery at orchestrator startup
+
+生成合成引擎目錄（預設 3000 個模組，每 10 個中有 1 個引擎，其餘為導入較重的輔助模組），比較：
+- 導入掃描：逐個導入模組並檢查 BaseEngine 子類（原 EngineRegistry 做法）
+- AST 冷啟動：解析所有文件並寫入清單快取
+- AST 熱啟動：清單快取命中，只重新解析有變更的文件
+
+用法:
+    python benchmark_engine_discovery.py --modules 3000 --changed 10
+"""
+
+import argparse
+import importlib.util
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import engine_base
+from engine_base import BaseEngine, EngineType
+from engine_discovery import EngineManifest
+
+ENGINE_TEMPLATE = '''
+from engine_base import ExecutionEngineBase, EngineType, TaskResult
+
+
+class Engine{index}(ExecutionEngineBase):
+    ENGINE_TYPE = EngineType.{engine_type}
+
+    async def _execute(self, task):
+        return TaskResult(task_id=task.get("task_id", ""), success=True)
+'''
+
+HELPER_TEMPLATE = '''
+import json
+import dataclasses
+
+TABLE = {{i: str(i) * 4 for i in range(2000)}}
+
+
+@dataclasses.dataclass
+class Helper{index}:
+    value: int = {index}
+
+    def dump(self):
+        return json.dumps(dataclasses.asdict(self))
+'''
+
+ENGINE_TYPES = ["EXECUTION", "VALIDATION", "GENERATION", "INTEGRATION"]
+
+
+def generate_tree(root: Path, modules: int) -> None:
+    """生成合成引擎目錄（每個子目錄 100 個模組）"""
+    for i in range(modules):
+        directory = root / f"group_{i // 100}"
+        directory.mkdir(exist_ok=True)
+        if i % 10 == 0:
+            source = ENGINE_TEMPLATE.format(index=i, engine_type=ENGINE_TYPES[i // 10 % 4])
+        else:
+            source = HELPER_TEMPLATE.format(index=i)
+        (directory / f"module_{i}.py").write_text(source)
+
+
+def import_scan(root: Path) -> list:
+    """原做法：導入每個模組並檢查 BaseEngine 子類"""
+    engines = []
+    for py_file in root.rglob("*.py"):
+        if py_file.name.startswith('_'):
+            continue
+        try:
+            spec = importlib.util.spec_from_file_location(py_file.stem, py_file)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            for name, obj in vars(module).items():
+                if (isinstance(obj, type) and issubclass(obj, BaseEngine)
+                        and obj is not BaseEngine and not name.startswith('_')):
+                    engines.append({
+                        "class_name": name,
+                        "module_path": str(py_file),
+                        "engine_type": getattr(obj, 'ENGINE_TYPE', EngineType.EXECUTION).value,
+                    })
+        except Exception:
+            pass
+    return engines
+
+
+def measure(label: str, func, count_label=None):
+    """執行並輸出耗時與峰值內存"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1] / (1 << 20)
+    tracemalloc.stop()
+    print(f"{label:<18} {elapsed:>10.1f} ms {peak:>8.1f} MiB  {count_label(result) if count_label else ''}")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Engine discovery benchmark")
+    parser.add_argument("--modules", type=int, default=3000, help="合成模組數")
+    parser.add_argument("--changed", type=int, default=10, help="熱啟動前修改的文件數")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory(prefix="engine-bench-") as tmp:
+        root = Path(tmp) / "engines"
+        root.mkdir()
+        generate_tree(root, args.modules)
+        cache_path = Path(tmp) / "state" / "engine_manifest.json"
+
+        def engines(result):
+            return f"{len(result)} engines"
+
+        imported = measure("import scan", lambda: import_scan(root), engines)
+        cold = measure("ast (cold cache)", lambda: EngineManifest(cache_path).discover([root]), engines)
+        warm = measure("ast (warm cache)", lambda: EngineManifest(cache_path).discover([root]), engines)
+
+        for path in sorted(root.rglob("*.py"))[:args.changed]:
+            path.write_text(path.read_text() + "\n# touched\n")
+
+        manifest = EngineManifest(cache_path)
+        measure("ast (changed)", lambda: manifest.discover([root]),
+                lambda result: f"{len(result)} engines ({manifest.misses} re-parsed)")
+
+        def key(entry):
+            return entry["class_name"], entry["engine_type"]
+
+        # 導入掃描會把模組中導入的框架基類（ExecutionEngineBase 等）也報告為引擎
+        framework = {name for name, obj in vars(engine_base).items() if isinstance(obj, type)}
+        defined = [entry for entry in imported if entry["class_name"] not in framework]
+        print(f"import scan reported {len(imported) - len(defined)} imported base classes as engines")
+        assert sorted(map(key, defined)) == sorted(map(key, cold)) == sorted(map(key, warm))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+引擎調度器吞吐量基準測試
+Throughput benchmark for EngineScheduler
+
+註冊多個同類型、速度不同的模擬引擎（預設每個任務 2/5/10/40 ms，並發上限 4），
+按類型提交任務，比較：
+- 原調度方式：單一調度循環，全部任務送往第一個健康引擎
+- 隨機選擇：新調度器，但隨機選擇引擎
+- 負載感知：新調度器，power-of-two-choices + 延遲 EWMA
+
+用法:
+    python benchmark_scheduler.py --tasks 1000 --delays 2,5,10,40
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from engine_base import (
+    BaseEngine,
+    EngineConfig,
+    EngineType,
+    PersistenceConfig,
+    ResourceConfig,
+    TaskResult,
+)
+from master_orchestrator import EngineRegistration, EngineRegistry, EngineScheduler, EventBus
+
+
+class SimulatedEngine(BaseEngine):
+    """固定延遲的模擬引擎"""
+
+    def __init__(self, config: EngineConfig, delay: float):
+        super().__init__(config)
+        self.delay = delay
+
+    async def _initialize(self) -> bool:
+        return True
+
+    async def _execute(self, task: Dict[str, Any]) -> TaskResult:
+        await asyncio.sleep(self.delay)
+        return TaskResult(task_id=task["task_id"], success=True)
+
+    async def _shutdown(self) -> bool:
+        return True
+
+    def _get_capabilities(self) -> Dict[str, Any]:
+        return {"delay": self.delay}
+
+
+class RandomScheduler(EngineScheduler):
+    """隨機選擇引擎（對照組）"""
+
+    def select_engine(self, candidates: List[EngineRegistration]) -> EngineRegistration:
+        return self._random.choice(candidates)
+
+
+async def build_registry(delays: List[float], concurrency: int) -> EngineRegistry:
+    registry = EngineRegistry()
+    for index, delay in enumerate(delays):
+        config = EngineConfig(
+            engine_name=f"sim-{index}-{delay * 1000:g}ms",
+            resource=ResourceConfig(max_concurrent_tasks=concurrency),
+            persistence=PersistenceConfig(enabled=False),
+        )
+        instance = SimulatedEngine(config, delay)
+        await instance.start()
+        registry.register_engine(EngineRegistration(
+            engine_id=config.engine_id,
+            engine_name=config.engine_name,
+            engine_class="SimulatedEngine",
+            engine_type=EngineType.EXECUTION,
+            module_path=__file__,
+            config=config,
+            instance=instance,
+            healthy=True,
+        ))
+    return registry
+
+
+def completed(registry: EngineRegistry) -> int:
+    return sum(reg.instance._tasks_completed for reg in registry.get_all_engines())
+
+
+async def stop_all(registry: EngineRegistry):
+    for reg in registry.get_all_engines():
+        await reg.instance.stop()
+
+
+async def run_legacy(delays: List[float], concurrency: int, tasks: int) -> float:
+    """原調度方式：逐個任務分發給 healthy_engines[0]"""
+    registry = await build_registry(delays, concurrency)
+    queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+    for i in range(tasks):
+        queue.put_nowait((0, i, {"target_engine_type": EngineType.EXECUTION.value}))
+
+    start = time.perf_counter()
+    while not queue.empty():
+        _, _, task = queue.get_nowait()
+        engines = registry.get_engines_by_type(EngineType.EXECUTION)
+        healthy_engines = [e for e in engines if e.healthy and e.instance]
+        await healthy_engines[0].instance.submit_task(task)
+    while completed(registry) < tasks:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    print_distribution(registry)
+    await stop_all(registry)
+    return elapsed
+
+
+async def run_scheduler(scheduler_class, delays: List[float], concurrency: int,
+                        tasks: int, workers: int) -> float:
+    """新調度器：按類型提交，等待全部完成"""
+    registry = await build_registry(delays, concurrency)
+    scheduler = scheduler_class(registry, EventBus(), dispatch_workers=workers,
+                                max_engine_concurrency=concurrency)
+    await scheduler.start()
+
+    start = time.perf_counter()
+    for _ in range(tasks):
+        await scheduler.schedule_task({"target_engine_type": EngineType.EXECUTION.value})
+    while completed(registry) < tasks:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    metrics = scheduler.get_metrics()["engines"]
+    print_distribution(registry, metrics)
+    await scheduler.stop()
+    await stop_all(registry)
+    return elapsed
+
+
+def print_distribution(registry: EngineRegistry, metrics: Dict[str, Dict] = None):
+    for reg in registry.get_all_engines():
+        line = f"    {reg.engine_name:<14} {reg.instance._tasks_completed:>6} tasks"
+        lane = (metrics or {}).get(reg.engine_id)
+        if lane:
+            line += (f"  latency ewma {lane['latency_ewma_ms']:>7.1f} ms"
+                     f"  wait ewma {lane['wait_ewma_ms']:>8.1f} ms  max wait {lane['max_wait_ms']:>8.1f} ms")
+        print(line)
+
+
+async def main_async(args) -> int:
+    delays = [float(d) / 1000 for d in args.delays.split(",")]
+    runs = [
+        ("legacy (first engine)", lambda: run_legacy(delays, args.concurrency, args.tasks)),
+        ("random", lambda: run_scheduler(RandomScheduler, delays, args.concurrency, args.tasks, args.workers)),
+        ("p2c + latency ewma", lambda: run_scheduler(EngineScheduler, delays, args.concurrency,
+                                                     args.tasks, args.workers)),
+    ]
+    for label, run in runs:
+        print(f"{label}:")
+        elapsed = await run()
+        print(f"  {args.tasks} tasks in {elapsed * 1000:.1f} ms ({args.tasks / elapsed:.0f} tasks/s)")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="EngineScheduler throughput benchmark")
+    parser.add_argument("--tasks", type=int, default=1000, help="任務數")
+    parser.add_argument("--delays", default="2,5,10,40", help="各模擬引擎的任務延遲（毫秒）")
+    parser.add_argument("--concurrency", type=int, default=4, help="每個引擎的並發上限")
+    parser.add_argument("--workers", type=int, default=4, help="分發工作者數")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -494,8 +494,8 @@ class BaseEngine(ABC):
                 self._logger.error(f"主循環錯誤: {e}")
                 await asyncio.sleep(1)
 
-    async def _process_task(self, task: Dict[str, Any]):
-        """處理單一任務"""
+    async def _process_task(self, task: Dict[str, Any]) -> TaskResult:
+        """處理單一任務（更新統計並發送事件，供主循環與外部調度器調用）"""
         task_id = task["task_id"]
         self._active_tasks.add(task_id)
 
@@ -515,6 +515,7 @@ class BaseEngine(ABC):
                 "success": result.success,
                 "duration_ms": result.duration_ms,
             })
+            return result
 
         except Exception as e:
             self._tasks_failed += 1
@@ -524,6 +525,7 @@ class BaseEngine(ABC):
                 "task_id": task_id,
                 "error": str(e),
             })
+            return TaskResult(task_id=task_id, success=False, error=str(e))
 
         finally:
             self._active_tasks.discard(task_id)
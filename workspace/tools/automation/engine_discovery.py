@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Engine Discovery - 靜態引擎發現
+
+以 AST 解析代替動態導入來發現 BaseEngine 子類：
+- 每個 Python 文件只解析語法樹，不執行模組代碼，啟動時不支付任何導入成本
+- 繼承關係跨文件按類名解析（支援經由 ExecutionEngineBase 等中間基類的間接繼承）
+- 解析結果與 engine.yaml 內容寫入清單快取，按 (路徑, mtime, 大小) 判斷是否失效，
+  重新啟動時只重新解析有變更的文件
+
+Version: 1.0.0
+"""
+
+import ast
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import engine_base
+import yaml
+from engine_base import BaseEngine, EngineType
+
+MANIFEST_VERSION = 1
+
+# 遍歷時跳過的目錄
+SKIPPED_DIRS = frozenset({"__pycache__", "node_modules", ".git", ".venv", "venv"})
+
+logger = logging.getLogger("engine_discovery")
+
+
+# ============================================================================
+# AST 解析
+# ============================================================================
+
+def _base_name(node: ast.expr) -> Optional[str]:
+    """基類表達式的類名（`BaseEngine` 或 `engine_base.BaseEngine`）"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _engine_type(node: ast.expr) -> Optional[str]:
+    """ENGINE_TYPE 賦值的類型值（`EngineType.X` 或 `EngineType("x")`）"""
+    try:
+        if isinstance(node, ast.Attribute):
+            return EngineType[node.attr].value
+        if isinstance(node, ast.Call) and node.args and isinstance(node.args[0], ast.Constant):
+            return EngineType(node.args[0].value).value
+    except (KeyError, ValueError):
+        pass
+    return None
+
+
+def parse_module_classes(source: bytes, filename: str = "<module>") -> List[Dict[str, Any]]:
+    """
+    解析模組頂層類定義
+
+    Returns:
+        [{"name", "bases", "engine_type"}]，按定義順序
+    """
+    classes = []
+    for node in ast.parse(source, filename=filename).body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        engine_type = None
+        for statement in node.body:
+            if isinstance(statement, ast.Assign):
+                targets = statement.targets
+            elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+                targets = [statement.target]
+            else:
+                continue
+            if any(isinstance(t, ast.Name) and t.id == "ENGINE_TYPE" for t in targets):
+                engine_type = _engine_type(statement.value)
+        classes.append({
+            "name": node.name,
+            "bases": [name for name in map(_base_name, node.bases) if name],
+            "engine_type": engine_type,
+        })
+    return classes
+
+
+def _framework_classes() -> Dict[str, Optional[str]]:
+    """engine_base 中定義的引擎基類 {類名: ENGINE_TYPE 值}"""
+    classes = {}
+    for name, obj in vars(engine_base).items():
+        if isinstance(obj, type) and issubclass(obj, BaseEngine) and obj.__module__ == engine_base.__name__:
+            engine_type = obj.__dict__.get("ENGINE_TYPE")
+            classes[name] = engine_type.value if isinstance(engine_type, EngineType) else None
+    return classes
+
+
+# ============================================================================
+# 清單快取
+# ============================================================================
+
+class EngineManifest:
+    """
+    引擎清單快取
+
+    使用方式:
+        manifest = EngineManifest(STATE_PATH / "engine_manifest.json")
+        engines = manifest.discover([ENGINES_PATH])
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        """
+        Args:
+            cache_path: 清單快取文件（None 時不持久化）
+        """
+        self.cache_path = cache_path
+        self.hits = 0
+        self.misses = 0
+        self._modules: Dict[str, Dict[str, Any]] = {}
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self._modules = data.get("modules", {})
+                self._configs = data.get("configs", {})
+        except (OSError, ValueError) as e:
+            logger.debug(f"讀取引擎清單快取失敗 {self.cache_path}: {e}")
+
+    def save(self) -> None:
+        """寫入清單快取（臨時文件 + 原子替換）"""
+        if not self.cache_path or not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "modules": self._modules, "configs": self._configs}, f)
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
+
+    def discover(self, search_paths: List[Path]) -> List[Dict[str, Any]]:
+        """
+        發現引擎類與 engine.yaml 配置
+
+        Args:
+            search_paths: 搜尋目錄（不存在的目錄略過）
+
+        Returns:
+            與 EngineRegistry.discover_engines 相同格式的引擎資訊列表：
+            先列出各搜尋目錄中的引擎類，再列出 engine.yaml 配置
+        """
+        modules: List[Tuple[str, List[Dict[str, Any]]]] = []
+        configs: List[Dict[str, Any]] = []
+        seen_modules: Set[str] = set()
+        seen_configs: Set[str] = set()
+
+        for search_path in search_paths:
+            if not search_path.exists():
+                continue
+            path_configs = []
+            for path, stat in self._walk(search_path):
+                key = str(path)
+                if path.name == "engine.yaml":
+                    seen_configs.add(key)
+                    config = self._cached(self._configs, key, stat, lambda path=path: self._read_config(path))
+                    if config:
+                        path_configs.append(dict(config, config_path=key))
+                elif path.suffix == ".py" and not path.name.startswith('_'):
+                    seen_modules.add(key)
+                    classes = self._cached(self._modules, key, stat, lambda path=path: self._parse_module(path))
+                    modules.append((key, classes))
+            configs.extend(path_configs)
+
+        # 刪除已不存在的文件（僅限本次搜尋範圍內）
+        roots = tuple(str(p) + os.sep for p in search_paths)
+        for entries, seen in ((self._modules, seen_modules), (self._configs, seen_configs)):
+            for key in [k for k in entries if k.startswith(roots) and k not in seen]:
+                del entries[key]
+                self._dirty = True
+
+        self.save()
+        return self._resolve(modules) + configs
+
+    def _walk(self, root: Path) -> Iterator[Tuple[Path, os.stat_result]]:
+        """遍歷目錄，返回 .py 與 engine.yaml 文件及其 stat（按路徑排序）"""
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIPPED_DIRS)
+            for filename in sorted(filenames):
+                if filename.endswith(".py") or filename == "engine.yaml":
+                    path = Path(dirpath) / filename
+                    try:
+                        yield path, path.stat()
+                    except OSError:
+                        continue
+
+    def _cached(self, entries: Dict[str, Dict[str, Any]], key: str, stat: os.stat_result, compute) -> Any:
+        """(路徑, mtime, 大小) 未變時返回快取值，否則重新計算並更新快取"""
+        entry = entries.get(key)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            self.hits += 1
+            return entry["value"]
+        self.misses += 1
+        value = compute()
+        entries[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "value": value}
+        self._dirty = True
+        return value
+
+    @staticmethod
+    def _parse_module(path: Path) -> List[Dict[str, Any]]:
+        try:
+            return parse_module_classes(path.read_bytes(), str(path))
+        except (OSError, SyntaxError, ValueError) as e:
+            logger.debug(f"解析模組失敗 {path}: {e}")
+            return []
+
+    @staticmethod
+    def _read_config(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f)
+            return config if isinstance(config, dict) else None
+        except (OSError, yaml.YAMLError) as e:
+            logger.debug(f"讀取配置失敗 {path}: {e}")
+            return None
+
+    @staticmethod
+    def _resolve(modules: List[Tuple[str, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """按類名解析繼承鏈，找出所有 BaseEngine 子類"""
+        engine_types: Dict[str, Optional[str]] = _framework_classes()
+        framework = set(engine_types)
+        pending = [(path, cls) for path, classes in modules for cls in classes]
+
+        # 逐輪傳播，直到沒有新的引擎類（輪數等於最長的跨文件繼承鏈）
+        engines: Dict[Tuple[str, str], Optional[str]] = {}
+        changed = True
+        while changed:
+            changed = False
+            for path, cls in pending:
+                key = (path, cls["name"])
+                if key in engines or cls["name"] in framework:
+                    continue
+                bases = [b for b in cls["bases"] if b in engine_types]
+                if not bases:
+                    continue
+                engine_type = cls["engine_type"] or next(
+                    (engine_types[b] for b in bases if engine_types[b]), None
+                )
+                engines[key] = engine_type
+                if cls["name"] not in engine_types or engine_type:
+                    engine_types[cls["name"]] = engine_type
+                changed = True
+
+        return [
+            {
+                "class_name": cls["name"],
+                "module_path": path,
+                "engine_type": engines[(path, cls["name"])] or EngineType.EXECUTION.value,
+            }
+            for path, cls in pending
+            if (path, cls["name"]) in engines and not cls["name"].startswith('_')
+        ]
@@ -77,11 +77,15 @@ import json
 import yaml
 import sys
 import signal
+import itertools
+import random
+import time
+import uuid
 import importlib
 import importlib.util
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Type, Set, Callable, Union
+from typing import Dict, List, Optional, Any, Type, Set, Callable, Tuple, Union
 from dataclasses import dataclass, field, asdict
 from enum import Enum, auto
 import logging
@@ -91,6 +95,7 @@ from engine_base import (
     BaseEngine, EngineConfig, EngineState, EngineType,
     ExecutionMode, Priority, EngineEvent, TaskResult, HealthStatus
 )
+from engine_discovery import EngineManifest
 
 # ============================================================================
 # 常數定義
@@ -116,11 +121,16 @@ class OrchestratorConfig:
     auto_start_engines: bool = True         # 自動啟動引擎
     auto_recover: bool = True               # 自動恢復
     auto_scale: bool = False                # 自動擴縮
+    lazy_engine_loading: bool = True        # 首次調度時才導入引擎模組
+    discovery_cache: bool = True            # 持久化引擎發現清單
 
     # 執行設定
     max_concurrent_engines: int = 50        # 最大並行引擎數
     health_check_interval: float = 30.0     # 健康檢查間隔
     garbage_collect_interval: float = 300.0 # 垃圾回收間隔
+    dispatch_workers: int = 4               # 調度器分發工作者數
+    engine_queue_size: int = 100            # 每個引擎的調度隊列上限
+    max_engine_concurrency: int = 10        # 每個引擎的並發任務上限
 
     # 路徑配置
     engines_paths: List[str] = field(default_factory=lambda: [
@@ -157,6 +167,7 @@ class EngineRegistration:
     registered_at: str = ""
     last_health_check: str = ""
     healthy: bool = False
+    lazy: bool = False                      # 尚未載入，首次調度時導入並啟動
 
 # ============================================================================
 # 事件總線
@@ -338,6 +349,8 @@ class EngineRegistry:
     def __init__(self):
         self._engines: Dict[str, EngineRegistration] = {}
         self._engine_classes: Dict[str, Type[BaseEngine]] = {}
+        self._modules: Dict[str, Any] = {}
+        self._activation_locks: Dict[str, asyncio.Lock] = {}
         self._logger = logging.getLogger("engine_registry")
 
     def register_class(self, name: str, engine_class: Type[BaseEngine]):
@@ -377,20 +390,25 @@ class EngineRegistry:
         """獲取引擎類"""
         return self._engine_classes.get(name)
 
-    def discover_engines(self, search_paths: List[Path]) -> List[Dict[str, Any]]:
+    def discover_engines(self, search_paths: List[Path],
+                         cache_path: Optional[Path] = None) -> List[Dict[str, Any]]:
         """
         Automatically discover and collect engine metadata from specified directories.
 
         This method implements a dual-strategy engine discovery system that scans
         filesystem paths for both Python modules containing BaseEngine subclasses
-        and YAML configuration files defining engine specifications.
+        and YAML configuration files defining engine specifications. No module is
+        imported during discovery; see `engine_discovery.EngineManifest`.
 
         Discovery Strategies:
         ---------------------
-        1. **Python Module Introspection**:
-           - Recursively scans for all `*.py` files in search paths
+        1. **Static Python Module Analysis**:
+           - Walks all `*.py` files in search paths in a single pass
            - Excludes files starting with underscore (private modules)
-           - Dynamically loads modules and inspects for BaseEngine subclasses
+           - Parses each module's AST for top-level class definitions
+           - Resolves inheritance by class name across files, so engines that
+             derive from `ExecutionEngineBase` or from another discovered
+             engine are found as well
            - Extracts engine metadata (class name, module path, engine type)
 
         2. **YAML Configuration Discovery**:
@@ -404,6 +422,9 @@ class EngineRegistry:
         search_paths : List[Path]
             List of directory paths to search for engines. Non-existent paths
             are silently skipped without raising errors.
+        cache_path : Optional[Path]
+            Manifest cache file. Parsed classes and engine.yaml contents are
+            keyed by (path, mtime, size); only changed files are re-read.
 
         Returns:
         --------
@@ -414,8 +435,10 @@ class EngineRegistry:
             For Python module discoveries, each dict contains:
             - `class_name` (str): Name of the BaseEngine subclass
             - `module_path` (str): Absolute path to the Python module file
-            - `engine_type` (str): Engine type value from ENGINE_TYPE attribute
-                                   or defaults to `EngineType.EXECUTION` (the enum value; if a string is returned, it is extracted via `.value`)
+            - `engine_type` (str): Value of the `ENGINE_TYPE = EngineType.X`
+                                   class attribute (inherited from engine base
+                                   classes when absent), otherwise
+                                   `EngineType.EXECUTION.value`
 
             For YAML config discoveries, each dict contains:
             - All fields defined in the YAML file
@@ -425,28 +448,22 @@ class EngineRegistry:
         ---------
         - **Non-blocking**: Discovery failures are logged at DEBUG level and
           do not halt the overall discovery process.
-          Note: Because failures are logged at DEBUG level, they may not be visible in production environments unless debug logging is enabled. This can make troubleshooting discovery issues more difficult.
-        - **Recursive**: Searches entire directory trees using rglob patterns
-        - **Safe**: Catches and handles module loading exceptions gracefully
+        - **Side-effect free**: Module code is never executed during discovery;
+          engines are imported by `load_engine()` when first needed
+        - **Definitions only**: Classes imported into a module (for example
+          `from engine_base import ExecutionEngineBase`) are not reported;
+          classes defined in `engine_base` itself are never reported
         - **Deduplication**: Caller is responsible for handling duplicate
           discoveries (same engine found via both strategies)
 
         File Exclusions:
         ----------------
         - Python files starting with `_` (e.g., `__init__.py`, `_private.py`)
-        - Directories without read permissions (silently skipped)
-
-        Module Loading:
-        ---------------
-        - Uses `importlib.util.spec_from_file_location` for dynamic loading
-        - Modules are loaded in isolated namespace to prevent conflicts
-        - Only inspects module-level class definitions
-        - Does not instantiate engines during discovery phase
+        - `__pycache__`, `node_modules`, `.git` and virtualenv directories
 
         Error Handling:
         ---------------
         - Invalid Python syntax: Logged and skipped
-        - Import errors: Logged and skipped
         - YAML parse errors: Logged and skipped
         - File permission errors: Silently skipped
 
@@ -467,10 +484,9 @@ class EngineRegistry:
 
         Performance Considerations:
         ---------------------------
-        - Discovery time scales with number of files in search paths
-        - Module loading incurs one-time import cost per Python file
-        - Recommended to cache results and re-discover only on file changes
-        - Consider using file system watchers for production deployments
+        - Discovery time scales with the size of changed files only when a
+          cache is used; unchanged files cost one `stat()` call
+        - Startup memory no longer grows with imported engine modules
 
         Thread Safety:
         --------------
@@ -479,232 +495,295 @@ class EngineRegistry:
 
         See Also:
         ---------
-        - `_inspect_module()`: Internal method for Python module introspection
+        - `engine_discovery.EngineManifest`: AST scan and manifest cache
+        - `load_engine()`: Import and instantiate a registered engine
         - `register_engine()`: Register discovered engines for use
         - `EngineConfig`: Expected configuration structure for engines
         """
-        discovered = []
-
-        for search_path in search_paths:
-            if not search_path.exists():
-                continue
-
-            # 搜尋 Python 模組
-            for py_file in search_path.rglob("*.py"):
-                if py_file.name.startswith('_'):
-                    continue
-
-                try:
-                    engine_info = self._inspect_module(py_file)
-                    if engine_info:
-                        discovered.extend(engine_info)
-                except Exception as e:
-                    self._logger.debug(f"檢查模組失敗 {py_file}: {e}")
-
-            # 搜尋配置檔
-            for config_file in search_path.rglob("engine.yaml"):
-                try:
-                    with open(config_file, 'r', encoding='utf-8') as f:
-                        config = yaml.safe_load(f)
-                    if config:
-                        config['config_path'] = str(config_file)
-                        discovered.append(config)
-                except Exception as e:
-                    self._logger.debug(f"讀取配置失敗 {config_file}: {e}")
-
+        manifest = EngineManifest(cache_path)
+        discovered = manifest.discover(search_paths)
+        self._logger.debug(f"引擎清單快取: 命中 {manifest.hits}, 重新解析 {manifest.misses}")
         return discovered
 
-    def _inspect_module(self, module_path: Path) -> List[Dict[str, Any]]:
-        """
-        INTERNAL: Inspect a Python module file to discover BaseEngine subclasses.
-
-        This is a private/internal method. It dynamically loads a Python module and uses
-        runtime introspection to identify all classes that inherit from BaseEngine, extracting
-        metadata for registration.
-
-        Do NOT call this method directly. Use the public `discover_engines()` method instead,
-        which handles engine discovery and registration in a safe and supported manner.
-
-        Parameters
-        ----------
-        module_path : Path
-            Path to the Python module file (.py) to inspect.
-
-        Returns
-        -------
-        List[Dict[str, Any]]
-            List of metadata dictionaries for each discovered engine class, or an empty list.
-        Engine Class Criteria:
-        ----------------------
-        A class is considered a valid engine if ALL of these conditions are met:
-        - Is a Python class (type instance)
-        - Is a subclass of BaseEngine
-        - Is NOT the BaseEngine class itself (no self-inheritance)
-        - Class name does not start with underscore (public classes only)
-
-        Metadata Extraction:
-        --------------------
-        - **class_name**: Directly from the class `__name__` attribute
-        - **module_path**: Converted to string for JSON serialization
-        - **engine_type**: String value extracted from the ENGINE_TYPE class 
-                           attribute if present, otherwise defaults to the 
-                           string value of EngineType.EXECUTION
-
-        Error Handling:
-        ---------------
-        All exceptions during module loading and introspection are silently
-        caught and ignored. **No exceptions are logged at all.**
-
-        .. warning::
-           This may make debugging difficult, as any errors (e.g., syntax errors,
-           missing dependencies, or other failures) will be completely silent.
-           Unlike ``discover_engines``, which logs exceptions at DEBUG level,
-           this method does not log any errors during discovery.
-
-        This ensures that:
-        - Syntax errors in modules don't crash discovery
-        - Missing dependencies don't halt the process
-        - Malformed modules are gracefully skipped
-
-        Common failure scenarios:
-        - ImportError: Module has missing dependencies
-        - SyntaxError: Module contains invalid Python syntax
-        - AttributeError: Module has unexpected structure
-        - FileNotFoundError: Module path is invalid (should not occur with proper caller)
-
-        Security Considerations:
-        ------------------------
-        - **Code Execution**: This method executes arbitrary Python code from files
-        - **Trust Boundary**: Only use with trusted module paths from controlled
-          search directories
-        - **Isolation**: Each module is loaded in a fresh namespace to prevent
-          cross-contamination
-        - **No Sandbox**: This method does NOT provide security sandboxing
-
-        Performance Notes:
-        ------------------
-        - Module loading has O(n) complexity where n = file size
-        - Class introspection is O(m) where m = number of module attributes
-        - Each module is loaded only once per discovery cycle
-        - Consider caching results for frequently inspected modules
-
-        Example Discovered Metadata:
-        ----------------------------
-        >>> engines = registry._inspect_module(Path("engines/validator.py"))
-        >>> print(engines)
-        [
-            {
-                'class_name': 'ValidationEngine',
-                'module_path': '/app/tools/automation/engines/validator.py',
-                'engine_type': 'validation'
-            },
-            {
-                'class_name': 'SyntaxValidationEngine',
-                'module_path': '/app/tools/automation/engines/validator.py',
-                'engine_type': 'validation'
-            }
-        ]
-
-        See Also:
-        ---------
-        - `discover_engines()`: Public method that calls this for module discovery
-        - `BaseEngine`: The base class that all engines must inherit from
-        - `EngineType`: Enum defining valid engine type values
-        """
-        engines = []
-
-        try:
+    def _load_module(self, module_path: str):
+        """導入引擎模組（同一路徑只導入一次）"""
+        module = self._modules.get(module_path)
+        if module is None:
             spec = importlib.util.spec_from_file_location(
-                module_path.stem, module_path
+                Path(module_path).stem, module_path
             )
             if spec is None or spec.loader is None:
-                return engines
-
+                raise ImportError(f"無法載入模組: {module_path}")
             module = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(module)
+            self._modules[module_path] = module
+        return module
 
-            # 尋找 BaseEngine 子類
-            for name, obj in vars(module).items():
-                if (isinstance(obj, type) and
-                    issubclass(obj, BaseEngine) and
-                    obj is not BaseEngine and
-                    not name.startswith('_')):
-
-                    # 獲取引擎資訊
-                    engines.append({
-                        "class_name": name,
-                        "module_path": str(module_path),
-                        "engine_type": getattr(obj, 'ENGINE_TYPE', EngineType.EXECUTION).value,
-                    })
+    def load_engine(self, registration: EngineRegistration) -> BaseEngine:
+        """
+        導入模組並建立引擎實例
 
-        except Exception as e:
-            pass
+        Raises:
+            Exception: 模組導入或引擎建構失敗
+        """
+        if registration.instance is None:
+            module = self._load_module(registration.module_path)
+            engine_class = getattr(module, registration.engine_class)
+            registration.instance = engine_class(registration.config)
+            registration.lazy = False
+            self._logger.info(f"引擎已載入: {registration.engine_name}")
+        return registration.instance
+
+    async def activate_engine(self, registration: EngineRegistration) -> bool:
+        """
+        確保延遲載入的引擎已載入並啟動（並發調用只載入一次）
 
-        return engines
+        Returns:
+            bool: 引擎是否可用
+        """
+        lock = self._activation_locks.setdefault(registration.engine_id, asyncio.Lock())
+        async with lock:
+            if not registration.lazy:
+                return registration.healthy and registration.instance is not None
+            try:
+                instance = self.load_engine(registration)
+                registration.healthy = await instance.start()
+            except Exception as e:
+                registration.lazy = False
+                registration.healthy = False
+                self._logger.error(f"載入引擎 {registration.engine_class} 失敗: {e}")
+            return registration.healthy
 
 # ============================================================================
 # 引擎調度器
 # ============================================================================
 
+@dataclass
+class EngineLane:
+    """單一引擎的調度通道（有界隊列、並發上限與負載統計）"""
+    registration: EngineRegistration
+    queue: asyncio.PriorityQueue
+    concurrency: int
+    workers: List[asyncio.Task] = field(default_factory=list)
+    in_flight: int = 0
+    dispatched: int = 0
+    completed: int = 0
+    failed: int = 0
+    latency_ewma_ms: Optional[float] = None
+    wait_ewma_ms: Optional[float] = None
+    max_wait_ms: float = 0.0
+
+    @property
+    def outstanding(self) -> int:
+        """排隊與執行中的任務數"""
+        return self.queue.qsize() + self.in_flight
+
+
 class EngineScheduler:
     """
     引擎調度器 - 任務調度與分發
+
+    - 提交的任務進入全局優先隊列，由多個分發工作者路由到各引擎的有界隊列
+    - 按類型調度時使用 power-of-two-choices：隨機取兩個候選引擎，
+      選擇「未完成任務數 × 延遲 EWMA / 並發上限」較小者
+    - 每個引擎以等同其並發上限的工作者消費隊列；隊列滿時分發工作者等待（背壓）
     """
 
-    def __init__(self, registry: EngineRegistry, event_bus: EventBus):
+    LATENCY_ALPHA = 0.2  # EWMA 平滑係數
+
+    def __init__(self, registry: EngineRegistry, event_bus: EventBus,
+                 dispatch_workers: int = 4, engine_queue_size: int = 100,
+                 max_engine_concurrency: int = 10):
         self._registry = registry
         self._event_bus = event_bus
         self._task_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._dispatch_workers = max(1, dispatch_workers)
+        self._engine_queue_size = engine_queue_size
+        self._max_engine_concurrency = max(1, max_engine_concurrency)
+        self._lanes: Dict[str, EngineLane] = {}
+        self._dispatchers: List[asyncio.Task] = []
+        self._random = random.Random()
+        self._routed = 0
+        self._unroutable = 0
         self._running = False
         self._logger = logging.getLogger("engine_scheduler")
 
     async def start(self):
         """啟動調度器"""
         self._running = True
-        asyncio.create_task(self._schedule_loop())
-        self._logger.info("調度器已啟動")
+        self._dispatchers = [
+            asyncio.create_task(self._schedule_loop()) for _ in range(self._dispatch_workers)
+        ]
+        self._logger.info(f"調度器已啟動 ({self._dispatch_workers} 個分發工作者)")
 
     async def stop(self):
-        """停止調度器"""
+        """停止調度器（取消分發與引擎工作者）"""
         self._running = False
+        workers = self._dispatchers + [w for lane in self._lanes.values() for w in lane.workers]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._dispatchers = []
+        self._lanes.clear()
 
     async def schedule_task(self, task: Dict[str, Any], priority: Priority = Priority.NORMAL):
         """調度任務"""
-        await self._task_queue.put((priority.value, task))
+        task["task_id"] = task.get("task_id") or str(uuid.uuid4())
+        task["submitted_at"] = datetime.now().isoformat()
+        # 序號保證同優先級按提交順序執行，且不比較任務字典
+        await self._task_queue.put((priority.value, next(self._sequence), time.monotonic(), task))
 
     async def _schedule_loop(self):
         """調度循環"""
         while self._running:
             try:
-                _, task = await asyncio.wait_for(self._task_queue.get(), timeout=1.0)
-                await self._dispatch_task(task)
+                entry = await asyncio.wait_for(self._task_queue.get(), timeout=1.0)
+                await self._dispatch_task(entry)
             except asyncio.TimeoutError:
                 continue
             except Exception as e:
                 self._logger.error(f"調度錯誤: {e}")
 
-    async def _dispatch_task(self, task: Dict[str, Any]):
-        """分發任務"""
+    async def _dispatch_task(self, entry: Tuple[int, int, float, Dict[str, Any]]):
+        """分發任務到選定引擎的隊列"""
+        task = entry[3]
+        reg = await self._select_target(task)
+        if reg is None:
+            self._unroutable += 1
+            self._logger.warning(f"找不到合適的引擎執行任務: {task.get('task_id')}")
+            return
+
+        lane = self._get_lane(reg)
+        await lane.queue.put(entry)
+        lane.dispatched += 1
+        self._routed += 1
+
+    async def _select_target(self, task: Dict[str, Any]) -> Optional[EngineRegistration]:
+        """按目標引擎 ID 或類型選擇引擎"""
         target_engine_id = task.get("target_engine_id")
         target_engine_type = task.get("target_engine_type")
 
-        # 找到合適的引擎
         if target_engine_id:
             reg = self._registry.get_engine(target_engine_id)
+            if reg and reg.lazy:
+                await self._registry.activate_engine(reg)
             if reg and reg.instance and reg.healthy:
-                await reg.instance.submit_task(task)
-                return
+                return reg
 
         elif target_engine_type:
             engines = self._registry.get_engines_by_type(EngineType(target_engine_type))
             healthy_engines = [e for e in engines if e.healthy and e.instance]
+            if not healthy_engines:
+                # 沒有已載入的可用引擎時載入延遲引擎
+                for e in engines:
+                    if e.lazy and await self._registry.activate_engine(e):
+                        healthy_engines.append(e)
+                        break
             if healthy_engines:
-                # 負載均衡 (簡單輪詢)
-                engine = healthy_engines[0]
-                await engine.instance.submit_task(task)
-                return
+                return self.select_engine(healthy_engines)
+
+        return None
+
+    def select_engine(self, candidates: List[EngineRegistration]) -> EngineRegistration:
+        """power-of-two-choices：隨機取兩個候選，返回預期完成時間較短者"""
+        if len(candidates) > 2:
+            candidates = self._random.sample(candidates, 2)
+        default_latency = self._default_latency()
+        return min(candidates, key=lambda reg: self._load_score(reg, default_latency))
+
+    def _load_score(self, reg: EngineRegistration, default_latency: float) -> Tuple[bool, float]:
+        """(隊列已滿, 未完成任務數 × 延遲 EWMA / 並發上限)"""
+        lane = self._lanes.get(reg.engine_id)
+        if lane is None:
+            return (False, 0.0)
+        latency = lane.latency_ewma_ms if lane.latency_ewma_ms is not None else default_latency
+        return (lane.queue.full(), (lane.outstanding + 1) * latency / lane.concurrency)
+
+    def _default_latency(self) -> float:
+        """尚無延遲樣本的引擎使用已知引擎的平均延遲"""
+        samples = [lane.latency_ewma_ms for lane in self._lanes.values() if lane.latency_ewma_ms is not None]
+        return sum(samples) / len(samples) if samples else 1.0
+
+    def _get_lane(self, reg: EngineRegistration) -> EngineLane:
+        """獲取或建立引擎通道"""
+        lane = self._lanes.get(reg.engine_id)
+        if lane is None:
+            concurrency = max(1, min(self._max_engine_concurrency,
+                                     reg.config.resource.max_concurrent_tasks))
+            lane = EngineLane(
+                registration=reg,
+                queue=asyncio.PriorityQueue(maxsize=self._engine_queue_size),
+                concurrency=concurrency,
+            )
+            lane.workers = [asyncio.create_task(self._lane_worker(lane)) for _ in range(concurrency)]
+            self._lanes[reg.engine_id] = lane
+        return lane
+
+    def _ewma(self, previous: Optional[float], value: float) -> float:
+        if previous is None:
+            return value
+        return self.LATENCY_ALPHA * value + (1 - self.LATENCY_ALPHA) * previous
+
+    async def _lane_worker(self, lane: EngineLane):
+        """引擎工作者：從引擎隊列取任務並執行"""
+        reg = lane.registration
+        while self._running:
+            entry = await lane.queue.get()
+            try:
+                instance = reg.instance
+                if instance is None or not reg.healthy:
+                    # 引擎已不可用，交回全局隊列重新路由
+                    await self._task_queue.put(entry)
+                    await asyncio.sleep(0.1)
+                    continue
+                while instance.state == EngineState.PAUSED:
+                    await asyncio.sleep(0.5)
+
+                wait_ms = (time.monotonic() - entry[2]) * 1000
+                lane.wait_ewma_ms = self._ewma(lane.wait_ewma_ms, wait_ms)
+                lane.max_wait_ms = max(lane.max_wait_ms, wait_ms)
+
+                lane.in_flight += 1
+                start = time.monotonic()
+                try:
+                    result = await instance._process_task(entry[3])
+                finally:
+                    lane.in_flight -= 1
+                lane.latency_ewma_ms = self._ewma(lane.latency_ewma_ms, (time.monotonic() - start) * 1000)
+
+                if result.success:
+                    lane.completed += 1
+                else:
+                    lane.failed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                lane.failed += 1
+                self._logger.error(f"引擎 {reg.engine_name} 執行任務失敗: {e}")
 
-        self._logger.warning(f"找不到合適的引擎執行任務: {task.get('task_id')}")
+    def get_metrics(self) -> Dict[str, Any]:
+        """調度指標：全局隊列、各引擎隊列深度、等待時間與延遲"""
+        return {
+            "pending": self._task_queue.qsize(),
+            "routed": self._routed,
+            "unroutable": self._unroutable,
+            "engines": {
+                engine_id: {
+                    "name": lane.registration.engine_name,
+                    "queue_depth": lane.queue.qsize(),
+                    "in_flight": lane.in_flight,
+                    "concurrency": lane.concurrency,
+                    "dispatched": lane.dispatched,
+                    "completed": lane.completed,
+                    "failed": lane.failed,
+                    "latency_ewma_ms": lane.latency_ewma_ms,
+                    "wait_ewma_ms": lane.wait_ewma_ms,
+                    "max_wait_ms": lane.max_wait_ms,
+                }
+                for engine_id, lane in self._lanes.items()
+            },
+        }
 
 # ============================================================================
 # 管道執行器
@@ -790,13 +869,21 @@ class PipelineExecutor:
         engine = None
         if engine_id:
             reg = self._registry.get_engine(engine_id)
+            if reg and reg.lazy:
+                await self._registry.activate_engine(reg)
             if reg and reg.instance:
                 engine = reg.instance
         elif engine_type:
             engines = self._registry.get_engines_by_type(EngineType(engine_type))
             healthy = [e for e in engines if e.healthy and e.instance]
+            if not healthy:
+                # 沒有已載入的可用引擎時載入延遲引擎
+                for e in engines:
+                    if e.lazy and await self._registry.activate_engine(e):
+                        healthy.append(e)
+                        break
             if healthy:
-                engine = healthy[0].instance
+                engine = self._scheduler.select_engine(healthy).instance
 
         if not engine:
             return {"success": False, "error": "找不到引擎"}
@@ -889,18 +976,21 @@ class HealthMonitor:
         """獲取系統健康概覽"""
         engines = self._registry.get_all_engines()
         healthy = [e for e in engines if e.healthy]
+        # 尚未載入的延遲引擎不計入健康比例
+        loaded = len(engines) - sum(1 for e in engines if e.lazy)
 
         return {
             "total_engines": len(engines),
             "healthy_engines": len(healthy),
-            "unhealthy_engines": len(engines) - len(healthy),
-            "health_ratio": len(healthy) / len(engines) if engines else 1.0,
+            "unhealthy_engines": loaded - len(healthy),
+            "lazy_engines": len(engines) - loaded,
+            "health_ratio": len(healthy) / loaded if loaded else 1.0,
             "engines": [
                 {
                     "id": e.engine_id,
                     "name": e.engine_name,
                     "healthy": e.healthy,
-                    "state": e.instance.state.name if e.instance else "N/A",
+                    "state": e.instance.state.name if e.instance else ("LAZY" if e.lazy else "N/A"),
                 }
                 for e in engines
             ],
@@ -929,7 +1019,12 @@ class MasterOrchestrator:
         # 核心組件
         self.event_bus = EventBus(max_size=self.config.event_queue_size)
         self.registry = EngineRegistry()
-        self.scheduler = EngineScheduler(self.registry, self.event_bus)
+        self.scheduler = EngineScheduler(
+            self.registry, self.event_bus,
+            dispatch_workers=self.config.dispatch_workers,
+            engine_queue_size=self.config.engine_queue_size,
+            max_engine_concurrency=self.config.max_engine_concurrency,
+        )
         self.pipeline_executor = PipelineExecutor(self.registry, self.scheduler)
         self.health_monitor = HealthMonitor(self.registry, self.event_bus)
 
@@ -1038,7 +1133,10 @@ class MasterOrchestrator:
         self._logger.info("發現引擎中...")
 
         search_paths = [BASE_PATH / p for p in self.config.engines_paths]
-        discovered = self.registry.discover_engines(search_paths)
+        cache_path = None
+        if self.config.discovery_cache:
+            cache_path = BASE_PATH / self.config.state_path / "engine_manifest.json"
+        discovered = self.registry.discover_engines(search_paths, cache_path)
 
         self._logger.info(f"發現 {len(discovered)} 個引擎")
 
@@ -1056,42 +1154,32 @@ class MasterOrchestrator:
         if not module_path or not class_name:
             return
 
-        try:
-            # 動態載入模組
-            spec = importlib.util.spec_from_file_location(
-                Path(module_path).stem, module_path
-            )
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-
-            # 獲取引擎類
-            engine_class = getattr(module, class_name)
-
-            # 建立配置
-            config = EngineConfig(
-                engine_name=class_name,
-                engine_type=EngineType(info.get("engine_type", "execution")),
-                execution_mode=ExecutionMode.AUTONOMOUS,
-            )
+        # 建立配置
+        config = EngineConfig(
+            engine_name=class_name,
+            engine_type=EngineType(info.get("engine_type", "execution")),
+            execution_mode=ExecutionMode.AUTONOMOUS,
+        )
 
-            # 建立實例
-            instance = engine_class(config)
-
-            # 註冊
-            registration = EngineRegistration(
-                engine_id=config.engine_id,
-                engine_name=class_name,
-                engine_class=class_name,
-                engine_type=config.engine_type,
-                module_path=module_path,
-                config=config,
-                instance=instance,
-            )
+        registration = EngineRegistration(
+            engine_id=config.engine_id,
+            engine_name=class_name,
+            engine_class=class_name,
+            engine_type=config.engine_type,
+            module_path=module_path,
+            config=config,
+            lazy=self.config.lazy_engine_loading,
+        )
 
-            self.registry.register_engine(registration)
+        # 延遲載入時只註冊，首次調度時才導入模組
+        if not registration.lazy:
+            try:
+                self.registry.load_engine(registration)
+            except Exception as e:
+                self._logger.error(f"載入引擎 {class_name} 失敗: {e}")
+                return
 
-        except Exception as e:
-            self._logger.error(f"載入引擎 {class_name} 失敗: {e}")
+        self.registry.register_engine(registration)
 
     async def _start_all_engines(self):
         """啟動所有引擎"""
@@ -1124,6 +1212,8 @@ class MasterOrchestrator:
     async def start_engine(self, engine_id: str) -> bool:
         """啟動指定引擎"""
         reg = self.registry.get_engine(engine_id)
+        if reg and reg.lazy:
+            return await self.registry.activate_engine(reg)
         if not reg or not reg.instance:
             return False
         return await reg.instance.start()
@@ -1179,6 +1269,8 @@ class MasterOrchestrator:
     async def execute_task(self, engine_id: str, task: Dict[str, Any]) -> TaskResult:
         """直接執行任務"""
         reg = self.registry.get_engine(engine_id)
+        if reg and reg.lazy:
+            await self.registry.activate_engine(reg)
         if not reg or not reg.instance:
             return TaskResult(
                 task_id=task.get("task_id", ""),
@@ -1208,11 +1300,12 @@ class MasterOrchestrator:
                     "name": e.engine_name,
                     "type": e.engine_type.value,
                     "healthy": e.healthy,
-                    "state": e.instance.state.name if e.instance else "N/A",
+                    "state": e.instance.state.name if e.instance else ("LAZY" if e.lazy else "N/A"),
                 }
                 for e in self.registry.get_all_engines()
             ],
             "pipelines": list(self.pipeline_executor._pipelines.keys()),
+            "scheduler": self.scheduler.get_metrics(),
         }
 
 # ============================================================================
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+靜態引擎發現測試
+Tests for AST-based engine discovery, the manifest cache and lazy loading
+"""
+
+import asyncio
+import json
+import os
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine_base import EngineConfig, EngineType, PersistenceConfig
+from engine_discovery import EngineManifest
+from master_orchestrator import (
+    EngineRegistration,
+    EngineRegistry,
+    EngineScheduler,
+    EventBus,
+    PipelineConfig,
+    PipelineExecutor,
+)
+
+
+def write(path: Path, source: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(source).lstrip())
+    return path
+
+
+@pytest.fixture
+def engines_dir(tmp_path):
+    root = tmp_path / "engines"
+    # 子類所在文件排在基類之前，需要跨文件多輪解析
+    write(root / "a_child.py", """
+        from m_middle import MiddleEngine
+
+        class ChildEngine(MiddleEngine):
+            pass
+
+        class Helper:
+            pass
+    """)
+    write(root / "m_middle.py", """
+        from z_base import SharedBase
+
+        class MiddleEngine(SharedBase):
+            pass
+    """)
+    write(root / "z_base.py", """
+        from engine_base import ValidationEngineBase, EngineType
+
+        class SharedBase(ValidationEngineBase):
+            ENGINE_TYPE = EngineType.VALIDATION
+
+        class _PrivateEngine(SharedBase):
+            pass
+    """)
+    write(root / "plain.py", """
+        from engine_base import ExecutionEngineBase
+
+        class PlainEngine(ExecutionEngineBase):
+            pass
+    """)
+    write(root / "_skipped.py", """
+        from engine_base import BaseEngine
+
+        class SkippedEngine(BaseEngine):
+            pass
+    """)
+    write(root / "broken.py", "class Broken(:\n")
+    write(root / "sub" / "engine.yaml", "engine_name: yaml-engine\n")
+    return root
+
+
+def write_lazy_engine(directory: Path, log: Path) -> Path:
+    """寫入一個在導入與啟動時記錄事件的引擎模組"""
+    return write(directory / "lazy_engine.py", f"""
+        import asyncio
+        from engine_base import ExecutionEngineBase, TaskResult
+
+        LOG = {str(log)!r}
+        with open(LOG, "a") as f:
+            f.write("import\\n")
+
+        class LazyEngine(ExecutionEngineBase):
+            async def _initialize(self):
+                await asyncio.sleep(0.01)
+                with open(LOG, "a") as f:
+                    f.write("start\\n")
+                return True
+
+            async def _execute(self, task):
+                return TaskResult(task_id=task["task_id"], success=True,
+                                  result={{"stage": task.get("label"), "input": task.get("input")}})
+
+            async def _shutdown(self):
+                return True
+
+            def _get_capabilities(self):
+                return {{}}
+
+            async def execute_operation(self, operation):
+                return {{}}
+
+            async def rollback(self, steps=1):
+                return True
+    """)
+
+
+def lazy_registration(registry: EngineRegistry, module_path: Path, name: str = "lazy") -> EngineRegistration:
+    config = EngineConfig(engine_name=name, persistence=PersistenceConfig(enabled=False))
+    registration = EngineRegistration(
+        engine_id=config.engine_id,
+        engine_name=name,
+        engine_class="LazyEngine",
+        engine_type=EngineType.EXECUTION,
+        module_path=str(module_path),
+        config=config,
+        lazy=True,
+    )
+    registry.register_engine(registration)
+    return registration
+
+
+def by_class(engines):
+    return {(e["class_name"], Path(e["module_path"]).name): e["engine_type"] for e in engines if "class_name" in e}
+
+
+class TestEngineDiscovery:
+    """AST 發現測試"""
+
+    def test_cross_file_inheritance(self, engines_dir):
+        """測試經由其他文件中的中間基類繼承的引擎被發現，引擎類型沿繼承鏈傳遞"""
+        engines = EngineManifest().discover([engines_dir])
+
+        assert by_class(engines) == {
+            ("ChildEngine", "a_child.py"): "validation",
+            ("MiddleEngine", "m_middle.py"): "validation",
+            ("SharedBase", "z_base.py"): "validation",
+            ("PlainEngine", "plain.py"): EngineType.EXECUTION.value,
+        }
+        configs = [e for e in engines if "config_path" in e]
+        assert [c["engine_name"] for c in configs] == ["yaml-engine"]
+
+    def test_imported_bases_not_reported(self, engines_dir):
+        """測試導入到模組中的基類只在其定義文件中報告，engine_base 的類從不報告"""
+        engines = by_class(EngineManifest().discover([engines_dir]))
+
+        assert ("MiddleEngine", "a_child.py") not in engines
+        assert ("SharedBase", "m_middle.py") not in engines
+        assert not any(name.endswith("EngineBase") for name, _ in engines)
+        assert not any(name in ("Helper", "SkippedEngine", "_PrivateEngine") for name, _ in engines)
+
+
+class TestManifestCache:
+    """清單快取測試"""
+
+    def test_hit_miss_and_prune(self, engines_dir, tmp_path):
+        """測試快取按 (路徑, mtime, 大小) 命中、失效與刪除"""
+        cache_path = tmp_path / "state" / "engine_manifest.json"
+        first = EngineManifest(cache_path)
+        expected = first.discover([engines_dir])
+        assert (first.hits, first.misses) == (0, 6)
+        assert cache_path.exists()
+
+        warm = EngineManifest(cache_path)
+        assert warm.discover([engines_dir]) == expected
+        assert (warm.hits, warm.misses) == (6, 0)
+
+        # 大小相同、mtime 不同
+        plain = engines_dir / "plain.py"
+        stat = plain.stat()
+        os.utime(plain, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        # 大小不同
+        write(engines_dir / "m_middle.py", """
+            from engine_base import TransformEngineBase, EngineType
+
+            class MiddleEngine(TransformEngineBase):
+                ENGINE_TYPE = EngineType.TRANSFORM
+        """)
+        (engines_dir / "z_base.py").unlink()
+
+        changed = EngineManifest(cache_path)
+        engines = by_class(changed.discover([engines_dir]))
+        assert (changed.hits, changed.misses) == (3, 2)
+        assert engines == {
+            ("ChildEngine", "a_child.py"): "transform",
+            ("MiddleEngine", "m_middle.py"): "transform",
+            ("PlainEngine", "plain.py"): EngineType.EXECUTION.value,
+        }
+
+        cached = json.loads(cache_path.read_text())["modules"]
+        assert str(engines_dir / "z_base.py") not in cached
+        assert str(engines_dir / "plain.py") in cached
+
+    def test_prune_limited_to_search_paths(self, engines_dir, tmp_path):
+        """測試只刪除本次搜尋範圍內已不存在的文件"""
+        other = tmp_path / "other"
+        write(other / "extra.py", """
+            from engine_base import ExecutionEngineBase
+
+            class ExtraEngine(ExecutionEngineBase):
+                pass
+        """)
+        cache_path = tmp_path / "engine_manifest.json"
+        EngineManifest(cache_path).discover([engines_dir, other])
+
+        EngineManifest(cache_path).discover([engines_dir])
+
+        cached = json.loads(cache_path.read_text())["modules"]
+        assert str(other / "extra.py") in cached
+
+
+class TestLazyActivation:
+    """延遲載入測試"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_activation_loads_once(self, tmp_path):
+        """測試並發調用 activate_engine 時模組只導入一次、引擎只啟動一次"""
+        log = tmp_path / "events.log"
+        module_path = write_lazy_engine(tmp_path, log)
+        engines = by_class(EngineManifest().discover([tmp_path]))
+        assert ("LazyEngine", "lazy_engine.py") in engines
+        assert not log.exists()
+
+        registry = EngineRegistry()
+        registration = lazy_registration(registry, module_path)
+
+        results = await asyncio.gather(*(registry.activate_engine(registration) for _ in range(10)))
+
+        assert all(results)
+        assert log.read_text().splitlines() == ["import", "start"]
+        assert not registration.lazy and registration.healthy
+        assert await registry.activate_engine(registration)
+        assert log.read_text().splitlines() == ["import", "start"]
+        await registration.instance.stop()
+
+    @pytest.mark.asyncio
+    async def test_pipeline_activates_lazy_engines(self, tmp_path):
+        """測試管道階段按引擎 ID 或類型指定延遲引擎時先載入並啟動引擎"""
+        log = tmp_path / "events.log"
+        module_path = write_lazy_engine(tmp_path, log)
+        registry = EngineRegistry()
+        by_id = lazy_registration(registry, module_path, "by-id")
+        executor = PipelineExecutor(registry, EngineScheduler(registry, EventBus()))
+        executor.register_pipeline(PipelineConfig(
+            pipeline_id="lazy",
+            name="lazy",
+            stages=[
+                {"engine_id": by_id.engine_id, "params": {"label": "first"}},
+                {"engine_type": EngineType.EXECUTION.value, "params": {"label": "second"}},
+            ],
+        ))
+
+        result = await executor.execute_pipeline("lazy", {"x": 1})
+
+        assert result["success"], result
+        assert [r["output"]["stage"] for r in result["results"]] == ["first", "second"]
+        assert result["results"][1]["output"]["input"] == {"stage": "first", "input": {"x": 1}}
+        assert not by_id.lazy and by_id.healthy
+        await by_id.instance.stop()
+
+        # 僅按類型指定時載入同類型的延遲引擎
+        registry = EngineRegistry()
+        by_type = lazy_registration(registry, module_path, "by-type")
+        executor = PipelineExecutor(registry, EngineScheduler(registry, EventBus()))
+        executor.register_pipeline(PipelineConfig(
+            pipeline_id="typed", name="typed", stages=[{"engine_type": EngineType.EXECUTION.value}],
+        ))
+
+        assert (await executor.execute_pipeline("typed"))["success"]
+        assert not by_type.lazy and by_type.healthy
+        await by_type.instance.stop()
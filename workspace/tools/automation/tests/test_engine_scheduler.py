@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+EngineScheduler 測試
+Tests for the load-aware EngineScheduler and its per-engine lanes
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine_base import (
+    BaseEngine,
+    EngineConfig,
+    EngineType,
+    PersistenceConfig,
+    Priority,
+    ResourceConfig,
+    TaskResult,
+)
+from master_orchestrator import EngineRegistration, EngineRegistry, EngineScheduler, EventBus
+
+
+class RecordingEngine(BaseEngine):
+    """記錄執行順序的引擎；gate 未設置時任務阻塞"""
+
+    def __init__(self, config: EngineConfig, gate: Optional[asyncio.Event] = None):
+        super().__init__(config)
+        self.gate = gate
+        self.executed: List[Any] = []
+
+    async def _initialize(self) -> bool:
+        return True
+
+    async def _execute(self, task: Dict[str, Any]) -> TaskResult:
+        if self.gate is not None:
+            await self.gate.wait()
+        self.executed.append(task.get("label"))
+        return TaskResult(task_id=task["task_id"], success=True)
+
+    async def _shutdown(self) -> bool:
+        return True
+
+    def _get_capabilities(self) -> Dict[str, Any]:
+        return {}
+
+
+async def add_engine(registry: EngineRegistry, name: str, concurrency: int = 1,
+                     gate: Optional[asyncio.Event] = None, healthy: bool = True) -> EngineRegistration:
+    config = EngineConfig(
+        engine_name=name,
+        resource=ResourceConfig(max_concurrent_tasks=concurrency),
+        persistence=PersistenceConfig(enabled=False),
+    )
+    instance = RecordingEngine(config, gate)
+    await instance.start()
+    registration = EngineRegistration(
+        engine_id=config.engine_id,
+        engine_name=name,
+        engine_class="RecordingEngine",
+        engine_type=EngineType.EXECUTION,
+        module_path=__file__,
+        config=config,
+        instance=instance,
+        healthy=healthy,
+    )
+    registry.register_engine(registration)
+    return registration
+
+
+async def wait_until(predicate, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+async def shutdown(scheduler: EngineScheduler, registry: EngineRegistry):
+    await scheduler.stop()
+    for reg in registry.get_all_engines():
+        await reg.instance.stop()
+
+
+class TestEngineScheduler:
+    """調度器測試"""
+
+    @pytest.mark.asyncio
+    async def test_equal_priority_is_fifo(self):
+        """測試同優先級按提交順序執行，且不比較任務字典"""
+        registry = EngineRegistry()
+        reg = await add_engine(registry, "fifo")
+        scheduler = EngineScheduler(registry, EventBus(), dispatch_workers=1, max_engine_concurrency=1)
+
+        # 任務字典互相不可比較；排序若落到字典上會拋出 TypeError
+        for i in range(20):
+            await scheduler.schedule_task({"target_engine_id": reg.engine_id, "label": i, "payload": {"i": i}})
+        await scheduler.schedule_task(
+            {"target_engine_id": reg.engine_id, "label": "urgent", "payload": {}}, Priority.HIGH
+        )
+        await scheduler.start()
+        await wait_until(lambda: len(reg.instance.executed) == 21)
+
+        assert reg.instance.executed == ["urgent"] + list(range(20))
+        assert scheduler.get_metrics()["engines"][reg.engine_id]["failed"] == 0
+        await shutdown(scheduler, registry)
+
+    @pytest.mark.asyncio
+    async def test_backpressure_when_engine_queue_full(self):
+        """測試引擎隊列滿時分發工作者等待，任務留在全局隊列"""
+        registry = EngineRegistry()
+        gate = asyncio.Event()
+        reg = await add_engine(registry, "slow", gate=gate)
+        scheduler = EngineScheduler(registry, EventBus(), dispatch_workers=1,
+                                    engine_queue_size=2, max_engine_concurrency=1)
+        await scheduler.start()
+
+        for i in range(10):
+            await scheduler.schedule_task({"target_engine_id": reg.engine_id, "label": i})
+        # 一個執行中、兩個在引擎隊列、一個由分發工作者持有等待入隊
+        await wait_until(lambda: scheduler.get_metrics()["pending"] == 6)
+        await asyncio.sleep(0.05)
+
+        metrics = scheduler.get_metrics()
+        lane = metrics["engines"][reg.engine_id]
+        assert metrics["pending"] == 6
+        assert lane["queue_depth"] == 2 and lane["in_flight"] == 1
+        assert metrics["routed"] == 3
+
+        gate.set()
+        await wait_until(lambda: len(reg.instance.executed) == 10)
+        assert reg.instance.executed == list(range(10))
+        await shutdown(scheduler, registry)
+
+    @pytest.mark.asyncio
+    async def test_reroutes_when_engine_becomes_unhealthy(self):
+        """測試引擎變為不健康後，其隊列中的任務重新路由到其他引擎"""
+        registry = EngineRegistry()
+        gate = asyncio.Event()
+        first = await add_engine(registry, "first", gate=gate)
+        second = await add_engine(registry, "second", healthy=False)
+        scheduler = EngineScheduler(registry, EventBus(), dispatch_workers=1, max_engine_concurrency=1)
+        await scheduler.start()
+
+        for i in range(5):
+            await scheduler.schedule_task({"target_engine_type": EngineType.EXECUTION.value, "label": i})
+        await wait_until(lambda: scheduler.get_metrics()["routed"] == 5)
+
+        first.healthy = False
+        second.healthy = True
+        gate.set()
+        await wait_until(lambda: len(first.instance.executed) + len(second.instance.executed) == 5)
+
+        # 已在執行中的任務在原引擎完成，其餘改由健康引擎執行
+        assert first.instance.executed == [0]
+        assert sorted(second.instance.executed) == [1, 2, 3, 4]
+        assert scheduler.get_metrics()["unroutable"] == 0
+        await shutdown(scheduler, registry)
+
+    @pytest.mark.asyncio
+    async def test_select_engine_prefers_less_loaded(self):
+        """測試 select_engine 選擇預期完成時間較短的引擎"""
+        registry = EngineRegistry()
+        busy = await add_engine(registry, "busy", concurrency=2)
+        idle = await add_engine(registry, "idle", concurrency=2)
+        scheduler = EngineScheduler(registry, EventBus())
+        await scheduler.start()
+        busy_lane, idle_lane = scheduler._get_lane(busy), scheduler._get_lane(idle)
+
+        # 未完成任務數較多
+        busy_lane.latency_ewma_ms = idle_lane.latency_ewma_ms = 10.0
+        busy_lane.in_flight = 2
+        assert scheduler.select_engine([busy, idle]) is idle
+        assert scheduler.select_engine([idle, busy]) is idle
+
+        # 未完成任務數相同時延遲較高
+        busy_lane.in_flight = idle_lane.in_flight = 1
+        busy_lane.latency_ewma_ms = 50.0
+        assert scheduler.select_engine([busy, idle]) is idle
+
+        busy_lane.in_flight = idle_lane.in_flight = 0
+        await shutdown(scheduler, registry)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+引用更新基準測試
+Benchmark for Executor reference rewriting
+
+生成合成文檔目錄（預設 10000 個 Markdown/YAML 文件、1000 個移動），比較：
+- 原做法：每個文件 × 每個移動 × 5 種格式逐一 str.replace，有變更即寫回
+- 單次掃描（單進程）：前綴樹正則一次掃描，內容未變不寫入
+- 單次掃描（進程池）
+
+三種做法在各自的目錄副本上執行，最後比較結果是否一致。
+
+用法:
+    python benchmark_reference_rewrite.py --files 10000 --moves 1000
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from refactor_engine import update_references
+
+
+def generate_tree(root: Path, files: int, moves: int, links: int, seed: int) -> Dict[str, str]:
+    """生成合成目錄，返回移動映射表"""
+    rng = random.Random(seed)
+    targets = [f"docs/section-{i % 50}/page-{i}.md" for i in range(files)]
+    moved = {path: path.replace("docs/", "archive/", 1) for path in rng.sample(targets, moves)}
+
+    for i, path in enumerate(targets):
+        file_path = root / path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if i % 4 == 0:
+            file_path = file_path.with_suffix(".yaml")
+            lines = [f"ref_{j}: {rng.choice(targets)}" for j in range(links)]
+        else:
+            lines = [f"# Page {i}", ""]
+            for j in range(links):
+                prefix = rng.choice(["", "./", "../"])
+                lines.append(f"- See [page {j}]({prefix}{rng.choice(targets)}) for details.")
+        file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return moved
+
+
+def legacy_update(root: Path, moved_files: Dict[str, str]) -> int:
+    """原 Executor._update_all_references 的逐一替換"""
+    updated_count = 0
+    for file_path in root.rglob("*"):
+        if not file_path.is_file() or file_path.suffix not in [".md", ".yaml", ".yml"]:
+            continue
+        if ".refactor_backup" in str(file_path):
+            continue
+
+        content = file_path.read_text(encoding='utf-8')
+        updated_content = content
+        has_changes = False
+        for old_path, new_path in moved_files.items():
+            old_rel = str(Path(old_path))
+            new_rel = str(Path(new_path))
+            patterns = [
+                (f"]({old_rel})", f"]({new_rel})"),
+                (f"](./{old_rel})", f"](./{new_rel})"),
+                (f"](../{old_rel})", f"](../{new_rel})"),
+                (f': {old_rel}', f': {new_rel}'),
+                (f'"{old_rel}"', f'"{new_rel}"'),
+            ]
+            for old_pattern, new_pattern in patterns:
+                if old_pattern in updated_content:
+                    updated_content = updated_content.replace(old_pattern, new_pattern)
+                    has_changes = True
+        if has_changes:
+            file_path.write_text(updated_content, encoding='utf-8')
+            updated_count += 1
+    return updated_count
+
+
+def snapshot(root: Path) -> Dict[str, str]:
+    return {str(p.relative_to(root)): p.read_text(encoding='utf-8') for p in root.rglob("*") if p.is_file()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reference rewrite benchmark")
+    parser.add_argument("--files", type=int, default=10000, help="文件數")
+    parser.add_argument("--moves", type=int, default=1000, help="移動的文件數")
+    parser.add_argument("--links", type=int, default=20, help="每個文件的引用數")
+    parser.add_argument("--workers", type=int, default=4, help="進程池大小")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="refactor-bench-") as tmp:
+        source = Path(tmp) / "source"
+        moved = generate_tree(source, args.files, args.moves, args.links, args.seed)
+
+        runs = [
+            ("legacy", lambda root: (legacy_update(root, moved), [])),
+            ("single pass", lambda root: update_references(root, moved, max_workers=1)),
+            ("single pass (pool)", lambda root: update_references(root, moved, max_workers=args.workers,
+                                                                   parallel_threshold=0)),
+        ]
+        results = []
+        for label, run in runs:
+            root = Path(tmp) / label.replace(" ", "_")
+            shutil.copytree(source, root)
+            start = time.perf_counter()
+            updated, errors = run(root)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{label:<20} {elapsed:>10.1f} ms  {updated:>6} files updated  {len(errors)} errors")
+            results.append(snapshot(root))
+
+        assert all(result == results[0] for result in results[1:]), "rewrite results differ"
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
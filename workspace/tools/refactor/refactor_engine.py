@@ -21,6 +21,8 @@ import os
 import sys
 import re
 import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
@@ -38,6 +40,10 @@ CONFIG_PATH = CONFIG_DIR / "refactor-engine-config.yaml"
 SCRATCH_CONFIG_PATH = CONFIG_DIR / "legacy-scratch-processor.yaml"
 INTEGRATION_CONFIG_PATH = CONFIG_DIR / "integration-processor.yaml"
 
+# 引用更新掃描的文件類型與略過的目錄
+REFERENCE_SUFFIXES = (".md", ".yaml", ".yml")
+REFERENCE_SKIP_DIRS = {".refactor_backup", ".git"}
+
 # 問題嚴重程度
 SEVERITY_CRITICAL = "critical"
 SEVERITY_HIGH = "high"
@@ -751,6 +757,168 @@ class PlanGenerator:
             "checkpoints": [],
         }
 
+# ============================================================================
+# 引用重寫
+# ============================================================================
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    將路徑集合編譯為前綴樹形式的正則表達式
+
+    每個位置只需沿前綴樹比對一次，而非逐一嘗試所有路徑；
+    貪婪的可選分支使較長的路徑優先匹配。
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+def build_reference_rewriter(moved_files: Dict[str, str]) -> Tuple[re.Pattern, Dict[str, str]]:
+    """
+    建立引用重寫器
+
+    支援的引用格式與原逐一替換相同：`](path)`、`](./path)`、`](../path)`、
+    `: path`（YAML）與 `"path"`。moved_files 按執行順序排列，連續移動
+    （a → b → c）與交換位置均解析為各文件的最終位置。
+
+    Returns:
+        (匹配任一舊路徑引用的正則, 舊路徑 → 新路徑)
+    """
+    # 按移動順序重放，追蹤每個原路徑的當前位置
+    table: Dict[str, str] = {}
+    holders: Dict[str, List[str]] = defaultdict(list)  # 當前位置 → 原路徑
+    for old, new in moved_files.items():
+        old, new = str(Path(old)), str(Path(new))
+        originals = holders.pop(old, [])
+        if old not in table:
+            originals.append(old)
+        for original in originals:
+            table[original] = new
+        holders[new].extend(originals)
+    table = {old: new for old, new in table.items() if old != new}
+
+    paths = _trie_pattern(list(table))
+    pattern = re.compile(
+        rf"(?P<link>\]\((?:\.{{1,2}}/)?)(?P<link_path>{paths})\)"
+        rf'|"(?P<quoted_path>{paths})"'
+        rf"|: (?P<yaml_path>{paths})"
+    )
+    return pattern, table
+
+
+def _rewrite_match(match: re.Match, table: Dict[str, str]) -> str:
+    if match.group("link") is not None:
+        return f"{match.group('link')}{table[match.group('link_path')]})"
+    if match.group("quoted_path") is not None:
+        return f'"{table[match.group("quoted_path")]}"'
+    return f": {table[match.group('yaml_path')]}"
+
+
+def rewrite_file_references(file_path: Path, pattern: re.Pattern, table: Dict[str, str]) -> bool:
+    """
+    重寫單一文件中的引用（內容未變時不寫入）
+
+    以同目錄臨時文件寫入後原子替換，中斷時不會留下寫了一半的文件。
+
+    Returns:
+        文件是否被更新
+    """
+    content = file_path.read_text(encoding='utf-8')
+    updated_content = pattern.sub(lambda match: _rewrite_match(match, table), content)
+    if updated_content == content:
+        return False
+
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(updated_content)
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+# 進程池工作者狀態（由 _init_rewrite_worker 設定，每個進程只編譯一次正則）
+_WORKER_PATTERN: Optional[re.Pattern] = None
+_WORKER_TABLE: Dict[str, str] = {}
+
+
+def _init_rewrite_worker(moved_files: Dict[str, str]):
+    global _WORKER_PATTERN, _WORKER_TABLE
+    _WORKER_PATTERN, _WORKER_TABLE = build_reference_rewriter(moved_files)
+
+
+def _rewrite_chunk(paths: List[str]) -> List[Tuple[str, bool, Optional[str]]]:
+    results = []
+    for path in paths:
+        try:
+            results.append((path, rewrite_file_references(Path(path), _WORKER_PATTERN, _WORKER_TABLE), None))
+        except Exception as e:
+            results.append((path, False, str(e)))
+    return results
+
+
+def _reference_files(root: Path) -> List[str]:
+    """列出需要更新引用的文件（略過備份目錄）"""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in REFERENCE_SKIP_DIRS]
+        files.extend(os.path.join(dirpath, name) for name in filenames if name.endswith(REFERENCE_SUFFIXES))
+    return files
+
+
+def update_references(root: Path, moved_files: Dict[str, str],
+                      max_workers: Optional[int] = None,
+                      parallel_threshold: int = 500) -> Tuple[int, List[Tuple[Path, str]]]:
+    """
+    單次掃描更新所有文件中指向已移動文件的引用
+
+    Args:
+        root: 掃描根目錄
+        moved_files: 舊路徑 → 新路徑（相對於 root）
+        max_workers: 進程池大小（預設為 CPU 數）
+        parallel_threshold: 文件數達到此值時使用進程池
+
+    Returns:
+        (更新的文件數, [(文件, 錯誤訊息)])
+    """
+    if not moved_files:
+        return 0, []
+
+    files = _reference_files(root)
+    workers = max_workers or os.cpu_count() or 1
+
+    if len(files) < parallel_threshold or workers < 2:
+        _init_rewrite_worker(moved_files)
+        results = _rewrite_chunk(files)
+    else:
+        chunk_size = max(1, len(files) // (workers * 4))
+        chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_rewrite_worker,
+                                 initargs=(moved_files,)) as pool:
+            results = [result for chunk in pool.map(_rewrite_chunk, chunks) for result in chunk]
+
+    updated_count = sum(1 for _, updated, _ in results if updated)
+    errors = [(Path(path), error) for path, _, error in results if error]
+    return updated_count, errors
+
 # ============================================================================
 # 執行器
 # ============================================================================
@@ -836,6 +1004,7 @@ class Executor:
             else:
                 try:
                     self._execute_step(step)
+                    self.executed_steps.append(step)
                     print(f"{step_desc} → ✓")
                     result["executed"].append({
                         "phase": phase.id,
@@ -918,50 +1087,10 @@ class Executor:
             print("    ℹ️  無需更新引用（無文件移動）")
             return
 
-        # 掃描所有 Markdown 和 YAML 文件
-        updated_count = 0
-        for file_path in self.target.rglob("*"):
-            if not file_path.is_file():
-                continue
-
-            if file_path.suffix not in [".md", ".yaml", ".yml"]:
-                continue
-
-            if ".refactor_backup" in str(file_path):
-                continue
-
-            try:
-                content = file_path.read_text(encoding='utf-8')
-                updated_content = content
-                has_changes = False
-
-                # 處理 Markdown 連結: [text](path)
-                for old_path, new_path in moved_files.items():
-                    # 相對路徑匹配
-                    old_rel = str(Path(old_path))
-                    new_rel = str(Path(new_path))
-
-                    # 匹配多種可能的引用格式
-                    patterns = [
-                        (f"]({old_rel})", f"]({new_rel})"),
-                        (f"](./{old_rel})", f"](./{new_rel})"),
-                        (f"](../{old_rel})", f"](../{new_rel})"),
-                        (f': {old_rel}', f': {new_rel}'),  # YAML 路徑
-                        (f'"{old_rel}"', f'"{new_rel}"'),  # 引號包圍
-                    ]
-
-                    for old_pattern, new_pattern in patterns:
-                        if old_pattern in updated_content:
-                            updated_content = updated_content.replace(old_pattern, new_pattern)
-                            has_changes = True
-
-                # 如果有變更，寫回文件
-                if has_changes:
-                    file_path.write_text(updated_content, encoding='utf-8')
-                    updated_count += 1
-
-            except Exception as e:
-                print(f"    ⚠️  更新 {file_path.relative_to(self.target)} 失敗: {e}")
+        # 單次掃描所有 Markdown 和 YAML 文件
+        updated_count, errors = update_references(self.target, moved_files)
+        for file_path, error in errors:
+            print(f"    ⚠️  更新 {file_path.relative_to(self.target)} 失敗: {error}")
 
         print(f"    ✓ 已更新 {updated_count} 個文件的引用")
 